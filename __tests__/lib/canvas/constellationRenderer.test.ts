@@ -1,5 +1,5 @@
-import { drawConstellationLines } from '@/lib/canvas/constellationRenderer';
-import type { ConstellationLine } from '@/types/constellation';
+import { drawConstellationGeometry, drawConstellationLines } from '@/lib/canvas/constellationRenderer';
+import type { ConstellationGeometry, ConstellationLine } from '@/types/constellation';
 import type { Star } from '@/types/star';
 
 function createMockContext() {
@@ -86,3 +86,72 @@ describe('drawConstellationLines', () => {
     expect(ctx.beginPath).not.toHaveBeenCalled();
   });
 });
+
+describe('drawConstellationGeometry', () => {
+  const geometry: ConstellationGeometry = {
+    version: 1,
+    vertices: {
+      hip: [1, 2, 3, 4],
+      ra: [0, 5, 10, 180],
+      dec: [0, 5, 0, 0],
+      x: [1, 0.9924, 0.9848, -1],
+      y: [0, 0.0868, 0.1736, 0],
+      z: [0, 0.0872, 0, 0],
+    },
+    constellations: [
+      { constellationId: 'Ori', indices: [0, 1, 1, 2], strips: [[0, 1, 2]] },
+      { constellationId: 'Tau', indices: [2, 3], strips: [[2, 3]] },
+    ],
+  };
+
+  it('strokes every strip in a single path', () => {
+    const ctx = createMockContext();
+
+    const count = drawConstellationGeometry(ctx, geometry, { ra: 0, dec: 0 }, 1, 800, 600);
+
+    expect(count).toBe(2);
+    expect(ctx.beginPath).toHaveBeenCalledTimes(1);
+    expect(ctx.stroke).toHaveBeenCalledTimes(1);
+    expect(ctx.moveTo).toHaveBeenCalledTimes(2);
+    expect(ctx.lineTo).toHaveBeenCalledTimes(2);
+  });
+
+  it('breaks strips at vertices that cannot be projected', () => {
+    const ctx = createMockContext();
+
+    const count = drawConstellationGeometry(ctx, geometry, { ra: 180, dec: 0 }, 1, 800, 600);
+
+    expect(count).toBe(0);
+    expect(ctx.lineTo).not.toHaveBeenCalled();
+    expect(ctx.stroke).not.toHaveBeenCalled();
+  });
+
+  it('skips segments whose stars are not displayed', () => {
+    const ctx = createMockContext();
+    // HIP 3（頂点 2）は表示モードで絞り込まれて表示されていない
+    const displayed = new Map<number, Star>([
+      [1, starA],
+      [2, starB],
+      [4, { ...starA, id: 4, ra: 180 }],
+    ]);
+
+    const count = drawConstellationGeometry(ctx, geometry, { ra: 0, dec: 0 }, 1, 800, 600, {
+      starIndex: displayed,
+    });
+
+    expect(count).toBe(1);
+    expect(ctx.moveTo).toHaveBeenCalledTimes(1);
+    expect(ctx.lineTo).toHaveBeenCalledTimes(1);
+  });
+
+  it('draws nothing when none of the endpoint stars are displayed', () => {
+    const ctx = createMockContext();
+
+    const count = drawConstellationGeometry(ctx, geometry, { ra: 0, dec: 0 }, 1, 800, 600, {
+      starIndex: {},
+    });
+
+    expect(count).toBe(0);
+    expect(ctx.stroke).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,118 @@
+import { existsSync, readFileSync } from 'fs';
+import { join } from 'path';
+import { parseBinaryBundle } from '@/lib/data/binaryBundle';
+import {
+  celestialToScreen,
+  equatorialToHorizontal,
+  getJulianDate,
+  getLocalSiderealTime,
+} from '@/lib/canvas/coordinateUtils';
+
+/**
+ * scripts/build_golden_vectors.py が作るゴールデンベクトル（入力と期待値の組）との突き合わせ
+ * 期待値は scripts/pipeline/skytransform.py の参照実装（このファイルと同じ式の NumPy 版）で計算している
+ */
+
+const GOLDEN_PATH = process.env.GOLDEN_VECTORS
+  ?? join(process.cwd(), 'data/generated/golden/coordinate-transforms.bin');
+
+const COLUMNS = [
+  'ra', 'dec', 'timeMs', 'latitude', 'longitude', 'centerRa', 'centerDec', 'zoom', 'width', 'height',
+  'julianDate', 'siderealTime', 'altitude', 'azimuth',
+  'orthographicX', 'orthographicY', 'stereographicX', 'stereographicY',
+] as const;
+
+type GoldenRow = Record<(typeof COLUMNS)[number], number>;
+
+// 三角関数の実装（V8 と libm）の末尾桁の違いだけを許す
+const DEGREE_TOLERANCE = 1e-9;
+// 方位角は acos で求めるため、子午線の近く（cos Az ≈ ±1）では末尾桁の違いが 1e-9 度程度まで広がる
+const AZIMUTH_TOLERANCE = 1e-7;
+const PIXEL_TOLERANCE = 1e-6;
+
+// python3 scripts/build_golden_vectors.py と同じ参照実装で build_golden(6, seed=1) から取った行（NaN は null）
+const SAMPLE: number[][] = [
+  [184.2557848920924, -1.697237533558387, -2103443821644.0, -67.02827643070748, -122.92018776478344, 182.73445928225465, 4.050273697076759, 11.079255725374187, 664.0, 1222.0, 2416242.0853935187, 312.05765552073717, -12.230159158601545, 233.91355370752936, 456.07617428084995, 1079.1134375545932, 207.58924890799707, 1080.3757258392106],
+  [342.1669306773367, 74.04427363030433, 906155327431.0, -49.94876412967096, 162.73053674142653, 334.6126550985161, 85.366263200365, 3.275012574888383, 529.0, 1172.0, 2451075.408877315, 127.53573526782566, -61.827066748868596, 340.6777434144286, 303.59190191144285, 795.7909917696877, 225.02014214720074, 797.8730000046535],
+  [51.897460579068145, 67.41553612022044, 3923190072335.0, 11.169286217947686, -124.43269228293445, 92.80912283882517, -56.1915463382157, 3.291884933011837, 2371.0, 478.0, 2485994.7925, 196.6755180209875, -7.408305251972408, 347.0935052710542, NaN, NaN, NaN, NaN],
+  [341.5138009694078, 26.716732782300195, -407293963412.0, -20.20155918192829, 3.7091699059267285, 274.7262717158592, -19.351480317735152, 8.04210191276759, 1663.0, 452.0, 2435873.449490741, 119.36404128465801, -50.964339310363684, 287.86759098611793, NaN, NaN, NaN, NaN],
+  [112.25932272377476, 4.729619153206971, 2513339167039.0, 52.49811700626131, -128.15896499306723, 96.02829204780802, 19.903636839115617, 0.8628791590816615, 395.0, 580.0, 2469677.0736921295, 50.661595604382455, 20.73232601202516, 110.39179217112302, 240.24980772908242, 328.09502917521775, 153.14880779411905, 329.5220481866478],
+  [152.39752163012724, -26.50126629172453, 585643878497.0, 18.924586069952596, 78.2538213982445, 145.9088810785069, -21.016867652805566, 10.281611245018468, 903.0, 764.0, 2447365.785625, 122.30780297378078, 35.99762725418223, 146.31845045985284, NaN, NaN, NaN, NaN],
+];
+
+function toRow(values: ArrayLike<number>): GoldenRow {
+  return Object.fromEntries(COLUMNS.map((name, i) => [name, values[i]])) as GoldenRow;
+}
+
+/** 期待値との差の最大値（方位角は 0 / 360 度の折り返しを考慮し、null の食い違いは件数で数える） */
+function compareRow(row: GoldenRow, errors: Record<string, number>): void {
+  const date = new Date(row.timeMs);
+  const observer = { latitude: row.latitude, longitude: row.longitude, date };
+  const horizontal = equatorialToHorizontal(row.ra, row.dec, observer);
+  const azimuthDelta = Math.abs(horizontal.azimuth - row.azimuth);
+
+  const track = (name: string, value: number) => {
+    if (!(value <= errors[name])) errors[name] = value;
+  };
+  track('julianDate', Math.abs(getJulianDate(date) - row.julianDate));
+  track('siderealTime', Math.abs(getLocalSiderealTime(date, row.longitude) - row.siderealTime));
+  track('altitude', Math.abs(horizontal.altitude - row.altitude));
+  track('azimuth', Math.min(azimuthDelta, 360 - azimuthDelta));
+
+  const center = { ra: row.centerRa, dec: row.centerDec };
+  for (const mode of ['orthographic', 'stereographic'] as const) {
+    const screen = celestialToScreen(row.ra, row.dec, center, row.zoom, row.width, row.height, mode);
+    const expectedX = row[`${mode}X`];
+    const expectedY = row[`${mode}Y`];
+    if ((screen === null) !== Number.isNaN(expectedX)) {
+      errors.nullMismatch += 1;
+    } else if (screen) {
+      track('screen', Math.max(Math.abs(screen.x - expectedX), Math.abs(screen.y - expectedY)));
+    }
+  }
+}
+
+function emptyErrors(): Record<string, number> {
+  return { julianDate: 0, siderealTime: 0, altitude: 0, azimuth: 0, screen: 0, nullMismatch: 0 };
+}
+
+function expectWithinTolerance(errors: Record<string, number>): void {
+  expect(errors.julianDate).toBe(0);
+  expect(errors.siderealTime).toBeLessThanOrEqual(DEGREE_TOLERANCE);
+  expect(errors.altitude).toBeLessThanOrEqual(DEGREE_TOLERANCE);
+  expect(errors.azimuth).toBeLessThanOrEqual(AZIMUTH_TOLERANCE);
+  expect(errors.screen).toBeLessThanOrEqual(PIXEL_TOLERANCE);
+  expect(errors.nullMismatch).toBe(0);
+}
+
+describe('coordinate transforms against golden vectors', () => {
+  // timeMs はミリ秒の端数を含む（getJulianDate と同じく秒未満は切り捨てて期待値を計算している）
+  it('matches the NumPy reference on the embedded sample', () => {
+    const errors = emptyErrors();
+    SAMPLE.forEach((values) => compareRow(toRow(values), errors));
+    expectWithinTolerance(errors);
+  });
+
+  // python3 scripts/build_golden_vectors.py で生成した後に実行される（未生成なら省略）
+  (existsSync(GOLDEN_PATH) ? it : it.skip)('matches every row of the generated golden file', () => {
+    const file = readFileSync(GOLDEN_PATH);
+    const buffer = file.buffer.slice(file.byteOffset, file.byteOffset + file.byteLength) as ArrayBuffer;
+    const { header, columns } = parseBinaryBundle(buffer);
+    const data = COLUMNS.map((name) => columns[name]);
+    const values = new Float64Array(COLUMNS.length);
+    const errors = emptyErrors();
+
+    const started = performance.now();
+    for (let i = 0; i < header.count; i++) {
+      for (let c = 0; c < data.length; c++) values[c] = data[c][i];
+      compareRow(toRow(values), errors);
+    }
+    const elapsed = performance.now() - started;
+
+    if (process.env.GOLDEN_BENCHMARK) {
+      // 1 行あたりユリウス日 1 回・恒星時 2 回・地平座標 1 回・画面座標 2 回の変換
+      console.log(`${header.count} rows in ${elapsed.toFixed(0)} ms (${Math.round(header.count / elapsed * 1000)} rows/s)`);
+    }
+    expectWithinTolerance(errors);
+  });
+});
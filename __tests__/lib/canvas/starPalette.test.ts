@@ -0,0 +1,51 @@
+import {
+  COLOR_CLASSES,
+  FADE_LEVELS,
+  STAR_PALETTE,
+  UNKNOWN_COLOR_CLASS,
+  colorClass,
+  fadeLevel,
+  paletteIndex,
+} from '@/lib/canvas/starPalette';
+
+describe('starPalette', () => {
+  it('builds one entry per color class and fade level', () => {
+    expect(STAR_PALETTE).toHaveLength(COLOR_CLASSES.length * FADE_LEVELS);
+    expect(STAR_PALETTE[0]).toEqual({ core: '#9bb0ff', inner: '#9bb0ffCC', outer: '#9bb0ff55' });
+    expect(STAR_PALETTE[FADE_LEVELS - 1].core).toBe('#ffffff');
+  });
+
+  it('classifies B-V with upper-exclusive limits', () => {
+    expect(colorClass(-0.5, null)).toBe(0);
+    expect(colorClass(-0.3, null)).toBe(1);
+    expect(colorClass(0.2, null)).toBe(2);
+    expect(colorClass(1.4, null)).toBe(5);
+  });
+
+  it('falls back to spectral type when B-V is missing', () => {
+    expect(colorClass(null, 'G2V')).toBe(4);
+    expect(colorClass(null, 'm2')).toBe(5);
+    expect(colorClass(null, null)).toBe(UNKNOWN_COLOR_CLASS);
+  });
+
+  it('keeps the spectral K color and the pre-palette fallback for unknown stars', () => {
+    // B-V のある K 型は #ffd2a1、スペクトル型だけの K 型は以前どおり #ffb56c
+    expect(STAR_PALETTE[colorClass(1.0, null) * FADE_LEVELS].core).toBe('#ffd2a1');
+    expect(STAR_PALETTE[colorClass(null, 'K5III') * FADE_LEVELS].core).toBe('#ffb56c');
+    // B-V もスペクトル型も無い星は、以前の描画（B-V = 0 とみなす）と同じ #fff4ea
+    expect(STAR_PALETTE[paletteIndex({ bv: null, spectralType: null, vmag: 1 })].core).toBe('#fff4ea');
+  });
+
+  it('fades faint stars toward white in fixed steps', () => {
+    expect(fadeLevel(1)).toBe(0);
+    expect(fadeLevel(null)).toBe(0);
+    expect(fadeLevel(6)).toBe(FADE_LEVELS - 1);
+    expect(fadeLevel(4.75)).toBe(4);
+  });
+
+  it('prefers the prebuilt colorIndex from stars.json', () => {
+    const star = { bv: -0.2, spectralType: 'B2V', vmag: 1 };
+    expect(paletteIndex(star)).toBe(1 * FADE_LEVELS);
+    expect(paletteIndex({ ...star, colorIndex: 42 })).toBe(42);
+  });
+});
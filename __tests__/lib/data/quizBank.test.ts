@@ -0,0 +1,113 @@
+import type { Star } from '@/types/star';
+import {
+  QuizBankSet,
+  QuizBankShard,
+  clearQuizBankCache,
+  createQuizFromBank,
+  createStarLookup,
+  drawQuizFromBank,
+  quizBankShardPath,
+} from '@/lib/data/quizBank';
+
+function star(id: number, properName: string | undefined, vmag: number, spectralType: string, parallax: number): Star {
+  return {
+    id, ra: id % 360, dec: 10, vmag, bv: null, spectralType, parallax,
+    pmRA: null, pmDE: null, name: null, constellation: null, properName,
+  } as Star;
+}
+
+const stars: Star[] = [
+  star(32349, 'シリウス', -1.46, 'A1V', 379.21),
+  star(27989, 'ベテルギウス', 0.42, 'M1-2Ia-Iab', 6.55),
+  star(69673, 'アークトゥルス', -0.05, 'K1.5IIIFe-0.5', 88.83),
+  star(24608, 'カペラ', 0.08, 'G5IIIe+G0III', 76.2),
+  star(11767, undefined, 1.97, 'F7:Ib-IIv', 7.54),
+];
+
+function shard(type: QuizBankShard['type'], questions: QuizBankShard['questions']): QuizBankShard {
+  const count = (questions.target ?? questions.first ?? []).length;
+  return {
+    version: 1, type, difficulty: 'easy', category: 'all', seed: 1, stream: [0, 0, 2], count, unique: count,
+    strata: { name: 'vmag', edges: [0, 1, 2, 3], counts: [] },
+    questions,
+  };
+}
+
+describe('createQuizFromBank', () => {
+  const lookup = createStarLookup(stars);
+
+  it('builds a brightness quiz with choices in bank order', () => {
+    const quiz = createQuizFromBank(shard('brightness', { first: [27989], second: [32349], answer: [1] }), 0, lookup);
+
+    expect(quiz?.type).toBe('brightness');
+    expect(quiz?.choices).toEqual(['ベテルギウス', 'シリウス']);
+    expect(quiz?.correctAnswer).toBe('シリウス');
+    expect(quiz?.compareStar?.id).toBe(27989);
+  });
+
+  it('builds a color quiz whose answer index matches the spectral type', () => {
+    const quiz = createQuizFromBank(shard('color', { target: [27989], answer: [3] }), 0, lookup);
+
+    expect(quiz?.correctAnswer).toBe('赤い');
+    expect(quiz?.choices[3]).toBe('赤い');
+  });
+
+  it('formats distance choices from the stored light-year values', () => {
+    const quiz = createQuizFromBank(
+      shard('distance', { target: [32349], choices: [[550, 9, 40, 200]], answer: [1] }),
+      0,
+      lookup
+    );
+
+    expect(quiz?.choices).toEqual(['約550光年', '約9光年', '約40光年', '約200光年']);
+    expect(quiz?.correctAnswer).toBe('約9光年');
+  });
+
+  it('returns null for stars missing from the data, without a proper name, or with a stale answer', () => {
+    expect(createQuizFromBank(shard('find-star', { target: [1] }), 0, lookup)).toBeNull();
+    expect(createQuizFromBank(shard('find-star', { target: [11767] }), 0, lookup)).toBeNull();
+    expect(createQuizFromBank(shard('color', { target: [24608], answer: [0] }), 0, lookup)).toBeNull();
+  });
+});
+
+describe('drawQuizFromBank', () => {
+  const lookup = createStarLookup(stars);
+
+  it('picks the question at the drawn index', () => {
+    const bank = shard('find-star', { target: [32349, 69673, 24608] });
+
+    expect(drawQuizFromBank(bank, lookup, () => 0.5)?.targetStar?.id).toBe(69673);
+    expect(drawQuizFromBank(bank, lookup, () => 0.99)?.targetStar?.id).toBe(24608);
+  });
+
+  it('returns null for an empty shard', () => {
+    expect(drawQuizFromBank(shard('find-star', { target: [] }), lookup)).toBeNull();
+  });
+});
+
+describe('QuizBankSet', () => {
+  afterEach(() => {
+    clearQuizBankCache();
+  });
+
+  it('fetches each shard once and draws from it', async () => {
+    const bank = shard('color', { target: [32349, 24608], answer: [1, 2] });
+    const fetcher = jest.fn().mockResolvedValue({ ok: true, json: async () => bank });
+    const banks = new QuizBankSet(stars, { fetcher });
+
+    const first = await banks.draw('color', 'easy', 'all', () => 0);
+    const second = await banks.draw('color', 'easy', 'all', () => 0.9);
+
+    expect(fetcher).toHaveBeenCalledTimes(1);
+    expect(fetcher).toHaveBeenCalledWith(quizBankShardPath('color', 'easy', 'all'));
+    expect(first?.correctAnswer).toBe('白い');
+    expect(second?.correctAnswer).toBe('黄色い');
+  });
+
+  it('rejects when the shard cannot be loaded', async () => {
+    const fetcher = jest.fn().mockResolvedValue({ ok: false, status: 404, statusText: 'Not Found' });
+    const banks = new QuizBankSet(stars, { fetcher });
+
+    await expect(banks.draw('distance', 'hard', 'north')).rejects.toThrow('Failed to load');
+  });
+});
@@ -0,0 +1,123 @@
+import {
+  StarSearchIndex,
+  StarSearchIndexData,
+  normalizeSearchText,
+} from '@/lib/data/starSearchIndex';
+
+/**
+ * scripts/pipeline/searchindex.py の build_search_index で 6 星から作った索引
+ * （シリウス、リギル・ケンタウルス、アカマル、はくちょう座61番星、アークトゥルス、アルタイル）
+ */
+const SEARCH_INDEX: StarSearchIndexData = {
+  version: 1,
+  kinds: ['properName', 'iauName', 'bayer', 'flamsteed'],
+  entries: {
+    hip: [
+      32349, 69673, 97649, 32349, 69673, 71683, 97649, 13847, 32349, 69673, 71683, 97649, 13847,
+      32349, 69673, 97649, 104214,
+    ],
+    kind: [0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3],
+    text: [
+      'シリウス', 'アークトゥルス', 'アルタイル', 'Sirius', 'Arcturus', 'Rigil Kentaurus', 'Altair', 'Acamar',
+      'α CMa', 'α Boo', 'α¹ Cen', 'α Aql', 'θ¹ Eri', '9 CMa', '16 Boo', '53 Aql', '61 Cyg',
+    ],
+  },
+  keys: [
+    '16boo', '53aql', '61cyg', '9cma', 'acamar', 'alp1cen', 'alpaql', 'alpboo', 'alpcen', 'alpcma',
+    'alpha1cen', 'alphaaql', 'alphaboo', 'alphacen', 'alphacma', 'altair', 'arcturus',
+    'rigilkentaurus', 'sirius', 'the1eri', 'theeri', 'theta1eri', 'thetaeri', 'アルタイル', 'アークトゥルス',
+    'シリウス',
+  ],
+  keyEntries: [
+    [14], [15], [16], [13], [7], [10], [11], [9], [10], [8], [10], [11], [9], [10], [8], [6], [4],
+    [5], [3], [12], [12], [12], [12], [2], [1], [0],
+  ],
+  trigrams: [
+    '16b', '1ce', '1cy', '1er', '3aq', '53a', '61c', '6bo', '9cm', 'a1c', 'a1e', 'aaq', 'abo',
+    'aca', 'ace', 'acm', 'aer', 'air', 'alp', 'alt', 'ama', 'aql', 'arc', 'aur', 'boo', 'cam',
+    'cen', 'cma', 'ctu', 'cyg', 'e1e', 'eer', 'ent', 'eri', 'eta', 'gil', 'ha1', 'haa', 'hab',
+    'hac', 'he1', 'hee', 'het', 'igi', 'ilk', 'iri', 'ius', 'ken', 'lke', 'lp1', 'lpa', 'lpb',
+    'lpc', 'lph', 'lta', 'mar', 'nta', 'p1c', 'paq', 'pbo', 'pce', 'pcm', 'pha', 'rct', 'rig',
+    'riu', 'rus', 'sir', 'ta1', 'tae', 'tai', 'tau', 'the', 'tur', 'uru', 'アルタ', 'アーク', 'ゥルス',
+    'クトゥ', 'シリウ', 'タイル', 'トゥル', 'リウス', 'ルタイ', 'ークト',
+  ],
+  postings: [
+    [0], [5, 5], [2], [19, 2], [1], [1], [2], [0], [3], [10], [21], [11], [12], [4], [13], [14],
+    [22], [15], [5, 1, 1, 1, 1, 1, 1, 1, 1, 1], [15], [4], [1, 5, 5], [16], [17], [0, 7, 5], [4],
+    [5, 3, 2, 3], [3, 6, 5], [16], [2], [19], [20], [17], [19, 1, 1, 1], [21, 1], [17], [10], [11],
+    [12], [13, 1], [19], [20], [21, 1], [17], [17], [18], [18], [17], [17], [5], [6], [7], [8, 1],
+    [10, 1, 1, 1, 1], [15], [4], [17], [5], [6], [7], [8], [9], [10, 1, 1, 1, 1], [16], [17], [18],
+    [16, 1], [18], [21], [22], [15], [17], [19, 1, 1, 1], [16], [16, 1], [23], [24], [24], [24],
+    [25], [23], [24], [25], [23], [24],
+  ],
+  catalog: {
+    hip: [13847, 18502, 37324, 2010, 25966, 6565],
+    hd: [18622, 30293, 75982, 3723, 59022, 13449],
+    hdHip: [13847, 32349, 69673, 71683, 97649, 104214],
+    hr: [897, 1594, 2849, 119, 2098, 528],
+    hrHip: [13847, 32349, 69673, 71683, 97649, 104214],
+  },
+};
+
+describe('normalizeSearchText', () => {
+  it('folds kana width and hiragana to full-width katakana', () => {
+    expect(normalizeSearchText('しりうす')).toBe('シリウス');
+    expect(normalizeSearchText('ｼﾘｳｽ')).toBe('シリウス');
+    expect(normalizeSearchText('ベガ')).not.toBe(normalizeSearchText('ヘカ'));
+    expect(normalizeSearchText('アークトゥルス')).toBe('アークトゥルス');
+  });
+
+  it('drops diacritics, case, spaces and separators', () => {
+    expect(normalizeSearchText('Açamar')).toBe('acamar');
+    expect(normalizeSearchText('Ｓｉｒｉｕｓ')).toBe('sirius');
+    expect(normalizeSearchText('Rigil Kentaurus')).toBe('rigilkentaurus');
+    expect(normalizeSearchText('ラス・アルハゲ')).toBe('ラスアルハゲ');
+  });
+
+  it('spells Greek letters as Bayer abbreviations', () => {
+    expect(normalizeSearchText('α CMa')).toBe('alpcma');
+    expect(normalizeSearchText('α¹ Cen')).toBe('alp1cen');
+    expect(normalizeSearchText('Θ Eri')).toBe('theeri');
+  });
+});
+
+describe('StarSearchIndex', () => {
+  const index = new StarSearchIndex(SEARCH_INDEX);
+
+  it('finds katakana, IAU names and designations by prefix', () => {
+    expect(index.search('しり')[0]).toEqual({ hip: 32349, text: 'シリウス', kind: 'properName' });
+    expect(index.search('sir')[0]).toEqual({ hip: 32349, text: 'Sirius', kind: 'iauName' });
+    expect(index.search('alpha cen')[0]).toEqual({ hip: 71683, text: 'α¹ Cen', kind: 'bayer' });
+    expect(index.search('θ Eri')[0]).toEqual({ hip: 13847, text: 'θ¹ Eri', kind: 'bayer' });
+    expect(index.search('61 cyg')[0]).toEqual({ hip: 104214, text: '61 Cyg', kind: 'flamsteed' });
+  });
+
+  it('ranks by kind, then brightness, and lists each star once', () => {
+    const hits = index.search('a');
+    expect(hits.map(hit => hit.hip)).toEqual([69673, 97649, 13847, 32349, 71683]);
+    expect(new Set(hits.map(hit => hit.hip)).size).toBe(hits.length);
+    expect(index.search('a', 2)).toHaveLength(2);
+  });
+
+  it('falls back to trigram substring matches', () => {
+    expect(index.search('kentaurus')).toEqual([{ hip: 71683, text: 'Rigil Kentaurus', kind: 'iauName' }]);
+    expect(index.search('xyz')).toEqual([]);
+    expect(index.search('')).toEqual([]);
+  });
+
+  it('looks up HIP, HD and HR numbers exactly', () => {
+    expect(index.search('HIP 32349')[0]).toEqual({ hip: 32349, text: 'HIP 32349', kind: 'catalog' });
+    expect(index.resolve('HD 48915')).toEqual([32349]);
+    expect(index.resolve('hr5459')).toEqual([71683]);
+    expect(index.resolve('HIP 1')).toEqual([]);
+  });
+
+  it('matches quiz answers only on a whole name', () => {
+    expect(index.matches('しりうす', 32349)).toBe(true);
+    expect(index.matches('Alpha CMa', 32349)).toBe(true);
+    expect(index.matches('9 CMa', 32349)).toBe(true);
+    expect(index.matches('Acamar', 13847)).toBe(true);
+    expect(index.matches('シリ', 32349)).toBe(false);
+    expect(index.matches('Sirius', 97649)).toBe(false);
+  });
+});
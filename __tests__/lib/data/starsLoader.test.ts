@@ -30,3 +30,60 @@ describe('starsLoader', () => {
     expect(typeof sirius?.dec).toBe('number');
   });
 });
+
+describe('starsLoader mapping', () => {
+  // stars.json の形（null のフィールドは省略、constellation は IAU 略号）
+  const rawStars = [
+    { id: 27989, ra: 88.793, dec: 7.407, vmag: 0.45, bv: 1.5, spectralType: 'M1-M2Ia-Iab', name: '58Alp Ori', hd: 39801, hr: 2061, parallax: 7.63, pmRA: 27.54, pmDE: 11.3, constellation: 'Ori', properName: 'ベテルギウス' },
+    { id: 24436, ra: 78.634, dec: -8.202, vmag: 0.18, constellation: 'Ori' },
+    { id: 1, ra: 0.0009, dec: 1.089, vmag: 9.1, constellation: 'Xyz' },
+    { id: 2, ra: 0.003, dec: -19.5, constellation: null },
+    { id: 3, ra: 0.005, dec: 38.86 },
+  ];
+  const fetcher = jest.fn().mockResolvedValue({ ok: true, json: async () => rawStars });
+
+  beforeEach(() => {
+    clearStarsCache();
+  });
+
+  const loadById = async () => new Map((await loadStars({ fetcher })).map((star) => [star.id, star]));
+
+  it('maps IAU abbreviations to Japanese constellation names', async () => {
+    const stars = await loadById();
+    expect(stars.get(27989)?.constellation).toBe('オリオン');
+    expect(stars.get(24436)?.constellation).toBe('オリオン');
+  });
+
+  it('leaves unknown, null and missing constellation codes untranslated', async () => {
+    const stars = await loadById();
+    expect(stars.get(1)?.constellation).toBe('Xyz');
+    expect(stars.get(2)?.constellation).toBeNull();
+    expect(stars.get(3)?.constellation).toBeUndefined();
+  });
+
+  it('restores omitted nullable fields as null and keeps present values', async () => {
+    const stars = await loadById();
+    const rigel = stars.get(24436);
+    for (const field of ['bv', 'spectralType', 'name', 'hd', 'hr', 'parallax', 'pmRA', 'pmDE'] as const) {
+      expect(rigel?.[field]).toBeNull();
+    }
+    expect(rigel?.vmag).toBe(0.18);
+    expect(stars.get(2)?.vmag).toBeNull();
+
+    const betelgeuse = stars.get(27989);
+    expect(betelgeuse?.hd).toBe(39801);
+    expect(betelgeuse?.pmDE).toBe(11.3);
+  });
+
+  it('fills proper names from the bright star table', async () => {
+    const stars = await loadById();
+    expect(stars.get(24436)?.properName).toBe('リゲル');
+    expect(stars.get(27989)?.properName).toBe('ベテルギウス');
+    expect(stars.get(1)?.properName).toBeUndefined();
+  });
+
+  it('filters by magnitude after mapping, dropping stars without vmag', async () => {
+    const stars = await loadStars({ fetcher, maxMagnitude: 1 });
+    expect(stars.map((star) => star.id)).toEqual([27989, 24436]);
+  });
+});
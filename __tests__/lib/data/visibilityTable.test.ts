@@ -0,0 +1,183 @@
+import { parseBinaryBundle } from '@/lib/data/binaryBundle';
+import {
+  HorizonVisibility,
+  VisibilityBand,
+  VisibilityIndex,
+  clearVisibilityCache,
+  findVisibilityBand,
+  idChecksum,
+  loadHorizonVisibility,
+  loadVisibilityBand,
+} from '@/lib/data/visibilityTable';
+import type { Star } from '@/types/star';
+
+/** scripts/pipeline/bundle.py と同じ配置でバンドルを組み立てる */
+function buildBundle(columns: { name: string; dtype: string; data: Int16Array | Uint8Array }[]): ArrayBuffer {
+  const align = (value: number) => Math.ceil(value / 8) * 8;
+  const specs = columns.map(({ name, dtype, data }) => ({ name, dtype, length: data.length, offset: 0 }));
+  const header = { version: 1, count: columns[0].data.length, columns: specs, strings: {} };
+  let encoded = new Uint8Array(0);
+  for (let pass = 0; pass < 3; pass++) {
+    let position = align(8 + encoded.length);
+    columns.forEach(({ data }, i) => {
+      specs[i].offset = position;
+      position += align(data.byteLength);
+    });
+    encoded = new TextEncoder().encode(JSON.stringify(header));
+  }
+  const last = specs[specs.length - 1];
+  const buffer = new ArrayBuffer(last.offset + align(columns[columns.length - 1].data.byteLength));
+  const bytes = new Uint8Array(buffer);
+  bytes.set(new TextEncoder().encode('STRB'));
+  new DataView(buffer).setUint32(4, encoded.length, true);
+  bytes.set(encoded, 8);
+  columns.forEach(({ data }, i) => bytes.set(new Uint8Array(data.buffer, data.byteOffset, data.byteLength), specs[i].offset));
+  return buffer;
+}
+
+// scripts/pipeline/visibility.py の band_table で北緯 35〜40 度の帯について計算した値
+// ポラリス、シリウス、アクルックス、カノープス、ベガ、ベテルギウス、リゲル、座標欠損
+const IDS = [11767, 32349, 60718, 30438, 91262, 27989, 24436, 1];
+const RA = [37.95, 101.29, 186.65, 95.99, 279.23, 88.79, 78.63, 0];
+// scripts/pipeline/visibility.py の id_checksum(IDS)
+const ID_CHECKSUM = 347199903;
+const HOUR_ANGLE = Int16Array.from([18000, 7917, -1, 2789, 13471, 9759, 8545, 18000]);
+const CIRCUMPOLAR = Uint8Array.from([1]);
+const NEVER_RISES = Uint8Array.from([4]);
+
+const band: VisibilityBand = {
+  latitude: [35, 40],
+  horizon: -1,
+  hourAngleScale: 100,
+  idChecksum: ID_CHECKSUM,
+  hourAngle: HOUR_ANGLE,
+  circumpolar: CIRCUMPOLAR,
+  neverRises: NEVER_RISES,
+};
+
+const index: VisibilityIndex = {
+  version: 2,
+  bandWidth: 5,
+  horizon: -1,
+  hourAngleScale: 100,
+  count: RA.length,
+  idChecksum: ID_CHECKSUM,
+  bands: [
+    { latitude: [30, 35], path: 'lat+30.bin', circumpolar: 0, neverRises: 0, visibleFraction: 0.5 },
+    { latitude: [35, 40], path: 'lat+35.bin', circumpolar: 1, neverRises: 1, visibleFraction: 0.5 },
+    { latitude: [85, 90], path: 'lat+85.bin', circumpolar: 0, neverRises: 0, visibleFraction: 0.5 },
+  ],
+};
+
+describe('HorizonVisibility', () => {
+  const visibility = new HorizonVisibility(band, RA);
+
+  it('drops stars that never rise and flags circumpolar stars', () => {
+    expect(Array.from(visibility.candidates)).toEqual([0, 1, 3, 4, 5, 6, 7]);
+    expect(visibility.neverRises(2)).toBe(true);
+    expect(visibility.isCircumpolar(0)).toBe(true);
+    expect(visibility.isCircumpolar(1)).toBe(false);
+  });
+
+  it('keeps stars within the rise/set hour angle', () => {
+    expect(visibility.mayBeAboveHorizon(1, 101.29)).toBe(true);
+    expect(visibility.mayBeAboveHorizon(1, 101.29 + 90)).toBe(false);
+    expect(visibility.mayBeAboveHorizon(3, 95.99 - 27)).toBe(true);
+    expect(visibility.mayBeAboveHorizon(3, 95.99 + 30)).toBe(false);
+    expect(visibility.mayBeAboveHorizon(0, 250)).toBe(true);
+    expect(visibility.mayBeAboveHorizon(2, 186.65)).toBe(false);
+  });
+
+  it('wraps the hour angle around 0 and 360 degrees', () => {
+    expect(visibility.mayBeAboveHorizon(4, 279.23 + 134 - 360)).toBe(true);
+    expect(visibility.mayBeAboveHorizon(4, 279.23 - 135)).toBe(false);
+  });
+
+  it('lists the rows that may be above the horizon', () => {
+    expect(Array.from(visibility.rowsAboveHorizon(101.29))).toEqual([0, 1, 3, 5, 6, 7]);
+  });
+
+  it('rejects star arrays that do not match the table', () => {
+    expect(() => new HorizonVisibility(band, RA.slice(1))).toThrow('Visibility table has 8 rows');
+  });
+});
+
+describe('findVisibilityBand', () => {
+  it('selects the band containing the latitude', () => {
+    expect(findVisibilityBand(index, 35.7).path).toBe('lat+35.bin');
+    expect(findVisibilityBand(index, 35).path).toBe('lat+35.bin');
+    expect(findVisibilityBand(index, 90).path).toBe('lat+85.bin');
+    expect(() => findVisibilityBand(index, 20)).toThrow('Latitude out of range');
+  });
+});
+
+function bandBuffer(): ArrayBuffer {
+  return buildBundle([
+    { name: 'hourAngle', dtype: 'int16', data: HOUR_ANGLE },
+    { name: 'circumpolar', dtype: 'uint8', data: CIRCUMPOLAR },
+    { name: 'neverRises', dtype: 'uint8', data: NEVER_RISES },
+  ]);
+}
+
+function bandFetcher(buffer: ArrayBuffer = bandBuffer()) {
+  return jest.fn(async (path: string) => ({
+    ok: true,
+    json: async () => index,
+    arrayBuffer: async () => buffer,
+    path,
+  }));
+}
+
+describe('loadVisibilityBand', () => {
+  afterEach(() => {
+    clearVisibilityCache();
+  });
+
+  it('reads the bitsets and hour angles from the binary band file', async () => {
+    const buffer = bandBuffer();
+    const fetcher = bandFetcher(buffer);
+
+    const loaded = await loadVisibilityBand(35.7, { fetcher: fetcher as never });
+
+    expect(fetcher).toHaveBeenCalledWith('/data/visibility/index.json');
+    expect(fetcher).toHaveBeenCalledWith('/data/visibility/lat+35.bin');
+    expect(Array.from(loaded.hourAngle)).toEqual(Array.from(HOUR_ANGLE));
+    expect(loaded.neverRises[0]).toBe(4);
+    expect(loaded.idChecksum).toBe(ID_CHECKSUM);
+    expect(parseBinaryBundle(buffer).header.count).toBe(8);
+  });
+
+  it('rejects files that are not bundles', () => {
+    expect(() => parseBinaryBundle(new ArrayBuffer(16))).toThrow('Not a star data bundle');
+  });
+});
+
+describe('loadHorizonVisibility', () => {
+  const stars = IDS.map((id, i) => ({ id, ra: RA[i] }) as Star);
+
+  afterEach(() => {
+    clearVisibilityCache();
+  });
+
+  it('matches the checksum computed by the table builder', () => {
+    expect(idChecksum(IDS)).toBe(ID_CHECKSUM);
+    expect(idChecksum([...IDS].reverse())).not.toBe(ID_CHECKSUM);
+  });
+
+  it('accepts the stars in the order the table was built for', async () => {
+    const visibility = await loadHorizonVisibility(35.7, stars, { fetcher: bandFetcher() as never });
+    expect(Array.from(visibility.rowsAboveHorizon(101.29))).toEqual([0, 1, 3, 5, 6, 7]);
+  });
+
+  it('rejects reordered stars', async () => {
+    const reordered = [stars[1], stars[0], ...stars.slice(2)];
+    await expect(loadHorizonVisibility(35.7, reordered, { fetcher: bandFetcher() as never }))
+      .rejects.toThrow('different star order');
+  });
+
+  it('rejects filtered stars', async () => {
+    const filtered = stars.filter((star) => star.id !== 60718);
+    await expect(loadHorizonVisibility(35.7, filtered, { fetcher: bandFetcher() as never }))
+      .rejects.toThrow('Visibility table has 8 rows');
+  });
+});
@@ -11,9 +11,10 @@ import {
   OBSERVATION_MODE_ICONS,
 } from '@/types/observationMode';
 import type { Star } from '@/types/star';
-import type { ConstellationLine, Constellation } from '@/types/constellation';
+import type { ConstellationGeometry, ConstellationLine, Constellation } from '@/types/constellation';
 import { loadStars } from '@/lib/data/starsLoader';
 import { loadConstellationLines } from '@/lib/data/constellationLinesLoader';
+import { loadConstellationGeometry } from '@/lib/data/constellationGeometryLoader';
 import { loadConstellations } from '@/lib/data/constellationsLoader';
 import QuizContainer from '@/components/Quiz/QuizContainer';
 import { useQuiz } from '@/context/QuizContext';
@@ -44,6 +45,7 @@ export default function Home() {
   const [observationMode, setObservationMode] = useState<ObservationMode>('naked-eye');
   const [allStars, setAllStars] = useState<Star[]>([]);
   const [constellationLines, setConstellationLines] = useState<ConstellationLine[]>([]);
+  const [constellationGeometry, setConstellationGeometry] = useState<ConstellationGeometry | null>(null);
   const [constellations, setConstellations] = useState<Constellation[]>([]);
   const [isMobileQuizOpen, setMobileQuizOpen] = useState(false);
   const [loadError, setLoadError] = useState<string | null>(null);
@@ -126,6 +128,16 @@ export default function Home() {
       }
     }
     fetchConstellationData();
+    // 描画用ジオメトリが無い場合は constellationLines（HIP 番号の組）で描く
+    loadConstellationGeometry()
+      .then((geometry) => {
+        if (!cancelled) {
+          setConstellationGeometry(geometry);
+        }
+      })
+      .catch((error) => {
+        console.warn('星座線ジオメトリの読み込みに失敗しました', error);
+      });
     return () => {
       cancelled = true;
     };
@@ -370,6 +382,7 @@ export default function Home() {
       <StarField
         stars={stars}
         constellationLines={constellationLines}
+        constellationGeometry={constellationGeometry}
         viewCenter={DEFAULT_VIEW_CENTER}
         zoom={DEFAULT_ZOOM_LEVEL}
         className="h-full w-full"
@@ -2,10 +2,10 @@
 
 import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { Star } from '@/types/star';
-import type { ConstellationLine } from '@/types/constellation';
+import type { ConstellationGeometry, ConstellationLine } from '@/types/constellation';
 import { ProjectionMode, ObserverLocation, celestialToScreen } from '@/lib/canvas/coordinateUtils';
 import { drawStars } from '@/lib/canvas/starRenderer';
-import { drawConstellationLines } from '@/lib/canvas/constellationRenderer';
+import { drawConstellationGeometry, drawConstellationLines } from '@/lib/canvas/constellationRenderer';
 
 export interface FocusStep {
   viewCenter: { ra: number; dec: number };
@@ -22,6 +22,8 @@ export interface FocusProgram {
 interface StarFieldProps {
   stars: Star[];
   constellationLines?: ConstellationLine[];
+  /** 指定した場合は constellationLines の代わりにこちらで星座線を描く（星の検索表を使わない） */
+  constellationGeometry?: ConstellationGeometry | null;
   viewCenter?: { ra: number; dec: number };
   zoom?: number;
   className?: string;
@@ -58,6 +60,7 @@ const getTimestamp = () => (
 export default function StarField({
   stars,
   constellationLines = [],
+  constellationGeometry = null,
   viewCenter: initialViewCenter = { ra: 180, dec: 0 },
   zoom: initialZoom = 1.5,
   className = '',
@@ -517,7 +520,21 @@ export default function StarField({
       );
 
       // 星座線を描画
-      if (showConstellationLines && constellationLines.length > 0) {
+      if (showConstellationLines && constellationGeometry) {
+        drawConstellationGeometry(
+          ctx,
+          constellationGeometry,
+          viewCenter,
+          zoom,
+          canvasSize.width,
+          canvasSize.height,
+          {
+            projectionMode,
+            observer: projectionMode === 'stereographic' ? TOKYO_OBSERVER : undefined,
+            starIndex,
+          }
+        );
+      } else if (showConstellationLines && constellationLines.length > 0) {
         drawConstellationLines(
           ctx,
           constellationLines,
@@ -551,6 +568,7 @@ export default function StarField({
   }, [
     stars,
     constellationLines,
+    constellationGeometry,
     starIndex,
     viewCenter,
     zoom,
@@ -3,39 +3,39 @@ export const BRIGHT_STAR_NAMES: Record<number, string> = {
   30438: 'カノープス',
   91262: 'ベガ',
   97649: 'アルタイル',
-  11767: 'リゲル',
-  24436: 'ベテルギウス',
-  27989: 'プロキオン',
+  24436: 'リゲル',
+  27989: 'ベテルギウス',
+  37279: 'プロキオン',
   69673: 'アークトゥルス',
   65474: 'スピカ',
   21421: 'アルデバラン',
-  113368: 'アンタレス',
-  87833: 'デネブ',
-  80763: 'デネボラ',
-  25336: 'カペラ',
+  80763: 'アンタレス',
+  102098: 'デネブ',
+  57632: 'デネボラ',
+  24608: 'カペラ',
   49669: 'レグルス',
-  68702: 'ポルックス',
-  62956: 'アクルックス',
-  71683: 'ミモザ',
-  24608: 'ベラトリックス',
-  25930: 'アルニラム',
-  26311: 'アルニタク',
-  26727: 'サイフ',
-  17702: 'アルゴル',
+  37826: 'ポルックス',
+  60718: 'アクルックス',
+  62434: 'ミモザ',
+  25336: 'ベラトリックス',
+  26311: 'アルニラム',
+  26727: 'アルニタク',
+  27366: 'サイフ',
+  14576: 'アルゴル',
   677: 'アルフェラッツ',
-  3179: 'ミラク',
-  113881: 'シャウラ',
-  85927: 'ラス・アルハゲ',
-  46390: 'カストル',
-  102098: 'デネブ・カイトス',
-  68933: 'アルカイド',
-  59774: 'ミザール',
-  54061: 'アリオト',
-  58001: 'アルコル',
+  5447: 'ミラク',
+  85927: 'シャウラ',
+  86032: 'ラス・アルハゲ',
+  36850: 'カストル',
+  3419: 'デネブ・カイトス',
+  67301: 'アルカイド',
+  65378: 'ミザール',
+  62956: 'アリオト',
+  65477: 'アルコル',
   53910: 'メラク',
-  50801: 'フェクダ',
-  48319: 'メグレズ',
-  44471: 'ドゥベ',
+  58001: 'フェクダ',
+  59774: 'メグレズ',
+  54061: 'ドゥベ',
 };
 
 export default BRIGHT_STAR_NAMES;
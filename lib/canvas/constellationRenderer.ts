@@ -1,4 +1,4 @@
-import type { ConstellationLine } from '@/types/constellation';
+import type { ConstellationGeometry, ConstellationLine } from '@/types/constellation';
 import type { Star } from '@/types/star';
 import { celestialToScreen, ProjectionMode, ObserverLocation } from './coordinateUtils';
 
@@ -18,6 +18,14 @@ export interface DrawConstellationOptions {
   observer?: ObserverLocation;
 }
 
+export interface DrawConstellationGeometryOptions extends DrawConstellationOptions {
+  /**
+   * 表示中の星（表示モードで絞り込んだ後のもの）。指定すると、ここに無い星を端点とする線分は描かない
+   * （drawConstellationLines が星の検索表に無い星の線分を飛ばすのと同じ）
+   */
+  starIndex?: StarIndex;
+}
+
 export function drawConstellationLines(
   ctx: CanvasRenderingContext2D,
   constellations: ConstellationLine[],
@@ -84,3 +92,82 @@ export function drawConstellationLines(
   ctx.restore();
   return drawnSegments;
 }
+
+/**
+ * 星座線をジオメトリ（scripts/generate_constellation_lines.py が出力する頂点と折れ線）から描画する
+ * 頂点ごとに 1 回だけ投影し、全星座の折れ線を 1 つのパスにまとめて描く。
+ * 投影できない頂点（裏側・画面外）と、options.starIndex に無い（表示されていない）星の頂点で折れ線を切る
+ */
+export function drawConstellationGeometry(
+  ctx: CanvasRenderingContext2D,
+  geometry: ConstellationGeometry,
+  viewCenter: { ra: number; dec: number },
+  zoom: number,
+  canvasWidth: number,
+  canvasHeight: number,
+  options: DrawConstellationGeometryOptions = {}
+): number {
+  const {
+    color = 'rgba(255, 215, 0, 0.6)',
+    lineWidth = 1,
+    projectionMode = 'orthographic',
+    observer,
+    starIndex,
+  } = options;
+
+  const { hip, ra, dec } = geometry.vertices;
+  const screenX = new Float64Array(ra.length);
+  const screenY = new Float64Array(ra.length);
+  const visible = new Uint8Array(ra.length);
+  for (let i = 0; i < ra.length; i++) {
+    if (starIndex && !getStar(starIndex, hip[i])) {
+      continue;
+    }
+    const screen = celestialToScreen(
+      ra[i],
+      dec[i],
+      viewCenter,
+      zoom,
+      canvasWidth,
+      canvasHeight,
+      projectionMode,
+      observer
+    );
+    if (screen) {
+      screenX[i] = screen.x;
+      screenY[i] = screen.y;
+      visible[i] = 1;
+    }
+  }
+
+  let drawnSegments = 0;
+  ctx.save();
+  ctx.strokeStyle = color;
+  ctx.lineWidth = lineWidth;
+  ctx.beginPath();
+
+  geometry.constellations.forEach((constellation) => {
+    constellation.strips.forEach((strip) => {
+      let penDown = false;
+      for (const vertex of strip) {
+        if (!visible[vertex]) {
+          penDown = false;
+          continue;
+        }
+        if (penDown) {
+          ctx.lineTo(screenX[vertex], screenY[vertex]);
+          drawnSegments += 1;
+        } else {
+          ctx.moveTo(screenX[vertex], screenY[vertex]);
+          penDown = true;
+        }
+      }
+    });
+  });
+
+  if (drawnSegments > 0) {
+    ctx.stroke();
+  }
+  ctx.restore();
+  return drawnSegments;
+}
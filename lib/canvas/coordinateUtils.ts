@@ -56,7 +56,7 @@ export interface HorizontalCoordinates {
 /**
  * ユリウス日を計算
  */
-function getJulianDate(date: Date): number {
+export function getJulianDate(date: Date): number {
   const year = date.getUTCFullYear();
   const month = date.getUTCMonth() + 1;
   const day = date.getUTCDate();
@@ -88,7 +88,7 @@ function getJulianDate(date: Date): number {
  * @param longitude 経度（度）
  * @returns 地方恒星時（度）
  */
-function getLocalSiderealTime(date: Date, longitude: number): number {
+export function getLocalSiderealTime(date: Date, longitude: number): number {
   const jd = getJulianDate(date);
   const t = (jd - 2451545.0) / 36525.0;
 
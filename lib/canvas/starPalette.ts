@@ -0,0 +1,93 @@
+// 星の表示色パレット
+// scripts/pipeline/palette.py と同じ定数で組み立てる（変更時は両方を揃えること）
+import type { Star } from '@/types/star';
+
+/**
+ * 色クラス（番号順）。スペクトル型だけで判定した K 型は専用の橙色、
+ * 最後の色不明は B-V = 0 とみなした色（パレット導入前の描画と同じ）
+ */
+export const COLOR_CLASSES = [
+  '#9bb0ff', // 青白い星（O,B型）
+  '#cad7ff', // 白い星（A型）
+  '#fff4ea', // 黄白い星（F型）
+  '#fffaf0', // 黄色い星（G型）
+  '#ffd2a1', // オレンジ色の星（K型）
+  '#ff7f00', // 赤い星（M型）
+  '#ffb56c', // オレンジ色の星（スペクトル型だけで判定した K型）
+  '#fff4ea', // 色不明（B-V = 0 とみなした色）
+] as const;
+
+export const UNKNOWN_COLOR_CLASS = COLOR_CLASSES.length - 1;
+
+/** B-V の上限値（この値未満ならその番号のクラス） */
+const BV_CLASS_LIMITS = [-0.3, 0, 0.3, 0.6, 1.4];
+
+const SPECTRAL_CLASSES: Record<string, number> = { O: 0, B: 1, A: 2, F: 3, G: 4, K: 6, M: 5 };
+
+export const FADE_LEVELS = 8;
+const FADE_START_MAGNITUDE = 3.5;
+const FADE_RANGE = 2.5;
+
+export interface PaletteEntry {
+  /** グラデーション中心の色 */
+  core: string;
+  /** 30% 位置（不透明度 CC） */
+  inner: string;
+  /** 60% 位置（不透明度 55） */
+  outer: string;
+}
+
+function mixWithWhite(color: string, amount: number): string {
+  const clampAmount = Math.min(Math.max(amount, 0), 1);
+  const r = parseInt(color.slice(1, 3), 16);
+  const g = parseInt(color.slice(3, 5), 16);
+  const b = parseInt(color.slice(5, 7), 16);
+  const mix = (component: number) =>
+    Math.round(component + (255 - component) * clampAmount).toString(16).padStart(2, '0');
+  return `#${mix(r)}${mix(g)}${mix(b)}`;
+}
+
+/**
+ * パレット番号順の色（番号 = 色クラス × FADE_LEVELS + 白への混合段階）
+ * 描画のたびに色文字列を作らないよう、グラデーション用の文字列もここで用意しておく
+ */
+export const STAR_PALETTE: readonly PaletteEntry[] = COLOR_CLASSES.flatMap((color) =>
+  Array.from({ length: FADE_LEVELS }, (_, level) => {
+    const core = mixWithWhite(color, level / (FADE_LEVELS - 1));
+    return { core, inner: `${core}CC`, outer: `${core}55` };
+  })
+);
+
+/**
+ * B-V（無ければスペクトル型）から色クラスを決める
+ */
+export function colorClass(bv: number | null, spectralType: string | null): number {
+  if (bv !== null && Number.isFinite(bv)) {
+    let index = 0;
+    while (index < BV_CLASS_LIMITS.length && bv >= BV_CLASS_LIMITS[index]) index++;
+    return index;
+  }
+  const spectral = spectralType ? SPECTRAL_CLASSES[spectralType.trim().charAt(0).toUpperCase()] : undefined;
+  return spectral ?? UNKNOWN_COLOR_CLASS;
+}
+
+/**
+ * 等級から白への混合段階を決める（暗い星ほど白に近づける）
+ */
+export function fadeLevel(vmag: number | null): number {
+  if (vmag === null || !Number.isFinite(vmag)) return 0;
+  const amount = Math.min(Math.max((vmag - FADE_START_MAGNITUDE) / FADE_RANGE, 0), 1);
+  return Math.floor(amount * (FADE_LEVELS - 1) + 0.5);
+}
+
+/**
+ * 星のパレット番号
+ * stars.json にビルド時の colorIndex があればそれを使い、無ければその場で求める
+ */
+export function paletteIndex(star: Pick<Star, 'bv' | 'spectralType' | 'vmag' | 'colorIndex'>): number {
+  const prebuilt = star.colorIndex;
+  if (typeof prebuilt === 'number' && prebuilt >= 0 && prebuilt < STAR_PALETTE.length) {
+    return prebuilt;
+  }
+  return colorClass(star.bv, star.spectralType) * FADE_LEVELS + fadeLevel(star.vmag);
+}
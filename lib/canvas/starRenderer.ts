@@ -8,6 +8,7 @@ import {
 } from './coordinateUtils';
 import { getDrawStarsObserver, now as perfNow } from '@/performance/drawStarsObserver';
 import { drawCelestialGrid } from './gridRenderer';
+import { paletteIndex, STAR_PALETTE } from './starPalette';
 
 const BAYER_TO_GREEK: Record<string, string> = {
   Alp: 'α', Bet: 'β', Gam: 'γ', Del: 'δ',
@@ -36,30 +37,6 @@ function deriveBayerLabel(star: Star): string | null {
   }
   return null;
 }
-/**
- * B-V色指数から星の色を計算
- * @param bv B-V色指数
- * @returns RGB hex色
- */
-function bvToColor(bv: number): string {
-  if (bv < -0.3) return '#9bb0ff';
-  if (bv < 0) return '#cad7ff';
-  if (bv < 0.3) return '#fff4ea';
-  if (bv < 0.6) return '#fffaf0';
-  if (bv < 1.4) return '#ffd2a1';
-  return '#ff7f00';
-}
-
-function mixWithWhite(color: string, amount: number): string {
-  const clampAmount = Math.min(Math.max(amount, 0), 1);
-  const r = parseInt(color.slice(1, 3), 16);
-  const g = parseInt(color.slice(3, 5), 16);
-  const b = parseInt(color.slice(5, 7), 16);
-  const mix = (component: number) =>
-    Math.round(component + (255 - component) * clampAmount).toString(16).padStart(2, '0');
-  return `#${mix(r)}${mix(g)}${mix(b)}`;
-}
-
 /**
  * 星を描画
  * @param ctx キャンバスコンテキスト
@@ -103,10 +80,8 @@ export function drawStar(
   // 半径計算
   const radius = magnitudeToRadius(star.vmag);
 
-  // B-V色指数から色を計算
-  const baseColor = bvToColor(star.bv ?? 0);
-  const faintness = star.vmag !== null ? Math.min(Math.max((star.vmag - 3.5) / 2.5, 0), 1) : 0;
-  const color = faintness > 0 ? mixWithWhite(baseColor, faintness) : baseColor;
+  // 色はパレットから引く（B-V・等級による色分けはビルド時に済んでいる）
+  const color = STAR_PALETTE[paletteIndex(star)];
 
   // 瞬きアニメーション（明るい星ほど瞬く）
   const twinklePhase = star.id * 0.1 + time * 0.001;
@@ -126,9 +101,9 @@ export function drawStar(
     screenPos.y,
     animatedRadius * 2
   );
-  gradient.addColorStop(0, color);
-  gradient.addColorStop(0.3, color + 'CC'); // 透明度つき
-  gradient.addColorStop(0.6, color + '55');
+  gradient.addColorStop(0, color.core);
+  gradient.addColorStop(0.3, color.inner); // 透明度つき
+  gradient.addColorStop(0.6, color.outer);
   gradient.addColorStop(1, 'transparent');
 
   // 星を描画
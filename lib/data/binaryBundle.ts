@@ -0,0 +1,65 @@
+/**
+ * 列指向バイナリ（stars.bin と同じ形式。scripts/pipeline/bundle.py）の読み込み
+ * 数値列はコピーせずに ArrayBuffer をそのまま TypedArray として参照する。
+ * 文字列列は文字列表への索引（Int32Array、欠損は -1）のまま返す
+ */
+
+const MAGIC = 'STRB';
+const BUNDLE_VERSION = 1;
+
+export type BundleColumn =
+  | Int8Array
+  | Uint8Array
+  | Int16Array
+  | Uint16Array
+  | Int32Array
+  | Uint32Array
+  | Float32Array
+  | Float64Array;
+
+export interface BundleColumnSpec {
+  name: string;
+  dtype: string;
+  offset: number;
+  length: number;
+  strings?: string;
+}
+
+export interface BundleHeader {
+  version: number;
+  count: number;
+  columns: BundleColumnSpec[];
+}
+
+const COLUMN_TYPES: Record<string, new (buffer: ArrayBuffer, byteOffset: number, length: number) => BundleColumn> = {
+  int8: Int8Array,
+  uint8: Uint8Array,
+  int16: Int16Array,
+  uint16: Uint16Array,
+  int32: Int32Array,
+  uint32: Uint32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+};
+
+export function parseBinaryBundle(buffer: ArrayBuffer): { header: BundleHeader; columns: Record<string, BundleColumn> } {
+  const bytes = new Uint8Array(buffer);
+  if (String.fromCharCode(...bytes.subarray(0, 4)) !== MAGIC) {
+    throw new Error('Not a star data bundle');
+  }
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headerLength))) as BundleHeader;
+  if (header.version !== BUNDLE_VERSION) {
+    throw new Error(`Unsupported bundle version: ${header.version}`);
+  }
+  const columns: Record<string, BundleColumn> = {};
+  for (const spec of header.columns) {
+    const ColumnType = COLUMN_TYPES[spec.strings ? 'int32' : spec.dtype];
+    if (!ColumnType) {
+      throw new Error(`Unsupported column type: ${spec.dtype}`);
+    }
+    // 列の開始位置は 8 バイト境界に揃っている（リトルエンディアンの環境を前提とする）
+    columns[spec.name] = new ColumnType(buffer, spec.offset, spec.length);
+  }
+  return { header, columns };
+}
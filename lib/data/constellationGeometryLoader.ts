@@ -0,0 +1,28 @@
+import type { ConstellationGeometry } from '@/types/constellation';
+import { createCachedJsonLoader, JsonFetcher } from './cachedJsonLoader';
+
+const CONSTELLATION_GEOMETRY_PATH = '/data/constellation-geometry.json';
+
+export interface LoadConstellationGeometryOptions {
+  fetcher?: JsonFetcher;
+}
+
+const constellationGeometryLoader = createCachedJsonLoader<ConstellationGeometry>({
+  path: CONSTELLATION_GEOMETRY_PATH,
+  importData: () => import('@/public/data/constellation-geometry.json'),
+});
+
+/**
+ * 星座線の頂点・折れ線（scripts/generate_constellation_lines.py が stars.bin と突き合わせて生成）
+ * 星の検索表なしで drawConstellationGeometry に渡せる
+ */
+export async function loadConstellationGeometry(
+  options: LoadConstellationGeometryOptions = {}
+): Promise<ConstellationGeometry> {
+  const { fetcher } = options;
+  return constellationGeometryLoader.load(fetcher);
+}
+
+export function clearConstellationGeometryCache(): void {
+  constellationGeometryLoader.clear();
+}
@@ -0,0 +1,199 @@
+import type { Quiz } from '@/types/quiz';
+import type { Star } from '@/types/star';
+import type { JsonFetcher } from './cachedJsonLoader';
+import { buildFindStarQuiz } from './quizGenerator/findStarQuiz';
+import { buildBrightnessQuiz } from './quizGenerator/brightnessQuiz';
+import { buildColorQuiz } from './quizGenerator/colorQuiz';
+import { buildDistanceQuiz, formatDistance } from './quizGenerator/distanceQuiz';
+
+const QUIZ_BANK_DIR = '/data/quiz';
+const QUIZ_BANK_VERSION = 1;
+/** 星のデータがバンクと食い違う問題を引いたときに引き直す回数 */
+const MAX_DRAWS = 4;
+
+export type QuizBankType = 'find-star' | 'brightness' | 'color' | 'distance';
+export type QuizBankDifficulty = Quiz['difficulty'];
+export type QuizBankCategory = 'north' | 'south' | 'all';
+
+const QUIZ_BANK_TYPES: readonly string[] = ['find-star', 'brightness', 'color', 'distance'];
+
+/**
+ * クイズの問題バンクの 1 シャード（scripts/build_quiz_bank.py が生成する
+ * public/data/quiz/<種類>-<難易度>-<出題範囲>.json）
+ * 形式は scripts/pipeline/quizbank.py を参照。問題は列ごとの配列で、星は HIP 番号
+ */
+export interface QuizBankShard {
+  version: number;
+  type: QuizBankType;
+  difficulty: QuizBankDifficulty;
+  category: QuizBankCategory;
+  seed: number;
+  stream: number[];
+  count: number;
+  unique: number;
+  strata: { name: string; edges: number[]; counts: number[] };
+  questions: {
+    target?: number[];
+    first?: number[];
+    second?: number[];
+    answer?: number[];
+    /** 距離クイズの選択肢（光年。formatDistance で丸めた値） */
+    choices?: number[][];
+  };
+}
+
+export function isQuizBankType(type: string): type is QuizBankType {
+  return QUIZ_BANK_TYPES.includes(type);
+}
+
+export function quizBankShardPath(
+  type: QuizBankType,
+  difficulty: QuizBankDifficulty,
+  category: QuizBankCategory
+): string {
+  return `${QUIZ_BANK_DIR}/${type}-${difficulty}-${category}.json`;
+}
+
+export function createStarLookup(stars: Star[]): Map<number, Star> {
+  return new Map(stars.map((star) => [star.id, star]));
+}
+
+/** 選択肢の正解の位置が、星のデータから組み立てたクイズの正解と一致するか */
+function answerMatches(quiz: Quiz, answer: number | undefined): boolean {
+  return answer !== undefined && quiz.choices[answer] === quiz.correctAnswer;
+}
+
+/**
+ * シャードの index 番目の問題をクイズにする
+ * 星が読み込んだデータに無い・必要な値が欠けている・正解が食い違う（バンクが古い）場合は null
+ */
+export function createQuizFromBank(
+  shard: QuizBankShard,
+  index: number,
+  starLookup: Map<number, Star>
+): Quiz | null {
+  const { questions, difficulty } = shard;
+  const star = (hips: number[] | undefined) => (hips ? starLookup.get(hips[index]) : undefined);
+  const answer = questions.answer?.[index];
+
+  switch (shard.type) {
+    case 'find-star': {
+      const target = star(questions.target);
+      return target?.properName ? buildFindStarQuiz(target, difficulty) : null;
+    }
+    case 'brightness': {
+      const first = star(questions.first);
+      const second = star(questions.second);
+      if (!first?.properName || !second?.properName || first.vmag == null || second.vmag == null) return null;
+      const quiz = buildBrightnessQuiz(first, second, difficulty);
+      return answerMatches(quiz, answer) ? quiz : null;
+    }
+    case 'color': {
+      const target = star(questions.target);
+      if (!target?.properName || !target.spectralType) return null;
+      const quiz = buildColorQuiz(target, difficulty);
+      return answerMatches(quiz, answer) ? quiz : null;
+    }
+    case 'distance': {
+      const target = star(questions.target);
+      const values = questions.choices?.[index];
+      if (!target?.properName || target.parallax == null || target.parallax <= 0 || !values) return null;
+      // 丸めた値を formatDistance に通しても値は変わらない（表示の形式だけ揃える）
+      const quiz = buildDistanceQuiz(target, difficulty, values.map(formatDistance));
+      return answerMatches(quiz, answer) ? quiz : null;
+    }
+    default:
+      return null;
+  }
+}
+
+/** シャードから 1 問を無作為に取り出す（問題数に関係なく O(1)。作れなければ null） */
+export function drawQuizFromBank(
+  shard: QuizBankShard,
+  starLookup: Map<number, Star>,
+  random: () => number = Math.random
+): Quiz | null {
+  if (shard.count === 0) return null;
+  for (let attempt = 0; attempt < MAX_DRAWS; attempt++) {
+    const quiz = createQuizFromBank(shard, Math.floor(random() * shard.count), starLookup);
+    if (quiz) return quiz;
+  }
+  return null;
+}
+
+export interface LoadQuizBankOptions {
+  fetcher?: JsonFetcher;
+}
+
+// 読み込みに失敗したシャードも Promise ごと残し、出題のたびに取りに行かない
+const shardCache = new Map<string, Promise<QuizBankShard>>();
+
+async function fetchShard(path: string, fetcher?: JsonFetcher): Promise<QuizBankShard> {
+  const fetchJson = fetcher ?? globalThis.fetch?.bind(globalThis);
+  if (!fetchJson) {
+    throw new Error(`Failed to load ${path}: fetch is not available`);
+  }
+  const response = await fetchJson(path);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${path}: ${response.status} ${response.statusText}`);
+  }
+  const shard = (await response.json()) as QuizBankShard;
+  if (shard.version !== QUIZ_BANK_VERSION) {
+    throw new Error(`Unsupported quiz bank version: ${shard.version}`);
+  }
+  return shard;
+}
+
+export function loadQuizBankShard(
+  type: QuizBankType,
+  difficulty: QuizBankDifficulty,
+  category: QuizBankCategory,
+  options: LoadQuizBankOptions = {}
+): Promise<QuizBankShard> {
+  const path = quizBankShardPath(type, difficulty, category);
+  let shard = shardCache.get(path);
+  if (!shard) {
+    shard = fetchShard(path, options.fetcher);
+    shardCache.set(path, shard);
+  }
+  return shard;
+}
+
+/**
+ * 星のデータと問題バンクの組
+ * HIP 番号から星への表は作成時に 1 回だけ作り、シャードは種類・難易度・出題範囲ごとに初回だけ読む
+ */
+export class QuizBankSet {
+  private readonly starLookup: Map<number, Star>;
+  private readonly options: LoadQuizBankOptions;
+
+  constructor(stars: Star[], options: LoadQuizBankOptions = {}) {
+    this.starLookup = createStarLookup(stars);
+    this.options = options;
+  }
+
+  async draw(
+    type: QuizBankType,
+    difficulty: QuizBankDifficulty,
+    category: QuizBankCategory,
+    random: () => number = Math.random
+  ): Promise<Quiz | null> {
+    const shard = await loadQuizBankShard(type, difficulty, category, this.options);
+    return drawQuizFromBank(shard, this.starLookup, random);
+  }
+}
+
+let cachedSet: { stars: Star[]; set: QuizBankSet } | null = null;
+
+/** 同じ星の配列に対しては同じ QuizBankSet を返す */
+export function getQuizBankSet(stars: Star[], options: LoadQuizBankOptions = {}): QuizBankSet {
+  if (cachedSet?.stars !== stars) {
+    cachedSet = { stars, set: new QuizBankSet(stars, options) };
+  }
+  return cachedSet.set;
+}
+
+export function clearQuizBankCache(): void {
+  shardCache.clear();
+  cachedSet = null;
+}
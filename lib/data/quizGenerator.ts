@@ -3,6 +3,7 @@ import type { Quiz, QuizType } from '@/types/quiz';
 import type { Star } from '@/types/star';
 import { loadConstellations } from './constellationsLoader';
 import { loadStars } from './starsLoader';
+import { getQuizBankSet, isQuizBankType, QuizBankSet } from './quizBank';
 import { selectQuizType } from './quizGenerator/selectQuizType';
 import { generateFindStarQuiz } from './quizGenerator/findStarQuiz';
 import { generateBrightnessQuiz } from './quizGenerator/brightnessQuiz';
@@ -13,6 +14,8 @@ import { generateDistanceQuiz } from './quizGenerator/distanceQuiz';
 export interface QuizData {
   constellations: Constellation[];
   stars: Star[];
+  /** 問題バンク（無い場合や読み込めない場合は出題のたびに stars から生成する） */
+  banks?: QuizBankSet;
 }
 
 export interface GenerateQuizParams {
@@ -149,7 +152,7 @@ async function loadDefaultData(): Promise<QuizData> {
     loadConstellations(),
     loadStars(),
   ]);
-  return { constellations, stars };
+  return { constellations, stars, banks: getQuizBankSet(stars) };
 }
 
 export async function generateQuiz(
@@ -183,6 +186,14 @@ export async function generateQuiz(
   }
 
   // 新しいクイズタイプの処理（quizTypeが指定されていない or 新形式のタイプ）
+  // 問題バンクがあればそこから 1 問取り出し、取り出せなければ従来どおり生成する
+  if (dataset.banks && isQuizBankType(quizType)) {
+    const quiz = await dataset.banks
+      .draw(quizType, params.difficulty, params.category)
+      .catch(() => null);
+    if (quiz) return quiz;
+  }
+
   try {
     switch (quizType) {
       case 'find-star':
@@ -78,31 +78,42 @@ export function generateBrightnessQuiz(
     throw new Error('No star pairs available for brightness quiz');
   }
 
-  // ランダムに1ペア選択
+  // ランダムに1ペア選択（選択肢はランダムな順序で）
   const [star1, star2] = pairs[Math.floor(Math.random() * pairs.length)];
+  return Math.random() < 0.5
+    ? buildBrightnessQuiz(star1, star2, difficulty)
+    : buildBrightnessQuiz(star2, star1, difficulty);
+}
 
+/**
+ * 2つの星から「明るさ比べ」クイズを組み立てる（問題バンクからの出題と共通）
+ * @param first 1つ目の選択肢の星
+ * @param second 2つ目の選択肢の星
+ * @param difficulty 難易度
+ * @returns 生成されたクイズ
+ */
+export function buildBrightnessQuiz(
+  first: Star,
+  second: Star,
+  difficulty: 'easy' | 'medium' | 'hard'
+): Quiz {
   // 明るい星（等級が小さい方）が正解
-  const brighterStar = star1.vmag! < star2.vmag! ? star1 : star2;
-  const dimmerStar = star1.vmag! < star2.vmag! ? star2 : star1;
-
-  // 選択肢はランダムな順序で
-  const choices = Math.random() < 0.5
-    ? [star1.properName!, star2.properName!]
-    : [star2.properName!, star1.properName!];
+  const brighterStar = first.vmag! < second.vmag! ? first : second;
+  const dimmerStar = first.vmag! < second.vmag! ? second : first;
 
   // 視野中心は2つの星の中点
-  const viewCenter = calculateMidpoint(star1, star2);
+  const viewCenter = calculateMidpoint(first, second);
 
   // ズームレベルは両方の星が見えるように調整
-  const zoomLevel = calculateZoomForTwoStars(star1, star2);
+  const zoomLevel = calculateZoomForTwoStars(first, second);
 
   return {
     id: `brightness-${Date.now()}-${Math.random().toString(36).slice(2)}`,
     type: 'brightness',
     questionType: 'description',
-    question: `「${star1.properName}」と「${star2.properName}」、どちらが明るいでしょうか？`,
+    question: `「${first.properName}」と「${second.properName}」、どちらが明るいでしょうか？`,
     correctAnswer: brighterStar.properName!,
-    choices,
+    choices: [first.properName!, second.properName!],
     difficulty,
     targetStar: brighterStar,
     compareStar: dimmerStar,
@@ -30,7 +30,7 @@ function getColorFromSpectralType(spectralType: string): string {
 /**
  * 難易度に応じた選択肢セットを取得
  */
-function getColorChoices(difficulty: 'easy' | 'medium' | 'hard'): string[] {
+export function getColorChoices(difficulty: 'easy' | 'medium' | 'hard'): string[] {
   const allColors = ['青白い', '白い', '黄色い', 'オレンジ', '赤い'];
 
   if (difficulty === 'easy') {
@@ -77,6 +77,16 @@ export function generateColorQuiz(
   // ランダムに1つ選択
   const target = candidates[Math.floor(Math.random() * candidates.length)];
 
+  return buildColorQuiz(target, difficulty);
+}
+
+/**
+ * 対象の星から「色あて」クイズを組み立てる（問題バンクからの出題と共通）
+ * @param target 固有名とスペクトル型を持つ対象の星
+ * @param difficulty 難易度
+ * @returns 生成されたクイズ
+ */
+export function buildColorQuiz(target: Star, difficulty: 'easy' | 'medium' | 'hard'): Quiz {
   // 正解の色
   const correctColor = getColorFromSpectralType(target.spectralType!);
 
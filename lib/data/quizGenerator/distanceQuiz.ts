@@ -6,7 +6,7 @@ import type { Star } from '@/types/star';
  * @param parallax 視差（ミリ秒角）
  * @returns 距離（光年）
  */
-function calculateDistance(parallax: number): number {
+export function calculateDistance(parallax: number): number {
   // 視差（mas）からパーセク（pc）への変換: d(pc) = 1000 / p(mas)
   // パーセクから光年への変換: 1 pc ≈ 3.26 ly
   const distanceInParsecs = 1000 / parallax;
@@ -19,7 +19,7 @@ function calculateDistance(parallax: number): number {
  * @param distance 距離（光年）
  * @returns フォーマットされた距離文字列
  */
-function formatDistance(distance: number): string {
+export function formatDistance(distance: number): string {
   if (distance < 10) {
     return `約${Math.round(distance)}光年`;
   } else if (distance < 100) {
@@ -104,11 +104,28 @@ export function generateDistanceQuiz(
 
   // 距離を計算
   const distance = calculateDistance(target.parallax!);
-  const correctAnswer = formatDistance(distance);
 
   // 選択肢を生成
   const choices = generateDistanceChoices(distance, difficulty);
 
+  return buildDistanceQuiz(target, difficulty, choices);
+}
+
+/**
+ * 対象の星と選択肢から「距離」クイズを組み立てる（問題バンクからの出題と共通）
+ * @param target 固有名と視差を持つ対象の星
+ * @param difficulty 難易度
+ * @param choices formatDistance で整形した選択肢（正解を含む）
+ * @returns 生成されたクイズ
+ */
+export function buildDistanceQuiz(
+  target: Star,
+  difficulty: 'easy' | 'medium' | 'hard',
+  choices: string[]
+): Quiz {
+  const distance = calculateDistance(target.parallax!);
+  const correctAnswer = formatDistance(distance);
+
   return {
     id: `distance-${Date.now()}-${Math.random().toString(36).slice(2)}`,
     type: 'distance',
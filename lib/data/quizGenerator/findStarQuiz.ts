@@ -38,10 +38,20 @@ export function generateFindStarQuiz(
   // ランダムに1つ選択
   const target = candidates[Math.floor(Math.random() * candidates.length)];
 
+  return buildFindStarQuiz(target, difficulty);
+}
+
+/**
+ * 対象の星から「この星を探せ！」クイズを組み立てる（問題バンクからの出題と共通）
+ * @param target 固有名を持つ対象の星
+ * @param difficulty 難易度
+ * @returns 生成されたクイズ
+ */
+export function buildFindStarQuiz(target: Star, difficulty: 'easy' | 'medium' | 'hard'): Quiz {
   // 星座名の取得（ない場合は「その星座」と表示）
   const constellationText = target.constellation ? `「${target.constellation}座」の` : '';
 
-  // フィルタでproperNameが存在することを保証しているが、TypeScriptにはわからないので確認
+  // 呼び出し側で properName がある星を選んでいるが、TypeScriptにはわからないので確認
   if (!target.properName) {
     throw new Error('Target star lacks properName');
   }
@@ -0,0 +1,282 @@
+import { createCachedJsonLoader, JsonFetcher } from './cachedJsonLoader';
+
+const SEARCH_INDEX_PATH = '/data/search-index.json';
+const SEARCH_INDEX_VERSION = 1;
+const DEFAULT_LIMIT = 10;
+const NGRAM = 3;
+
+/**
+ * 星の名前検索の索引（scripts/build_search_index.py が生成する search-index.json）
+ * 形式は scripts/pipeline/searchindex.py を参照。番号の列はすべて昇順の差分符号化
+ */
+export interface StarSearchIndexData {
+  version: number;
+  kinds: string[];
+  entries: { hip: number[]; kind: number[]; text: string[] };
+  keys: string[];
+  keyEntries: number[][];
+  trigrams: string[];
+  postings: number[][];
+  catalog: { hip: number[]; hd: number[]; hdHip: number[]; hr: number[]; hrHip: number[] };
+}
+
+export type StarSearchKind = 'properName' | 'iauName' | 'bayer' | 'flamsteed' | 'catalog';
+
+export interface StarSearchHit {
+  hip: number;
+  /** 一致した表記（シリウス、α CMa など。カタログ番号は入力のまま） */
+  text: string;
+  kind: StarSearchKind;
+}
+
+/**
+ * 正規化の表は scripts/pipeline/searchindex.py と同じ（変更時は両方を揃えること）
+ * ギリシャ文字はバイエル符号の略号に置き換える（α → alp）
+ */
+const GREEK_ABBREVIATIONS: Record<string, string> = {
+  α: 'alp', β: 'bet', γ: 'gam', δ: 'del', ε: 'eps', ζ: 'zet', η: 'eta', θ: 'the',
+  ι: 'iot', κ: 'kap', λ: 'lam', μ: 'mu', ν: 'nu', ξ: 'xi', ο: 'omi', π: 'pi',
+  ρ: 'rho', σ: 'sig', τ: 'tau', υ: 'ups', φ: 'phi', χ: 'chi', ψ: 'psi', ω: 'ome',
+  ς: 'sig', ϑ: 'the', ϕ: 'phi',
+};
+const SEPARATORS = new Set(Array.from(' \t　・･-‐‑–—−_.,\'’`"'));
+const COMBINING_MARKS = /[\u0300-\u036f]/g;
+const HIRAGANA_START = 0x3041;
+const HIRAGANA_END = 0x309e;
+const KATAKANA_OFFSET = 0x60;
+const CATALOG_QUERY = /^(hip|hd|hr)(\d+)$/;
+
+/**
+ * 検索キー・検索語の正規化
+ * NFKC → 小文字化 → ギリシャ文字を略号に → ダイアクリティカルマークを除く（濁点は残す）
+ * → ひらがなをカタカナに → 空白と区切り記号を除く（長音符「ー」は残す）
+ * 例: "しりうす" / "ｼﾘｳｽ" → "シリウス"、"α¹ Cen" → "alp1cen"、"Açamar" → "acamar"
+ */
+export function normalizeSearchText(text: string): string {
+  const folded = Array.from(text.normalize('NFKC').toLowerCase(), (ch) => GREEK_ABBREVIATIONS[ch] ?? ch)
+    .join('')
+    .normalize('NFD')
+    .replace(COMBINING_MARKS, '')
+    .normalize('NFC');
+  let result = '';
+  for (const ch of folded) {
+    if (SEPARATORS.has(ch)) continue;
+    const code = ch.codePointAt(0)!;
+    result += code >= HIRAGANA_START && code <= HIRAGANA_END ? String.fromCodePoint(code + KATAKANA_OFFSET) : ch;
+  }
+  return result;
+}
+
+function trigramsOf(key: string): string[] {
+  const chars = Array.from(key);
+  const grams = new Set<string>();
+  for (let i = 0; i + NGRAM <= chars.length; i++) {
+    grams.add(chars.slice(i, i + NGRAM).join(''));
+  }
+  return [...grams];
+}
+
+function undelta(values: number[]): Int32Array {
+  const result = new Int32Array(values.length);
+  let current = 0;
+  for (let i = 0; i < values.length; i++) {
+    current += values[i];
+    result[i] = current;
+  }
+  return result;
+}
+
+/** 昇順の配列の積集合 */
+function intersect(a: Int32Array, b: Int32Array): Int32Array {
+  const result: number[] = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] < b[j]) i++;
+    else if (a[i] > b[j]) j++;
+    else {
+      result.push(a[i]);
+      i++;
+      j++;
+    }
+  }
+  return Int32Array.from(result);
+}
+
+function lowerBound(keys: string[], key: string, start = 0): number {
+  let lo = start;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (keys[mid] < key) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/**
+ * 名前検索の索引
+ * 接頭辞は検索キーの二分探索、部分一致は 3-gram の転置リストの積集合で候補を絞ってから確かめる。
+ * 星の配列を走査しないので、検索 1 回は 1 ミリ秒未満で終わる
+ */
+export class StarSearchIndex {
+  private readonly kinds: StarSearchKind[];
+  private readonly entryHip: number[];
+  private readonly entryKind: number[];
+  private readonly entryText: string[];
+  private readonly keys: string[];
+  private readonly keyEntries: Int32Array[];
+  private readonly keyNumbers: Map<string, number>;
+  private readonly postings: Map<string, Int32Array>;
+  private readonly hips: Set<number>;
+  private readonly catalog: Record<'hd' | 'hr', Map<number, number>>;
+
+  constructor(data: StarSearchIndexData) {
+    if (data.version !== SEARCH_INDEX_VERSION) {
+      throw new Error(`Unsupported search index version: ${data.version}`);
+    }
+    this.kinds = data.kinds as StarSearchKind[];
+    this.entryHip = data.entries.hip;
+    this.entryKind = data.entries.kind;
+    this.entryText = data.entries.text;
+    this.keys = data.keys;
+    this.keyEntries = data.keyEntries.map(undelta);
+    this.keyNumbers = new Map(data.keys.map((key, number) => [key, number]));
+    this.postings = new Map(data.trigrams.map((gram, i) => [gram, undelta(data.postings[i])]));
+    this.hips = new Set(undelta(data.catalog.hip));
+    const numbers = (values: number[], hips: number[]) =>
+      new Map(Array.from(undelta(values), (value, i): [number, number] => [value, hips[i]]));
+    this.catalog = {
+      hd: numbers(data.catalog.hd, data.catalog.hdHip),
+      hr: numbers(data.catalog.hr, data.catalog.hrHip),
+    };
+  }
+
+  get size(): number {
+    return this.entryHip.length;
+  }
+
+  /** 正規化した "hip32349" / "hd48915" / "hr2491" → HIP 番号（収録外なら null） */
+  catalogHip(key: string): number | null {
+    const match = CATALOG_QUERY.exec(key);
+    if (!match) return null;
+    const number = Number(match[2]);
+    if (match[1] === 'hip') return this.hips.has(number) ? number : null;
+    return this.catalog[match[1] as 'hd' | 'hr'].get(number) ?? null;
+  }
+
+  /** key で始まる検索キーの番号の範囲 [start, end) */
+  prefixRange(key: string): [number, number] {
+    const start = lowerBound(this.keys, key);
+    return [start, lowerBound(this.keys, `${key}\uffff`, start)];
+  }
+
+  /** key を含む検索キーの番号（3 文字以上） */
+  substringKeys(key: string): number[] {
+    const grams = trigramsOf(key);
+    if (grams.length === 0) return [];
+    const lists: Int32Array[] = [];
+    for (const gram of grams) {
+      const list = this.postings.get(gram);
+      if (!list) return [];
+      lists.push(list);
+    }
+    lists.sort((a, b) => a.length - b.length);
+    let candidates = lists[0];
+    for (let i = 1; i < lists.length && candidates.length > 0; i++) {
+      candidates = intersect(candidates, lists[i]);
+    }
+    return Array.from(candidates).filter((number) => this.keys[number].includes(key));
+  }
+
+  /**
+   * 検索キーの番号 → その表記を表示順に、星ごとに最初の 1 件だけ limit 件まで
+   * 表記に印を付けてから先頭から走査するので、候補が多くても並べ替えは要らない
+   */
+  private hits(keyNumbers: Iterable<number>, limit: number, seen: Set<number>): StarSearchHit[] {
+    const hits: StarSearchHit[] = [];
+    if (limit <= 0) return hits;
+    const marked = new Uint8Array(this.entryHip.length);
+    let any = false;
+    for (const number of keyNumbers) {
+      for (const entry of this.keyEntries[number]) marked[entry] = 1;
+      any = true;
+    }
+    if (!any) return hits;
+    for (let entry = 0; entry < marked.length && hits.length < limit; entry++) {
+      if (!marked[entry]) continue;
+      const hip = this.entryHip[entry];
+      if (seen.has(hip)) continue;
+      seen.add(hip);
+      hits.push({ hip, text: this.entryText[entry], kind: this.kinds[this.entryKind[entry]] });
+    }
+    return hits;
+  }
+
+  /** オートコンプリート: カタログ番号・検索キーの完全一致 → 接頭辞一致 → 部分一致 の順に limit 件まで */
+  search(query: string, limit = DEFAULT_LIMIT): StarSearchHit[] {
+    const key = normalizeSearchText(query);
+    if (!key) return [];
+    const seen = new Set<number>();
+    const hits: StarSearchHit[] = [];
+    const hip = this.catalogHip(key);
+    if (hip !== null) {
+      seen.add(hip);
+      hits.push({ hip, text: query.trim(), kind: 'catalog' });
+    }
+    const exact = this.keyNumbers.get(key);
+    if (exact !== undefined) {
+      hits.push(...this.hits([exact], limit - hits.length, seen));
+    }
+    const [start, end] = this.prefixRange(key);
+    const prefixed: number[] = [];
+    for (let number = start; number < end; number++) {
+      if (number !== exact) prefixed.push(number);
+    }
+    hits.push(...this.hits(prefixed, limit - hits.length, seen));
+    if (hits.length < limit && Array.from(key).length >= NGRAM) {
+      const inner = this.substringKeys(key).filter((number) => number < start || number >= end);
+      hits.push(...this.hits(inner, limit - hits.length, seen));
+    }
+    return hits;
+  }
+
+  /** 解答の表記と完全一致する星の HIP 番号（表示順。同じ表記の星が複数あればすべて） */
+  resolve(answer: string): number[] {
+    const key = normalizeSearchText(answer);
+    const hip = this.catalogHip(key);
+    if (hip !== null) return [hip];
+    const number = this.keyNumbers.get(key);
+    if (number === undefined) return [];
+    return [...new Set(Array.from(this.keyEntries[number], (entry) => this.entryHip[entry]))];
+  }
+
+  /** クイズの解答判定: answer がその星の名前・符号・カタログ番号のどれかと一致するか */
+  matches(answer: string, hip: number): boolean {
+    return this.resolve(answer).includes(hip);
+  }
+}
+
+export interface LoadStarSearchIndexOptions {
+  fetcher?: JsonFetcher;
+}
+
+const searchIndexLoader = createCachedJsonLoader<StarSearchIndexData>({
+  path: SEARCH_INDEX_PATH,
+  importData: () => import('@/public/data/search-index.json'),
+});
+
+let cachedIndex: { data: StarSearchIndexData; index: StarSearchIndex } | null = null;
+
+export async function loadStarSearchIndex(options: LoadStarSearchIndexOptions = {}): Promise<StarSearchIndex> {
+  const data = await searchIndexLoader.load(options.fetcher);
+  if (cachedIndex?.data !== data) {
+    cachedIndex = { data, index: new StarSearchIndex(data) };
+  }
+  return cachedIndex.index;
+}
+
+export function clearStarSearchIndexCache(): void {
+  searchIndexLoader.clear();
+  cachedIndex = null;
+}
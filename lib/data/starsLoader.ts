@@ -29,6 +29,14 @@ const CONSTELLATION_NAMES: Record<string, string> = {
   Vir: 'おとめ', Vol: 'とびうお', Vul: 'こぎつね',
 };
 
+/**
+ * stars.json では値が null のフィールドを省略している（scripts/pipeline/jsonout.py）
+ * 描画・判定側は `=== null` で欠損を判定するため、読み込み時に null を補う
+ */
+const NULLABLE_STAR_FIELDS = [
+  'vmag', 'bv', 'spectralType', 'name', 'hd', 'hr', 'parallax', 'pmRA', 'pmDE',
+] as const;
+
 export interface LoadStarsOptions {
   /** 等級の上限（例: 6.5 で6.5等より明るい星のみ） */
   maxMagnitude?: number;
@@ -37,18 +45,13 @@ export interface LoadStarsOptions {
 }
 
 /**
- * 星の名前から星座の日本語名を抽出
- * 例: "Zet Scl" → "ちょうこくしつ", "M 31  And" → "アンドロメダ"
+ * 星座略号から日本語名を引く
+ * stars.json の constellation にはビルド時に IAU 星座境界で判定した略号が入っている
+ * 例: "Scl" → "ちょうこくしつ", "And" → "アンドロメダ"
  */
-function extractConstellation(name: string | null): string | null {
-  if (!name) return null;
-
-  // 名前の最後の単語（3文字の大文字で始まる）を星座略称として抽出
-  const match = name.match(/\b([A-Z][a-z]{2})\b\s*$/);
-  if (!match) return null;
-
-  const abbreviation = match[1];
-  return CONSTELLATION_NAMES[abbreviation] || null;
+function constellationName(code: string | null | undefined): string | null {
+  if (!code) return null;
+  return CONSTELLATION_NAMES[code] || null;
 }
 
 const starsLoader = createCachedJsonLoader<Star[]>({
@@ -57,9 +60,14 @@ const starsLoader = createCachedJsonLoader<Star[]>({
   transform: (data) =>
     (data as Star[]).map((star) => {
       const properName = BRIGHT_STAR_NAMES[star.id];
-      const constellation = extractConstellation(star.name);
+      const constellation = constellationName(star.constellation);
 
       const updates: Partial<Star> = {};
+      for (const field of NULLABLE_STAR_FIELDS) {
+        if (star[field] === undefined) {
+          updates[field] = null;
+        }
+      }
       if (properName && star.properName !== properName) {
         updates.properName = properName;
       }
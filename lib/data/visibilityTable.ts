@@ -0,0 +1,231 @@
+import type { Star } from '@/types/star';
+import type { JsonFetcher } from './cachedJsonLoader';
+import { parseBinaryBundle } from './binaryBundle';
+
+const VISIBILITY_DIR = '/data/visibility';
+const VISIBILITY_VERSION = 2;
+const FULL_CIRCLE = 360;
+
+/**
+ * 緯度帯ごとの可視性の表（scripts/build_visibility_tables.py が生成する public/data/visibility/）
+ * 形式は scripts/pipeline/visibility.py を参照。行は stars.bin / stars.json と同じ並び
+ */
+export interface VisibilityIndex {
+  version: number;
+  bandWidth: number;
+  /** 地平とみなす高度（度） */
+  horizon: number;
+  hourAngleScale: number;
+  count: number;
+  /** 表を作ったときの HIP 番号の並びのチェックサム（idChecksum） */
+  idChecksum: number;
+  bands: VisibilityBandInfo[];
+}
+
+export interface VisibilityBandInfo {
+  latitude: [number, number];
+  path: string;
+  circumpolar: number;
+  neverRises: number;
+  visibleFraction: number;
+}
+
+export interface VisibilityBand {
+  latitude: [number, number];
+  horizon: number;
+  hourAngleScale: number;
+  idChecksum: number;
+  /** 出没の時角 × hourAngleScale（昇らない星は -1、周極星は 180 × hourAngleScale） */
+  hourAngle: Int16Array;
+  circumpolar: Uint8Array;
+  neverRises: Uint8Array;
+}
+
+function normalizeDegrees(value: number): number {
+  const result = value % FULL_CIRCLE;
+  return result < 0 ? result + FULL_CIRCLE : result;
+}
+
+/** 時角（度、-180〜180）。lst と ra は 0〜360 度 */
+function hourAngle(lst: number, ra: number): number {
+  const delta = lst - ra;
+  if (delta < -180) return delta + FULL_CIRCLE;
+  return delta >= 180 ? delta - FULL_CIRCLE : delta;
+}
+
+/**
+ * HIP 番号の並びのチェックサム（32 ビット FNV-1a を 1 星 1 語で回したもの）
+ * scripts/pipeline/visibility.py の id_checksum と同じ値になる
+ */
+export function idChecksum(ids: ArrayLike<number>): number {
+  let checksum = 0x811c9dc5;
+  for (let i = 0; i < ids.length; i++) {
+    checksum = Math.imul(checksum ^ (ids[i] >>> 0), 0x01000193) >>> 0;
+  }
+  return checksum;
+}
+
+export function testBit(bits: Uint8Array, row: number): boolean {
+  return (bits[row >> 3] & (1 << (row & 7))) !== 0;
+}
+
+/** 観測地の緯度を含む緯度帯（北極の 90 度は最後の帯） */
+export function findVisibilityBand(index: VisibilityIndex, latitude: number): VisibilityBandInfo {
+  const band = index.bands.find(({ latitude: [low, high] }) => latitude >= low && latitude < high)
+    ?? (latitude === 90 ? index.bands[index.bands.length - 1] : undefined);
+  if (!band) {
+    throw new Error(`Latitude out of range: ${latitude}`);
+  }
+  return band;
+}
+
+/**
+ * 観測地の緯度帯の表で、地平より上にある可能性のある星を絞り込む
+ * 昇らない星は作成時に除き、残りは時角 |地方恒星時 - 赤経| が出没の時角以下の星だけを返す。
+ * 表は帯の中のどの緯度でも地平より上の星を残す側に寄せてあるので、最終的な高度は
+ * equatorialToHorizontal などで確かめる（三角関数の計算はここで残った星だけで済む）
+ */
+export class HorizonVisibility {
+  readonly band: VisibilityBand;
+  /** 昇らない星を除いた行番号 */
+  readonly candidates: Int32Array;
+  private readonly ra: Float64Array;
+  /** 出没の時角（度）。昇らない星は -1 */
+  private readonly limits: Float64Array;
+
+  constructor(band: VisibilityBand, ra: ArrayLike<number>) {
+    if (ra.length !== band.hourAngle.length) {
+      throw new Error(`Visibility table has ${band.hourAngle.length} rows but ${ra.length} stars were given`);
+    }
+    this.band = band;
+    this.ra = Float64Array.from(ra, normalizeDegrees);
+    this.limits = Float64Array.from(band.hourAngle, (value) => (value < 0 ? -1 : value / band.hourAngleScale));
+    const candidates = new Int32Array(ra.length);
+    let count = 0;
+    for (let byte = 0; byte < band.neverRises.length; byte++) {
+      const bits = band.neverRises[byte];
+      if (bits === 0xff) continue;
+      const end = Math.min((byte + 1) * 8, ra.length);
+      for (let row = byte * 8; row < end; row++) {
+        if (!(bits & (1 << (row & 7)))) candidates[count++] = row;
+      }
+    }
+    this.candidates = candidates.slice(0, count);
+  }
+
+  isCircumpolar(row: number): boolean {
+    return testBit(this.band.circumpolar, row);
+  }
+
+  neverRises(row: number): boolean {
+    return testBit(this.band.neverRises, row);
+  }
+
+  /** localSiderealTime（度）のとき、row の星が地平より上にある可能性があるか */
+  mayBeAboveHorizon(row: number, localSiderealTime: number): boolean {
+    return Math.abs(hourAngle(normalizeDegrees(localSiderealTime), this.ra[row])) <= this.limits[row];
+  }
+
+  /**
+   * localSiderealTime（度）のとき地平より上にある可能性のある行番号（out を渡すと再利用する）
+   * 描画のたびに呼ぶため、判定を展開して三角関数も剰余も使わない
+   */
+  rowsAboveHorizon(localSiderealTime: number, out?: Int32Array): Int32Array {
+    const { candidates, ra, limits } = this;
+    const rows = out && out.length >= candidates.length ? out : new Int32Array(candidates.length);
+    const lst = normalizeDegrees(localSiderealTime);
+    let count = 0;
+    for (let i = 0; i < candidates.length; i++) {
+      const row = candidates[i];
+      const delta = hourAngle(lst, ra[row]);
+      if (delta <= limits[row] && -delta <= limits[row]) rows[count++] = row;
+    }
+    return rows.subarray(0, count);
+  }
+}
+
+export interface LoadVisibilityOptions {
+  fetcher?: JsonFetcher;
+}
+
+async function fetchOk(path: string, fetcher?: JsonFetcher): Promise<Response> {
+  const fetchData = fetcher ?? globalThis.fetch?.bind(globalThis);
+  if (!fetchData) {
+    throw new Error(`Failed to load ${path}: fetch is not available`);
+  }
+  const response = await fetchData(path);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${path}: ${response.status} ${response.statusText}`);
+  }
+  return response;
+}
+
+let cachedIndex: Promise<VisibilityIndex> | null = null;
+const bandCache = new Map<string, Promise<VisibilityBand>>();
+
+export function loadVisibilityIndex(options: LoadVisibilityOptions = {}): Promise<VisibilityIndex> {
+  if (!cachedIndex) {
+    cachedIndex = fetchOk(`${VISIBILITY_DIR}/index.json`, options.fetcher)
+      .then((response) => response.json() as Promise<VisibilityIndex>)
+      .then((index) => {
+        if (index.version !== VISIBILITY_VERSION) {
+          throw new Error(`Unsupported visibility table version: ${index.version}`);
+        }
+        return index;
+      });
+    cachedIndex.catch(() => {
+      cachedIndex = null;
+    });
+  }
+  return cachedIndex;
+}
+
+/** 観測地の緯度を含む帯の表を読む（帯ごとに 1 回だけ取得する） */
+export async function loadVisibilityBand(
+  latitude: number,
+  options: LoadVisibilityOptions = {}
+): Promise<VisibilityBand> {
+  const index = await loadVisibilityIndex(options);
+  const info = findVisibilityBand(index, latitude);
+  let band = bandCache.get(info.path);
+  if (!band) {
+    band = fetchOk(`${VISIBILITY_DIR}/${info.path}`, options.fetcher)
+      .then((response) => response.arrayBuffer())
+      .then((buffer) => {
+        const { columns } = parseBinaryBundle(buffer);
+        return {
+          latitude: info.latitude,
+          horizon: index.horizon,
+          hourAngleScale: index.hourAngleScale,
+          idChecksum: index.idChecksum,
+          hourAngle: columns.hourAngle as Int16Array,
+          circumpolar: columns.circumpolar as Uint8Array,
+          neverRises: columns.neverRises as Uint8Array,
+        };
+      });
+    bandCache.set(info.path, band);
+    band.catch(() => bandCache.delete(info.path));
+  }
+  return band;
+}
+
+/**
+ * stars は loadStars() が返す全件（stars.bin と同じ並び）。表の行は並びで星を指すため、
+ * 絞り込んだ・並べ替えた配列や、表と別に作り直した星データを渡すとエラーにする
+ */
+export async function loadHorizonVisibility(
+  latitude: number,
+  stars: Star[],
+  options: LoadVisibilityOptions = {}
+): Promise<HorizonVisibility> {
+  const band = await loadVisibilityBand(latitude, options);
+  if (stars.length === band.hourAngle.length && idChecksum(stars.map((star) => star.id)) !== band.idChecksum) {
+    throw new Error('Visibility table was built for a different star order; pass the unfiltered stars from loadStars()');
+  }
+  return new HorizonVisibility(band, Float64Array.from(stars, (star) => star.ra));
+}
+
+export function clearVisibilityCache(): void {
+  cachedIndex = null;
+  bandCache.clear();
+}
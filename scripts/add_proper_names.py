@@ -3,14 +3,15 @@
 IAU固有名リストを取得してHipparcosデータにマッピング
 """
 
-from astroquery.vizier import Vizier
-import pandas as pd
 import json
+from pathlib import Path
+
+from pipeline.jsonout import format_size_report, write_records
+from pipeline.vizier_cache import query_catalog
 
 # IAU Star Names カタログ取得
 print("🌟 IAU固有名リスト取得中...")
-viz = Vizier(columns=["*"], row_limit=-1)
-iau_names = viz.query_constraints(catalog="B/pastel/catalog")[0].to_pandas()
+iau_names = query_catalog("B/pastel/catalog", columns=["*"])
 
 print(f"✅ IAU固有名: {len(iau_names)}件取得")
 
@@ -28,7 +29,7 @@ if "HD" in iau_names.columns:
 
     mapped_count = 0
     for star in stars:
-        if star["hd"] and star["hd"] in hd_to_name:
+        if star.get("hd") and star["hd"] in hd_to_name:
             star["properName"] = hd_to_name[star["hd"]]
             mapped_count += 1
 
@@ -37,8 +38,8 @@ if "HD" in iau_names.columns:
 # 保存
 output_file = "../public/data/stars.json"
 print(f"💾 保存中: {output_file}")
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(stars, f, ensure_ascii=False, indent=2)
+written = write_records(Path(output_file), stars)
+print(format_size_report([written]))
 
 print("✅ 完了！")
 
@@ -46,4 +47,4 @@ print("✅ 完了！")
 print("\n📋 固有名が付いた星のサンプル:")
 named_stars = [s for s in stars if s.get("properName")][:10]
 for star in named_stars:
-    print(f"  HIP {star['id']}: {star.get('properName')} (vmag={star['vmag']})")
+    print(f"  HIP {star['id']}: {star.get('properName')} (vmag={star.get('vmag')})")
@@ -1,84 +1,16 @@
 """
 有名な星の固有名を追加するスクリプト
+
+STAR_NAMES だけを付ける（build_data.py のビルドでは、カタカナ表記の出典を統合した索引で
+rebuild_stars_from_csv.py が付ける。build_proper_names.py を参照）。
 """
 
 import json
 import os
+from pathlib import Path
 
-# HIP番号と固有名のマッピング（主要な明るい星のみ）
-STAR_NAMES = {
-    # こぐま座
-    11767: "ポラリス",    # Polaris
-    82080: "コカブ",      # Kochab
-
-    # おおぐま座
-    54061: "ドゥーベ",    # Dubhe
-    53910: "メラク",      # Merak
-    58001: "フェクダ",    # Phecda
-    59774: "メグレズ",    # Megrez
-    62956: "アリオト",    # Alioth
-    65378: "ミザール",    # Mizar
-    67301: "アルカイド",  # Alkaid
-
-    # オリオン座
-    24436: "リゲル",      # Rigel
-    27989: "ベテルギウス", # Betelgeuse
-    26311: "ベラトリックス", # Bellatrix
-    25930: "アルニラム",  # Alnilam
-    25336: "アルニタク",  # Alnitak
-    26727: "ミンタカ",    # Mintaka
-    27366: "サイフ",      # Saiph
-
-    # おうし座
-    21421: "アルデバラン", # Aldebaran
-
-    # ふたご座
-    37826: "カストル",    # Castor
-    37279: "ポルックス",  # Pollux
-
-    # しし座
-    49669: "レグルス",    # Regulus
-    50583: "デネボラ",    # Denebola
-    57632: "アルギエバ",  # Algieba
-
-    # おとめ座
-    65474: "スピカ",      # Spica
-
-    # こと座
-    91262: "ベガ",        # Vega
-
-    # わし座
-    97649: "アルタイル",  # Altair
-
-    # はくちょう座
-    102098: "デネブ",     # Deneb
-
-    # さそり座
-    80763: "アンタレス",  # Antares
-
-    # ケンタウルス座
-    71683: "リギルケンタウルス", # Rigil Kentaurus (Alpha Centauri)
-    68702: "ハダル",      # Hadar
-
-    # りゅうこつ座
-    30438: "カノープス",  # Canopus
-
-    # おおいぬ座
-    32349: "シリウス",    # Sirius
-
-    # こいぬ座
-    37279: "プロキオン",  # Procyon
-
-    # ペガスス座
-    113368: "マルカブ",   # Markab
-    112158: "シェアト",   # Scheat
-    113963: "アルゲニブ", # Algenib
-    677: "アルフェラッツ", # Alpheratz (And/Peg)
-
-    # カシオペア座
-    3179: "シェダル",     # Schedar
-    746: "カフ",          # Caph
-}
+from pipeline.japanese_names import STAR_NAMES
+from pipeline.jsonout import format_size_report, write_records
 
 def add_star_names():
     """固有名を追加"""
@@ -102,16 +34,16 @@ def add_star_names():
     print(f"固有名を設定した星数: {named_count}")
 
     # 保存
-    with open(input_path, 'w', encoding='utf-8') as f:
-        json.dump(stars, f, indent=2, ensure_ascii=False)
+    written = write_records(Path(input_path), stars)
 
     print(f"保存完了: {input_path}")
+    print(format_size_report([written]))
 
     # 固有名がある星を表示
     print("\n固有名がある星:")
     for star in stars:
         if star.get('properName'):
-            print(f"  {star['properName']} (HIP {star['id']}) - {star['constellation']} - {star['magnitude']:.2f}等")
+            print(f"  {star['properName']} (HIP {star['id']}) - {star.get('constellation')} - {star['magnitude']:.2f}等")
 
 if __name__ == "__main__":
     add_star_names()
@@ -4,34 +4,30 @@
 
 import json
 import os
+from pathlib import Path
 
-# Tycho-2データにはHIP番号がないため、RA/Decで照合
-# 主要な明るい星の座標（RA, Dec）と固有名のマッピング
-BRIGHT_STARS = [
-    # (RA範囲min, RA範囲max, Dec範囲min, Dec範囲max, 固有名)
-    (0.0, 0.15, 38.8, 38.9, "アルフェラッツ"),
-    (37.9, 38.0, 89.2, 89.3, "ポラリス"),
-    (86.9, 87.1, 28.0, 28.1, "アルデバラン"),
-    (78.6, 78.7, -8.3, -8.1, "リゲル"),
-    (88.7, 88.9, 7.3, 7.5, "ベテルギウス"),
-    (101.2, 101.4, -16.8, -16.6, "シリウス"),
-    (95.9, 96.1, 52.0, 52.3, "カペラ"),
-    (114.8, 115.0, 5.2, 5.3, "プロキオン"),
-    (152.1, 152.3, 11.9, 12.0, "レグルス"),
-    (201.2, 201.4, -11.3, -11.1, "スピカ"),
-    (213.9, 214.1, 19.1, 19.3, "アルクトゥルス"),
-    (279.2, 279.4, 38.7, 38.8, "ベガ"),
-    (297.6, 297.8, 8.8, 8.9, "アルタイル"),
-    (310.3, 310.5, 45.2, 45.3, "デネブ"),
-    (247.3, 247.6, -26.5, -26.3, "アンタレス"),
-]
+import numpy as np
 
-def find_star_name(ra, dec):
-    """RA/Decから固有名を検索"""
-    for ra_min, ra_max, dec_min, dec_max, name in BRIGHT_STARS:
-        if ra_min <= ra <= ra_max and dec_min <= dec <= dec_max:
-            return name
-    return None
+from pipeline.crossmatch import SkyIndex
+from pipeline.japanese_names import STAR_NAMES
+from pipeline.jsonout import format_size_report, write_records
+
+# Tycho-2データにはHIP番号がないため、IAU-CSN（named-stars.json）の J2000 座標で位置照合する
+NAMED_STARS_PATH = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'named-stars.json')
+MATCH_RADIUS_ARCSEC = 30.0
+
+def load_named_positions():
+    """固有名（カタカナ）を持つ HIP 番号の J2000 座標を named-stars.json から取得"""
+    with open(NAMED_STARS_PATH, 'r', encoding='utf-8') as f:
+        named = json.load(f)
+    positions = {entry['hip']: (entry['ra'], entry['dec']) for entry in named if entry.get('hip') in STAR_NAMES}
+    missing = sorted(set(STAR_NAMES) - set(positions))
+    if missing:
+        print(f"named-stars.json に座標が無い HIP: {missing}")
+    hips = sorted(positions)
+    ra = np.array([positions[hip][0] for hip in hips], dtype=np.float64)
+    dec = np.array([positions[hip][1] for hip in hips], dtype=np.float64)
+    return hips, ra, dec
 
 def main():
     """固有名を追加"""
@@ -43,24 +39,27 @@ def main():
 
     print(f"読み込んだ星数: {len(stars)}")
 
-    # 固有名を追加
+    # 固有名を追加（各固有名の座標から半径内で最も近い星）
+    ra = np.array([s['ra'] if s.get('ra') is not None else np.nan for s in stars], dtype=np.float64)
+    dec = np.array([s['dec'] if s.get('dec') is not None else np.nan for s in stars], dtype=np.float64)
+    hips, named_ra, named_dec = load_named_positions()
+    index, _ = SkyIndex(ra, dec).nearest(named_ra, named_dec, MATCH_RADIUS_ARCSEC)
+
     named_count = 0
-    for star in stars:
-        ra = star.get('ra')
-        dec = star.get('dec')
-        if ra is not None and dec is not None:
-            name = find_star_name(ra, dec)
-            if name:
-                star['properName'] = name
-                named_count += 1
+    for hip, found in zip(hips, index.tolist()):
+        if found < 0:
+            print(f"  照合なし: {STAR_NAMES[hip]} (HIP {hip})")
+            continue
+        stars[found]['properName'] = STAR_NAMES[hip]
+        named_count += 1
 
     print(f"固有名を設定した星数: {named_count}")
 
     # 保存
-    with open(input_path, 'w', encoding='utf-8') as f:
-        json.dump(stars, f, indent=2, ensure_ascii=False)
+    written = write_records(Path(input_path), stars)
 
     print(f"保存完了: {input_path}")
+    print(format_size_report([written]))
 
     # 固有名がある星を表示
     print("\n固有名がある星:")
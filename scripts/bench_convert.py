@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+変換処理のベンチマーク（iterrows 版 vs 列演算版）
+
+合成した Hipparcos 形式の DataFrame に対して、従来の df.iterrows() による
+1行ずつの変換と pipeline/convert.py の列演算による変換を実行し、
+それぞれの rows/sec を表示する。JSON への書き出し時間も別に計測する
+（列演算版は pipeline/jsonout.py による .gz/.br の同時生成を含む）。
+
+使用例:
+  python3 scripts/bench_convert.py                  # 100,000 行と 2,500,000 行
+  python3 scripts/bench_convert.py --sizes 10000    # 行数を指定
+  python3 scripts/bench_convert.py --skip-legacy    # 列演算版のみ
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline.convert import (
+    build_frame,
+    coalesce,
+    parallax_to_distance,
+    star_color,
+    to_float,
+    to_nullable_int,
+    to_nullable_str,
+    write_records_json,
+)
+
+SPECTRAL_TYPES = np.array(["O9V", "B2III", "A0V", "F5IV", "G2V", "K1III", "M2Iab", ""], dtype=object)
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """fetch_hipparcos_fast.py の出力と同じ列構成の合成データを作る"""
+    rng = np.random.default_rng(seed)
+
+    def with_gaps(values: np.ndarray, rate: float) -> np.ndarray:
+        values = values.astype("float64")
+        values[rng.random(rows) < rate] = np.nan
+        return values
+
+    names = np.where(rng.random(rows) < 0.08, "Alp Ori", None)
+    return pd.DataFrame({
+        "HIP": np.arange(1, rows + 1),
+        "RA": rng.uniform(0, 360, rows),
+        "DEC": np.degrees(np.arcsin(rng.uniform(-1, 1, rows))),
+        "Vmag": with_gaps(rng.uniform(-1.5, 9.0, rows), 0.01),
+        "B-V_hip2": with_gaps(rng.normal(0.7, 0.5, rows), 0.1),
+        "B-V_bsc": with_gaps(rng.normal(0.7, 0.5, rows), 0.9),
+        "SpType": SPECTRAL_TYPES[rng.integers(0, len(SPECTRAL_TYPES), rows)],
+        "Name": names,
+        "HD": with_gaps(rng.integers(1, 360000, rows), 0.3),
+        "HR": with_gaps(rng.integers(1, 9110, rows), 0.9),
+        "Plx": with_gaps(rng.normal(8, 10, rows), 0.05),
+        "pmRA": rng.normal(0, 50, rows),
+        "pmDE": rng.normal(0, 50, rows),
+    })
+
+
+def legacy_bv_to_color(bv_index):
+    if pd.isna(bv_index):
+        return "#ffffff"
+    if bv_index < -0.3:
+        return "#9bb0ff"
+    elif bv_index < 0:
+        return "#cad7ff"
+    elif bv_index < 0.3:
+        return "#fff4ea"
+    elif bv_index < 0.6:
+        return "#fffaf0"
+    elif bv_index < 1.4:
+        return "#ffd2a1"
+    return "#ff7f00"
+
+
+def convert_legacy(df: pd.DataFrame) -> list[dict]:
+    """従来の convert_to_json.py / fetch_star_data_detailed.py と同じ iterrows 変換"""
+    stars = []
+    for _, row in df.iterrows():
+        bv_value = None
+        if pd.notna(row.get("B-V_hip2")):
+            bv_value = float(row["B-V_hip2"])
+        elif pd.notna(row.get("B-V_bsc")):
+            bv_value = float(row["B-V_bsc"])
+
+        distance = None
+        plx = row.get("Plx")
+        if pd.notna(plx) and plx > 0:
+            distance = round(1000.0 / plx, 1)
+
+        stars.append({
+            "id": int(row["HIP"]) if pd.notna(row["HIP"]) else None,
+            "ra": float(row["RA"]) if pd.notna(row["RA"]) else None,
+            "dec": float(row["DEC"]) if pd.notna(row["DEC"]) else None,
+            "vmag": float(row["Vmag"]) if pd.notna(row["Vmag"]) else None,
+            "bv": bv_value,
+            "color": legacy_bv_to_color(bv_value),
+            "spectralType": row["SpType"] if pd.notna(row["SpType"]) else None,
+            "name": row["Name"] if pd.notna(row["Name"]) else None,
+            "hd": int(row["HD"]) if pd.notna(row["HD"]) else None,
+            "hr": int(row["HR"]) if pd.notna(row["HR"]) else None,
+            "distance": distance,
+        })
+    return stars
+
+
+def convert_vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    bv = coalesce(df, ["B-V_hip2", "B-V_bsc"])
+    return build_frame({
+        "id": to_nullable_int(df["HIP"]),
+        "ra": to_float(df["RA"]),
+        "dec": to_float(df["DEC"]),
+        "vmag": to_float(df["Vmag"]),
+        "bv": bv,
+        "color": star_color(bv, df["SpType"]),
+        "spectralType": to_nullable_str(df["SpType"]),
+        "name": to_nullable_str(df["Name"]),
+        "hd": to_nullable_int(df["HD"]),
+        "hr": to_nullable_int(df["HR"]),
+        "distance": parallax_to_distance(df["Plx"]),
+    })
+
+
+def timed(func, *args) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def report(label: str, rows: int, seconds: float) -> None:
+    print(f"  {label:<24} {seconds:8.2f} 秒  {rows / seconds:>12,.0f} rows/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 2_500_000])
+    parser.add_argument("--skip-legacy", action="store_true", help="iterrows 版の計測を省略する")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "stars.json"
+        for rows in args.sizes:
+            df = synthetic_frame(rows)
+            print(f"{rows:,} 行")
+
+            if not args.skip_legacy:
+                stars, seconds = timed(convert_legacy, df)
+                report("iterrows 変換", rows, seconds)
+
+                def dump_legacy() -> None:
+                    with output.open("w", encoding="utf-8") as f:
+                        json.dump(stars, f, ensure_ascii=False, indent=2)
+
+                _, seconds = timed(dump_legacy)
+                report("json.dump 書き出し", rows, seconds)
+                del stars
+
+            frame, seconds = timed(convert_vectorized, df)
+            report("列演算 変換", rows, seconds)
+            _, seconds = timed(write_records_json, frame, output)
+            report("逐次書き出し(gz/br込)", rows, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+データパイプラインの段階別ベンチマーク（合成カタログ・履歴・性能低下の検出）
+
+合成カタログ（等級・銀緯の分布付き）に対して parse / convert / crossmatch /
+constellations / serialize の各段階の時間と最大メモリを計測し、履歴に追記する。
+同じマシンの過去の記録（直近 --baseline-runs 回の中央値）より --time-threshold を
+超えて遅い段階、--memory-threshold を超えてメモリが多い段階があれば終了コード 1 で終わる。
+詳細は scripts/pipeline/benchmark.py。
+
+使用例:
+  python3 scripts/bench_pipeline.py                         # 1万・10万・100万・250万行
+  python3 scripts/bench_pipeline.py --sizes 10000 100000    # 行数を指定
+  python3 scripts/bench_pipeline.py --stage-threshold serialize=0.5
+  python3 scripts/bench_pipeline.py --accept                # 意図した変化として基準値を更新する
+  python3 scripts/bench_pipeline.py --sizes 100000 --brotli-quality 11 --no-record
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pipeline.benchmark import (
+    BENCHMARK_BROTLI_QUALITY,
+    DEFAULT_SIZES,
+    STAGES,
+    append_history,
+    baselines,
+    find_regressions,
+    format_results,
+    history_path,
+    load_history,
+    machine_info,
+    make_record,
+    run_benchmarks,
+)
+from pipeline.constellations import GRID_PATH
+
+
+def stage_threshold(text: str) -> tuple[str, float]:
+    stage, _, value = text.partition("=")
+    if stage not in STAGES or not value:
+        raise argparse.ArgumentTypeError(f"段階=割合 の形式で指定してください（段階: {', '.join(STAGES)}）: {text}")
+    return stage, float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="計測する行数")
+    parser.add_argument("--seed", type=int, default=0, help="合成カタログの乱数シード")
+    parser.add_argument("--brotli-quality", type=int, default=BENCHMARK_BROTLI_QUALITY,
+                        help="書き出し時の Brotli の圧縮レベル（既定: 5。11 は圧縮だけで数十分かかる）")
+    parser.add_argument("--grid", type=Path, default=GRID_PATH, help="星座判定の参照格子（無ければ星座判定を省略）")
+    parser.add_argument("--history", type=Path, default=history_path(), help="履歴ファイル（JSON Lines）")
+    parser.add_argument("--baseline-runs", type=int, default=5, help="基準値に使う直近の記録の数")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="時間の許容増加率（既定: 0.25 = 25%%）")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="最大メモリの許容増加率")
+    parser.add_argument("--stage-threshold", type=stage_threshold, action="append", default=[],
+                        metavar="段階=割合", help="段階ごとの時間の許容増加率（複数指定可）")
+    parser.add_argument("--accept", action="store_true", help="性能低下があっても基準値として記録し、失敗にしない")
+    parser.add_argument("--no-record", action="store_true", help="履歴に追記しない")
+    args = parser.parse_args()
+
+    # 計測用のプロセスにも引き継がれる（履歴の比較条件にも入る）
+    os.environ["STAR_PIPELINE_BROTLI_QUALITY"] = str(args.brotli_quality)
+    grid_path = args.grid if args.grid.exists() else None
+    if grid_path is None:
+        print(f"⚠️ 参照格子がありません（{args.grid}）。constellations は計測しません"
+              "（scripts/build_constellation_grid.py で作成できます）")
+
+    machine = machine_info()
+    reference = baselines(load_history(args.history), machine, args.baseline_runs)
+    print(f"マシン: {machine['node']} / Python {machine['python']} / Brotli {machine['brotliQuality']}"
+          f"（基準値 {len(reference)} 件）")
+
+    def report(rows: int, results: list[dict]) -> None:
+        print(format_results(results, reference))
+
+    results = run_benchmarks(args.sizes, seed=args.seed, grid_path=grid_path, on_size=report)
+    regressions = find_regressions(
+        results,
+        reference,
+        time_threshold=args.time_threshold,
+        memory_threshold=args.memory_threshold,
+        stage_thresholds=dict(args.stage_threshold),
+    )
+
+    if not args.no_record:
+        append_history(args.history, make_record(results, machine, regressions, accepted=args.accept or not regressions))
+        print(f"\n履歴に追記: {args.history}")
+
+    if not regressions:
+        print("性能低下なし")
+        return
+    print(f"\n性能低下 {len(regressions)} 件:")
+    for item in regressions:
+        if item["metric"] == "seconds":
+            value, baseline = f"{item['value']:.3f} 秒", f"{item['baseline']:.3f} 秒"
+        else:
+            value, baseline = f"{item['value'] / 1024**2:.0f} MB", f"{item['baseline'] / 1024**2:.0f} MB"
+        print(f"  {item['rows']:>12,} 行 {item['stage']:<15} {value}（基準 {baseline}、"
+              f"許容 +{item['threshold'] * 100:.0f}%）")
+    if args.accept:
+        print("--accept のため基準値として記録しました")
+        return
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+IAU 星座境界から星座判定用の参照格子を作るスクリプト
+
+入力:
+  VizieR VI/49/constbnd（B1875 の星座境界頂点、pipeline/vizier_cache 経由で取得・キャッシュ）
+出力:
+  data/generated/constellation-grid.npz（赤経・赤緯の境界値とセルごとの星座番号）
+
+判定方法は scripts/pipeline/constellations.py を参照。
+STAR_PIPELINE_OFFLINE=1 の場合はキャッシュ済みの境界データだけを使う。
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from pipeline.constellations import GRID_PATH, ConstellationGrid, constellation_codes, fetch_boundaries
+
+
+def main() -> None:
+    started = time.perf_counter()
+    polygons = fetch_boundaries()
+    codes = constellation_codes()
+    grid = ConstellationGrid.from_polygons(polygons, codes)
+    elapsed = time.perf_counter() - started
+
+    found = {polygon.code for polygon in polygons}
+    missing = [code for code in codes if code not in found]
+    if missing:
+        raise RuntimeError(f"境界データに含まれない星座があります: {', '.join(missing)}")
+    if grid.unassigned_cells:
+        raise RuntimeError(f"どの星座にも属さないセルがあります（{grid.unassigned_cells} セル）")
+
+    grid.save(GRID_PATH)
+    rows, cols = grid.labels.shape
+    print(f"境界: {len(polygons)} 多角形, {sum(p.ra.size for p in polygons):,} 頂点")
+    print(f"参照格子: 赤経 {cols} × 赤緯 {rows} セル, 星座 {len(np.unique(grid.labels))} 個 ({elapsed:.2f} 秒)")
+    print(f"書き出し完了: {GRID_PATH}")
+
+
+if __name__ == "__main__":
+    main()
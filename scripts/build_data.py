@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+public/data 以下の生成物をまとめてビルドするスクリプト（差分ビルド・並行実行）
+
+各ステージの入力・出力・コマンドを STAGES に宣言し、入力内容が変わったステージと
+その下流だけを再実行する。スクリプトと、そこから import される pipeline/ のモジュールは
+自動的に入力に加わる。例えば data/raw/iau/IAU-CSN.txt を編集した場合は
+named-stars と名前索引（とその下流の search-index・quiz-bank）だけが再生成され、
+Hipparcos CSV の再解析は行われない（stars はカタカナ表記だけの proper-names に依存する）。
+
+使用例:
+  python3 scripts/build_data.py                  # 古くなったステージをすべて再ビルド
+  python3 scripts/build_data.py sky-tiles        # sky-tiles とその上流だけ
+  python3 scripts/build_data.py --dry-run        # 実行せずに判定だけ表示
+  python3 scripts/build_data.py --force stars    # 強制的に再ビルド
+  python3 scripts/build_data.py --list           # ステージ一覧
+  python3 scripts/build_data.py --force --profile stars   # 計測・プロファイル付きで再ビルド
+
+状態は data/generated/build-state.json に保存される（削除すると全ステージが未ビルド扱い）。
+各スクリプトの段階ごとの計測結果は data/generated/runs/<スクリプト名>/ に残る。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from dataclasses import replace
+
+from pipeline.buildgraph import BuildError, BuildGraph, Stage, StageResult, import_closure
+from pipeline.jsonout import COMPRESSED_SUFFIXES
+
+
+def json_outputs(*paths: str) -> tuple[str, ...]:
+    """JSON 出力と、pipeline/jsonout.py が同時に書き出す圧縮版（.gz / .br）"""
+    return tuple(f"{path}{suffix}" for path in paths for suffix in ("", *COMPRESSED_SUFFIXES))
+
+
+def with_script_inputs(*stages: Stage) -> tuple[Stage, ...]:
+    """
+    各ステージの入力に、コマンドで実行する Python スクリプトとそこから import される
+    scripts/ 以下のモジュールを加える（pipeline/ を直したら、それを使うステージだけが再実行される）
+    """
+    return tuple(
+        replace(stage, inputs=(*stage.inputs, *import_closure(
+            f"scripts/{command[1]}" for command in stage.commands if command[0] == "python"
+        )))
+        for stage in stages
+    )
+
+
+# Hipparcos（hipparcos_vmag9_named.csv）での等級シャードの累計件数の目安（rest は総数）。
+# 品質検査は ±10% を超えると失敗し、stars ステージが失敗扱いになる
+HIPPARCOS_EXPECTED_COUNTS: dict[str, int] = {
+    "mag4": 513,
+    "mag7": 14_000,
+    "rest": 102_372,
+}
+
+
+def expected_count_arguments(counts: dict[str, int]) -> tuple[str, ...]:
+    """check_star_data.py の --expected-count 引数（コマンドの一部なので、目安を変えると再検査される）"""
+    return tuple(arg for name, count in counts.items() for arg in ("--expected-count", f"{name}={count}"))
+
+
+# inputs にはデータファイルだけを書く（スクリプトと pipeline/ のモジュールは with_script_inputs が加える）
+STAGES: tuple[Stage, ...] = with_script_inputs(
+    Stage(
+        name="constellation-grid",
+        description="VI/49 星座境界 → 星座判定用の参照格子（VizieR キャッシュ使用）",
+        inputs=("public/data/constellations.json",),
+        outputs=("data/generated/constellation-grid.npz",),
+        commands=(("python", "build_constellation_grid.py"),),
+    ),
+    Stage(
+        name="proper-names",
+        description="固有名のカタカナ表記（brightStarNames.ts・japanese_names.py）→ 星データに付ける名前索引",
+        inputs=("data/brightStarNames.ts",),
+        outputs=("data/generated/proper-names.npz",),
+        commands=(("python", "build_proper_names.py"),),
+    ),
+    Stage(
+        name="name-index",
+        description="固有名の出典（カタカナ表・IAU-CSN・Stellarium）→ HIP 番号をキーにした名前索引",
+        inputs=(
+            "data/brightStarNames.ts",
+            "data/raw/iau/IAU-CSN.txt",
+            "data/raw/iau/starNames.csv",
+            "data/raw/stellarium/common_star_names.fab",
+        ),
+        outputs=("data/generated/name-index.npz", "data/generated/name-index-report.json"),
+        commands=(("python", "build_name_index.py"),),
+    ),
+    Stage(
+        name="stars",
+        description="Hipparcos CSV → stars.json / stars.bin / 等級別シャード（固有名カタカナ表記を付与、品質検査）",
+        inputs=(
+            "scripts/hipparcos_vmag9_named.csv",
+            "data/generated/proper-names.npz",
+            "data/generated/constellation-grid.npz",
+        ),
+        outputs=(
+            *json_outputs("public/data/stars.json", "public/data/star-palette.json", "public/data/stars-manifest.json"),
+            "public/data/stars.bin",
+            "public/data/tiers",
+            "data/generated/quality/stars.json",
+        ),
+        # 品質検査に失敗するとステージが失敗し、下流（sky-tiles など）は実行されない
+        commands=(
+            ("python", "rebuild_stars_from_csv.py"),
+            ("python", "check_star_data.py", *expected_count_arguments(HIPPARCOS_EXPECTED_COUNTS)),
+        ),
+    ),
+    Stage(
+        name="sky-tiles",
+        description="stars.json → HEALPix セル分割",
+        inputs=("public/data/stars.json",),
+        outputs=("public/data/sky",),
+        commands=(("python", "build_sky_tiles.py"),),
+    ),
+    Stage(
+        name="epoch-keyframes",
+        description="stars.json → 固有運動による元期別キーフレーム（±5万年）",
+        inputs=("public/data/stars.json",),
+        outputs=("public/data/epochs",),
+        commands=(("python", "build_epoch_keyframes.py"),),
+    ),
+    Stage(
+        name="search-index",
+        description="stars.bin + 名前索引 → 名前検索の索引（検索キーの接頭辞表・3-gram 転置リスト・カタログ番号）",
+        inputs=(
+            "public/data/stars.bin",
+            "data/generated/name-index.npz",
+        ),
+        outputs=json_outputs("public/data/search-index.json"),
+        commands=(("python", "build_search_index.py"),),
+    ),
+    Stage(
+        name="quiz-bank",
+        description="stars.bin + 名前索引 → クイズの問題バンク（種類 × 難易度 × 出題範囲ごとのシャード、層別抽出）",
+        inputs=(
+            "public/data/stars.bin",
+            "data/generated/name-index.npz",
+        ),
+        outputs=("public/data/quiz", "data/generated/quiz-bank-report.json"),
+        commands=(("python", "build_quiz_bank.py"),),
+    ),
+    Stage(
+        name="visibility",
+        description="stars.bin → 緯度帯ごとの可視性の表（周極星・昇らない星のビット列、出没の時角）",
+        inputs=("public/data/stars.bin",),
+        outputs=("public/data/visibility",),
+        commands=(("python", "build_visibility_tables.py"),),
+    ),
+    Stage(
+        name="golden-vectors",
+        description="座標変換（coordinateUtils.ts）の NumPy 参照実装 → 入力と期待値の組（TS のテストで突き合わせる）",
+        inputs=(),
+        outputs=("data/generated/golden/coordinate-transforms.bin",),
+        commands=(("python", "build_golden_vectors.py"),),
+    ),
+    Stage(
+        name="named-stars",
+        description="IAU-CSN.txt → named-stars.json",
+        inputs=("data/raw/iau/IAU-CSN.txt",),
+        outputs=json_outputs("public/data/named-stars.json"),
+        commands=(("python", "generate_named_stars.py"),),
+    ),
+    Stage(
+        name="constellation-lines",
+        description="Stellarium constellationship.fab + stars.bin → constellation-lines.json / 描画用ジオメトリ",
+        inputs=(
+            "data/raw/stellarium/constellationship.fab",
+            "public/data/stars.bin",
+        ),
+        outputs=(
+            *json_outputs("public/data/constellation-lines.json", "public/data/constellation-geometry.json"),
+            "data/generated/constellation-lines-report.json",
+        ),
+        commands=(("python", "generate_constellation_lines.py"),),
+    ),
+    Stage(
+        name="hip-main",
+        description="data/raw/hip_main.dat(.gz) → data/generated/hip_main.npz",
+        inputs=(
+            "data/raw/ReadMe",
+            "data/raw/hip_main.dat",
+            "data/raw/hip_main.dat.gz",
+        ),
+        outputs=("data/generated/hip_main.npz",),
+        commands=(("python", "ingest_hip_main.py"),),
+    ),
+)
+
+STATUS_LABELS = {"built": "ビルド", "fresh": "最新", "failed": "失敗", "skipped": "スキップ"}
+
+
+def print_result(result: StageResult) -> None:
+    label = STATUS_LABELS[result.status]
+    detail = f"（{result.reason}）" if result.reason else ""
+    timing = f" {result.seconds:.1f} 秒" if result.status in ("built", "failed") and result.seconds else ""
+    print(f"[{label}] {result.name}{timing}{detail}", flush=True)
+    if result.status == "failed" and result.log:
+        print(result.log.rstrip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="ビルドするステージ（省略時は全ステージ）")
+    parser.add_argument("--force", action="store_true", help="入力が変わっていなくても再実行する")
+    parser.add_argument("--dry-run", action="store_true", help="実行せずに再ビルド対象を表示する")
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="同時に実行するステージ数")
+    parser.add_argument("--list", action="store_true", help="ステージ一覧を表示する")
+    parser.add_argument("--profile", action="store_true",
+                        help="各スクリプトで cProfile と collapsed stack を書き出す（data/generated/runs/）")
+    parser.add_argument("--trace-memory", action="store_true", help="各スクリプトで段階ごとの tracemalloc の最大値を記録する")
+    args = parser.parse_args()
+
+    # 各ステージのコマンドに環境変数で引き継ぐ（pipeline/instrument.py）
+    if args.profile:
+        os.environ["STAR_PIPELINE_PROFILE"] = "1"
+    if args.trace_memory:
+        os.environ["STAR_PIPELINE_TRACE_MEMORY"] = "1"
+
+    try:
+        graph = BuildGraph(STAGES)
+        if args.list:
+            for stage in STAGES:
+                deps = ", ".join(sorted(graph.graph[stage.name])) or "-"
+                print(f"{stage.name:<20} 上流: {deps:<12} {stage.description}")
+            return
+        if args.dry_run:
+            for stage, reason in graph.plan(args.targets, force=args.force):
+                print(f"{'[再ビルド]' if reason else '[最新]    '} {stage.name}" + (f"（{reason}）" if reason else ""))
+            return
+        results = graph.build(args.targets, force=args.force, jobs=args.jobs, on_result=print_result)
+    except BuildError as exc:
+        print(f"エラー: {exc}", file=sys.stderr)
+        sys.exit(2)
+
+    counts = {status: sum(1 for r in results if r.status == status) for status in STATUS_LABELS}
+    print(" / ".join(f"{STATUS_LABELS[status]} {count}" for status, count in counts.items()))
+    if counts["failed"] or counts["skipped"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+固有運動による星の位置の変化を元期ごとのキーフレームとして書き出すスクリプト
+
+入力:
+  public/data/stars.json（元期 J1991.25、pmRA/pmDE は mas/年）
+出力:
+  public/data/epochs/keyframes.bin（stars.bin 形式。dx/dy/dz の int16 列、元期順に N 件ずつ並ぶ）
+  public/data/epochs/index.json（元期・scale・星 ID の並び）
+
+index.json の例:
+  {
+    "version": 1,
+    "baseEpoch": 1991.25,
+    "epochs": [-48000.0, ..., 52000.0],
+    "scales": [1.2e-05, ...],
+    "count": 9110,
+    "ids": [677, 746, ...],
+    "bin": {"path": "epochs/keyframes.bin", "bytes": 5520000, "sha256": "..."}
+  }
+
+復元: k 番目の元期での i 番目の星の方向ベクトルは
+  normalize(u0[i] + scales[k] * (dx, dy, dz)[k * count + i])
+で、u0 は stars.json の x/y/z（単位ベクトル）。キーフレームの間は差分を線形補間してから正規化する。
+計測結果は data/generated/runs/build_epoch_keyframes/（--profile / --trace-memory）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+import numpy as np
+
+from pipeline.bundle import write_bundle
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import format_size_report, write_json
+from pipeline.paths import PUBLIC_DATA_DIR
+from pipeline.propagation import HIPPARCOS_EPOCH, keyframe_deltas, keyframe_epochs, motion_vectors
+from pipeline.sphere import radec_to_unit
+from pipeline.tiers import describe_file
+
+SOURCE = PUBLIC_DATA_DIR / "stars.json"
+EPOCHS_DIR = PUBLIC_DATA_DIR / "epochs"
+BIN_PATH = EPOCHS_DIR / "keyframes.bin"
+INDEX_PATH = EPOCHS_DIR / "index.json"
+INDEX_VERSION = 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-vmag", type=float, default=6.5, help="対象とする等級の上限（既定: 6.5 等）")
+    parser.add_argument("--step", type=float, default=1000.0, help="キーフレームの間隔（年）")
+    parser.add_argument("--span", type=float, default=50000.0, help="J2000 から前後に何年分を作るか")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if not SOURCE.exists():
+        raise FileNotFoundError(f"入力ファイルが存在しません: {SOURCE}")
+    with Instrument.from_args("build_epoch_keyframes", args) as run:
+        with run.stage("read") as stage:
+            with SOURCE.open("r", encoding="utf-8") as f:
+                stars = json.load(f)
+            stage.count(len(stars))
+
+        with run.stage("select", rows_in=len(stars)) as stage:
+            stars = [
+                s for s in stars
+                if s.get("vmag") is not None and s["vmag"] <= args.max_vmag
+                and s.get("ra") is not None and s.get("dec") is not None
+            ]
+            ra = np.array([s["ra"] for s in stars], dtype=np.float64)
+            dec = np.array([s["dec"] for s in stars], dtype=np.float64)
+            pm_ra = np.array([np.nan if s.get("pmRA") is None else s["pmRA"] for s in stars], dtype=np.float64)
+            pm_de = np.array([np.nan if s.get("pmDE") is None else s["pmDE"] for s in stars], dtype=np.float64)
+            stage.count(len(stars))
+
+        with run.stage("keyframes", rows_in=len(stars)) as stage:
+            vectors = radec_to_unit(ra, dec)
+            velocity = motion_vectors(ra, dec, pm_ra, pm_de)
+            epochs = keyframe_epochs(args.step, args.span)
+            frames, scales = keyframe_deltas(vectors, velocity, epochs, HIPPARCOS_EPOCH)
+            stage.count(len(stars) * len(epochs))
+
+        with run.stage("write"):
+            flat = frames.reshape(-1, 3)
+            write_bundle(BIN_PATH, {"dx": flat[:, 0], "dy": flat[:, 1], "dz": flat[:, 2]}, string_tables={})
+
+            index = {
+                "version": INDEX_VERSION,
+                "baseEpoch": HIPPARCOS_EPOCH,
+                "epochs": epochs.tolist(),
+                "scales": scales.tolist(),
+                "count": len(stars),
+                "ids": [s["id"] for s in stars],
+                "bin": describe_file(BIN_PATH, PUBLIC_DATA_DIR),
+            }
+            written = write_json(INDEX_PATH, index)
+        run.add_output(BIN_PATH, written)
+
+    # 量子化による誤差（最も誤差の大きい元期での最大角度）
+    worst = float(np.degrees(np.max(scales)) * 3600.0 / 2.0 * np.sqrt(3.0))
+    moving = int(np.count_nonzero(np.any(velocity != 0.0, axis=1)))
+    print(f"生成完了: {INDEX_PATH}")
+    print(f"  {len(stars)} 件（固有運動あり {moving} 件）× {len(epochs)} 元期"
+          f"（{epochs[0]:.0f} 〜 {epochs[-1]:.0f} 年、{args.step:.0f} 年ごと）")
+    print(f"  {BIN_PATH.name}: {index['bin']['bytes']:,} バイト、量子化誤差 最大 {worst:.2f} 秒角")
+    print(format_size_report([written], PUBLIC_DATA_DIR))
+
+
+if __name__ == "__main__":
+    main()
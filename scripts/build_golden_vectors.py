@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+座標変換（lib/canvas/coordinateUtils.ts）のゴールデンベクトルを作るスクリプト
+
+入力:
+  なし（固定の乱数シードで入力を作るので、星表が変わっても出力は変わらない）
+出力:
+  data/generated/golden/coordinate-transforms.bin（入力と期待値の組。形式は scripts/pipeline/skytransform.py）
+
+期待値は pipeline/skytransform.py の参照実装（coordinateUtils.ts と同じ式）で計算する。
+__tests__/lib/canvas/coordinateUtils.golden.test.ts がこのファイルを読み、ユリウス日・
+地方恒星時・方位角と高度・正射図法とステレオ図法の画面座標を TS の実装と突き合わせる
+（GOLDEN_BENCHMARK=1 で TS 側の 1 秒あたりの変換数も表示する）。
+
+--benchmark を付けると、星 × 観測条件の一括変換（horizontal_grid）の速度を測り、
+参照実装との差の最大値も表示する。
+
+使用例:
+  python3 scripts/build_golden_vectors.py
+  python3 scripts/build_golden_vectors.py --rows 1000000 --benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pipeline.bundle import write_bundle
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.skytransform import (
+    DEFAULT_GOLDEN_ROWS,
+    DEFAULT_GOLDEN_SEED,
+    GOLDEN_INPUTS,
+    GOLDEN_OUTPUTS,
+    build_golden,
+    equatorial_to_horizontal,
+    golden_path,
+    horizontal_grid,
+    julian_date,
+    local_sidereal_time,
+)
+
+BENCHMARK_STARS = 100_000
+BENCHMARK_OBSERVERS = 200  # 時刻 20 × 観測地 10
+
+
+def benchmark(run: Instrument, stars: int, observers: int, seed: int) -> None:
+    """星 stars 個 × 観測条件 observers 個を一括変換し、参照実装との差を確かめる"""
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0.0, 360.0, stars)
+    dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, stars)))
+    time_ms = np.floor(rng.uniform(0.0, 4_102_444_800_000.0, observers))
+    latitude = rng.uniform(-89.0, 89.0, observers)
+    lst = local_sidereal_time(julian_date(time_ms), rng.uniform(-180.0, 180.0, observers))
+    transforms = stars * observers
+
+    results = {}
+    for dtype in (np.float64, np.float32):
+        with run.stage(f"grid-{np.dtype(dtype).name}", rows_in=transforms) as stage:
+            started = time.perf_counter()
+            for rows, azimuth, altitude in horizontal_grid(ra, dec, lst, latitude, dtype=dtype):
+                stage.count(azimuth.size)
+            results[np.dtype(dtype).name] = transforms / (time.perf_counter() - started)
+
+    # 参照実装は要素ごとに三角関数を計算するので、観測条件の一部だけで比べる
+    sample = slice(0, min(observers, 10))
+    with run.stage("reference", rows_in=stars * len(range(observers)[sample])):
+        started = time.perf_counter()
+        ref_az, ref_alt = equatorial_to_horizontal(ra[None, :], dec[None, :], latitude[sample, None], lst[sample, None])
+        reference_rate = ref_az.size / (time.perf_counter() - started)
+    _, azimuth, altitude = next(horizontal_grid(ra, dec, lst[sample], latitude[sample]))
+    # 天頂付近は方位角が定まらないので、方位角の差は地平線方向の距離（cos 高度を掛けた値）で比べる
+    az_error = np.abs((azimuth - ref_az + 180.0) % 360.0 - 180.0) * np.cos(np.radians(ref_alt))
+
+    print(f"一括変換（星 {stars:,} × 観測条件 {observers:,} = {transforms:,} 件）")
+    for name, rate in results.items():
+        print(f"  horizontal_grid {name}: {rate / 1e6:6.1f} M 件/秒")
+    print(f"  参照実装（要素ごと）     : {reference_rate / 1e6:6.1f} M 件/秒")
+    print(f"  参照実装との差の最大値: 高度 {np.abs(altitude - ref_alt).max():.2e} 度、"
+          f"方位角 {az_error.max():.2e} 度（× cos 高度）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=golden_path(), help="出力ファイル")
+    parser.add_argument("--rows", type=int, default=DEFAULT_GOLDEN_ROWS, help="ゴールデンベクトルの行数")
+    parser.add_argument("--seed", type=int, default=DEFAULT_GOLDEN_SEED, help="入力を作る乱数シード")
+    parser.add_argument("--benchmark", action="store_true", help="一括変換の速度と参照実装との差を表示する")
+    parser.add_argument("--benchmark-stars", type=int, default=BENCHMARK_STARS, help="--benchmark の星の数")
+    parser.add_argument("--benchmark-observers", type=int, default=BENCHMARK_OBSERVERS,
+                        help="--benchmark の観測条件（時刻と観測地の組）の数")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.rows <= 0:
+        parser.error("--rows は 1 以上にしてください")
+
+    with Instrument.from_args("build_golden_vectors", args) as run:
+        with run.stage("golden", rows_in=args.rows) as stage:
+            columns = build_golden(args.rows, args.seed)
+            stage.count(len(columns["ra"]))
+        with run.stage("write"):
+            ordered = {name: columns[name] for name in (*GOLDEN_INPUTS, *GOLDEN_OUTPUTS)}
+            size = write_bundle(args.output, ordered, string_tables={})
+            run.add_output(args.output)
+        if args.benchmark:
+            benchmark(run, args.benchmark_stars, args.benchmark_observers, args.seed)
+
+    hidden = {
+        name: int(np.isnan(columns[f"{name}X"]).sum()) for name in ("orthographic", "stereographic")
+    }
+    print(f"生成完了: {args.output}（{args.rows:,} 行、{size:,} バイト、シード {args.seed}）")
+    print(f"  画面外（null）: 正射図法 {hidden['orthographic']:,} 行、ステレオ図法 {hidden['stereographic']:,} 行")
+
+
+if __name__ == "__main__":
+    main()
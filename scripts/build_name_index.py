@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+星の名前の出典を統合し、HIP 番号をキーにした名前索引を作るスクリプト
+
+入力（優先順位の高い順。欄ごとに先に名前を持っていた出典を採用する）:
+  カタカナ表記（properName）
+    1〜3. build_proper_names.py の katakana_sources()
+         （data/brightStarNames.ts、pipeline/japanese_names.py の FAMOUS_STARS・STAR_NAMES）
+  英語名（iauName）
+    4. data/raw/iau/IAU-CSN.txt（HD 番号・HR 番号・ダイアクリティカル付き表記も取る）
+    5. data/raw/stellarium/common_star_names.fab
+    6. data/raw/iau/starNames.csv
+出力:
+  data/generated/name-index.npz（形式は scripts/pipeline/nameindex.py）
+  data/generated/name-index-report.json（出典ごとの件数、採用されなかった名前、名前の重複）
+
+名前検索の索引（build_search_index.py）とクイズの問題バンク（build_quiz_bank.py）がこの索引を使う。
+stars.json などへの固有名の付与は、カタカナ表記だけの索引（build_proper_names.py）で行う。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from build_proper_names import katakana_sources
+from generate_named_stars import SOURCE as IAU_CSN_PATH
+from generate_named_stars import load_named_stars
+from pipeline.nameindex import (
+    NameSource,
+    SourceEntry,
+    csv_source,
+    index_path,
+    merge_sources,
+    stellarium_source,
+)
+from pipeline.paths import ROOT
+
+STELLARIUM_NAMES_PATH = ROOT / "data" / "raw" / "stellarium" / "common_star_names.fab"
+STAR_NAMES_CSV_PATH = ROOT / "data" / "raw" / "iau" / "starNames.csv"
+
+
+def iau_csn_source(path: Path = IAU_CSN_PATH) -> NameSource:
+    entries = {}
+    for star in load_named_stars():
+        hr = re.fullmatch(r"HR\s+(\d+)", star.designation or "")
+        aliases = (star.diacritics,) if star.diacritics and star.diacritics != star.iau_name else ()
+        entries[star.hip] = SourceEntry(star.iau_name, hd=star.hd, hr=int(hr.group(1)) if hr else None, aliases=aliases)
+    return NameSource(path.name, "iauName", entries, path)
+
+
+def name_sources() -> list[NameSource]:
+    return [
+        *katakana_sources(),
+        iau_csn_source(),
+        stellarium_source(STELLARIUM_NAMES_PATH),
+        csv_source(STAR_NAMES_CSV_PATH),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=index_path(), help="名前索引の出力先")
+    parser.add_argument("--verbose", "-v", action="store_true", help="採用されなかった名前をすべて表示する")
+    args = parser.parse_args()
+
+    sources = name_sources()
+    index, conflicts, collisions = merge_sources(sources)
+    index.save(args.output)
+
+    report_path = args.output.with_name(args.output.stem + "-report.json")
+    report = {
+        "sources": index.sources,
+        "entries": len(index),
+        "conflicts": [
+            {"hip": c.hip, "field": c.field, "chosen": list(c.chosen), "rejected": list(c.rejected)} for c in conflicts
+        ],
+        "collisions": [{"key": c.key, "hip": c.hip, "otherHip": c.other_hip} for c in collisions],
+    }
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+    print(f"生成完了: {args.output}（{len(index):,} 件、{args.output.stat().st_size:,} バイト）")
+    for number, source in enumerate(index.sources, start=1):
+        note = f"（{source['note']}）" if source["note"] else ""
+        print(f"  {number}. {source['label']:<26} {source['field']:<10} {source['entries']:>5} 件{note}")
+    with_proper = int((index.proper_source >= 0).sum())
+    with_iau = int((index.iau_source >= 0).sum())
+    print(f"  カタカナ表記 {with_proper} 件、英語名 {with_iau} 件、HD {int((index.hd >= 0).sum())} 件、"
+          f"HR {int((index.hr >= 0).sum())} 件、名前キー {len(index.name_keys)} 件")
+
+    if conflicts:
+        print(f"⚠️ 出典どうしで食い違う名前 {len(conflicts)} 件（優先順位の高い出典を採用）:")
+        for c in conflicts if args.verbose else conflicts[:10]:
+            print(f"  HIP {c.hip:>6} {c.field}: {c.chosen[1]}（{c.chosen[0]}）を採用、{c.rejected[1]}（{c.rejected[0]}）は不採用")
+        if not args.verbose and len(conflicts) > 10:
+            print(f"  ...ほか {len(conflicts) - 10} 件（--verbose または {report_path.name}）")
+    if collisions:
+        print(f"⚠️ 別の星と同じ名前 {len(collisions)} 件（先に登録した星を採用）: "
+              + ", ".join(f"{c.key}（HIP {c.hip} / {c.other_hip}）" for c in collisions[:5]))
+
+
+if __name__ == "__main__":
+    main()
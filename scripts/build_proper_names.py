@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+カタカナ表記（properName）の出典だけを統合した名前索引を作るスクリプト
+
+rebuild_stars_from_csv.py が stars.json / stars.bin / 等級別シャードに固有名を付けるための索引。
+英語名の出典（IAU-CSN など）は含めないため、それらを編集しても stars ステージは再実行されない。
+
+入力（優先順位の高い順）:
+  1. data/brightStarNames.ts（アプリが表示に使う表）
+  2. pipeline/japanese_names.py の FAMOUS_STARS（旧 add_iau_names.py の表）
+  3. pipeline/japanese_names.py の STAR_NAMES（add_star_names.py の表）
+出力:
+  data/generated/proper-names.npz（形式は scripts/pipeline/nameindex.py、英語名の欄は空）
+
+英語名も含めた名前索引は build_name_index.py が同じ出典を先頭にして作る。
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from pipeline.japanese_names import FAMOUS_STARS, STAR_NAMES
+from pipeline.nameindex import NameSource, merge_sources, proper_names_path, table_source, typescript_source
+from pipeline.paths import ROOT
+
+BRIGHT_STAR_NAMES_PATH = ROOT / "data" / "brightStarNames.ts"
+
+
+def katakana_sources() -> list[NameSource]:
+    return [
+        typescript_source(BRIGHT_STAR_NAMES_PATH),
+        table_source("FAMOUS_STARS", FAMOUS_STARS),
+        table_source("STAR_NAMES", STAR_NAMES),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=proper_names_path(), help="索引の出力先")
+    args = parser.parse_args()
+
+    index, conflicts, collisions = merge_sources(katakana_sources())
+    index.save(args.output)
+
+    print(f"生成完了: {args.output}（{len(index):,} 件、{args.output.stat().st_size:,} バイト）")
+    for number, source in enumerate(index.sources, start=1):
+        print(f"  {number}. {source['label']:<26} {source['entries']:>5} 件")
+    if conflicts:
+        print(f"⚠️ 出典どうしで食い違う名前 {len(conflicts)} 件（優先順位の高い出典を採用）:")
+        for c in conflicts[:10]:
+            print(f"  HIP {c.hip:>6}: {c.chosen[1]}（{c.chosen[0]}）を採用、{c.rejected[1]}（{c.rejected[0]}）は不採用")
+    if collisions:
+        print(f"⚠️ 別の星と同じ名前 {len(collisions)} 件（先に登録した星を採用）: "
+              + ", ".join(f"{c.key}（HIP {c.hip} / {c.other_hip}）" for c in collisions[:5]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+クイズの問題バンクを作るスクリプト（種類 × 難易度 × 出題範囲ごとの JSON シャード）
+
+入力:
+  public/data/stars.bin（rebuild_stars_from_csv.py の出力。等級・スペクトル型・年周視差）
+  data/generated/name-index.npz（build_name_index.py の出力。固有名のある星だけを出題する）
+出力:
+  public/data/quiz/<種類>-<難易度>-<出題範囲>.json（.gz / .br。形式は scripts/pipeline/quizbank.py）
+  public/data/quiz/index.json（シャードの一覧）
+  data/generated/quiz-bank-report.json（層ごとの割合・正解の位置の割合など、難易度の偏りの確認用）
+
+使用例:
+  python3 scripts/build_quiz_bank.py
+  python3 scripts/build_quiz_bank.py --size 5000 --seed 1      # 問題数と乱数の種を変える
+  python3 scripts/build_quiz_bank.py --types distance           # 一部の種類だけ作り直す
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from pipeline.bundle import read_bundle
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import write_json
+from pipeline.nameindex import NameIndex
+from pipeline.nameindex import index_path as name_index_path
+from pipeline.paths import GENERATED_DIR, PUBLIC_DATA_DIR
+from pipeline.quizbank import (
+    BANK_VERSION,
+    BUILDERS,
+    CATEGORIES,
+    DEFAULT_BANK_SIZE,
+    DEFAULT_SEED,
+    DIFFICULTIES,
+    QUIZ_TYPES,
+    balance,
+    bank_dir,
+    shard_name,
+    shard_rng,
+    star_table,
+)
+
+REPORT_PATH = GENERATED_DIR / "quiz-bank-report.json"
+
+
+def merged_index(path: Path, args: argparse.Namespace, shards: list[dict]) -> dict:
+    """シャードの一覧（--types で一部だけ作り直した場合は、前回の一覧の他の種類を残す）"""
+    kept = []
+    if path.exists() and set(args.types) != set(QUIZ_TYPES):
+        previous = json.loads(path.read_text(encoding="utf-8"))
+        kept = [shard for shard in previous.get("shards", []) if shard["type"] not in args.types]
+    return {"version": BANK_VERSION, "seed": args.seed, "size": args.size, "shards": kept + shards}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", type=Path, default=PUBLIC_DATA_DIR / "stars.bin", help="入力の stars.bin")
+    parser.add_argument("--names", type=Path, default=name_index_path(), help="名前索引（name-index.npz）")
+    parser.add_argument("--output", type=Path, default=bank_dir(), help="シャードの出力先ディレクトリ")
+    parser.add_argument("--report", type=Path, default=REPORT_PATH, help="偏りの確認用レポートの出力先")
+    parser.add_argument("--size", type=int, default=DEFAULT_BANK_SIZE, help="1 シャードあたりの問題数")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="乱数の種")
+    parser.add_argument("--types", nargs="+", choices=QUIZ_TYPES, default=list(QUIZ_TYPES), help="作るクイズの種類")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    for path in (args.bundle, args.names):
+        if not path.exists():
+            raise FileNotFoundError(f"入力ファイルが存在しません: {path}")
+
+    written, shards, report = [], [], {}
+    with Instrument.from_args("build_quiz_bank", args) as run:
+        with run.stage("read") as stage:
+            _, columns = read_bundle(args.bundle)
+            names = NameIndex.load(args.names)
+            rows = names.rows(columns["id"])
+            named = rows >= 0
+            named[named] = names.proper_name[rows[named]] != ""
+            stars = star_table(columns, columns["spectralType"], named)
+            stage.count(len(stars.hip))
+        for quiz_type in args.types:
+            with run.stage(quiz_type) as stage:
+                for difficulty in DIFFICULTIES:
+                    for category in CATEGORIES:
+                        rng, stream = shard_rng(args.seed, quiz_type, difficulty, category)
+                        bank = BUILDERS[quiz_type](stars, difficulty, category, args.size, rng)
+                        name = shard_name(quiz_type, difficulty, category)
+                        written.append(write_json(args.output / name, bank.to_dict(args.seed, stream)))
+                        shards.append({"type": quiz_type, "difficulty": difficulty, "category": category,
+                                       "path": name, "count": bank.count, "unique": bank.unique()})
+                        report[name] = balance(bank)
+                        stage.count(bank.count)
+        written.append(write_json(args.output / "index.json", merged_index(args.output / "index.json", args, shards)))
+        for file in written:
+            run.add_output(file)
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+    print(f"生成完了: {args.output}（固有名のある星 {int(stars.named.sum())} 件、種 {args.seed}）")
+    print(f"  {'シャード':<34} {'問題数':>6} {'異なる問題':>10}  層ごとの割合 / 正解の位置")
+    for shard in shards:
+        summary = report[shard["path"]]
+        extra = "".join(f" {key}={summary[key]}" for key in ("meanMagDiff", "medianNearestRatio") if key in summary)
+        answer = f" / {summary['answerShare']}" if "answerShare" in summary else ""
+        print(f"  {shard['path']:<34} {shard['count']:>6} {shard['unique']:>10}  "
+              f"{summary['strata']['share']}{answer}{extra}")
+    empty = [shard["path"] for shard in shards if shard["count"] == 0]
+    if empty:
+        print(f"⚠️ 問題を作れなかったシャード {len(empty)} 件（アプリは従来の生成に戻る）: {', '.join(empty)}")
+    total = sum(file.bytes for file in written)
+    total_br = sum(file.brotli_bytes for file in written)
+    print(f"  合計 {len(written)} ファイル、{total:,} バイト（Brotli {total_br:,} バイト）")
+    print(f"レポート: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+星の名前検索の索引（search-index.json）を作るスクリプト
+
+入力:
+  public/data/stars.bin（rebuild_stars_from_csv.py の出力。HIP / HD / HR 番号、等級、BSC 符号）
+  data/generated/name-index.npz（build_name_index.py の出力。カタカナ表記と IAU 英語名）
+出力:
+  public/data/search-index.json（.gz / .br。形式と正規化の手順は scripts/pipeline/searchindex.py）
+
+アプリ側は lib/data/starSearchIndex.ts がこの索引を読み、オートコンプリートとクイズの
+解答判定を行う。書き出した後、代表的な検索語で索引を引き直して結果と所要時間を表示する。
+計測結果は data/generated/runs/build_search_index/（--profile / --trace-memory）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pipeline.bundle import read_bundle
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import format_size_report, write_json
+from pipeline.nameindex import NameIndex
+from pipeline.nameindex import index_path as name_index_path
+from pipeline.paths import PUBLIC_DATA_DIR
+from pipeline.searchindex import SearchIndex, build_search_index, index_path
+
+# 書き出した後に引き直して確かめる検索語と、先頭に来るべき星の HIP 番号
+SAMPLE_QUERIES: tuple[tuple[str, int], ...] = (
+    ("しりうす", 32349),
+    ("ｼﾘｳｽ", 32349),
+    ("Sirius", 32349),
+    ("α CMa", 32349),
+    ("alpha cma", 32349),
+    ("9 CMa", 32349),
+    ("HD 48915", 32349),
+    ("HR 2491", 32349),
+    ("HIP 32349", 32349),
+    ("Betelgeuse", 27989),
+    ("あーく", 69673),
+)
+
+
+def names_by_row(names: NameIndex, hips: np.ndarray) -> tuple[list, list]:
+    rows = names.rows(hips)
+    proper, iau = [None] * len(hips), [None] * len(hips)
+    for position in np.flatnonzero(rows >= 0).tolist():
+        row = rows[position]
+        proper[position] = str(names.proper_name[row]) or None
+        iau[position] = str(names.iau_name[row]) or None
+    return proper, iau
+
+
+def check_samples(index: SearchIndex, hips: set[int]) -> list[str]:
+    lines, failures = [], 0
+    for query, expected in SAMPLE_QUERIES:
+        if expected not in hips:
+            continue  # 入力に含まれない星（部分的なデータで作った場合）
+        started = time.perf_counter()
+        hits = index.search(query)
+        elapsed = (time.perf_counter() - started) * 1e3
+        ok = bool(hits) and hits[0].hip == expected
+        failures += not ok
+        found = f"{hits[0].text}（HIP {hits[0].hip}）" if hits else "なし"
+        lines.append(f"  {'✓' if ok else '✗'} {query:<12} → {found:<24} {len(hits):>2} 件 {elapsed:6.3f} ms")
+    if failures:
+        lines.append(f"⚠️ 期待した星が先頭に来なかった検索語 {failures} 件")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", type=Path, default=PUBLIC_DATA_DIR / "stars.bin", help="入力の stars.bin")
+    parser.add_argument("--names", type=Path, default=name_index_path(), help="名前索引（name-index.npz）")
+    parser.add_argument("--output", type=Path, default=index_path(), help="索引の出力先")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    for path in (args.bundle, args.names):
+        if not path.exists():
+            raise FileNotFoundError(f"入力ファイルが存在しません: {path}")
+
+    with Instrument.from_args("build_search_index", args) as run:
+        with run.stage("read") as stage:
+            _, columns = read_bundle(args.bundle)
+            names = NameIndex.load(args.names)
+            stage.count(len(columns["id"]))
+        with run.stage("names", rows_in=len(columns["id"])) as stage:
+            proper, iau = names_by_row(names, columns["id"])
+            stage.count(sum(name is not None for name in proper) + sum(name is not None for name in iau))
+        with run.stage("index", rows_in=len(columns["id"])) as stage:
+            data = build_search_index(
+                columns["id"], columns["vmag"], columns["name"], columns["hd"], columns["hr"], proper, iau
+            )
+            stage.count(len(data["entries"]["hip"]))
+        with run.stage("write"):
+            written = write_json(args.output, data)
+        run.add_output(written)
+        with run.stage("check"):
+            index = SearchIndex(data)
+            samples = check_samples(index, set(columns["id"].tolist()))
+
+    kinds = np.bincount(data["entries"]["kind"], minlength=len(data["kinds"]))
+    print(f"生成完了: {args.output}")
+    print(
+        f"  表記 {len(index):,} 件（" + "、".join(f"{kind} {count:,}" for kind, count in zip(data["kinds"], kinds))
+        + f"）、検索キー {len(data['keys']):,} 件、3-gram {len(data['trigrams']):,} 件"
+    )
+    print(f"  カタログ番号: HIP {len(data['catalog']['hip']):,}、HD {len(data['catalog']['hd']):,}、"
+          f"HR {len(data['catalog']['hr']):,}")
+    print(format_size_report([written], args.output.parent))
+    print("検索の確認:")
+    print("\n".join(samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+public/data/stars.json を HEALPix セル単位に分割するスクリプト
+
+入力:
+  public/data/stars.json（rebuild_stars_from_csv.py の出力）
+出力:
+  public/data/sky/<シャード名>/o<order>-<画素番号>.bin（stars.bin 形式）
+  public/data/sky/index.json（セル索引）
+
+形式と order の設定は scripts/pipeline/skytiles.py を参照。
+計測結果は data/generated/runs/build_sky_tiles/（--profile / --trace-memory）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import format_size_report, write_json
+from pipeline.paths import PUBLIC_DATA_DIR
+from pipeline.skytiles import SKY_DIRNAME, write_sky_tiles
+
+SOURCE = PUBLIC_DATA_DIR / "stars.json"
+INDEX_PATH = PUBLIC_DATA_DIR / SKY_DIRNAME / "index.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if not SOURCE.exists():
+        raise FileNotFoundError(f"入力ファイルが存在しません: {SOURCE}")
+
+    with Instrument.from_args("build_sky_tiles", args) as run:
+        with run.stage("read") as stage:
+            with SOURCE.open("r", encoding="utf-8") as f:
+                stars = json.load(f)
+            stage.count(len(stars))
+        with run.stage("tiles", rows_in=len(stars)) as stage:
+            index = write_sky_tiles(stars, PUBLIC_DATA_DIR)
+            stage.count(sum(tier["count"] for tier in index["tiers"]))
+        with run.stage("index"):
+            written = write_json(INDEX_PATH, index)
+        run.add_output(written)
+
+    print(f"生成完了: {INDEX_PATH}")
+    for tier in index["tiers"]:
+        counts = [cell["count"] for cell in tier["cells"]] or [0]
+        print(
+            f"  {tier['name']:>5}: order {tier['order']}, {len(tier['cells']):>4} セル, "
+            f"{tier['count']:>7} 件 (1セル最大 {max(counts)} 件)"
+        )
+
+    print(format_size_report([written], PUBLIC_DATA_DIR))
+
+
+if __name__ == "__main__":
+    main()
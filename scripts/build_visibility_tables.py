@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+緯度帯ごとの可視性の表（周極星・昇らない星・出没の時角）を作るスクリプト
+
+入力:
+  public/data/stars.bin（rebuild_stars_from_csv.py の出力。赤緯と、並びの確認用に HIP 番号を使う）
+出力:
+  public/data/visibility/lat<下端>.bin（緯度帯ごと。形式は scripts/pipeline/visibility.py）
+  public/data/visibility/index.json（.gz / .br。緯度帯の一覧）
+
+アプリ側は lib/data/visibilityTable.ts が観測地の緯度の帯だけを読み、昇らない星を捨てて、
+時角が出没の時角を超える星の高度計算を省く。書き出した後、帯ごとに緯度と時角を無作為に
+選んで高度を直接計算し、地平より上の星を表が捨てていないことを確かめる。
+
+使用例:
+  python3 scripts/build_visibility_tables.py
+  python3 scripts/build_visibility_tables.py --band-width 2 --horizon -0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from pipeline.bundle import read_bundle, write_bundle
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import write_json
+from pipeline.paths import PUBLIC_DATA_DIR
+from pipeline.visibility import (
+    DEFAULT_BAND_WIDTH,
+    DEFAULT_HORIZON,
+    HOUR_ANGLE_SCALE,
+    VISIBILITY_VERSION,
+    band_edges,
+    band_name,
+    band_table,
+    check_band,
+    id_checksum,
+    table_dir,
+)
+
+CHECK_SAMPLES = 200_000  # 緯度帯ごと
+CHECK_SEED = 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", type=Path, default=PUBLIC_DATA_DIR / "stars.bin", help="入力の stars.bin")
+    parser.add_argument("--output", type=Path, default=table_dir(), help="出力先ディレクトリ")
+    parser.add_argument("--band-width", type=float, default=DEFAULT_BAND_WIDTH, help="緯度帯の幅（度）")
+    parser.add_argument("--horizon", type=float, default=DEFAULT_HORIZON, help="地平とみなす高度（度）")
+    parser.add_argument("--check-samples", type=int, default=CHECK_SAMPLES, help="緯度帯ごとの確認の標本数（0 で省略）")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.bundle.exists():
+        raise FileNotFoundError(f"入力ファイルが存在しません: {args.bundle}")
+    if not 0 < args.band_width <= 180:
+        parser.error("--band-width は 0 より大きく 180 以下にしてください")
+
+    rng = np.random.default_rng(CHECK_SEED)
+    bands, checks, total_bytes = [], [], 0
+    with Instrument.from_args("build_visibility_tables", args) as run:
+        with run.stage("read") as stage:
+            _, columns = read_bundle(args.bundle, decode_strings=False)
+            dec = np.asarray(columns["dec"], dtype=np.float64)
+            stage.count(len(dec))
+        edges = band_edges(args.band_width)
+        with run.stage("tables", rows_in=len(dec) * len(edges)) as stage:
+            for low, high in edges:
+                table = band_table(dec, low, high, args.horizon)
+                path = args.output / band_name(low)
+                total_bytes += write_bundle(path, table.columns(), string_tables={}, equal_lengths=False)
+                bands.append({
+                    "latitude": [low, high],
+                    "path": path.name,
+                    "circumpolar": int(table.circumpolar.sum()),
+                    "neverRises": int(table.never_rises.sum()),
+                    "visibleFraction": round(table.visible_fraction(), 4),
+                })
+                if args.check_samples:
+                    checks.append(check_band(table, dec, rng, args.check_samples, args.horizon))
+                stage.count(len(dec))
+        index = {
+            "version": VISIBILITY_VERSION,
+            "bandWidth": args.band_width,
+            "horizon": args.horizon,
+            "hourAngleScale": HOUR_ANGLE_SCALE,
+            "count": len(dec),
+            "idChecksum": id_checksum(columns["id"]),
+            "bands": bands,
+        }
+        written = write_json(args.output / "index.json", index)
+        run.add_output(written)
+
+    print(f"生成完了: {args.output}（{len(dec):,} 星 × {len(bands)} 帯、幅 {args.band_width:g} 度、地平 {args.horizon:g} 度）")
+    print(f"  {'緯度帯':<14} {'周極星':>9} {'昇らない':>9} {'高度計算が要る割合':>10}")
+    for band in bands:
+        low, high = band["latitude"]
+        print(f"  {low:+6.1f}〜{high:+6.1f} {band['circumpolar']:>10,} {band['neverRises']:>10,} "
+              f"{band['visibleFraction']:>12.1%}")
+    print(f"  合計 {total_bytes:,} バイト（1 帯あたり {total_bytes // max(len(bands), 1):,} バイト）")
+    if checks:
+        failures = {key: sum(check[key] for check in checks) for key in ("missed", "circumpolarBelow", "neverRisesAbove")}
+        samples = sum(check["samples"] for check in checks)
+        if any(failures.values()):
+            print(f"⚠️ 確認で食い違い（標本 {samples:,} 件）: {failures}")
+        else:
+            print(f"確認: 標本 {samples:,} 件（緯度・時角を無作為に選んだ高度の直接計算）と食い違いなし")
+
+
+if __name__ == "__main__":
+    main()
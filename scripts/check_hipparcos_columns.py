@@ -2,16 +2,14 @@
 Hipparcosカタログの利用可能なカラムを確認
 """
 
-from astroquery.vizier import Vizier
+from pipeline.vizier_cache import query_catalog
 
 # Hipparcos Main Catalogue
 catalog_id = "I/239/hip_main"
 
-viz = Vizier(row_limit=5)
-result = viz.query_constraints(catalog=catalog_id, Vmag="<8.0")
+df = query_catalog(catalog_id, column_filters={"Vmag": "<8.0"}, row_limit=5)
 
-if result:
-    df = result[0].to_pandas()
+if not df.empty:
     print("利用可能なカラム:")
     for col in df.columns:
         print(f"  - {col}")
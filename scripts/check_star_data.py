@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+星データの品質検査（stars.bin / stars.json を一括検査し、違反があれば終了コード 1）
+
+rebuild_stars_from_csv.py の後に実行し、スキーマ・欠損率・値域・
+方向余弦・HIP 番号の重複・年周視差・等級シャードの件数・stars.json / マニフェストとの
+一致・properName と名前索引（既定はカタカナ表記の proper-names.npz）の一致を確かめる。
+検査の内容と閾値は scripts/pipeline/quality.py を参照。
+レポートは data/generated/quality/stars.json に書き出す。
+
+等級シャードの件数の目安はカタログによって異なるため、--expected-count で渡したときだけ比べる
+（Hipparcos の目安は build_data.py の stars ステージが渡す）。
+
+使用例:
+  python3 scripts/check_star_data.py
+  python3 scripts/check_star_data.py --verbose                 # 合格した検査も表示
+  python3 scripts/check_star_data.py --expected-count mag4=513 --expected-count rest=102372
+  python3 scripts/check_star_data.py --bundle other/stars.bin --no-name-index
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from pipeline.nameindex import NameIndex, proper_names_path
+from pipeline.paths import PUBLIC_DATA_DIR
+from pipeline.quality import (
+    COUNT_TOLERANCE,
+    format_report,
+    report_path,
+    validate_bundle,
+    write_report,
+)
+
+
+def expected_count(value: str) -> tuple[str, int]:
+    """--expected-count の "シャード名=累計件数"（例: mag7=14000）"""
+    name, separator, count = value.partition("=")
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"シャード名=件数 の形式で指定してください: {value}")
+    try:
+        return name.strip(), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"件数が整数ではありません: {value}") from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", type=Path, default=PUBLIC_DATA_DIR / "stars.bin", help="検査する stars.bin")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="HIP 番号の並びと properName を検査する stars.json（既定: バンドルと同じディレクトリ）")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help="件数を照合するマニフェスト（既定: バンドルと同じディレクトリの stars-manifest.json）")
+    parser.add_argument("--report", type=Path, default=report_path(), help="レポートの出力先")
+    parser.add_argument("--skip", action="append", default=[], metavar="検査名",
+                        help="行わない検査（接頭辞で指定、複数指定可。例: tier-counts, parallax）")
+    parser.add_argument("--expected-count", type=expected_count, action="append", default=[], metavar="シャード名=件数",
+                        help="等級シャードの累計件数の目安（複数指定可。rest は総数。例: mag7=14000）")
+    parser.add_argument("--count-tolerance", type=float, default=COUNT_TOLERANCE,
+                        help="等級シャードの件数の許容誤差（既定: 0.1 = ±10%%）")
+    parser.add_argument("--name-index", type=Path, default=proper_names_path(),
+                        help="properName を突き合わせる名前索引（既定: build_proper_names.py の出力）")
+    parser.add_argument("--no-name-index", action="store_true", help="properName を名前索引と突き合わせない")
+    parser.add_argument("--verbose", "-v", action="store_true", help="合格した検査も表示する")
+    args = parser.parse_args()
+
+    if not args.bundle.exists():
+        raise FileNotFoundError(f"入力ファイルが存在しません: {args.bundle}")
+    names = None
+    if not args.no_name_index:
+        if not args.name_index.exists():
+            raise FileNotFoundError(f"名前索引がありません: {args.name_index}（--no-name-index で省略できます）")
+        names = NameIndex.load(args.name_index)
+    report = validate_bundle(
+        args.bundle,
+        json_path=args.json or args.bundle.with_suffix(".json"),
+        manifest_path=args.manifest or args.bundle.parent / "stars-manifest.json",
+        names=names,
+        expected_counts=dict(args.expected_count) or None,
+        count_tolerance=args.count_tolerance,
+        skip=args.skip,
+    )
+    write_report(report, args.report)
+    print(format_report(report, verbose=args.verbose))
+    print(f"レポート: {args.report}")
+    if report["status"] != "ok":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
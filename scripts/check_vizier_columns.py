@@ -3,21 +3,19 @@
 VizieRカタログのカラム名を確認するスクリプト
 """
 
-from astroquery.vizier import Vizier
+from pipeline.vizier_cache import query_catalog
 
 # Hipparcos-2カタログのカラム確認
 print("=" * 60)
 print("Hipparcos-2 (I/311/hip2) カラム一覧")
 print("=" * 60)
-viz = Vizier()
-viz.ROW_LIMIT = 1
-result = viz.query_constraints(catalog="I/311/hip2")
-if result:
+df = query_catalog("I/311/hip2", row_limit=1)
+if not df.empty:
     print("カラム名:")
-    for col in result[0].colnames:
+    for col in df.columns:
         print(f"  - {col}")
     print(f"\nサンプルデータ:")
-    print(result[0])
+    print(df)
 
 print("\n")
 
@@ -25,15 +23,13 @@ print("\n")
 print("=" * 60)
 print("Bright Star Catalogue (V/50) カラム一覧")
 print("=" * 60)
-viz = Vizier()
-viz.ROW_LIMIT = 1
-result = viz.query_constraints(catalog="V/50")
-if result:
+df = query_catalog("V/50", row_limit=1)
+if not df.empty:
     print("カラム名:")
-    for col in result[0].colnames:
+    for col in df.columns:
         print(f"  - {col}")
     print(f"\nサンプルデータ:")
-    print(result[0])
+    print(df)
 
 print("\n")
 
@@ -41,12 +37,10 @@ print("\n")
 print("=" * 60)
 print("Henry Draper Catalogue (B/hd) カラム一覧")
 print("=" * 60)
-viz = Vizier()
-viz.ROW_LIMIT = 1
-result = viz.query_constraints(catalog="B/hd")
-if result:
+df = query_catalog("B/hd", row_limit=1)
+if not df.empty:
     print("カラム名:")
-    for col in result[0].colnames:
+    for col in df.columns:
         print(f"  - {col}")
     print(f"\nサンプルデータ:")
-    print(result[0])
+    print(df)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+公開前に public/data の .json.br を最高圧縮（Brotli 11）で作り直す
+
+各スクリプトは書き出しの速さを優先して Brotli 5（STAR_PIPELINE_BROTLI_QUALITY の既定）で
+.json.br を作る。11 は stars.json だけで 1 分以上かかるため、配信するファイルが揃った後に
+このスクリプトで 1 回だけ圧縮し直す（JSON と .gz は変えない）。
+対象は同じ名前の .json.br を持つ .json（pipeline/jsonout.py の出力）。
+
+使用例:
+  python3 scripts/build_data.py && python3 scripts/compress_public_data.py
+  python3 scripts/compress_public_data.py public/data/stars.json   # 指定したファイルだけ
+  python3 scripts/compress_public_data.py --quality 9
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline.jsonout import PUBLISH_BROTLI_QUALITY, compressed_paths, format_size_report, recompress_brotli
+from pipeline.paths import PUBLIC_DATA_DIR
+
+
+def published_json(root: Path = PUBLIC_DATA_DIR) -> list[Path]:
+    return sorted(path for path in root.rglob("*.json") if all(p.exists() for p in compressed_paths(path)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path, help="対象の .json（既定: public/data 以下のすべて）")
+    parser.add_argument("--quality", type=int, default=PUBLISH_BROTLI_QUALITY, help="Brotli の圧縮レベル（0〜11）")
+    args = parser.parse_args()
+
+    paths = args.paths or published_json()
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"入力ファイルが存在しません: {path}")
+
+    start = time.perf_counter()
+    written = [recompress_brotli(path, args.quality) for path in paths]
+    print(f"{len(written)} ファイルを Brotli {args.quality} で圧縮し直しました（{time.perf_counter() - start:.1f} 秒）")
+    if written:
+        print(format_size_report(written, PUBLIC_DATA_DIR if not args.paths else None))
+
+
+if __name__ == "__main__":
+    main()
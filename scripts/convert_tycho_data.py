@@ -4,30 +4,21 @@ Tycho-2データを既存フォーマットに変換するスクリプト
 
 import json
 import os
+from pathlib import Path
 
-def magnitude_to_color(magnitude, bt_magnitude):
-    """
-    等級から星の色を推定
-    BT-VT（色指数）から色を決定
-    """
-    if bt_magnitude is None or magnitude is None:
-        return "#ffffff"  # デフォルト白
+import numpy as np
 
-    color_index = bt_magnitude - magnitude
+from pipeline.jsonout import format_size_report, write_records
+from pipeline.palette import bv_class, class_colors, tycho_bv
 
-    # 色指数から色を決定（簡易版）
-    if color_index < 0:
-        return "#9bb0ff"  # 青白い星（O,B型）
-    elif color_index < 0.3:
-        return "#cad7ff"  # 白い星（A型）
-    elif color_index < 0.6:
-        return "#fff4ea"  # 黄白い星（F型）
-    elif color_index < 0.8:
-        return "#fffaf0"  # 黄色い星（G型）
-    elif color_index < 1.4:
-        return "#ffd2a1"  # オレンジ色の星（K型）
-    else:
-        return "#ff7f00"  # 赤い星（M型）
+def tycho_colors(tycho_data):
+    """
+    BT-VT（色指数）から星の色を推定
+    Johnson B-V に換算してから共通パレット（pipeline/palette.py）の色クラスに分類する
+    """
+    bt = np.array([np.nan if s["bt_magnitude"] is None else s["bt_magnitude"] for s in tycho_data], dtype=float)
+    vt = np.array([np.nan if s["magnitude"] is None else s["magnitude"] for s in tycho_data], dtype=float)
+    return class_colors(bv_class(tycho_bv(bt, vt))).tolist()
 
 def convert_tycho_to_app_format():
     """
@@ -42,13 +33,14 @@ def convert_tycho_to_app_format():
 
     # 変換
     converted_data = []
-    for i, star in enumerate(tycho_data, 1):
+    colors = tycho_colors(tycho_data)
+    for i, (star, color) in enumerate(zip(tycho_data, colors), 1):
         converted_star = {
             "id": i,
             "ra": star["ra"],
             "dec": star["dec"],
             "magnitude": star["magnitude"],
-            "color": magnitude_to_color(star["magnitude"], star["bt_magnitude"]),
+            "color": color,
             # 以下はTycho-2には含まれていないのでデフォルト値
             "properName": None,
             "constellation": None,
@@ -59,13 +51,11 @@ def convert_tycho_to_app_format():
 
     # 出力ファイルに保存
     output_path = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'stars.json')
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(converted_data, f, indent=2, ensure_ascii=False)
+    written = write_records(Path(output_path), converted_data)
 
     print(f"\n変換完了: {output_path}")
     print(f"総星数: {len(converted_data)}")
+    print(format_size_report([written]))
 
     # サンプル表示
     print("\nサンプルデータ（最初の3件）:")
@@ -6,34 +6,33 @@ Hipparcos-2 + Bright Star + Henry Draper 結合版
 ======================================================
 """
 
-from astroquery.vizier import Vizier
-import pandas as pd
+from pipeline.convert import sexagesimal_to_degrees, to_float
+from pipeline.crossmatch import SkyIndex, cross_match
+from pipeline.vizier_cache import query_catalog
 
-Vizier.ROW_LIMIT = -1
+HIPPARCOS_EPOCH = 1991.25
+BSC_EPOCH = 2000.0
+# HD 番号で結合できなかった星を BSC と位置で照合する半径（秒角）
+BSC_MATCH_RADIUS_ARCSEC = 10.0
+BSC_COLUMNS = ["HR", "Name", "RAJ2000", "DEJ2000", "SpType", "Vmag", "B-V_bsc"]
 
 # --- Hipparcos-2 ---
 print("🔭 Hipparcos-2 取得中...")
 # 正しいカラム名: RArad(deg), DErad(deg), Hpmag, B-V
-hip2_viz = Vizier(columns=[
+hip2 = query_catalog("I/311/hip2", columns=[
     "HIP", "RArad", "DErad", "Plx", "pmRA", "pmDE", "Hpmag", "B-V"
 ])
-hip2_viz.ROW_LIMIT = -1
-hip2 = hip2_viz.query_constraints(catalog="I/311/hip2")[0].to_pandas()
 
 # --- Bright Star Catalogue ---
 print("🌟 Bright Star Catalogue 取得中...")
 # 正しいカラム名: HR, HD, Name, RAJ2000, DEJ2000, Vmag, B-V, SpType
-bsc_viz = Vizier(columns=[
+bsc = query_catalog("V/50", columns=[
     "HR", "HD", "Name", "RAJ2000", "DEJ2000", "SpType", "Vmag", "B-V"
 ])
-bsc_viz.ROW_LIMIT = -1
-bsc = bsc_viz.query_constraints(catalog="V/50")[0].to_pandas()
 
 # --- Hipparcos-2 の元データから HD番号を取得 ---
 print("📘 Hipparcos Main Catalogue (HD番号取得用) 取得中...")
-hip_main_viz = Vizier(columns=["HIP", "HD"])
-hip_main_viz.ROW_LIMIT = -1
-hip_main = hip_main_viz.query_constraints(catalog="I/239/hip_main")[0].to_pandas()
+hip_main = query_catalog("I/239/hip_main", columns=["HIP", "HD"])
 
 # --- 結合処理 ---
 print("🔧 結合中...")
@@ -44,6 +43,31 @@ hip2 = hip2.merge(hip_main, on="HIP", how="left")
 # Step 2: Bright Star Catalogue と結合
 merged = hip2.merge(bsc, on="HD", how="left", suffixes=("_hip2", "_bsc"))
 
+# Step 3: HD 番号で結合できなかった星は、BSC の残りと位置で照合する
+#         （Hipparcos の J1991.25 位置を固有運動で J2000 に移してから最近傍を取る）
+unmatched = merged.index[merged["HR"].isna()]
+rest = bsc[~bsc["HR"].isin(merged["HR"].dropna())].reset_index(drop=True)
+rest = rest.rename(columns={"B-V": "B-V_bsc"})
+hip_index = SkyIndex(
+    to_float(merged.loc[unmatched, "RArad"]).to_numpy(),
+    to_float(merged.loc[unmatched, "DErad"]).to_numpy(),
+    pm_ra=to_float(merged.loc[unmatched, "pmRA"]).to_numpy(),
+    pm_de=to_float(merged.loc[unmatched, "pmDE"]).to_numpy(),
+    epoch=HIPPARCOS_EPOCH,
+)
+bsc_index = SkyIndex(
+    sexagesimal_to_degrees(rest["RAJ2000"], hours=True).to_numpy(),
+    sexagesimal_to_degrees(rest["DEJ2000"]).to_numpy(),
+    epoch=BSC_EPOCH,
+)
+rows, found, _ = cross_match(hip_index, bsc_index, BSC_MATCH_RADIUS_ARCSEC, epoch=BSC_EPOCH, mutual=True)
+targets = unmatched[rows]
+for column in BSC_COLUMNS:
+    merged.loc[targets, column] = rest[column].to_numpy()[found]
+hd_missing = merged.loc[targets, "HD"].isna().to_numpy()
+merged.loc[targets[hd_missing], "HD"] = rest["HD"].to_numpy()[found[hd_missing]]
+print(f"   HD 番号で結合: {len(merged) - len(unmatched)} 件, 位置照合で追加: {len(rows)} 件")
+
 # --- 等級フィルタ（9等星まで） ---
 # Hpmagを使用（Hipparcos-2の等級）
 merged = merged[merged["Hpmag"] < 9]
@@ -5,10 +5,11 @@ Hipparcos星表（9等星まで）＋SIMBAD固有名付き
 ============================================
 """
 
-from astroquery.vizier import Vizier
-from astroquery.simbad import Simbad
-import pandas as pd
-from tqdm import tqdm
+import asyncio
+
+from pipeline.paths import GENERATED_DIR
+from pipeline.simbad import SimbadNameCache, resolve_names
+from pipeline.vizier_cache import query_catalog
 
 # --- Hipparcos設定 ---
 CATALOG_ID = "I/239/hip_main"
@@ -20,37 +21,31 @@ COLUMNS = [
 FILTERS = {"Vmag": "<9"}
 
 # --- VizieRからHipparcosデータ取得 ---
-viz = Vizier(columns=COLUMNS, column_filters=FILTERS)
-viz.ROW_LIMIT = -1
 print("🔭 VizieRからHipparcos星表を取得中...")
-result = viz.query_constraints(catalog=CATALOG_ID)
-hip = result[0].to_pandas()
+hip = query_catalog(CATALOG_ID, columns=COLUMNS, column_filters=FILTERS)
 print(f"✅ {len(hip)}個の星データを取得。")
 
 # --- SIMBADで固有名（Sirius, Vegaなど）を取得 ---
+# HIP番号をまとめてTAPに問い合わせ、結果はキャッシュに逐次保存する。
+# 中断しても再実行すれば未照合の星だけを問い合わせる。
+SIMBAD_CACHE = GENERATED_DIR / "simbad-names.sqlite"
+
 print("✨ SIMBADから固有名を照合中...")
-customSimbad = Simbad()
-customSimbad.TIMEOUT = 30
-customSimbad.add_votable_fields('ids', 'otype', 'flux(V)', 'sp', 'ra', 'dec')
-
-names = []
-for hip_id in tqdm(hip["HIP"], desc="照合進行中", unit="star"):
-    try:
-        result_table = customSimbad.query_object(f"HIP {hip_id}")
-        if result_table:
-            ids = result_table["IDS"][0].decode("utf-8") if hasattr(result_table["IDS"][0], "decode") else result_table["IDS"][0]
-            # 一番代表的な名前を選ぶ
-            if " " in ids:
-                name = ids.split("|")[0].strip()
-            else:
-                name = ids.strip()
-            names.append(name)
-        else:
-            names.append("")
-    except Exception:
-        names.append("")
-
-hip["Name_SIMBAD"] = names
+
+
+def show_progress(done: int, total: int) -> None:
+    print(f"\r照合進行中: {done}/{total} star", end="", flush=True)
+
+
+with SimbadNameCache(SIMBAD_CACHE) as cache:
+    stats = asyncio.run(resolve_names(hip["HIP"].astype(int), cache, on_batch=show_progress))
+    names = cache.names()
+
+print(f"\n✅ 照合 {stats['resolved']}件（キャッシュ済みを除く）、失敗 {stats['failed']}件")
+if stats["failed"]:
+    print("⚠️ 失敗した星は空欄になります。再実行すると未照合分だけを問い合わせます。")
+
+hip["Name_SIMBAD"] = hip["HIP"].astype(int).map(names).fillna("")
 
 # --- CSV出力 ---
 OUTPUT = "hipparcos_vmag9_simbad_full.csv"
@@ -1,138 +1,141 @@
 """
-より多くの星データを取得（10等星まで）
-Tycho-2カタログから取得
+より多くの星データを取得（既定は10等星まで）
+Tycho-2カタログ（I/259/tyc2）を赤緯帯 × 赤経区画に分けて並列に取得する
+
+取得済みのチャンクは data/generated/vizier-chunks/ に保存され（pipeline/vizier_chunks.py）、
+途中で失敗・中断しても再実行すると未取得のチャンクだけを問い合わせる。
+全チャンクが揃ったら列指向バンドル（merged.bin）に連結してから JSON を書き出す。
+段階ごとの時間・件数は data/generated/runs/fetch_more_stars/ に記録する（--profile / --trace-memory）。
+
+使用例:
+  python3 fetch_more_stars.py                        # VTmag < 10（約 30 万件）
+  python3 fetch_more_stars.py --max-vmag 16 --ra-sectors 8 --workers 8 \\
+      --output ../public/data/stars-tycho2.json       # Tycho-2 全体（約 250 万件）
 """
 
-from astroquery.vizier import Vizier
-import pandas as pd
-import json
+import argparse
 import os
+import time
+from pathlib import Path
 
-def bv_to_color(bv_index):
-    """B-V色指数から星の色を推定"""
-    if pd.isna(bv_index):
-        return "#ffffff"
-
-    if bv_index < -0.3:
-        return "#9bb0ff"  # 青白
-    elif bv_index < 0:
-        return "#cad7ff"  # 白
-    elif bv_index < 0.3:
-        return "#fff4ea"  # 黄白
-    elif bv_index < 0.6:
-        return "#fffaf0"  # 黄
-    elif bv_index < 1.4:
-        return "#ffd2a1"  # オレンジ
-    else:
-        return "#ff7f00"  # 赤
-
-def spectral_type_to_color(spectral_type):
-    """スペクトル型から星の色を推定"""
-    if pd.isna(spectral_type):
-        return "#ffffff"
-
-    sp = str(spectral_type).strip().upper()
-    if not sp:
-        return "#ffffff"
-
-    first_char = sp[0]
-    color_map = {
-        'O': '#9bb0ff', 'B': '#cad7ff', 'A': '#fff4ea',
-        'F': '#fffaf0', 'G': '#ffd2a1', 'K': '#ffb56c', 'M': '#ff7f00',
-    }
-    return color_map.get(first_char, '#ffffff')
-
-def determine_constellation(ra, dec):
-    """赤経・赤緯から星座を推定（簡易版）"""
-    if dec > 80:
-        return "UMi"
-    elif dec > 50:
-        return "UMa" if 0 <= ra < 120 else "Cep"
-    elif dec > 0:
-        if 60 <= ra < 120:
-            return "Leo"
-        elif 200 <= ra < 260:
-            return "Vir"
-        else:
-            return "And"
-    else:
-        if 60 <= ra < 120:
-            return "Ori"
-        elif 200 <= ra < 260:
-            return "Sco"
-        else:
-            return "Aqr"
-
-def main():
-    print("Tycho-2カタログから10等星までのデータを取得中...")
-
-    catalog_id = "I/259/tyc2"
+import pandas as pd
 
-    viz = Vizier(row_limit=-1)
-    result = viz.query_constraints(catalog=catalog_id, VTmag="<10.0")
+from pipeline.bundle import read_bundle
+from pipeline.constellations import assign_constellations, load_grid
+from pipeline.convert import (
+    build_frame,
+    bv_to_color,
+    coalesce,
+    to_float,
+    write_records_json,
+)
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import format_size_report
+from pipeline.palette import tycho_bv
+from pipeline.streaming import format_peak_rss
+from pipeline.vizier_chunks import TYCHO2_COLUMNS, ChunkPlan, fetch_chunks, merge_chunks
+
+CATALOG_ID = "I/259/tyc2"
+DEFAULT_OUTPUT = Path(os.path.dirname(__file__), '..', 'public', 'data', 'stars-10mag.json')
+
+def report_chunk(meta, done, total):
+    print(f"  [{done}/{total}] chunk-{meta['chunk']:04d} "
+          f"赤緯 {meta['decMin']:+7.2f}〜{meta['decMax']:+7.2f}° 赤経 {meta['raMin']:5.1f}〜{meta['raMax']:5.1f}°: "
+          f"{meta['rows']:,} 行（{meta['seconds']:.1f} 秒）")
 
-    if not result:
-        print("データ取得失敗")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-vmag", type=float, default=10.0, help="VTmag の上限（未満、既定: 10）")
+    parser.add_argument("--dec-bands", type=int, default=36, help="等面積の赤緯帯の数（既定: 36）")
+    parser.add_argument("--ra-sectors", type=int, default=4, help="赤緯帯ごとの赤経区画の数（既定: 4）")
+    parser.add_argument("--workers", type=int, default=4, help="同時に取得するチャンク数（既定: 4）")
+    parser.add_argument("--refresh", action="store_true", help="取得済みのチャンクも取り直す")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="出力する JSON")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with Instrument.from_args("fetch_more_stars", args) as run:
+        fetch_and_write(args, run)
+
+def fetch_and_write(args, run):
+    plan = ChunkPlan(
+        CATALOG_ID,
+        TYCHO2_COLUMNS,
+        {"VTmag": f"<{args.max_vmag:g}"},
+        dec_bands=args.dec_bands,
+        ra_sectors=args.ra_sectors,
+    )
+    print(f"Tycho-2カタログから VTmag < {args.max_vmag:g} のデータを取得中...")
+    print(f"  {args.dec_bands} 赤緯帯 × {args.ra_sectors} 赤経区画、同時 {args.workers} 件（{plan.directory}）")
+
+    started = time.perf_counter()
+    with run.stage("fetch") as stage:
+        stats = fetch_chunks(plan, workers=args.workers, refresh=args.refresh, on_chunk=report_chunk)
+        stage.count(stats["rows"])
+    print(f"チャンク: 全 {stats['chunks']} 件（取得済み {stats['cached']}、今回 {stats['fetched']}、"
+          f"失敗 {stats['failed']}）、今回 {stats['rows']:,} 行、{time.perf_counter() - started:.1f} 秒")
+    if stats["failed"]:
+        print("取得に失敗したチャンクがあります。再実行すると未取得の分だけを取得します")
         return
 
-    df = result[0].to_pandas()
-    print(f"取得した星数: {len(df)}")
-    print("カラム名:", df.columns.tolist())
-
-    star_data = []
-    for _, row in df.iterrows():
-        ra = row.get('_RA.icrs') or row.get('RA(ICRS)')
-        dec = row.get('_DE.icrs') or row.get('DE(ICRS)')
-
-        if pd.isna(ra) or pd.isna(dec):
-            continue
-
-        vmag = row.get('VTmag')
-        if pd.isna(vmag):
-            continue
-
-        # 色の決定
-        bt_mag = row.get('BTmag')
-        if pd.notna(bt_mag) and pd.notna(vmag):
-            bv = bt_mag - vmag
-            color = bv_to_color(bv)
-        else:
-            color = "#ffffff"
-
-        constellation = determine_constellation(float(ra), float(dec))
-
-        star = {
-            "id": len(star_data) + 1,
-            "ra": float(ra),
-            "dec": float(dec),
-            "magnitude": float(vmag),
-            "color": color,
+    with run.stage("merge") as stage:
+        rows, size = merge_chunks(plan)
+        stage.count(rows)
+    print(f"連結: {plan.merged_path}（{rows:,} 行、{size:,} バイト）")
+
+    with run.stage("read-merged") as stage:
+        _, columns = read_bundle(plan.merged_path)
+        df = pd.DataFrame(columns)
+        stage.count(len(df))
+
+    with run.stage("convert", rows_in=len(df)) as stage:
+        # 平均位置（RAmdeg/DEmdeg）が無い星は観測位置（RAdeg/DEdeg）を使う
+        df = df.assign(
+            ra=coalesce(df, ['RAmdeg', 'RAdeg']),
+            dec=coalesce(df, ['DEmdeg', 'DEdeg']),
+            vmag=to_float(df['VTmag']),
+        )
+        df = df.dropna(subset=['ra', 'dec', 'vmag']).reset_index(drop=True)
+
+        # 色の決定（BT-VT を Johnson B-V に換算する。BTmag 欠損時は白）
+        bv = pd.Series(tycho_bv(to_float(df['BTmag']), df['vmag']), index=df.index)
+        stage.count(len(df))
+
+    with run.stage("constellations", rows_in=len(df)) as stage:
+        constellation = pd.Series(assign_constellations(df['ra'], df['dec'], load_grid()), index=df.index)
+        stage.count(len(df))
+
+    with run.stage("frame", rows_in=len(df)) as stage:
+        star_data = build_frame({
+            "id": range(1, len(df) + 1),
+            "ra": df['ra'],
+            "dec": df['dec'],
+            "magnitude": df['vmag'],
+            "color": bv_to_color(bv),
             "properName": None,
             "constellation": constellation,
             "spectralType": None,
-            "distance": None
-        }
-        star_data.append(star)
+            "distance": None,
+        })
+        stage.count(len(star_data))
 
     # 保存
-    output_path = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'stars-10mag.json')
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(star_data, f, indent=2, ensure_ascii=False)
+    with run.stage("write", rows_in=len(star_data)) as stage:
+        written = write_records_json(star_data, args.output)
+        stage.count(len(star_data))
+    run.add_output(plan.merged_path, written)
 
-    print(f"\n星データを保存: {output_path}")
+    print(f"\n星データを保存: {args.output}")
     print(f"総星数: {len(star_data)}")
+    print(format_size_report([written]))
+    print(format_peak_rss())
 
     # 等級別の統計
-    mag_dist = {}
-    for star in star_data:
-        mag = int(star['magnitude'])
-        mag_dist[mag] = mag_dist.get(mag, 0) + 1
+    mag_dist = star_data['magnitude'].astype(int).value_counts().sort_index()
 
     print("\n等級別分布:")
-    for mag in sorted(mag_dist.keys()):
-        print(f"  {mag}等星: {mag_dist[mag]}個")
+    for mag, count in mag_dist.items():
+        print(f"  {mag}等星: {count}個")
 
 if __name__ == "__main__":
     main()
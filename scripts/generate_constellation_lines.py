@@ -4,17 +4,28 @@ Stellariumのconstellationship.fabをJSON形式に変換するスクリプト
 
 入力:
   data/raw/stellarium/constellationship.fab
+  public/data/stars.bin（星座線の頂点の座標。--lines-only では読まない）
 出力:
-  public/data/constellation-lines.json
+  public/data/constellation-lines.json（HIP 番号の組）
+  public/data/constellation-geometry.json（頂点・線分の索引・折れ線。形式は scripts/pipeline/linegeometry.py）
+  data/generated/constellation-lines-report.json（星表に無い HIP 番号と、除いた線分の数）
 """
 
+import argparse
 import json
 import pathlib
 from typing import List
 
+from pipeline.bundle import read_bundle
+from pipeline.jsonout import format_size_report, write_json, write_records
+from pipeline.linegeometry import build_line_geometry
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SOURCE = ROOT / "data" / "raw" / "stellarium" / "constellationship.fab"
 TARGET = ROOT / "public" / "data" / "constellation-lines.json"
+STARS = ROOT / "public" / "data" / "stars.bin"
+GEOMETRY_TARGET = ROOT / "public" / "data" / "constellation-geometry.json"
+REPORT_TARGET = ROOT / "data" / "generated" / "constellation-lines-report.json"
 
 
 def parse_constellationship(line: str) -> dict:
@@ -74,14 +85,43 @@ def load_lines() -> list:
     return records
 
 
+def write_geometry(records: list, stars_path: pathlib.Path) -> list:
+    if not stars_path.exists():
+        raise FileNotFoundError(
+            f"入力ファイルが存在しません: {stars_path}（rebuild_stars_from_csv.py で作成するか --lines-only を付ける）"
+        )
+    _, columns = read_bundle(stars_path, decode_strings=False)
+    geometry, report = build_line_geometry(records, columns["id"], columns)
+    written = write_json(GEOMETRY_TARGET, geometry)
+    REPORT_TARGET.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_TARGET.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+    vertices = len(geometry["vertices"]["hip"])
+    strips = sum(len(entry["strips"]) for entry in geometry["constellations"])
+    kept = report.segments - report.dropped_segments
+    print(f"生成完了: {GEOMETRY_TARGET}")
+    print(f"  頂点 {vertices} 件（線分の端点 {kept * 2} 件）、線分 {kept} 本 → 折れ線 {strips} 本"
+          f"（往復・重複で除いた線分 {report.duplicate_segments} 本）")
+    if report.unresolved:
+        unresolved = report.to_dict()["unresolved"]
+        print(f"⚠️ 星表に無い HIP 番号 {len(unresolved)} 件（線分 {report.dropped_segments} 本を除外、"
+              f"一覧は {REPORT_TARGET}）: "
+              + ", ".join(f"{entry['constellationId']} HIP {entry['hip']}" for entry in unresolved[:10]))
+    return [written]
+
+
 def main() -> None:
-    records = load_lines()
-    TARGET.parent.mkdir(parents=True, exist_ok=True)
-    with TARGET.open("w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stars", type=pathlib.Path, default=STARS, help="頂点の座標を引く stars.bin")
+    parser.add_argument("--lines-only", action="store_true", help="constellation-lines.json だけを書き出す")
+    args = parser.parse_args()
 
+    records = load_lines()
+    written = [write_records(TARGET, records)]
     print(f"生成完了: {TARGET} (星座数: {len(records)})")
+    if not args.lines_only:
+        written += write_geometry(records, args.stars)
+    print(format_size_report(written))
 
 
 if __name__ == "__main__":
@@ -10,12 +10,13 @@ IAU Catalog of Star Names (IAU-CSN) から固有名星データを抽出してJS
 
 from __future__ import annotations
 
-import json
 import pathlib
 import re
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
+from pipeline.jsonout import format_size_report, write_records
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SOURCE = ROOT / "data" / "raw" / "iau" / "IAU-CSN.txt"
 TARGET = ROOT / "public" / "data" / "named-stars.json"
@@ -186,12 +187,10 @@ def load_named_stars() -> Iterable[NamedStar]:
 
 def main() -> None:
     stars = load_named_stars()
-    TARGET.parent.mkdir(parents=True, exist_ok=True)
-    with TARGET.open("w", encoding="utf-8") as f:
-        json.dump([star.to_dict() for star in stars], f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    written = write_records(TARGET, (star.to_dict() for star in stars))
 
     print(f"生成完了: {TARGET} (固有名付き星数: {len(stars)})")
+    print(format_size_report([written]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+data/raw の CDS 固定長ファイルをネットワーク無しで列指向データに変換するスクリプト
+
+入力:
+  data/raw/ReadMe（Byte-by-byte Description）
+  data/raw/hip_main.dat または hip_main.dat.gz（他の ReadMe 掲載ファイルも指定可）
+出力:
+  data/generated/<ファイル名>.npz（列ごとの配列 + I 形式列の欠損マスク "<列名>__mask"）
+
+使用例:
+  python3 scripts/ingest_hip_main.py
+  python3 scripts/ingest_hip_main.py --file h_dm_com.dat --columns HIP Hp RAdeg DEdeg
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pipeline.cds import parse_readme, read_catalog
+from pipeline.paths import GENERATED_DIR, RAW_DIR
+
+README = RAW_DIR / "ReadMe"
+
+
+def resolve_source(filename: str) -> Path:
+    """非圧縮ファイルを優先し、無い（または空の）場合は .gz を使う"""
+    plain = RAW_DIR / filename
+    gz = RAW_DIR / f"{filename}.gz"
+    for candidate in (plain, gz):
+        if candidate.exists() and candidate.stat().st_size > 0:
+            return candidate
+    raise FileNotFoundError(f"入力ファイルが存在しません: {plain} / {gz}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", default="hip_main.dat", help="ReadMe に記載されたファイル名")
+    parser.add_argument("--columns", nargs="*", help="出力する列（省略時は全列）")
+    parser.add_argument("--output", type=Path, help="出力先 .npz（省略時は data/generated/<ファイル名>.npz）")
+    args = parser.parse_args()
+
+    layouts = parse_readme(README)
+    if args.file not in layouts:
+        raise KeyError(f"ReadMe に {args.file} の Byte-by-byte Description がありません")
+
+    source = resolve_source(args.file)
+    started = time.perf_counter()
+    table = read_catalog(source, layouts[args.file], args.columns)
+    elapsed = time.perf_counter() - started
+
+    arrays = dict(table.columns)
+    arrays.update({f"{label}__mask": mask for label, mask in table.masks.items()})
+
+    output = args.output or GENERATED_DIR / f"{Path(args.file).stem}.npz"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(output, **arrays)
+
+    print(f"読み込み完了: {source} ({len(table)} 行, {len(table.columns)} 列, {elapsed:.2f} 秒)")
+    print(f"書き出し完了: {output}")
+
+
+if __name__ == "__main__":
+    main()
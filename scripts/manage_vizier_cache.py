@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+VizieR 問い合わせキャッシュの確認・整理
+
+使用例:
+  python3 scripts/manage_vizier_cache.py list               # エントリ一覧
+  python3 scripts/manage_vizier_cache.py prune --ttl-days 90  # 90 日より古いものを削除
+  python3 scripts/manage_vizier_cache.py prune --max-bytes 500000000
+  python3 scripts/manage_vizier_cache.py clear              # すべて削除
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from pipeline.vizier_cache import cache_dir, cache_entries, evict
+
+
+def list_entries() -> None:
+    entries = sorted(cache_entries(), key=lambda meta: meta.get("lastUsedAt", 0), reverse=True)
+    now = time.time()
+    total = 0
+    for meta in entries:
+        age_days = (now - meta["createdAt"]) / 86400
+        filters = ",".join(f"{k}{v}" for k, v in meta.get("filters", {}).items()) or "-"
+        print(
+            f"{meta['key'][:12]}  {meta['catalog']:<20} {filters:<16} "
+            f"{meta['rows']:>9,} 行 {meta['bytes'] / 1e6:>8.1f} MB  {age_days:6.1f} 日前"
+        )
+        total += meta.get("bytes", 0)
+    print(f"{len(entries)} 件, 合計 {total / 1e6:.1f} MB ({cache_dir()})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="エントリ一覧を表示する")
+    prune = sub.add_parser("prune", help="期限切れ・容量超過のエントリを削除する")
+    prune.add_argument("--ttl-days", type=float, default=None)
+    prune.add_argument("--max-bytes", type=int, default=None)
+    sub.add_parser("clear", help="すべてのエントリを削除する")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        list_entries()
+    elif args.command == "prune":
+        removed = evict(max_bytes=args.max_bytes, ttl_days=args.ttl_days)
+        print(f"{len(removed)} 件削除")
+    elif args.command == "clear":
+        removed = evict(max_bytes=0)
+        print(f"{len(removed)} 件削除")
+
+
+if __name__ == "__main__":
+    main()
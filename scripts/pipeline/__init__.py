@@ -0,0 +1,6 @@
+"""
+星データ生成パイプラインの共通モジュール群
+
+scripts/ 直下の各スクリプトから `from pipeline import ...` で利用する。
+（`python3 scripts/xxx.py` として実行すると scripts/ が import パスに入る）
+"""
@@ -0,0 +1,364 @@
+"""
+データパイプラインのベンチマーク（段階ごとの時間・メモリ計測、履歴、性能低下の検出）
+
+合成カタログ（pipeline/synthetic.py）を行数ごとに作り、次の段階を順に計測する。
+  parse           CSV の読み込み（pandas.read_csv）
+  convert         列演算による変換（pipeline/convert.py）と方向余弦・パレット番号
+  crossmatch      KD 木による位置照合（pipeline/crossmatch.py、相手は BSC 相当の合成カタログ）
+  constellations  星座判定（pipeline/constellations.py、参照格子が無ければ省略）
+  serialize       stars.json（.gz/.br 込み）と stars.bin の書き出し
+行数ごとに別プロセス（spawn）で実行するため、前の行数のメモリ使用量は持ち越さない。
+メモリは段階の実行中に常駐メモリ（RSS）を定期的に読み、その最大値（peakRssBytes）と
+段階開始時からの増加分（rssGrowthBytes）を記録する。
+
+履歴は JSON Lines（既定 data/generated/benchmarks/pipeline-history.jsonl）に 1 回 1 行で追記する。
+  {"version": 1, "timestamp": "...", "commit": "abc1234", "accepted": true,
+   "machine": {"node": "...", "python": "3.11.9", ..., "brotliQuality": 11},
+   "results": [{"rows": 10000, "stage": "parse", "seconds": 0.02, "rowsPerSecond": ...,
+                "peakRssBytes": ..., "rssGrowthBytes": ...}, ...]}
+基準値は同じマシン（node・Python・Brotli の圧縮レベルが同じ）で accepted な直近の記録の中央値。
+性能低下があった回は accepted: false で記録し、以後の基準値には使わない。
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pipeline.paths import GENERATED_DIR, ROOT
+from pipeline.streaming import current_rss_bytes
+
+HISTORY_VERSION = 1
+STAGES: tuple[str, ...] = ("parse", "convert", "crossmatch", "constellations", "serialize")
+DEFAULT_SIZES: tuple[int, ...] = (10_000, 100_000, 1_000_000, 2_500_000)
+CROSSMATCH_RADIUS_ARCSEC = 2.0
+# 本番の既定（11）は圧縮だけで 0.3MB/秒程度になり serialize の時間をほぼ占めるため、計測では下げる
+BENCHMARK_BROTLI_QUALITY = 5
+SAMPLE_INTERVAL = 0.005
+
+
+def history_path() -> Path:
+    return GENERATED_DIR / "benchmarks" / "pipeline-history.jsonl"
+
+
+class MemorySampler:
+    """with ブロックの実行中に RSS を定期的に読み、最大値を記録する"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def __enter__(self) -> "MemorySampler":
+        self.start = self.peak = current_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+
+@dataclass(frozen=True)
+class StageResult:
+    rows: int
+    stage: str
+    seconds: float
+    peak_rss_bytes: int
+    rss_growth_bytes: int
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "stage": self.stage,
+            "seconds": round(self.seconds, 4),
+            "rowsPerSecond": round(self.rows / self.seconds) if self.seconds > 0 else None,
+            "peakRssBytes": self.peak_rss_bytes,
+            "rssGrowthBytes": self.rss_growth_bytes,
+        }
+
+
+def measure(rows: int, stage: str, func: Callable[..., object], *args) -> tuple[object, StageResult]:
+    with MemorySampler() as memory:
+        started = time.perf_counter()
+        result = func(*args)
+        seconds = time.perf_counter() - started
+    return result, StageResult(rows, stage, seconds, memory.peak, memory.peak - memory.start)
+
+
+def convert_catalog(df: pd.DataFrame) -> pd.DataFrame:
+    """Hipparcos 形式 → stars.json の列（fetch_star_data_detailed.py の変換 + 方向余弦・パレット番号）"""
+    from pipeline.convert import (
+        build_frame,
+        coalesce,
+        parallax_to_distance,
+        star_color,
+        to_float,
+        to_nullable_int,
+        to_nullable_str,
+    )
+    from pipeline.palette import palette_index
+    from pipeline.sphere import radec_to_unit
+
+    bv = coalesce(df, ["B-V_hip2", "B-V_bsc"])
+    spectral = to_nullable_str(df["SpType"])
+    frame = build_frame({
+        "id": to_nullable_int(df["HIP"]),
+        "ra": to_float(df["RA"]),
+        "dec": to_float(df["DEC"]),
+        "vmag": to_float(df["Vmag"]),
+        "bv": bv,
+        "color": star_color(bv, df["SpType"]),
+        "spectralType": spectral,
+        "name": to_nullable_str(df["Name"]),
+        "hd": to_nullable_int(df["HD"]),
+        "hr": to_nullable_int(df["HR"]),
+        "parallax": to_float(df["Plx"]),
+        "pmRA": to_float(df["pmRA"]),
+        "pmDE": to_float(df["pmDE"]),
+        "distance": parallax_to_distance(df["Plx"]),
+    })
+    vectors = radec_to_unit(frame["ra"].to_numpy(), frame["dec"].to_numpy()).astype(np.float32)
+    frame["x"], frame["y"], frame["z"] = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    frame["colorIndex"] = palette_index(bv.to_numpy(), spectral.tolist(), frame["vmag"].to_numpy())
+    return frame
+
+
+def bundle_columns(frame: pd.DataFrame) -> dict[str, object]:
+    """変換済みの DataFrame → stars.bin の列（STAR_COLUMNS の型、文字列列はリスト）"""
+    from pipeline.bundle import STAR_COLUMNS, STAR_STRING_COLUMNS, null_value
+
+    columns: dict[str, object] = {}
+    for name, dtype in STAR_COLUMNS.items():
+        if name in frame:
+            columns[name] = frame[name].to_numpy(dtype=dtype, na_value=null_value(dtype))
+    for name in STAR_STRING_COLUMNS:
+        if name in frame:
+            columns[name] = frame[name].astype(object).where(frame[name].notna(), None).tolist()
+    return columns
+
+
+def run_size(rows: int, seed: int = 0, grid_path: Optional[str] = None) -> list[dict]:
+    """1 つの行数について全段階を計測する（run_benchmarks から別プロセスで呼ばれる）"""
+    from pipeline.bundle import write_bundle
+    from pipeline.constellations import ConstellationGrid, assign_constellations
+    from pipeline.convert import write_records_json
+    from pipeline.crossmatch import SkyIndex, cross_match
+    from pipeline.synthetic import companion_catalog, synthetic_catalog
+
+    results: list[StageResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        csv_path = workdir / "catalog.csv"
+        source = synthetic_catalog(rows, seed)
+        companion = companion_catalog(source, seed=seed + 1)
+        source.to_csv(csv_path, index=False)
+        del source
+
+        df, result = measure(rows, "parse", pd.read_csv, csv_path)
+        results.append(result)
+
+        frame, result = measure(rows, "convert", convert_catalog, df)
+        results.append(result)
+        del df
+
+        def match() -> int:
+            stars = SkyIndex(frame["ra"].to_numpy(), frame["dec"].to_numpy())
+            other = SkyIndex(companion["ra"].to_numpy(), companion["dec"].to_numpy())
+            matched, _, _ = cross_match(stars, other, CROSSMATCH_RADIUS_ARCSEC)
+            return len(matched)
+
+        _, result = measure(rows, "crossmatch", match)
+        results.append(result)
+
+        if grid_path is not None:
+            grid = ConstellationGrid.load(Path(grid_path))
+
+            def assign() -> None:
+                frame["constellation"] = assign_constellations(frame["ra"].to_numpy(), frame["dec"].to_numpy(), grid)
+
+            _, result = measure(rows, "constellations", assign)
+            results.append(result)
+
+        def serialize() -> None:
+            write_records_json(frame, workdir / "stars.json")
+            write_bundle(workdir / "stars.bin", bundle_columns(frame))
+
+        _, result = measure(rows, "serialize", serialize)
+        results.append(result)
+
+    return [result.to_dict() for result in results]
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    *,
+    seed: int = 0,
+    grid_path: Optional[Path] = None,
+    on_size: Optional[Callable[[int, list[dict]], None]] = None,
+) -> list[dict]:
+    """行数ごとに新しいプロセスで run_size を実行し、全段階の結果をまとめて返す"""
+    context = multiprocessing.get_context("spawn")
+    results: list[dict] = []
+    for rows in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            size_results = pool.submit(run_size, rows, seed, str(grid_path) if grid_path else None).result()
+        results.extend(size_results)
+        if on_size:
+            on_size(rows, size_results)
+    return results
+
+
+def machine_info() -> dict:
+    from pipeline.jsonout import brotli_quality
+
+    return {
+        "node": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "cpus": os.cpu_count(),
+        "brotliQuality": brotli_quality(),
+    }
+
+
+def comparable(machine: Mapping[str, object], other: Mapping[str, object]) -> bool:
+    """同じ条件で計測した記録か（時間を比べてよいか）"""
+    return all(machine.get(key) == other.get(key) for key in ("node", "python", "brotliQuality"))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    records = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def append_history(path: Path, record: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def make_record(results: Sequence[dict], machine: dict, regressions: Sequence[dict], accepted: bool) -> dict:
+    return {
+        "version": HISTORY_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "accepted": accepted,
+        "machine": machine,
+        "results": list(results),
+        "regressions": list(regressions),
+    }
+
+
+def baselines(history: Sequence[dict], machine: Mapping[str, object], runs: int = 5) -> dict[tuple[int, str], dict]:
+    """(行数, 段階) → 直近 runs 回の accepted な記録の中央値（seconds, peakRssBytes, runs）"""
+    samples: dict[tuple[int, str], list[dict]] = {}
+    for record in reversed(history):
+        if not record.get("accepted", True) or not comparable(machine, record.get("machine", {})):
+            continue
+        for result in record["results"]:
+            bucket = samples.setdefault((result["rows"], result["stage"]), [])
+            if len(bucket) < runs:
+                bucket.append(result)
+    return {
+        key: {
+            "seconds": statistics.median(item["seconds"] for item in items),
+            "peakRssBytes": statistics.median(item["peakRssBytes"] for item in items),
+            "runs": len(items),
+        }
+        for key, items in samples.items()
+    }
+
+
+def find_regressions(
+    results: Sequence[dict],
+    reference: Mapping[tuple[int, str], dict],
+    *,
+    time_threshold: float = 0.25,
+    memory_threshold: float = 0.25,
+    stage_thresholds: Optional[Mapping[str, float]] = None,
+    min_seconds: float = 0.05,
+    min_bytes: int = 16 * 1024**2,
+) -> list[dict]:
+    """
+    基準値より threshold（割合）を超えて遅い・メモリが多い段階を返す
+
+    stage_thresholds で段階ごとに時間のしきい値を上書きできる。
+    差が min_seconds 秒・min_bytes バイト未満のものは計測の揺れとみなして無視する。
+    """
+    stage_thresholds = stage_thresholds or {}
+    regressions = []
+    for result in results:
+        base = reference.get((result["rows"], result["stage"]))
+        if base is None:
+            continue
+        checks = (
+            ("seconds", stage_thresholds.get(result["stage"], time_threshold), min_seconds),
+            ("peakRssBytes", memory_threshold, min_bytes),
+        )
+        for metric, threshold, minimum in checks:
+            value, expected = result[metric], base[metric]
+            if value > expected * (1.0 + threshold) and value - expected >= minimum:
+                regressions.append({
+                    "rows": result["rows"],
+                    "stage": result["stage"],
+                    "metric": metric,
+                    "value": value,
+                    "baseline": expected,
+                    "ratio": round(value / expected, 3) if expected else None,
+                    "threshold": threshold,
+                })
+    return regressions
+
+
+def format_results(results: Sequence[dict], reference: Mapping[tuple[int, str], dict]) -> str:
+    lines = [f"  {'行数':>10} {'段階':<13} {'秒':>8} {'rows/sec':>12} {'最大RSS':>7} {'増加':>7}  基準比"]
+    for result in results:
+        base = reference.get((result["rows"], result["stage"]))
+        change = f"{result['seconds'] / base['seconds'] * 100 - 100:+.0f}%" if base and base["seconds"] else "-"
+        rate = f"{result['rowsPerSecond']:,}" if result["rowsPerSecond"] else "-"
+        lines.append(
+            f"  {result['rows']:>12,} {result['stage']:<15} {result['seconds']:>9.3f} {rate:>12} "
+            f"{result['peakRssBytes'] / 1024**2:>7.0f}MB {result['rssGrowthBytes'] / 1024**2:>7.0f}MB  {change}"
+        )
+    return "\n".join(lines)
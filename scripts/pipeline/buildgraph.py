@@ -0,0 +1,375 @@
+"""
+データ生成の依存グラフと差分ビルド
+
+各ステージは入力ファイル・出力ファイル・実行コマンドを宣言する。
+- 入力内容（とコマンド）の SHA-256 を前回ビルド時の値と比べ、変わったステージだけを実行する
+- 出力が消えている・手で書き換えられている場合も再実行する
+- 他ステージの出力を入力に持つステージは、その完了を待ってから判定する
+- 依存関係の無いステージはスレッドプールで並行に実行する（各コマンドは別プロセス）
+
+スクリプトが import する pipeline/ のモジュール（と scripts/ 直下の他のスクリプト）は
+import_closure で辿ってステージの入力に加える（build_data.py）。
+前回の状態は data/generated/build-state.json に保存する。
+ファイルのハッシュは (サイズ, 更新時刻) が同じなら状態ファイルの値を再利用する。
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from pipeline.paths import GENERATED_DIR, ROOT, SCRIPTS_DIR
+
+STATE_VERSION = 1
+DEFAULT_STATE_PATH = GENERATED_DIR / "build-state.json"
+MISSING = "missing"
+
+
+class BuildError(RuntimeError):
+    """ステージの定義不備、またはコマンドの失敗"""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    ビルドの1段階
+
+    inputs / outputs は ROOT からの相対パス（ディレクトリ可）。
+    commands は scripts/ をカレントディレクトリとして順に実行する引数列。
+    先頭が "python" の場合は実行中の Python インタプリタに置き換える。
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    commands: tuple[tuple[str, ...], ...]
+    description: str = ""
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # "built" / "fresh" / "failed" / "skipped"
+    seconds: float = 0.0
+    reason: str = ""
+    log: str = ""
+
+
+class FileHasher:
+    """(サイズ, 更新時刻) をキーにファイルの SHA-256 を記憶する"""
+
+    def __init__(self, known: Optional[dict] = None) -> None:
+        self.known: dict[str, list] = dict(known or {})
+        self._lock = threading.Lock()
+
+    def file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.relative_to(ROOT)) if path.is_relative_to(ROOT) else str(path)
+        with self._lock:
+            cached = self.known.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        with self._lock:
+            self.known[key] = [stat.st_size, stat.st_mtime_ns, value]
+        return value
+
+    def path_digest(self, relative: str) -> str:
+        """ファイルはその内容、ディレクトリは配下の全ファイル（相対パス込み）、無ければ MISSING"""
+        path = ROOT / relative
+        if path.is_file():
+            return self.file_digest(path)
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for child in sorted(p for p in path.rglob("*") if p.is_file()):
+                digest.update(str(child.relative_to(path)).encode("utf-8"))
+                digest.update(self.file_digest(child).encode("ascii"))
+            return digest.hexdigest()
+        return MISSING
+
+
+def _imported_modules(path: Path) -> set[str]:
+    """スクリプトが import するモジュール名（"pipeline.bundle" / "pipeline" / "add_star_names" など）"""
+    names: set[str] = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"), filename=str(path))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+            # from pipeline import bundle
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _module_path(name: str) -> Optional[Path]:
+    """scripts/ 以下にあるモジュールのファイル（標準ライブラリ・外部パッケージは None）"""
+    base = SCRIPTS_DIR.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def import_closure(scripts: Iterable[str]) -> tuple[str, ...]:
+    """
+    スクリプト（ROOT からの相対パス）と、そこから import で辿れる scripts/ 以下の全ファイル
+
+    関数内の import や try の中の import も含める（実行されない分岐でも入力とみなす）。
+    """
+    pending = [ROOT / script for script in scripts]
+    seen: set[Path] = set()
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.is_file():
+            continue
+        seen.add(path)
+        for name in _imported_modules(path):
+            # pipeline.bundle の import は pipeline/__init__.py も実行する
+            parts = name.split(".")
+            for depth in range(1, len(parts) + 1):
+                module = _module_path(".".join(parts[:depth]))
+                if module is not None:
+                    pending.append(module)
+    return tuple(sorted(str(path.relative_to(ROOT)) for path in seen))
+
+
+def stage_digest(stage: Stage, hasher: FileHasher) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps(stage.commands).encode("utf-8"))
+    for relative in sorted(stage.inputs):
+        digest.update(relative.encode("utf-8"))
+        digest.update(hasher.path_digest(relative).encode("ascii"))
+    return digest.hexdigest()
+
+
+def output_digests(stage: Stage, hasher: FileHasher) -> dict[str, str]:
+    return {relative: hasher.path_digest(relative) for relative in stage.outputs}
+
+
+def upstream_map(stages: Sequence[Stage]) -> dict[str, set[str]]:
+    """ステージ名 → そのステージの入力を出力する（上流の）ステージ名"""
+    producers: dict[str, str] = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise BuildError(f"{output} を出力するステージが重複しています: {producers[output]}, {stage.name}")
+            producers[output] = stage.name
+
+    def produced_by(path: str) -> Optional[str]:
+        for output, name in producers.items():
+            if path == output or path.startswith(output.rstrip("/") + "/"):
+                return name
+        return None
+
+    graph = {}
+    for stage in stages:
+        deps = {produced_by(path) for path in stage.inputs} - {None, stage.name}
+        graph[stage.name] = deps  # type: ignore[assignment]
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: dict[str, set[str]]) -> None:
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str, trail: list[str]) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise BuildError("ステージの依存関係が循環しています: " + " -> ".join(trail + [name]))
+        visiting.add(name)
+        for dep in graph[name]:
+            visit(dep, trail + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name, [])
+
+
+def select(stages: Sequence[Stage], targets: Iterable[str]) -> list[Stage]:
+    """指定ステージとその上流をすべて含むステージ列を返す（targets が空なら全体）"""
+    targets = list(targets)
+    if not targets:
+        return list(stages)
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise BuildError(f"未定義のステージです: {', '.join(unknown)}（定義済み: {', '.join(by_name)}）")
+    graph = upstream_map(stages)
+    needed: set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(graph[name])
+    return [stage for stage in stages if stage.name in needed]
+
+
+class BuildGraph:
+    def __init__(self, stages: Sequence[Stage], state_path: Path = DEFAULT_STATE_PATH) -> None:
+        self.stages = list(stages)
+        self.by_name = {stage.name: stage for stage in self.stages}
+        self.graph = upstream_map(self.stages)
+        self.state_path = state_path
+        state = self._load_state()
+        self.records: dict[str, dict] = state.get("stages", {})
+        self.hasher = FileHasher(state.get("files"))
+        self._lock = threading.Lock()
+
+    def _load_state(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return state if state.get("version") == STATE_VERSION else {}
+
+    def save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with self.hasher._lock:
+                files = dict(self.hasher.known)
+            state = {"version": STATE_VERSION, "stages": self.records, "files": files}
+            text = json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            tmp_path.write_text(text + "\n", encoding="utf-8")
+            tmp_path.replace(self.state_path)
+
+    def stale_reason(self, stage: Stage) -> Optional[str]:
+        """再実行が必要な理由を返す（不要なら None）"""
+        record = self.records.get(stage.name)
+        if record is None:
+            return "未ビルド"
+        if record.get("inputs") != stage_digest(stage, self.hasher):
+            return "入力が変更された"
+        current = output_digests(stage, self.hasher)
+        for relative, digest in current.items():
+            if digest == MISSING:
+                return f"{relative} が存在しない"
+            if record.get("outputs", {}).get(relative) != digest:
+                return f"{relative} が変更された"
+        return None
+
+    def _run(self, stage: Stage, reason: str) -> StageResult:
+        digest_before = stage_digest(stage, self.hasher)
+        started = time.perf_counter()
+        logs = []
+        for command in stage.commands:
+            argv = [sys.executable, *command[1:]] if command[0] == "python" else list(command)
+            completed = subprocess.run(argv, cwd=SCRIPTS_DIR, capture_output=True, text=True)
+            logs.append(f"$ {' '.join(command)}\n{completed.stdout}{completed.stderr}")
+            if completed.returncode != 0:
+                return StageResult(
+                    stage.name, "failed", time.perf_counter() - started,
+                    f"{' '.join(command)} が終了コード {completed.returncode} で失敗", "\n".join(logs),
+                )
+        seconds = time.perf_counter() - started
+
+        missing_outputs = [path for path, digest in output_digests(stage, self.hasher).items() if digest == MISSING]
+        if missing_outputs:
+            return StageResult(stage.name, "failed", seconds, f"出力が生成されていません: {', '.join(missing_outputs)}", "\n".join(logs))
+
+        with self._lock:
+            self.records[stage.name] = {
+                "inputs": digest_before,
+                "outputs": output_digests(stage, self.hasher),
+                "builtAt": time.time(),
+                "seconds": round(seconds, 3),
+            }
+        self.save_state()
+        return StageResult(stage.name, "built", seconds, reason, "\n".join(logs))
+
+    def plan(self, targets: Iterable[str] = (), force: bool = False) -> list[tuple[Stage, Optional[str]]]:
+        """
+        実行せずに各ステージの判定結果を返す
+
+        上流が再実行される場合、その出力はまだ変わっていないため
+        下流は「上流が再ビルド対象」として扱う。
+        """
+        planned: dict[str, Optional[str]] = {}
+        result = []
+        for stage in self._ordered(select(self.stages, targets)):
+            reason = "強制" if force else self.stale_reason(stage)
+            if reason is None:
+                rebuilt = sorted(dep for dep in self.graph[stage.name] if planned.get(dep))
+                if rebuilt:
+                    reason = f"上流 {', '.join(rebuilt)} が再ビルド対象"
+            planned[stage.name] = reason
+            result.append((stage, reason))
+        return result
+
+    def _ordered(self, stages: Sequence[Stage]) -> list[Stage]:
+        names = {stage.name for stage in stages}
+        ordered: list[Stage] = []
+        placed: set[str] = set()
+        while len(ordered) < len(stages):
+            for stage in stages:
+                if stage.name not in placed and (self.graph[stage.name] & names) <= placed:
+                    ordered.append(stage)
+                    placed.add(stage.name)
+        return ordered
+
+    def build(
+        self,
+        targets: Iterable[str] = (),
+        force: bool = False,
+        jobs: int = 4,
+        on_result=None,
+    ) -> list[StageResult]:
+        """
+        対象ステージを依存順に実行する
+
+        各ステージの判定は上流がすべて終わった時点で行う（上流の新しい出力を入力として読むため）。
+        上流が失敗したステージは "skipped" になる。
+        """
+        stages = select(self.stages, targets)
+        names = {stage.name for stage in stages}
+        waiting = {stage.name: self.graph[stage.name] & names for stage in stages}
+        results: dict[str, StageResult] = {}
+        running: dict[Future, str] = {}
+
+        def settle(result: StageResult) -> None:
+            results[result.name] = result
+            if on_result:
+                on_result(result)
+
+        def evaluate(stage: Stage) -> StageResult:
+            reason = "強制" if force else self.stale_reason(stage)
+            if reason is None:
+                return StageResult(stage.name, "fresh")
+            return self._run(stage, reason)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while len(results) < len(stages):
+                for name, deps in list(waiting.items()):
+                    if not deps <= results.keys():
+                        continue
+                    del waiting[name]
+                    failed = sorted(dep for dep in deps if results[dep].status in ("failed", "skipped"))
+                    if failed:
+                        settle(StageResult(name, "skipped", reason=f"上流 {', '.join(failed)} が失敗"))
+                        continue
+                    running[pool.submit(evaluate, self.by_name[name])] = name
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    settle(future.result())
+
+        return [results[stage.name] for stage in stages]
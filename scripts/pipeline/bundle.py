@@ -0,0 +1,316 @@
+"""
+星データの列指向バイナリバンドル（stars.bin）の書き出し・読み込み
+
+クライアントが fetch した ArrayBuffer をそのまま TypedArray として参照できるよう、
+列ごとにリトルエンディアンの連続領域として格納する。
+
+ファイル構成:
+  [0:4]   マジック "STRB"
+  [4:8]   ヘッダ長（uint32 LE）
+  [8:...] JSON ヘッダ（UTF-8、8バイト境界まで空白で埋める）
+  以降    各列のデータ（8バイト境界に揃える）
+
+ヘッダ例:
+  {
+    "version": 1,
+    "count": 102372,
+    "columns": [
+      {"name": "ra", "dtype": "float32", "offset": 512, "length": 102372},
+      {"name": "name", "dtype": "int32", "offset": ..., "length": 102372, "strings": "names"}
+    ],
+    "strings": {
+      "names": {"offsets": {"dtype": "uint32", "offset": ..., "length": 3001},
+                "data": {"offset": ..., "byteLength": 41234}}
+    }
+  }
+
+欠損値: 浮動小数点は NaN、整数は -1（符号なし整数は最大値）、文字列は索引 -1。
+文字列列は重複を除いた文字列表への int32 索引として格納し、文字列表は
+UTF-8 を連結したバイト列と uint32 の開始位置配列（件数 + 1）で表す。
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+MAGIC = b"STRB"
+VERSION = 1
+ALIGNMENT = 8
+NULL_INT = -1
+
+
+def null_value(dtype: str) -> object:
+    kind = np.dtype(dtype).kind
+    if kind == "f":
+        return np.nan
+    if kind == "u":
+        return np.iinfo(dtype).max
+    return NULL_INT
+
+# stars.json のフィールド → バンドル内の型
+STAR_COLUMNS: dict[str, str] = {
+    "id": "int32",
+    "hd": "int32",
+    "hr": "int32",
+    "ra": "float32",
+    "dec": "float32",
+    "vmag": "float32",
+    "bv": "float32",
+    "parallax": "float32",
+    "pmRA": "float32",
+    "pmDE": "float32",
+    "x": "float32",
+    "y": "float32",
+    "z": "float32",
+    "colorIndex": "uint8",
+}
+# 文字列列 → 文字列表の名前
+STAR_STRING_COLUMNS: dict[str, str] = {
+    "name": "names",
+    "spectralType": "spectralTypes",
+    "constellation": "constellations",
+    "properName": "properNames",
+}
+
+
+def columns_from_records(
+    records: Sequence[Mapping[str, object]],
+    numeric: Mapping[str, str] = STAR_COLUMNS,
+    strings: Iterable[str] = STAR_STRING_COLUMNS,
+) -> dict[str, object]:
+    """辞書のリスト（stars.json 形式）から列ごとの配列を作る"""
+    columns: dict[str, object] = {}
+    for name, dtype in numeric.items():
+        null = null_value(dtype)
+        values = [record.get(name) for record in records]
+        columns[name] = np.array([null if v is None else v for v in values], dtype=dtype)
+    for name in strings:
+        columns[name] = [record.get(name) for record in records]
+    return columns
+
+
+def take_columns(columns: Mapping[str, object], indices: np.ndarray) -> dict[str, object]:
+    """列データから指定行だけを取り出す（文字列列はリストのまま扱う）"""
+    taken: dict[str, object] = {}
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            taken[name] = values[indices]
+        else:
+            taken[name] = [values[i] for i in indices]  # type: ignore[index]
+    return taken
+
+
+class StringTable:
+    """文字列列の重複を除いた文字列表（追記に対応）"""
+
+    def __init__(self) -> None:
+        self.lookup: dict[str, int] = {}
+        self.encoded: list[bytes] = []
+
+    def indices(self, values: Sequence[Optional[str]]) -> np.ndarray:
+        indices = np.full(len(values), NULL_INT, dtype="<i4")
+        for row, value in enumerate(values):
+            if value is None:
+                continue
+            idx = self.lookup.get(value)
+            if idx is None:
+                idx = self.lookup[value] = len(self.encoded)
+                self.encoded.append(value.encode("utf-8"))
+            indices[row] = idx
+        return indices
+
+    def offsets(self) -> np.ndarray:
+        offsets = np.zeros(len(self.encoded) + 1, dtype="<u4")
+        if self.encoded:
+            np.cumsum([len(item) for item in self.encoded], out=offsets[1:])
+        return offsets
+
+    def data(self) -> bytes:
+        return b"".join(self.encoded)
+
+
+def build_string_table(values: Sequence[Optional[str]]) -> tuple[np.ndarray, np.ndarray, bytes]:
+    """文字列列を (索引, 開始位置, UTF-8 連結バイト列) に変換する"""
+    table = StringTable()
+    indices = table.indices(values)
+    return indices, table.offsets(), table.data()
+
+
+def _pad(size: int) -> int:
+    return (-size) % ALIGNMENT
+
+
+class _SpilledColumn:
+    """列データを一時ファイルに追記していく（メモリには 1 回分の追記量しか載せない）"""
+
+    def __init__(self, dtype: np.dtype) -> None:
+        self.dtype = dtype
+        self.length = 0
+        self.file = tempfile.TemporaryFile()
+
+    def append(self, array: np.ndarray) -> None:
+        self.file.write(np.ascontiguousarray(array, dtype=self.dtype).tobytes())
+        self.length += len(array)
+
+    @property
+    def nbytes(self) -> int:
+        return self.length * self.dtype.itemsize
+
+
+class BundleWriter:
+    """
+    列データを少しずつ追記してバンドルを書き出す
+
+    数値列と文字列列の索引は一時ファイルに退避し、close() でヘッダを決めてから連結する。
+    メモリに残るのは文字列表（重複を除いた文字列）だけなので、星数が数百万件でも
+    追記 1 回分のデータ量で書き出せる。列の構成と型は最初の append で決まる。
+    equal_lengths=False ではビット列のように件数の異なる列を許す（ヘッダの count は先頭の列の件数）。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        string_tables: Mapping[str, str] = STAR_STRING_COLUMNS,
+        equal_lengths: bool = True,
+    ) -> None:
+        self.path = path
+        self.string_tables = string_tables
+        self.equal_lengths = equal_lengths
+        self.columns: dict[str, _SpilledColumn] = {}
+        self.tables: dict[str, StringTable] = {}
+
+    def append(self, columns: Mapping[str, object]) -> None:
+        if self.columns and list(columns) != list(self.columns):
+            raise ValueError(f"列の構成が一致しません: {list(columns)} != {list(self.columns)}")
+
+        lengths = set()
+        for name, values in columns.items():
+            if name in self.string_tables:
+                table = self.tables.setdefault(name, StringTable())
+                array = table.indices(values)  # type: ignore[arg-type]
+            else:
+                array = np.asarray(values)
+                array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+            if name not in self.columns:
+                self.columns[name] = _SpilledColumn(array.dtype)
+            self.columns[name].append(array)
+            lengths.add(self.columns[name].length)
+        if self.equal_lengths and len(lengths) > 1:
+            raise ValueError(f"列の件数が一致しません: {sorted(lengths)}")
+
+    def close(self) -> int:
+        """バンドルを書き出し、書き出したバイト数を返す"""
+        blocks: list[tuple[dict, object, int]] = []
+        column_specs: list[dict] = []
+        table_specs: dict[str, dict] = {}
+        count: Optional[int] = None
+
+        for name, column in self.columns.items():
+            if name in self.string_tables:
+                table = self.string_tables[name]
+                offsets = self.tables[name].offsets().tobytes()
+                data = self.tables[name].data()
+                offsets_spec = {"dtype": "uint32", "length": len(offsets) // 4}
+                data_spec = {"byteLength": len(data)}
+                table_specs[table] = {"offsets": offsets_spec, "data": data_spec}
+                blocks.append((offsets_spec, offsets, len(offsets)))
+                blocks.append((data_spec, data, len(data)))
+                spec = {"name": name, "dtype": "int32", "length": column.length, "strings": table}
+            else:
+                spec = {"name": name, "dtype": column.dtype.name, "length": column.length}
+            count = column.length if count is None else count
+            column_specs.append(spec)
+            blocks.append((spec, column.file, column.nbytes))
+
+        header = {"version": VERSION, "count": count or 0, "columns": column_specs, "strings": table_specs}
+
+        # オフセットはヘッダ長に依存するため、長さが収束するまで再計算する
+        header_bytes = b""
+        while True:
+            position = 8 + len(header_bytes) + _pad(8 + len(header_bytes))
+            for spec, _, size in blocks:
+                spec["offset"] = position
+                position += size + _pad(size)
+            encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            stable = len(encoded) == len(header_bytes)
+            header_bytes = encoded
+            if stable:
+                break
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b" " * _pad(8 + len(header_bytes)))
+            for _, payload, size in blocks:
+                if isinstance(payload, bytes):
+                    f.write(payload)
+                else:
+                    payload.seek(0)  # type: ignore[attr-defined]
+                    shutil.copyfileobj(payload, f)  # type: ignore[arg-type]
+                f.write(b"\0" * _pad(size))
+            written = f.tell()
+
+        self.abort()
+        return written
+
+    def abort(self) -> None:
+        """退避用の一時ファイルを閉じる（削除される）"""
+        for column in self.columns.values():
+            column.file.close()
+
+
+def write_bundle(
+    path: Path,
+    columns: Mapping[str, object],
+    string_tables: Mapping[str, str] = STAR_STRING_COLUMNS,
+    equal_lengths: bool = True,
+) -> int:
+    """
+    列データをバンドルとして書き出し、書き出したバイト数を返す
+
+    columns の値は NumPy 配列（数値列）または文字列/None のシーケンス（文字列列）。
+    文字列列は string_tables で文字列表名に対応付ける。
+    """
+    writer = BundleWriter(path, string_tables, equal_lengths)
+    writer.append(columns)
+    return writer.close()
+
+
+def read_bundle(path: Path, decode_strings: bool = True) -> tuple[dict, dict[str, object]]:
+    """
+    バンドルを読み込み (ヘッダ, 列) を返す。文字列列は str/None のリストに復元する
+
+    decode_strings=False の場合、文字列列は文字列表への int32 索引（欠損は -1）のまま返す。
+    """
+    raw = path.read_bytes()
+    if raw[:4] != MAGIC:
+        raise ValueError(f"星データバンドルではありません: {path}")
+    (header_length,) = struct.unpack_from("<I", raw, 4)
+    header = json.loads(raw[8 : 8 + header_length].decode("utf-8"))
+
+    tables: dict[str, list[str]] = {}
+    for table, spec in header["strings"].items():
+        offsets = np.frombuffer(raw, dtype="<u4", count=spec["offsets"]["length"], offset=spec["offsets"]["offset"])
+        start = spec["data"]["offset"]
+        data = raw[start : start + spec["data"]["byteLength"]]
+        tables[table] = [data[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+    columns: dict[str, object] = {}
+    for spec in header["columns"]:
+        dtype = np.dtype(spec["dtype"]).newbyteorder("<")
+        array = np.frombuffer(raw, dtype=dtype, count=spec["length"], offset=spec["offset"])
+        if "strings" in spec and decode_strings:
+            table = tables[spec["strings"]]
+            columns[spec["name"]] = [table[i] if i >= 0 else None for i in array]
+        else:
+            columns[spec["name"]] = array
+    return header, columns
@@ -0,0 +1,237 @@
+"""
+CDS 形式の ReadMe（Byte-by-byte Description）に基づく固定長カタログ読み込み
+
+data/raw/ReadMe のバイト位置定義を解析し、hip_main.dat などの固定長レコードを
+NumPy の型付き列へ一括で変換する。行ごとのループは使わず、レコード全体を
+(行数, レコード長) の uint8 行列として読み込み、列ごとにスライスして変換する。
+
+使用例:
+  fields = parse_readme(RAW_DIR / "ReadMe")
+  table = read_catalog(RAW_DIR / "hip_main.dat", fields["hip_main.dat"])
+  table["Vmag"]  # float64 (欠損は NaN)
+"""
+
+from __future__ import annotations
+
+import gzip
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+HEADER_RE = re.compile(r"^Byte-by-byte Description of files?:\s*(.+)$")
+SEPARATOR_RE = re.compile(r"^-{20,}\s*$")
+# 例: " 52- 63  F12.8 deg     RAdeg    *? alpha, degrees ..."
+FIELD_RE = re.compile(
+    r"^\s*(?P<start>\d+)(?:\s*-\s*(?P<end>\d+))?\s+"
+    r"(?P<format>[AIFE])(?P<width>\d+)(?:\.(?P<decimals>\d+))?\s+"
+    r"(?P<unit>\S+)\s+(?P<label>\S+)\s*(?P<explanation>.*)$"
+)
+# 説明文先頭の "?" / "*?" / "[1,3]?" / "*[CDMPRU]?" は欠損可を意味する
+NULLABLE_RE = re.compile(r"^\*?(?:\[[^\]]*\])?\*?\?")
+
+
+@dataclass(frozen=True)
+class CdsField:
+    """Byte-by-byte Description の1行分（バイト位置は 0-based・終端排他）"""
+
+    label: str
+    start: int
+    end: int
+    format: str
+    unit: str
+    nullable: bool
+    explanation: str
+
+    @property
+    def width(self) -> int:
+        return self.end - self.start
+
+    @property
+    def dtype(self) -> np.dtype:
+        if self.format == "I":
+            return np.dtype(np.int32 if self.width <= 9 else np.int64)
+        if self.format in ("F", "E"):
+            return np.dtype(np.float64)
+        return np.dtype(f"U{self.width}")
+
+
+@dataclass
+class CdsTable:
+    """
+    固定長ファイルを列指向で保持する
+
+    I 形式の欠損は 0 で埋めて `masks` に True を立てる。
+    F/E 形式の欠損は NaN、A 形式の欠損は空文字列になる。
+    """
+
+    columns: dict[str, np.ndarray]
+    masks: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, label: str) -> np.ndarray:
+        return self.columns[label]
+
+    def __contains__(self, label: object) -> bool:
+        return label in self.columns
+
+    def to_dataframe(self):
+        """pandas.DataFrame に変換する（I 形式の欠損は nullable Int 型で表現）"""
+        import pandas as pd
+
+        data = {}
+        for label, values in self.columns.items():
+            mask = self.masks.get(label)
+            if mask is not None:
+                data[label] = pd.arrays.IntegerArray(values, mask)
+            else:
+                data[label] = values
+        return pd.DataFrame(data)
+
+
+def parse_readme(path: Path) -> dict[str, list[CdsField]]:
+    """ReadMe からファイル名ごとのフィールド定義を取得する"""
+    if not path.exists():
+        raise FileNotFoundError(f"ReadMe が存在しません: {path}")
+
+    lines = path.read_text(encoding="latin-1").splitlines()
+    layouts: dict[str, list[CdsField]] = {}
+
+    idx = 0
+    while idx < len(lines):
+        header = HEADER_RE.match(lines[idx].strip())
+        idx += 1
+        if not header:
+            continue
+
+        filenames = [name for name in re.split(r"[\s,]+", header.group(1)) if name]
+
+        # 罫線3本（見出しの上下と表の終端）で囲まれた範囲がフィールド定義
+        separators = 0
+        fields: list[CdsField] = []
+        while idx < len(lines) and separators < 3:
+            line = lines[idx]
+            idx += 1
+            if SEPARATOR_RE.match(line):
+                separators += 1
+                continue
+            if separators == 2:
+                parsed = _parse_field_line(line)
+                if parsed is not None:
+                    fields.append(parsed)
+
+        fields = _dedupe_labels(fields)
+        for filename in filenames:
+            layouts[filename] = fields
+
+    return layouts
+
+
+def _parse_field_line(line: str) -> Optional[CdsField]:
+    match = FIELD_RE.match(line)
+    if not match:
+        # 説明文の折り返し行
+        return None
+
+    start = int(match.group("start"))
+    end = int(match.group("end") or start)
+    explanation = match.group("explanation").strip()
+    return CdsField(
+        label=match.group("label"),
+        start=start - 1,
+        end=end,
+        format=match.group("format"),
+        unit=match.group("unit"),
+        nullable=bool(NULLABLE_RE.match(explanation)),
+        explanation=explanation,
+    )
+
+
+def _dedupe_labels(fields: list[CdsField]) -> list[CdsField]:
+    """ラベル無し（---）や重複ラベルは開始バイト位置付きの名前に置き換える"""
+    seen: set[str] = set()
+    result = []
+    for f in fields:
+        label = f.label
+        if label == "---" or label in seen:
+            label = f"{label.strip('-') or 'col'}_{f.start + 1}"
+        seen.add(label)
+        result.append(CdsField(label, f.start, f.end, f.format, f.unit, f.nullable, f.explanation))
+    return result
+
+
+def read_records(path: Path, record_length: Optional[int] = None) -> np.ndarray:
+    """
+    固定長ファイルを (行数, レコード長) の uint8 行列として読み込む
+
+    .gz は自動で展開する。行末の空白が削られたファイルは空白で埋め直す。
+    """
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        raw = f.read()
+
+    if raw.startswith(b"version https://git-lfs"):
+        raise RuntimeError(f"Git LFS のポインタファイルです。`git lfs pull` で実体を取得してください: {path}")
+
+    buffer = np.frombuffer(raw, dtype=np.uint8)
+    lines = raw.splitlines()
+    width = max(max((len(line) for line in lines), default=0), record_length or 0)
+
+    if len(buffer) == len(lines) * (width + 1) and all(len(line) == width for line in lines):
+        # 全行同一長・LF区切り: コピー無しで2次元に並べ替える
+        return buffer.reshape(len(lines), width + 1)[:, :width]
+
+    matrix = np.full((len(lines), width), ord(" "), dtype=np.uint8)
+    for row, line in enumerate(lines):
+        matrix[row, : len(line)] = np.frombuffer(line, dtype=np.uint8)
+    return matrix
+
+
+def read_catalog(
+    path: Path,
+    fields: list[CdsField],
+    columns: Optional[Iterable[str]] = None,
+) -> CdsTable:
+    """ReadMe のフィールド定義に従って固定長ファイルを列ごとに変換する"""
+    selected = fields
+    if columns is not None:
+        wanted = list(columns)
+        by_label = {f.label: f for f in fields}
+        missing = [label for label in wanted if label not in by_label]
+        if missing:
+            raise KeyError(f"ReadMe に存在しない列です: {missing}")
+        selected = [by_label[label] for label in wanted]
+
+    record_length = max((f.end for f in fields), default=0)
+    records = read_records(path, record_length)
+
+    table = CdsTable(columns={})
+    for f in selected:
+        values, mask = decode_field(records, f)
+        table.columns[f.label] = values
+        if mask is not None:
+            table.masks[f.label] = mask
+    return table
+
+
+def decode_field(records: np.ndarray, f: CdsField) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """1列分のバイト列を型付き配列に変換する（I 形式のみ欠損マスクを返す）"""
+    raw = np.ascontiguousarray(records[:, f.start : f.end]).view(f"S{f.width}").ravel()
+    stripped = np.char.strip(raw)
+    blank = stripped == b""
+
+    if f.format == "A":
+        return stripped.astype(f.dtype), None
+
+    if f.format == "I":
+        values = np.where(blank, b"0", stripped).astype(f.dtype)
+        return values, (blank if blank.any() else None)
+
+    values = np.where(blank, b"nan", stripped).astype(np.float64)
+    return values, None
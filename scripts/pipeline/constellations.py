@@ -0,0 +1,295 @@
+"""
+IAU 星座境界による星座判定（B1875 への歳差 + 境界多角形 + 事前計算した参照格子）
+
+IAU の星座境界は B1875.0 分点の赤経一定線・赤緯一定線だけでできている。
+そこで境界頂点に現れる赤経・赤緯の値で天球を長方形のセルに区切り、
+各セルの中心を一度だけ境界多角形に対して判定しておけば（点の多角形内外判定）、
+以降の星は座標を B1875 に歳差させて searchsorted で 2 回二分探索するだけで決まる。
+
+境界データは VizieR VI/49（Davenhall & Leggett 1989）の constbnd 表
+（B1875 の RAhr / DEdeg / cst、星座ごとに頂点が境界順に並ぶ）を使う。
+天の極を含む星座（UMi, Oct）の境界は赤経方向に一周する。南向きの交差数で判定するため、
+南極を含む Oct だけ内外を反転させる。
+
+使用例:
+  grid = load_grid()                      # data/generated/constellation-grid.npz
+  codes = assign_constellations(ra, dec, grid)   # J2000 の赤経・赤緯（度）→ "Ori" 等
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pipeline.paths import GENERATED_DIR, PUBLIC_DATA_DIR
+from pipeline.sphere import radec_to_unit, unit_to_radec
+
+BOUNDARY_CATALOG = "VI/49/constbnd"
+GRID_PATH = GENERATED_DIR / "constellation-grid.npz"
+CONSTELLATIONS_PATH = PUBLIC_DATA_DIR / "constellations.json"
+
+J2000_JD = 2451545.0
+B1875_JD = 2405889.258550475
+ARCSEC = np.pi / (180.0 * 3600.0)
+# 境界頂点の赤経（F8.5 時）・赤緯（F11.7 度）の丸め誤差を吸収する幅（度）
+EDGE_TOLERANCE = 5e-4
+NO_CONSTELLATION = -1
+
+RA_COLUMNS = ("RAhr", "RAB1875", "_RA.B1875")
+DEC_COLUMNS = ("DEdeg", "DEB1875", "_DE.B1875")
+CODE_COLUMNS = ("cst", "Const", "const")
+
+
+def precession_matrix(jd_to: float, jd_from: float = J2000_JD) -> np.ndarray:
+    """
+    IAU 1976（Lieske 1977）の歳差行列。jd_from 分点の方向余弦に左から掛けると jd_to 分点になる
+    """
+    big_t = (jd_from - J2000_JD) / 36525.0
+    t = (jd_to - jd_from) / 36525.0
+    zeta = ((2306.2181 + 1.39656 * big_t - 0.000139 * big_t**2) * t
+            + (0.30188 - 0.000344 * big_t) * t**2 + 0.017998 * t**3) * ARCSEC
+    z = ((2306.2181 + 1.39656 * big_t - 0.000139 * big_t**2) * t
+         + (1.09468 + 0.000066 * big_t) * t**2 + 0.018203 * t**3) * ARCSEC
+    theta = ((2004.3109 - 0.85330 * big_t - 0.000217 * big_t**2) * t
+             - (0.42665 + 0.000217 * big_t) * t**2 - 0.041833 * t**3) * ARCSEC
+
+    cz, sz = np.cos(zeta), np.sin(zeta)
+    cZ, sZ = np.cos(z), np.sin(z)
+    ct, st = np.cos(theta), np.sin(theta)
+    return np.array([
+        [cz * ct * cZ - sz * sZ, -sz * ct * cZ - cz * sZ, -st * cZ],
+        [cz * ct * sZ + sz * cZ, -sz * ct * sZ + cz * cZ, -st * sZ],
+        [cz * st, -sz * st, ct],
+    ])
+
+
+def precess_radec(ra: np.ndarray, dec: np.ndarray, jd_to: float, jd_from: float = J2000_JD) -> tuple[np.ndarray, np.ndarray]:
+    vectors = radec_to_unit(ra, dec) @ precession_matrix(jd_to, jd_from).T
+    return unit_to_radec(vectors)
+
+
+def constellation_codes(path: Path = CONSTELLATIONS_PATH) -> list[str]:
+    """public/data/constellations.json の星座略号（IAU 表記、88 個）"""
+    with path.open("r", encoding="utf-8") as f:
+        return [entry["id"] for entry in json.load(f)]
+
+
+def _pick_column(frame: pd.DataFrame, candidates: Sequence[str]) -> str:
+    for name in candidates:
+        if name in frame.columns:
+            return name
+    raise KeyError(f"境界データに必要な列がありません（候補: {', '.join(candidates)}、実際: {', '.join(map(str, frame.columns))}）")
+
+
+@dataclass(frozen=True)
+class BoundaryPolygon:
+    """
+    1 星座分の境界（B1875、赤経 [0, 360) 度・赤緯 度、最後の頂点は最初の頂点へ戻る）
+
+    pole は境界が赤経方向に一周して天の極を含む場合の極（+1: 北極, -1: 南極, 0: 含まない）。
+    """
+
+    code: str
+    ra: np.ndarray
+    dec: np.ndarray
+    pole: int = 0
+
+
+def _wrap(delta: np.ndarray) -> np.ndarray:
+    """赤経差を (-180, 180] 度に収める"""
+    return 180.0 - (180.0 - delta) % 360.0
+
+
+def make_polygon(code: str, ra_hours: np.ndarray, dec: np.ndarray) -> BoundaryPolygon:
+    ra = np.mod(ra_hours * 15.0, 360.0)
+    if ra.size > 1 and np.isclose(_wrap(ra[0] - ra[-1]), 0.0) and np.isclose(dec[0], dec[-1]):
+        ra, dec = ra[:-1], dec[:-1]
+    winding = _wrap(np.roll(ra, -1) - ra).sum()
+    pole = 0
+    if abs(winding) > 180.0:
+        pole = 1 if dec.mean() > 0 else -1
+    return BoundaryPolygon(code, ra, dec, pole)
+
+
+def boundaries_from_frame(frame: pd.DataFrame, codes: Optional[Sequence[str]] = None) -> list[BoundaryPolygon]:
+    """
+    constbnd 表を星座ごとの多角形に分ける
+
+    星座略号は大文字（"UMA"）や SER1 / SER2 で入っているため、IAU 表記（"UMa", "Ser"）へ直す。
+    同じ略号の頂点が連続する範囲を 1 つの多角形として扱う。
+    """
+    ra_col = _pick_column(frame, RA_COLUMNS)
+    dec_col = _pick_column(frame, DEC_COLUMNS)
+    code_col = _pick_column(frame, CODE_COLUMNS)
+
+    by_upper = {code.upper(): code for code in (codes or constellation_codes())}
+    raw_codes = frame[code_col].astype(str).str.strip().str.upper().to_numpy()
+    ra_hours = pd.to_numeric(frame[ra_col], errors="coerce").to_numpy(dtype="float64")
+    dec = pd.to_numeric(frame[dec_col], errors="coerce").to_numpy(dtype="float64")
+
+    starts = np.flatnonzero(np.r_[True, raw_codes[1:] != raw_codes[:-1]])
+    ends = np.r_[starts[1:], raw_codes.size]
+    polygons = []
+    for start, end in zip(starts, ends):
+        raw = raw_codes[start]
+        code = by_upper.get(raw) or by_upper.get(raw.rstrip("0123456789"))
+        if code is None:
+            raise ValueError(f"未知の星座略号です: {raw!r}")
+        valid = np.isfinite(ra_hours[start:end]) & np.isfinite(dec[start:end])
+        polygons.append(make_polygon(code, ra_hours[start:end][valid], dec[start:end][valid]))
+    return polygons
+
+
+def _edges(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """境界値を昇順に並べ、近すぎる値をまとめ、両端を加える"""
+    values = np.sort(np.concatenate([values[(values > low) & (values < high)], [low, high]]))
+    keep = np.r_[True, np.diff(values) > EDGE_TOLERANCE]
+    values = values[keep]
+    values[-1] = high
+    return values
+
+
+def points_in_polygon(ra: np.ndarray, dec: np.ndarray, polygon: BoundaryPolygon, chunk: int = 4096) -> np.ndarray:
+    """
+    点から天の南極へ向かう子午線と境界辺の交差数の偶奇で内外判定する（赤経 0 度をまたぐ辺も可）
+
+    南極を含む境界（Oct）では偶奇が反転する。
+    """
+    ra1, dec1 = polygon.ra, polygon.dec
+    span = _wrap(np.roll(ra1, -1) - ra1)
+    ra2, dec2 = ra1 + span, np.roll(dec1, -1)
+    # 赤経が増える向きにそろえ、赤経一定の辺（交差しない）は除く
+    forward = span > 0
+    start_ra = np.where(forward, ra1, ra2) % 360.0
+    start_dec = np.where(forward, dec1, dec2)
+    end_dec = np.where(forward, dec2, dec1)
+    width = np.abs(span)
+    keep = width > 0
+    start_ra, start_dec, end_dec, width = start_ra[keep], start_dec[keep], end_dec[keep], width[keep]
+    slope = (end_dec - start_dec) / width
+
+    inside = np.zeros(ra.shape, dtype=bool)
+    for begin in range(0, ra.size, chunk):
+        x = ra[begin:begin + chunk, None]
+        offset = (x - start_ra) % 360.0
+        crossing_dec = start_dec + offset * slope
+        crossed = (offset < width) & (crossing_dec < dec[begin:begin + chunk, None])
+        inside[begin:begin + chunk] = np.count_nonzero(crossed, axis=1) % 2 == 1
+    return inside ^ (polygon.pole < 0)
+
+
+def _candidate_cells(cell_ra: np.ndarray, cell_dec: np.ndarray, polygon: BoundaryPolygon) -> np.ndarray:
+    """外接範囲で判定対象のセルを絞る"""
+    if polygon.pole > 0:
+        return np.flatnonzero(cell_dec >= polygon.dec.min())
+    if polygon.pole < 0:
+        return np.flatnonzero(cell_dec <= polygon.dec.max())
+    unwrapped = np.degrees(np.unwrap(np.radians(polygon.ra)))
+    low, high = unwrapped.min(), unwrapped.max()
+    in_ra = (cell_ra - low) % 360.0 <= high - low
+    in_dec = (cell_dec >= polygon.dec.min()) & (cell_dec <= polygon.dec.max())
+    return np.flatnonzero(in_ra & in_dec)
+
+
+@dataclass
+class ConstellationGrid:
+    """
+    B1875 の赤経・赤緯の境界値で区切ったセルごとの星座番号
+
+    labels[j, i] は dec_edges[j]〜dec_edges[j+1]、ra_edges[i]〜ra_edges[i+1]（度）のセルの
+    codes への索引（どの多角形にも入らない場合は NO_CONSTELLATION）。
+    """
+
+    ra_edges: np.ndarray
+    dec_edges: np.ndarray
+    labels: np.ndarray
+    codes: list[str]
+
+    @classmethod
+    def from_polygons(cls, polygons: Sequence[BoundaryPolygon], codes: Optional[Sequence[str]] = None) -> "ConstellationGrid":
+        codes = list(codes or sorted({polygon.code for polygon in polygons}))
+        index = {code: i for i, code in enumerate(codes)}
+        ra_edges = _edges(np.concatenate([polygon.ra % 360.0 for polygon in polygons]), 0.0, 360.0)
+        dec_edges = _edges(np.concatenate([polygon.dec for polygon in polygons]), -90.0, 90.0)
+
+        ra_mid = (ra_edges[:-1] + ra_edges[1:]) / 2
+        dec_mid = (dec_edges[:-1] + dec_edges[1:]) / 2
+        cell_ra, cell_dec = (grid.ravel() for grid in np.meshgrid(ra_mid, dec_mid))
+        labels = np.full(cell_ra.size, NO_CONSTELLATION, dtype=np.int16)
+        hits = np.zeros(cell_ra.size, dtype=np.int16)
+        for polygon in polygons:
+            idx = _candidate_cells(cell_ra, cell_dec, polygon)
+            inside = idx[points_in_polygon(cell_ra[idx], cell_dec[idx], polygon)]
+            labels[inside] = index[polygon.code]
+            hits[inside] += 1
+
+        overlaps = int(np.count_nonzero(hits > 1))
+        if overlaps:
+            raise ValueError(f"複数の星座に含まれるセルがあります（{overlaps} セル）。境界データを確認してください")
+        return cls(ra_edges, dec_edges, labels.reshape(dec_mid.size, ra_mid.size), codes)
+
+    @property
+    def unassigned_cells(self) -> int:
+        return int(np.count_nonzero(self.labels == NO_CONSTELLATION))
+
+    def lookup(self, ra_b1875: np.ndarray, dec_b1875: np.ndarray) -> np.ndarray:
+        """B1875 の赤経・赤緯（度）→ codes への索引"""
+        i = np.searchsorted(self.ra_edges, np.mod(ra_b1875, 360.0), side="right") - 1
+        j = np.searchsorted(self.dec_edges, dec_b1875, side="right") - 1
+        i = np.clip(i, 0, self.labels.shape[1] - 1)
+        j = np.clip(j, 0, self.labels.shape[0] - 1)
+        return self.labels[j, i]
+
+    def save(self, path: Path = GRID_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path, ra_edges=self.ra_edges, dec_edges=self.dec_edges,
+            labels=self.labels, codes=np.array(self.codes),
+        )
+
+    @classmethod
+    def load(cls, path: Path = GRID_PATH) -> "ConstellationGrid":
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(arrays["ra_edges"], arrays["dec_edges"], arrays["labels"], [str(c) for c in arrays["codes"]])
+
+
+def fetch_boundaries() -> list[BoundaryPolygon]:
+    """VizieR から境界データを取得する（pipeline/vizier_cache 経由）"""
+    from pipeline.vizier_cache import query_catalog
+
+    frame = query_catalog(BOUNDARY_CATALOG)
+    if frame.empty:
+        raise RuntimeError(f"星座境界データを取得できませんでした: {BOUNDARY_CATALOG}")
+    return boundaries_from_frame(frame)
+
+
+def load_grid(path: Path = GRID_PATH) -> ConstellationGrid:
+    """保存済みの参照格子を読み込む。無ければ境界データから作って保存する"""
+    if path.exists():
+        return ConstellationGrid.load(path)
+    grid = ConstellationGrid.from_polygons(fetch_boundaries(), constellation_codes())
+    grid.save(path)
+    return grid
+
+
+def assign_constellation_index(ra: np.ndarray, dec: np.ndarray, grid: ConstellationGrid) -> np.ndarray:
+    """J2000（ICRS）の赤経・赤緯（度）→ grid.codes への索引（座標欠損は NO_CONSTELLATION）"""
+    ra = np.asarray(ra, dtype="float64")
+    dec = np.asarray(dec, dtype="float64")
+    result = np.full(ra.shape, NO_CONSTELLATION, dtype=np.int16)
+    valid = np.isfinite(ra) & np.isfinite(dec)
+    ra_b, dec_b = precess_radec(ra[valid], dec[valid], B1875_JD)
+    result[valid] = grid.lookup(ra_b, dec_b)
+    return result
+
+
+def assign_constellations(ra: np.ndarray, dec: np.ndarray, grid: ConstellationGrid) -> np.ndarray:
+    """J2000（ICRS）の赤経・赤緯（度）→ 星座略号の配列（判定できない場合は None）"""
+    index = assign_constellation_index(ra, dec, grid)
+    codes = np.array([*grid.codes, None], dtype=object)
+    return codes[index]
@@ -0,0 +1,113 @@
+"""
+星カタログ DataFrame → アプリ用 JSON の列演算による変換
+
+各スクリプトで df.iterrows() を使って1行ずつ組み立てていた処理
+（欠損処理、B-V のフォールバック、視差→距離、色分類）を列単位の演算にまとめる。
+書き出しは pipeline.jsonout で逐次行う（最小化・null 省略・.gz/.br 同時生成）。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pipeline.jsonout import WrittenFile, write_records
+from pipeline.palette import bv_class, class_colors, color_class, spectral_class
+
+
+RECORD_CHUNK_ROWS = 50_000
+
+
+def to_float(series: pd.Series) -> pd.Series:
+    """数値に変換できない値を NaN にした float64 列を返す"""
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def to_nullable_int(series: pd.Series) -> pd.Series:
+    """欠損を保ったまま整数列（pandas の Int64）に変換する"""
+    return to_float(series).round().astype("Int64")
+
+
+def to_nullable_str(series: pd.Series) -> pd.Series:
+    """前後の空白を除き、空文字列と欠損を None にした文字列列を返す"""
+    stripped = series.astype("string").str.strip()
+    valid = stripped.notna() & (stripped != "").fillna(False)
+    return stripped.astype(object).where(valid, None)
+
+
+def coalesce(frame: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    """存在する列を左から順に見て、最初の非欠損値を採用する"""
+    result = pd.Series(np.nan, index=frame.index, dtype="float64")
+    for column in columns:
+        if column in frame.columns:
+            result = result.fillna(to_float(frame[column]))
+    return result
+
+
+def first_present(frame: pd.DataFrame, candidates: Sequence[str]) -> pd.Series:
+    """候補列のうち最初に存在するものを返す（どれも無ければすべて NaN）"""
+    for column in candidates:
+        if column in frame.columns:
+            return to_float(frame[column])
+    return pd.Series(np.nan, index=frame.index, dtype="float64")
+
+
+def sexagesimal_to_degrees(series: pd.Series, hours: bool = False) -> pd.Series:
+    """
+    "HH MM SS.s" / "±DD MM SS" 形式（区切りは空白またはコロン）を度に変換する
+
+    hours=True は赤経（時）として 15 倍する。数値の列はそのまま float にする。
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return to_float(series)
+    parts = series.astype("string").str.strip().str.replace(":", " ", regex=False).str.split(r"\s+", n=2, expand=True)
+    parts = parts.reindex(columns=range(3))
+    first = parts[0]
+    negative = first.str.startswith("-").fillna(False).to_numpy()
+    degrees = to_float(first).abs() + to_float(parts[1]).fillna(0.0) / 60.0 + to_float(parts[2]).fillna(0.0) / 3600.0
+    degrees = degrees.where(~negative, -degrees)
+    return degrees * 15.0 if hours else degrees
+
+
+def parallax_to_distance(parallax_mas: pd.Series) -> pd.Series:
+    """視差（ミリ秒角）から距離（パーセク、小数1桁）を求める。0 以下は欠損"""
+    plx = to_float(parallax_mas)
+    return (1000.0 / plx.where(plx > 0)).round(1)
+
+
+def bv_to_color(bv: pd.Series) -> pd.Series:
+    """B-V 色指数から表示色を決める（欠損は白、分類は pipeline.palette）"""
+    colors = class_colors(bv_class(to_float(bv).to_numpy()))
+    return pd.Series(colors, index=bv.index, dtype=object)
+
+
+def spectral_type_to_color(spectral_type: pd.Series) -> pd.Series:
+    """スペクトル型の先頭文字から表示色を決める（不明は白）"""
+    colors = class_colors(spectral_class(spectral_type.astype(object).tolist()))
+    return pd.Series(colors, index=spectral_type.index, dtype=object)
+
+
+def star_color(bv: pd.Series, spectral_type: pd.Series) -> pd.Series:
+    """B-V があればそれを、無ければスペクトル型を使って色を決める"""
+    colors = class_colors(color_class(to_float(bv).to_numpy(), spectral_type.astype(object).tolist()))
+    return pd.Series(colors, index=bv.index, dtype=object)
+
+
+def build_frame(columns: Mapping[str, pd.Series]) -> pd.DataFrame:
+    """出力フィールド名 → 列 の対応から出力用 DataFrame を作る（順序を保持）"""
+    return pd.DataFrame(dict(columns))
+
+
+def frame_records(frame: pd.DataFrame, chunk_rows: int = RECORD_CHUNK_ROWS) -> Iterator[dict]:
+    """DataFrame を 1 行 1 辞書として順に返す（欠損は None、変換は chunk_rows 行ずつ）"""
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start : start + chunk_rows].astype(object)
+        yield from chunk.where(chunk.notna(), None).to_dict(orient="records")
+
+
+def write_records_json(frame: pd.DataFrame, path: Path | str) -> WrittenFile:
+    """DataFrame を JSON 配列（1行1オブジェクト、欠損フィールドは省略）として逐次書き出す"""
+    return write_records(Path(path), frame_records(frame))
@@ -0,0 +1,166 @@
+"""
+天球上の位置によるカタログ照合（単位ベクトルの KD 木による半径検索・最近傍検索）
+
+赤経・赤緯を単位ベクトルに変換して scipy の cKDTree に載せ、角距離を弦の長さに
+置き換えて検索する。赤経 0/360 度や天の極の近くでも特別な扱いは要らない。
+固有運動（pmRA = μα cosδ, pmDE、mas/年）があれば、照合前に相手側の元期へ位置を移せる。
+
+使用例:
+  hip = SkyIndex(hip_ra, hip_dec, pm_ra=pm_ra, pm_de=pm_de, epoch=1991.25)
+  index, sep = hip.at_epoch(2000.0).nearest(tyc_ra, tyc_dec, radius_arcsec=1.0)
+  matched = join_nearest(tycho, bsc, 5.0, left_radec=("ra", "dec"), right_radec=("ra", "dec"))
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from pipeline.propagation import propagate
+from pipeline.sphere import radec_to_unit
+
+ARCSEC_PER_RADIAN = np.degrees(1.0) * 3600.0
+NO_MATCH = -1
+
+
+def arcsec_to_chord(radius_arcsec: float) -> float:
+    """角距離（秒角）→ 単位球上の弦の長さ"""
+    return 2.0 * np.sin(radius_arcsec / ARCSEC_PER_RADIAN / 2.0)
+
+
+def chord_to_arcsec(chord: np.ndarray) -> np.ndarray:
+    return 2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0)) * ARCSEC_PER_RADIAN
+
+
+class SkyIndex:
+    """赤経・赤緯（度）の点群に対する KD 木"""
+
+    def __init__(
+        self,
+        ra: np.ndarray,
+        dec: np.ndarray,
+        *,
+        pm_ra: Optional[np.ndarray] = None,
+        pm_de: Optional[np.ndarray] = None,
+        epoch: Optional[float] = None,
+        leafsize: int = 32,
+    ) -> None:
+        self.ra = np.asarray(ra, dtype=np.float64)
+        self.dec = np.asarray(dec, dtype=np.float64)
+        self.pm_ra = None if pm_ra is None else np.asarray(pm_ra, dtype=np.float64)
+        self.pm_de = None if pm_de is None else np.asarray(pm_de, dtype=np.float64)
+        self.epoch = epoch
+        self.leafsize = leafsize
+        vectors = radec_to_unit(self.ra, self.dec)
+        # 座標欠損の点は検索半径に入らない遠方に置く
+        vectors[~np.isfinite(vectors).all(axis=1)] = 10.0
+        self.tree = cKDTree(vectors, leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+
+    def __len__(self) -> int:
+        return self.ra.size
+
+    def at_epoch(self, epoch: float) -> "SkyIndex":
+        """固有運動で epoch 年の位置に移した索引を返す（固有運動・元期が無ければ自身）"""
+        if self.epoch is None or self.pm_ra is None or self.pm_de is None or epoch == self.epoch:
+            return self
+        ra, dec = propagate(self.ra, self.dec, self.pm_ra, self.pm_de, epoch - self.epoch)
+        return SkyIndex(ra, dec, pm_ra=self.pm_ra, pm_de=self.pm_de, epoch=epoch, leafsize=self.leafsize)
+
+    def nearest(self, ra: np.ndarray, dec: np.ndarray, radius_arcsec: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        各点について半径内で最も近い点の索引と角距離（秒角）を返す
+
+        見つからない場合は索引 NO_MATCH、角距離 NaN。
+        """
+        vectors = radec_to_unit(ra, dec)
+        valid = np.isfinite(vectors).all(axis=1)
+        index = np.full(valid.size, NO_MATCH, dtype=np.int64)
+        separation = np.full(valid.size, np.nan)
+        if not valid.any() or len(self) == 0:
+            return index, separation
+
+        chord, found = self.tree.query(
+            vectors[valid], k=1, distance_upper_bound=arcsec_to_chord(radius_arcsec), workers=-1,
+        )
+        hit = np.isfinite(chord)
+        rows = np.flatnonzero(valid)[hit]
+        index[rows] = found[hit]
+        separation[rows] = chord_to_arcsec(chord[hit])
+        return index, separation
+
+    def within(self, ra: np.ndarray, dec: np.ndarray, radius_arcsec: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        半径内のすべての組を (問い合わせ側の索引, 索引側の索引, 角距離[秒角]) で返す
+
+        問い合わせ側の索引順、同じ点の中では角距離の昇順に並ぶ。
+        """
+        vectors = radec_to_unit(ra, dec)
+        vectors[~np.isfinite(vectors).all(axis=1)] = -10.0
+        other = cKDTree(vectors, leafsize=self.leafsize, balanced_tree=False, compact_nodes=False)
+        pairs = other.sparse_distance_matrix(self.tree, arcsec_to_chord(radius_arcsec), output_type="ndarray")
+        query_index = pairs["i"].astype(np.int64)
+        catalog_index = pairs["j"].astype(np.int64)
+        separation = chord_to_arcsec(pairs["v"])
+        order = np.lexsort((separation, query_index))
+        return query_index[order], catalog_index[order], separation[order]
+
+
+def cross_match(
+    left: SkyIndex,
+    right: SkyIndex,
+    radius_arcsec: float,
+    *,
+    epoch: Optional[float] = None,
+    mutual: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    left の各点に対する right の最近傍を返す（一致した組のみ: left 索引, right 索引, 角距離）
+
+    epoch を指定すると両方をその元期へ移してから照合する。
+    mutual=True では互いに最近傍である組だけを残す（1 対 1 の対応）。
+    """
+    if epoch is not None:
+        left, right = left.at_epoch(epoch), right.at_epoch(epoch)
+    found, separation = right.nearest(left.ra, left.dec, radius_arcsec)
+    matched = np.flatnonzero(found != NO_MATCH)
+    left_index, right_index, separation = matched, found[matched], separation[matched]
+
+    if mutual and left_index.size:
+        back, _ = left.nearest(right.ra[right_index], right.dec[right_index], radius_arcsec)
+        keep = back == left_index
+        left_index, right_index, separation = left_index[keep], right_index[keep], separation[keep]
+    return left_index, right_index, separation
+
+
+def join_nearest(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    radius_arcsec: float,
+    *,
+    left_radec: Sequence[str] = ("ra", "dec"),
+    right_radec: Sequence[str] = ("ra", "dec"),
+    suffixes: Sequence[str] = ("", "_match"),
+    mutual: bool = False,
+    separation_column: str = "separation",
+) -> pd.DataFrame:
+    """
+    left の各行に、半径内で最も近い right の行を横に並べる（位置による左外部結合）
+
+    一致しなかった行の right 側の列は欠損、角距離（秒角）は separation_column に入る。
+    """
+    left_index = SkyIndex(left[left_radec[0]].to_numpy(dtype=float), left[left_radec[1]].to_numpy(dtype=float))
+    right_index = SkyIndex(right[right_radec[0]].to_numpy(dtype=float), right[right_radec[1]].to_numpy(dtype=float))
+    rows, found, separation = cross_match(left_index, right_index, radius_arcsec, mutual=mutual)
+
+    matched = right.iloc[found].reset_index(drop=True)
+    overlap = set(matched.columns) & set(left.columns)
+    matched = matched.rename(columns={c: f"{c}{suffixes[1]}" for c in overlap})
+    matched.index = left.index[rows]
+
+    result = left.rename(columns={c: f"{c}{suffixes[0]}" for c in overlap}) if suffixes[0] else left.copy()
+    result = result.join(matched, how="left")
+    result[separation_column] = pd.Series(separation, index=left.index[rows])
+    return result
@@ -0,0 +1,84 @@
+"""
+HEALPix（NESTED 方式）の画素番号計算
+
+healpy に依存せず NumPy だけで赤経・赤緯から画素番号を一括計算する。
+アルゴリズムは Górski et al. (2005) の ang2pix_nest に従う。
+order k の分割数は nside = 2**k、画素数は 12 * nside**2。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def nside_for_order(order: int) -> int:
+    if not 0 <= order <= 29:
+        raise ValueError(f"order は 0〜29 の範囲で指定してください: {order}")
+    return 1 << order
+
+
+def npix_for_order(order: int) -> int:
+    return 12 * nside_for_order(order) ** 2
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """下位32ビットの各ビットを偶数ビット位置へ広げる（Morton 符号化）"""
+    x = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x3333333333333333)
+    x = (x | (x << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return x
+
+
+def ang2pix_nest(order: int, ra_deg: np.ndarray, dec_deg: np.ndarray) -> np.ndarray:
+    """赤経・赤緯（度）から NESTED 方式の画素番号（int64）を返す"""
+    nside = nside_for_order(order)
+    ra = np.asarray(ra_deg, dtype=np.float64)
+    dec = np.asarray(dec_deg, dtype=np.float64)
+
+    z = np.sin(np.radians(dec))
+    za = np.abs(z)
+    tt = np.mod(np.radians(ra), 2 * np.pi) / (np.pi / 2)  # [0, 4)
+    tt = np.where(tt >= 4.0, 0.0, tt)
+
+    face = np.empty(z.shape, dtype=np.int64)
+    ix = np.empty(z.shape, dtype=np.int64)
+    iy = np.empty(z.shape, dtype=np.int64)
+
+    # 赤道域（|z| <= 2/3）
+    eq = za <= 2.0 / 3.0
+    if np.any(eq):
+        temp1 = nside * (0.5 + tt[eq])
+        temp2 = nside * z[eq] * 0.75
+        jp = (temp1 - temp2).astype(np.int64)
+        jm = (temp1 + temp2).astype(np.int64)
+        ifp = jp // nside
+        ifm = jm // nside
+        face[eq] = np.where(ifp == ifm, ifp | 4, np.where(ifp < ifm, ifp, ifm + 8))
+        ix[eq] = jm & (nside - 1)
+        iy[eq] = nside - (jp & (nside - 1)) - 1
+
+    # 極域
+    polar = ~eq
+    if np.any(polar):
+        ntt = np.minimum(tt[polar].astype(np.int64), 3)
+        tp = tt[polar] - ntt
+        tmp = nside * np.sqrt(3.0 * (1.0 - za[polar]))
+        jp = np.minimum((tp * tmp).astype(np.int64), nside - 1)
+        jm = np.minimum(((1.0 - tp) * tmp).astype(np.int64), nside - 1)
+        north = z[polar] >= 0
+        face[polar] = np.where(north, ntt, ntt + 8)
+        ix[polar] = np.where(north, nside - jm - 1, jp)
+        iy[polar] = np.where(north, nside - jp - 1, jm)
+
+    nested = _spread_bits(ix) | (_spread_bits(iy) << np.uint64(1))
+    return (face << (2 * order)) + nested.astype(np.int64)
+
+
+def parent_pixel(pixel: np.ndarray, order: int, parent_order: int) -> np.ndarray:
+    """NESTED 方式では上位 order の画素番号は下位ビットを落とすだけで求まる"""
+    if parent_order > order:
+        raise ValueError("parent_order は order 以下である必要があります")
+    return np.asarray(pixel) >> (2 * (order - parent_order))
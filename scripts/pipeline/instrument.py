@@ -0,0 +1,402 @@
+"""
+データ生成スクリプト共通の計測（段階ごとの実時間・CPU 時間・件数・処理速度）
+
+段階は with ブロック（stage）か反復子の包み（iterate）で区切る。同じ名前の段階は合算する。
+段階の中で別の段階が動いた時間は外側から差し引く（ジェネレータの連鎖では下流の next() が
+上流の next() を呼ぶため、差し引かないと上流の時間が下流にも数えられる）。
+
+終了時に data/generated/runs/<スクリプト名>/latest.json へ集計を書き、同じ内容を
+history.jsonl に 1 回 1 行で追記する。前回の latest.json と比べた増減も表示する。
+public/data は配信対象のため、集計（マシン名・引数を含む）は置かない。
+
+  {"version": 1, "script": "rebuild_stars_from_csv", "status": "ok", "wallSeconds": 14.2,
+   "cpuSeconds": 13.9, "peakRssBytes": ..., "argv": [...],
+   "stages": [{"name": "parse", "wallSeconds": 0.61, "cpuSeconds": 0.60, "rowsIn": 102372,
+               "rowsOut": 102372, "rowsPerSecond": 167823, "calls": 3, "tracedPeakBytes": null}, ...],
+   "outputs": [{"path": "public/data/stars.json", "bytes": 23215896}, ...],
+   "profile": {"pstats": "...", "collapsed": "..."}}
+
+オプション（add_arguments で各スクリプトに追加、環境変数でも指定できる）:
+  --trace-memory  STAR_PIPELINE_TRACE_MEMORY=1  段階ごとに tracemalloc の最大値も記録する（遅くなる）
+  --profile       STAR_PIPELINE_PROFILE=1       cProfile の結果（.pstats、snakeviz などで表示）と、
+                                                主スレッドを定期的に標本化した collapsed stack
+                                                （.collapsed、flamegraph.pl / speedscope 用）を書く
+
+使用例:
+  with Instrument.from_args("rebuild_stars_from_csv", args) as run:
+      row_batches = run.iterate("read", batched(read_rows(path)), size=len)
+      for rows in row_batches:
+          with run.stage("parse", rows_in=len(rows)) as stage:
+              ...
+              stage.count(len(batch))
+      run.add_output(OUTPUT_PATH)
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+from pipeline.jsonout import WrittenFile, brotli_quality
+from pipeline.paths import GENERATED_DIR, ROOT
+from pipeline.streaming import peak_rss_bytes
+
+T = TypeVar("T")
+
+SUMMARY_VERSION = 1
+SAMPLE_INTERVAL = 0.002
+
+
+def runs_dir() -> Path:
+    return GENERATED_DIR / "runs"
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "") not in ("", "0", "false")
+
+
+@dataclass
+class StageStats:
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    child_wall: float = 0.0
+    child_cpu: float = 0.0
+    calls: int = 0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    traced_peak: Optional[int] = None
+    upstream: Optional[str] = None
+
+    @property
+    def self_wall(self) -> float:
+        return self.wall - self.child_wall
+
+    @property
+    def self_cpu(self) -> float:
+        return self.cpu - self.child_cpu
+
+    def count(self, rows_out: int, rows_in: Optional[int] = None) -> None:
+        """処理した件数を加える（rows_in を省略すると入力件数は記録しない）"""
+        self.rows_out = (self.rows_out or 0) + rows_out
+        if rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + rows_in
+
+
+@dataclass
+class _Segment:
+    stats: StageStats
+    wall: float
+    cpu: float
+    traced_peak: int = 0
+
+
+class StackSampler:
+    """対象スレッドのスタックを一定間隔で読み、collapsed stack の件数を数える"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _label(frame: FrameType) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@dataclass
+class Instrument:
+    script: str
+    trace_memory: bool = False
+    profile: bool = False
+    summary_dir: Optional[Path] = None
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    outputs: list[Union[Path, WrittenFile]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.summary_dir = self.summary_dir or runs_dir() / self.script
+        self._stack: list[_Segment] = []
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started_at = datetime.now(timezone.utc)
+        self._wall = self._cpu = 0.0
+
+    @classmethod
+    def from_args(cls, script: str, args: Optional[argparse.Namespace] = None) -> "Instrument":
+        """add_arguments で追加したオプション（無ければ環境変数）から作る"""
+        return cls(
+            script,
+            trace_memory=getattr(args, "trace_memory", False) or _env_flag("STAR_PIPELINE_TRACE_MEMORY"),
+            profile=getattr(args, "profile", False) or _env_flag("STAR_PIPELINE_PROFILE"),
+            summary_dir=getattr(args, "summary_dir", None),
+        )
+
+    def __getitem__(self, name: str) -> StageStats:
+        return self.stages.setdefault(name, StageStats(name))
+
+    # --- 段階の計測 ---
+
+    def _enter(self, stats: StageStats) -> None:
+        if self.trace_memory:
+            if self._stack:
+                parent = self._stack[-1]
+                parent.traced_peak = max(parent.traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append(_Segment(stats, time.perf_counter(), time.process_time()))
+
+    def _exit(self) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        segment = self._stack.pop()
+        stats = segment.stats
+        elapsed_wall, elapsed_cpu = wall - segment.wall, cpu - segment.cpu
+        stats.wall += elapsed_wall
+        stats.cpu += elapsed_cpu
+        stats.calls += 1
+        if self.trace_memory:
+            peak = max(segment.traced_peak, tracemalloc.get_traced_memory()[1])
+            stats.traced_peak = max(stats.traced_peak or 0, peak)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.stats.child_wall += elapsed_wall
+            parent.stats.child_cpu += elapsed_cpu
+            if self.trace_memory:
+                parent.traced_peak = max(parent.traced_peak, stats.traced_peak or 0)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageStats]:
+        """with ブロックを 1 つの段階として計測する"""
+        stats = self[name]
+        if rows_in is not None:
+            stats.rows_in = (stats.rows_in or 0) + rows_in
+        self._enter(stats)
+        try:
+            yield stats
+        finally:
+            self._exit()
+
+    def iterate(
+        self,
+        name: str,
+        items: Iterable[T],
+        *,
+        upstream: Optional[str] = None,
+        size: Optional[Callable[[T], int]] = None,
+    ) -> Iterator[T]:
+        """
+        反復子の各 next() を段階 name として計測する
+
+        出力件数は要素数（size を渡すと size(要素) の合計。バッチなら len）。
+        upstream を指定すると、その段階の出力件数を入力件数とする。
+        next() ごとに時刻を 2 回取るため（1 回 4 µs 程度）、1 件ずつの反復子ではなく
+        バッチの反復子（pipeline/streaming.py の batched）を包む。
+        """
+        stats = self[name]
+        stats.upstream = upstream
+        return self._timed(stats, iter(items), size)
+
+    def _timed(self, stats: StageStats, iterator: Iterator[T], size: Optional[Callable[[T], int]]) -> Iterator[T]:
+        while True:
+            self._enter(stats)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            stats.count(size(item) if size else 1)
+            yield item
+
+    def add_output(self, *outputs: Union[Path, WrittenFile]) -> None:
+        """集計に載せる出力ファイル（WrittenFile なら圧縮後のサイズも載せる）"""
+        self.outputs.extend(outputs)
+
+    # --- 開始・終了 ---
+
+    def __enter__(self) -> "Instrument":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profile:
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall, cpu = time.perf_counter() - self._wall, time.process_time() - self._cpu
+        profile_paths = self._stop_profiling()
+        summary = self.summary(wall, cpu, "ok" if exc_type is None else "failed", profile_paths)
+        previous = self._previous_summary()
+        path = self.write_summary(summary)
+        print(format_summary(summary, previous))
+        print(f"計測結果: {path}")
+
+    def _stop_profiling(self) -> Optional[dict]:
+        if self._profiler is None or self._sampler is None:
+            return None
+        self._profiler.disable()
+        self._sampler.stop()
+        assert self.summary_dir is not None
+        self.summary_dir.mkdir(parents=True, exist_ok=True)
+        pstats_path = self.summary_dir / "profile.pstats"
+        collapsed_path = self.summary_dir / "profile.collapsed"
+        self._profiler.dump_stats(pstats_path)
+        self._sampler.write(collapsed_path)
+        return {"pstats": _relative(pstats_path), "collapsed": _relative(collapsed_path)}
+
+    # --- 集計 ---
+
+    def summary(self, wall: float, cpu: float, status: str = "ok", profile: Optional[dict] = None) -> dict:
+        stages = []
+        for stats in self.stages.values():
+            rows_in = stats.rows_in
+            if rows_in is None and stats.upstream in self.stages:
+                rows_in = self.stages[stats.upstream].rows_out
+            rows = stats.rows_out if stats.rows_out is not None else rows_in
+            stages.append({
+                "name": stats.name,
+                "wallSeconds": round(stats.self_wall, 4),
+                "cpuSeconds": round(stats.self_cpu, 4),
+                "rowsIn": rows_in,
+                "rowsOut": stats.rows_out,
+                "rowsPerSecond": round(rows / stats.self_wall) if rows and stats.self_wall > 0 else None,
+                "calls": stats.calls,
+                "tracedPeakBytes": stats.traced_peak,
+            })
+        return {
+            "version": SUMMARY_VERSION,
+            "script": self.script,
+            "status": status,
+            "startedAt": self._started_at.isoformat(timespec="seconds"),
+            "wallSeconds": round(wall, 3),
+            "cpuSeconds": round(cpu, 3),
+            "peakRssBytes": peak_rss_bytes(),
+            "traceMemory": self.trace_memory,
+            "brotliQuality": brotli_quality(),
+            "python": platform.python_version(),
+            "node": platform.node(),
+            "argv": sys.argv[1:],
+            "stages": stages,
+            "outputs": [_output_entry(output) for output in self.outputs],
+            "profile": profile,
+        }
+
+    def _previous_summary(self) -> Optional[dict]:
+        assert self.summary_dir is not None
+        try:
+            return json.loads((self.summary_dir / "latest.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def write_summary(self, summary: dict) -> Path:
+        """latest.json を置き換え、history.jsonl に追記する"""
+        assert self.summary_dir is not None
+        self.summary_dir.mkdir(parents=True, exist_ok=True)
+        latest = self.summary_dir / "latest.json"
+        tmp_path = latest.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(latest)
+        with (self.summary_dir / "history.jsonl").open("a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return latest
+
+
+def _output_entry(output: Union[Path, WrittenFile]) -> dict:
+    if isinstance(output, WrittenFile):
+        return {
+            "path": _relative(output.path),
+            "bytes": output.bytes,
+            "gzipBytes": output.gzip_bytes,
+            "brotliBytes": output.brotli_bytes,
+        }
+    path = Path(output)
+    return {"path": _relative(path), "bytes": path.stat().st_size if path.is_file() else None}
+
+
+def _relative(path: Path) -> str:
+    resolved = Path(path).resolve()
+    try:
+        return resolved.relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(resolved)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """各スクリプトの argparse に計測用のオプションを追加する"""
+    group = parser.add_argument_group("計測")
+    group.add_argument("--profile", action="store_true",
+                       help="cProfile（.pstats）と collapsed stack（.collapsed）を書き出す")
+    group.add_argument("--trace-memory", action="store_true", help="段階ごとの tracemalloc の最大値を記録する")
+    group.add_argument("--summary-dir", type=Path, default=None,
+                       help="計測結果の保存先（既定: data/generated/runs/<スクリプト名>）")
+
+
+def comparable(summary: dict, previous: Optional[dict]) -> bool:
+    """同じマシン・Brotli レベルで、tracemalloc・cProfile の有無も同じ（計測による遅れが同程度の）回どうしか"""
+    return (
+        previous is not None
+        and previous.get("version") == summary["version"]
+        and previous.get("node") == summary["node"]
+        and previous.get("brotliQuality") == summary["brotliQuality"]
+        and previous.get("traceMemory") == summary["traceMemory"]
+        and bool(previous.get("profile")) == bool(summary["profile"])
+    )
+
+
+def format_summary(summary: dict, previous: Optional[dict] = None) -> str:
+    """段階ごとの表（条件の同じ前回の集計があれば実時間の増減も）"""
+    before = {stage["name"]: stage for stage in previous["stages"]} if comparable(summary, previous) else {}
+    lines = [f"計測（{summary['script']}、実時間 {summary['wallSeconds']:.2f} 秒、CPU {summary['cpuSeconds']:.2f} 秒）:"]
+    for stage in summary["stages"]:
+        rows = stage["rowsOut"] if stage["rowsOut"] is not None else stage["rowsIn"]
+        rate = f"{stage['rowsPerSecond']:>10,} 件/秒" if stage["rowsPerSecond"] else " " * 15
+        traced = f"  tracemalloc {stage['tracedPeakBytes'] / 1024**2:,.0f} MiB" if stage["tracedPeakBytes"] else ""
+        old = before.get(stage["name"])
+        change = ""
+        if old and old["wallSeconds"] > 0:
+            change = f"  前回比 {stage['wallSeconds'] / old['wallSeconds'] * 100 - 100:+.0f}%"
+        lines.append(
+            f"  {stage['name']:<16} {stage['wallSeconds']:>8.3f} 秒 (CPU {stage['cpuSeconds']:>7.3f})"
+            f" {'' if rows is None else f'{rows:>10,} 件'} {rate}{traced}{change}"
+        )
+    return "\n".join(lines)
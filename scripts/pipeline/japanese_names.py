@@ -0,0 +1,123 @@
+"""
+固有名のカタカナ表記（手作業で作った HIP 番号 → 名前の対応表）
+
+統合は pipeline/nameindex.py が行う（優先順位は NAME_SOURCES）。表どうしで食い違う
+HIP 番号は scripts/build_name_index.py が一覧表示する。
+"""
+
+# 旧 add_iau_names.py で stars.json に付けていた表（data/brightStarNames.ts と同じ内容）
+# HIP 番号は IAU-CSN.txt（data/raw/iau/）の同じ星の番号に合わせてある
+FAMOUS_STARS = {
+    32349: "シリウス",      # おおいぬ座α星
+    30438: "カノープス",     # りゅうこつ座α星
+    91262: "ベガ",          # こと座α星
+    97649: "アルタイル",     # わし座α星
+    24436: "リゲル",        # オリオン座β星
+    27989: "ベテルギウス",   # オリオン座α星
+    37279: "プロキオン",     # こいぬ座α星
+    69673: "アークトゥルス", # うしかい座α星
+    65474: "スピカ",        # おとめ座α星
+    21421: "アルデバラン",   # おうし座α星
+    80763: "アンタレス",    # さそり座α星
+    102098: "デネブ",       # はくちょう座α星
+    57632: "デネボラ",      # しし座β星
+    24608: "カペラ",        # ぎょしゃ座α星
+    49669: "レグルス",      # しし座α星
+    37826: "ポルックス",    # ふたご座β星
+    60718: "アクルックス",   # みなみじゅうじ座α星
+    62434: "ミモザ",        # みなみじゅうじ座β星
+    25336: "ベラトリックス", # オリオン座γ星
+    26311: "アルニラム",    # オリオン座ε星
+    26727: "アルニタク",    # オリオン座ζ星
+    27366: "サイフ",        # オリオン座κ星
+    14576: "アルゴル",      # ペルセウス座β星
+    677: "アルフェラッツ",   # アンドロメダ座α星
+    5447: "ミラク",         # アンドロメダ座β星
+    85927: "シャウラ",      # さそり座λ星
+    86032: "ラス・アルハゲ", # へびつかい座α星
+    36850: "カストル",      # ふたご座α星
+    3419: "デネブ・カイトス", # くじら座β星
+    67301: "アルカイド",    # おおぐま座η星
+    65378: "ミザール",      # おおぐま座ζ星
+    62956: "アリオト",      # おおぐま座ε星
+    65477: "アルコル",      # おおぐま座80番星
+    53910: "メラク",        # おおぐま座β星
+    58001: "フェクダ",      # おおぐま座γ星
+    59774: "メグレズ",      # おおぐま座δ星
+    54061: "ドゥベ",        # おおぐま座α星
+}
+
+# add_star_names.py の表（主要な明るい星、星座ごと）
+STAR_NAMES = {
+    # こぐま座
+    11767: "ポラリス",    # Polaris
+    72607: "コカブ",      # Kochab
+
+    # おおぐま座
+    54061: "ドゥーベ",    # Dubhe
+    53910: "メラク",      # Merak
+    58001: "フェクダ",    # Phecda
+    59774: "メグレズ",    # Megrez
+    62956: "アリオト",    # Alioth
+    65378: "ミザール",    # Mizar
+    67301: "アルカイド",  # Alkaid
+
+    # オリオン座
+    24436: "リゲル",      # Rigel
+    27989: "ベテルギウス", # Betelgeuse
+    25336: "ベラトリックス", # Bellatrix
+    26311: "アルニラム",  # Alnilam
+    26727: "アルニタク",  # Alnitak
+    25930: "ミンタカ",    # Mintaka
+    27366: "サイフ",      # Saiph
+
+    # おうし座
+    21421: "アルデバラン", # Aldebaran
+
+    # ふたご座
+    36850: "カストル",    # Castor
+    37826: "ポルックス",  # Pollux
+
+    # しし座
+    49669: "レグルス",    # Regulus
+    57632: "デネボラ",    # Denebola
+    50583: "アルギエバ",  # Algieba
+
+    # おとめ座
+    65474: "スピカ",      # Spica
+
+    # こと座
+    91262: "ベガ",        # Vega
+
+    # わし座
+    97649: "アルタイル",  # Altair
+
+    # はくちょう座
+    102098: "デネブ",     # Deneb
+
+    # さそり座
+    80763: "アンタレス",  # Antares
+
+    # ケンタウルス座
+    71683: "リギルケンタウルス", # Rigil Kentaurus (Alpha Centauri)
+    68702: "ハダル",      # Hadar
+
+    # りゅうこつ座
+    30438: "カノープス",  # Canopus
+
+    # おおいぬ座
+    32349: "シリウス",    # Sirius
+
+    # こいぬ座
+    37279: "プロキオン",  # Procyon
+
+    # ペガスス座
+    113963: "マルカブ",   # Markab
+    113881: "シェアト",   # Scheat
+    1067: "アルゲニブ",   # Algenib
+    677: "アルフェラッツ", # Alpheratz (And/Peg)
+
+    # カシオペア座
+    3179: "シェダル",     # Schedar
+    746: "カフ",          # Caph
+}
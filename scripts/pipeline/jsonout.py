@@ -0,0 +1,247 @@
+"""
+public/data 向け JSON の書き出し（逐次出力・最小化・null 省略・圧縮版の同時生成）
+
+レコードのリストは 1 行 1 レコードの最小化 JSON として書き出す:
+  [
+  {"id":1,"ra":0.000911,"dec":1.089013,"vmag":9.1,...},
+  {"id":2,...}
+  ]
+レコードは反復子から 1 件ずつ受け取り、まとまった量ごとに書き出すため、
+全件を文字列として保持しない（メモリは読み込み側のデータ量だけで済む）。
+値が None のフィールドは省略する（読み込み側で欠損 = null として扱う）。
+
+同じ内容を <名前>.json.gz（gzip）と <名前>.json.br（Brotli）にも同時に書き出す。
+圧縮は書き出しと並行して逐次行うため、書き出し後に読み直すことはない。
+書き出し中は <名前>.tmp に書き、完了時に置き換える（読み込み中の同じファイルへも書き戻せる）。
+read_records はこの形式を 1 行ずつ読む（全体を読み込まずに済む）。
+gzip のヘッダには時刻を入れない（内容が同じなら同じバイト列になり、差分ビルドの判定が安定する）。
+
+環境変数:
+  STAR_PIPELINE_BROTLI_QUALITY  Brotli の圧縮レベル（0〜11、既定 5）。
+                                11 は stars.json で 1 分以上かかるため、各スクリプトでは使わない。
+                                公開前に compress_public_data.py（recompress_brotli）で 11 に圧縮し直す
+
+使用例:
+  written = write_records(PUBLIC_DATA_DIR / "stars.json", stars)
+  print(format_size_report([written], PUBLIC_DATA_DIR))
+
+  with RecordWriter(path) as writer:   # 複数のファイルへ振り分けながら書く場合
+      writer.write(record)
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Mapping, Optional, Sequence
+
+import brotli
+
+COMPRESSED_SUFFIXES: tuple[str, ...] = (".gz", ".br")
+GZIP_LEVEL = 9
+DEFAULT_BROTLI_QUALITY = 5
+PUBLISH_BROTLI_QUALITY = 11
+FLUSH_BYTES = 1 << 20
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+@dataclass(frozen=True)
+class WrittenFile:
+    path: Path
+    bytes: int
+    gzip_bytes: int
+    brotli_bytes: int
+    records: Optional[int] = None
+
+
+def brotli_quality() -> int:
+    return int(os.environ.get("STAR_PIPELINE_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY))
+
+
+def drop_nulls(record: Mapping[str, object]) -> dict:
+    return {key: value for key, value in record.items() if value is not None}
+
+
+def compressed_paths(path: Path) -> tuple[Path, ...]:
+    return tuple(path.with_name(path.name + suffix) for suffix in COMPRESSED_SUFFIXES)
+
+
+def _temporary(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+class _Sink:
+    """同じバイト列を JSON・gzip・Brotli の 3 ファイルへ書き込む"""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.targets = (path, *compressed_paths(path))
+        raw_path, gz_path, br_path = (_temporary(target) for target in self.targets)
+        self.raw: BinaryIO = raw_path.open("wb")
+        self.gz_file: BinaryIO = gz_path.open("wb")
+        self.gz = gzip.GzipFile(filename="", mode="wb", fileobj=self.gz_file, compresslevel=GZIP_LEVEL, mtime=0)
+        self.br_file: BinaryIO = br_path.open("wb")
+        self.br = brotli.Compressor(quality=brotli_quality())
+        self.pending: list[str] = []
+        self.pending_size = 0
+
+    def write(self, text: str) -> None:
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        data = "".join(self.pending).encode("utf-8")
+        self.pending.clear()
+        self.pending_size = 0
+        self.raw.write(data)
+        self.gz.write(data)
+        self.br_file.write(self.br.process(data))
+
+    def close(self, records: Optional[int] = None) -> WrittenFile:
+        self.flush()
+        self.gz.close()
+        self.br_file.write(self.br.finish())
+        sizes = [f.tell() for f in (self.raw, self.gz_file, self.br_file)]
+        for f in (self.raw, self.gz_file, self.br_file):
+            f.close()
+        for target in self.targets:
+            _temporary(target).replace(target)
+        return WrittenFile(self.path, *sizes, records=records)
+
+    def abort(self) -> None:
+        """書きかけのファイルを残さない（既存の出力はそのまま）"""
+        for f in (self.raw, self.gz_file, self.br_file):
+            f.close()
+        for target in self.targets:
+            _temporary(target).unlink(missing_ok=True)
+
+
+class RecordWriter:
+    """レコードを 1 件ずつ受け取って JSON 配列として書き出す（write_records の逐次版）"""
+
+    def __init__(self, path: Path, *, omit_null: bool = True) -> None:
+        self.omit_null = omit_null
+        self.count = 0
+        self.sink = _Sink(path)
+        self.sink.write("[")
+
+    def write(self, record: Mapping[str, object]) -> None:
+        if self.omit_null:
+            record = drop_nulls(record)
+        self.sink.write(",\n" if self.count else "\n")
+        self.sink.write(_ENCODER.encode(record))
+        self.count += 1
+
+    def close(self) -> WrittenFile:
+        self.sink.write("\n]\n")
+        return self.sink.close(records=self.count)
+
+    def abort(self) -> None:
+        self.sink.abort()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_records(
+    path: Path,
+    records: Iterable[Mapping[str, object]],
+    *,
+    omit_null: bool = True,
+) -> WrittenFile:
+    """レコードの反復子を 1 行 1 レコードの JSON 配列として逐次書き出す"""
+    writer = RecordWriter(path, omit_null=omit_null)
+    try:
+        for record in records:
+            writer.write(record)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    """
+    write_records の出力を 1 レコードずつ読む
+
+    1 行 1 レコードになっていないファイル（整形済みの古い出力など）は全体を読み込んで返す。
+    """
+    with path.open("r", encoding="utf-8") as f:
+        if f.readline().strip() == "[":
+            line = f.readline().rstrip().rstrip(",")
+            try:
+                first = None if line in ("", "]") else json.loads(line)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if first is not None:
+                    yield first
+                for line in f:
+                    line = line.rstrip().rstrip(",")
+                    if line and line != "]":
+                        yield json.loads(line)
+                return
+        f.seek(0)
+        yield from json.load(f)
+
+
+def write_json(path: Path, value: object) -> WrittenFile:
+    """マニフェスト・索引などの単一の値を最小化して書き出す"""
+    sink = _Sink(path)
+    try:
+        sink.write(_ENCODER.encode(value))
+        sink.write("\n")
+    except BaseException:
+        sink.abort()
+        raise
+    return sink.close()
+
+
+def recompress_brotli(path: Path, quality: int = PUBLISH_BROTLI_QUALITY) -> WrittenFile:
+    """
+    書き出し済みの JSON から <名前>.json.br だけを指定の圧縮レベルで作り直す（公開前の 1 回だけ）
+
+    JSON と .gz はそのまま。JSON はまとまった量ごとに読むため、全体を読み込まない。
+    """
+    br_path = compressed_paths(path)[1]
+    temporary = _temporary(br_path)
+    compressor = brotli.Compressor(quality=quality)
+    try:
+        with path.open("rb") as raw, temporary.open("wb") as out:
+            while chunk := raw.read(FLUSH_BYTES):
+                out.write(compressor.process(chunk))
+            out.write(compressor.finish())
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    temporary.replace(br_path)
+    gz_path = compressed_paths(path)[0]
+    return WrittenFile(path, path.stat().st_size, gz_path.stat().st_size, br_path.stat().st_size)
+
+
+def format_size_report(files: Sequence[WrittenFile], base: Optional[Path] = None) -> str:
+    """書き出したファイルのサイズ一覧（JSON / gzip / Brotli と圧縮率）"""
+    lines = [f"  {'':<32} {'JSON':>12} {'gzip':>12} {'Brotli':>12}"]
+    for written in files:
+        name = written.path.relative_to(base).as_posix() if base else written.path.name
+        ratio = written.brotli_bytes / written.bytes * 100 if written.bytes else 0.0
+        lines.append(
+            f"  {name:<32} {written.bytes:>12,} {written.gzip_bytes:>12,} {written.brotli_bytes:>12,}"
+            f"  ({ratio:.0f}%)"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""
+星座線の描画用ジオメトリ（頂点の重複を除いた頂点配列・線分の索引・つないだ折れ線）
+
+constellationship.fab は星座ごとに HIP 番号の組を並べただけの形式で、同じ星が複数の線分
+（星座をまたぐ場合もある）に現れ、同じ線分が往復で 2 回書かれていることもある。
+星表（stars.bin）と突き合わせて次の形にしておくと、描画側は頂点ごとに 1 回だけ投影し、
+星の検索表なしで線を引ける。
+
+形式（public/data/constellation-geometry.json、lib/data/constellationGeometryLoader.ts が読む）:
+  version
+  vertices        {"hip": [...], "ra": [...], "dec": [...], "x": [...], "y": [...], "z": [...]}
+                  全星座で共有する頂点（HIP 番号の昇順）。x, y, z は方向余弦
+  constellations  [{"constellationId": "And", "indices": [...], "strips": [[...], ...]}, ...]
+                  indices は線分ごとの頂点番号の組を平らに並べたもの（gl.LINES 用）、
+                  strips は線分をつないだ折れ線（頂点番号の列。閉じた線は先頭の頂点で終わる）
+
+星表に無い HIP 番号を含む線分は除き、resolve_lines のレポートに残す。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
+
+import numpy as np
+
+GEOMETRY_VERSION = 1
+ANGLE_DECIMALS = 5  # 度（約 0.04 秒角）
+VECTOR_DECIMALS = 6
+
+_VIRTUAL = -1  # 奇数次の頂点どうしを結ぶ仮の頂点
+
+
+@dataclass
+class LineReport:
+    """突き合わせの結果（星座ごとの件数と、星表に無い HIP 番号）"""
+
+    segments: int = 0
+    duplicate_segments: int = 0
+    dropped_segments: int = 0
+    unresolved: dict[str, dict[int, int]] = field(default_factory=dict)  # 星座 → HIP 番号 → 線分数
+
+    def to_dict(self) -> dict:
+        return {
+            "segments": self.segments,
+            "duplicateSegments": self.duplicate_segments,
+            "droppedSegments": self.dropped_segments,
+            "unresolved": [
+                {"constellationId": constellation, "hip": hip, "segments": count}
+                for constellation, hips in sorted(self.unresolved.items())
+                for hip, count in sorted(hips.items())
+            ],
+        }
+
+
+def unique_segments(lines: Sequence[Sequence[int]]) -> tuple[list[tuple[int, int]], int]:
+    """向きを問わずに重複と長さ 0 の線分を除く（最初に現れた向きと順序を保つ）→ (線分, 除いた数)"""
+    seen: set[tuple[int, int]] = set()
+    segments = []
+    for a, b in lines:
+        key = (min(a, b), max(a, b))
+        if a == b or key in seen:
+            continue
+        seen.add(key)
+        segments.append((a, b))
+    return segments, len(lines) - len(segments)
+
+
+def stitch_strips(segments: Sequence[tuple[int, int]]) -> list[list[int]]:
+    """
+    線分をつないで、できるだけ少ない折れ線にする
+
+    奇数次の頂点をすべて仮の頂点に結ぶと全頂点が偶数次になるので、オイラー閉路
+    （Hierholzer 法）を求めて仮の頂点で切れば、連結成分ごとに max(1, 奇数次の頂点数 / 2)
+    本の折れ線になる（これ以上は減らせない）。
+    """
+    adjacency: dict[int, list[tuple[int, int]]] = {}
+    edges = list(segments)
+    for number, (a, b) in enumerate(edges):
+        adjacency.setdefault(a, []).append((b, number))
+        adjacency.setdefault(b, []).append((a, number))
+    odd = [vertex for vertex, neighbors in adjacency.items() if len(neighbors) % 2]
+    for vertex in odd:
+        number = len(edges)
+        edges.append((_VIRTUAL, vertex))
+        adjacency.setdefault(_VIRTUAL, []).append((vertex, number))
+        adjacency[vertex].append((_VIRTUAL, number))
+
+    used = [False] * len(edges)
+    cursor = {vertex: 0 for vertex in adjacency}
+
+    def circuit(start: int) -> list[int]:
+        stack, path = [start], []
+        while stack:
+            vertex = stack[-1]
+            neighbors = cursor[vertex]
+            while neighbors < len(adjacency[vertex]) and used[adjacency[vertex][neighbors][1]]:
+                neighbors += 1
+            cursor[vertex] = neighbors
+            if neighbors < len(adjacency[vertex]):
+                neighbor, number = adjacency[vertex][neighbors]
+                used[number] = True
+                stack.append(neighbor)
+            else:
+                path.append(stack.pop())
+        return path[::-1]
+
+    strips: list[list[int]] = []
+    starts = ([_VIRTUAL] if odd else []) + [vertex for vertex in adjacency if vertex != _VIRTUAL]
+    for start in starts:
+        if cursor[start] >= len(adjacency[start]):
+            continue
+        walk = circuit(start)
+        piece: list[int] = []
+        for vertex in walk:
+            if vertex == _VIRTUAL:
+                if len(piece) > 1:
+                    strips.append(piece)
+                piece = []
+            else:
+                piece.append(vertex)
+        if len(piece) > 1:
+            strips.append(piece)
+    return strips
+
+
+def build_line_geometry(
+    records: Sequence[Mapping[str, object]],
+    hips: np.ndarray,
+    columns: Mapping[str, np.ndarray],
+) -> tuple[dict, LineReport]:
+    """
+    星座線（generate_constellation_lines.py の records）を星表と突き合わせてジオメトリにする
+
+    hips は星表の HIP 番号、columns は同じ並びの ra / dec / x / y / z。
+    """
+    hips = np.asarray(hips)
+    row_of_hip = {int(hip): row for row, hip in enumerate(hips.tolist())}
+    report = LineReport()
+
+    resolved: list[tuple[str, list[tuple[int, int]]]] = []
+    for record in records:
+        constellation = str(record["constellationId"])
+        segments, duplicates = unique_segments(record["lines"])
+        report.segments += len(segments)
+        report.duplicate_segments += duplicates
+        kept = []
+        for a, b in segments:
+            missing = [hip for hip in (a, b) if hip not in row_of_hip]
+            if missing:
+                report.dropped_segments += 1
+                counts = report.unresolved.setdefault(constellation, {})
+                for hip in missing:
+                    counts[hip] = counts.get(hip, 0) + 1
+                continue
+            kept.append((a, b))
+        resolved.append((constellation, kept))
+
+    vertex_hips = sorted({hip for _, segments in resolved for segment in segments for hip in segment})
+    vertex_of_hip = {hip: number for number, hip in enumerate(vertex_hips)}
+    rows = np.array([row_of_hip[hip] for hip in vertex_hips], dtype=np.int64)
+
+    def column(name: str, decimals: int) -> list[float]:
+        return np.round(np.asarray(columns[name], dtype=np.float64)[rows], decimals).tolist()
+
+    constellations = []
+    for constellation, segments in resolved:
+        indices = [vertex_of_hip[hip] for segment in segments for hip in segment]
+        strips = [[vertex_of_hip[hip] for hip in strip] for strip in stitch_strips(segments)]
+        constellations.append({"constellationId": constellation, "indices": indices, "strips": strips})
+
+    geometry = {
+        "version": GEOMETRY_VERSION,
+        "vertices": {
+            "hip": vertex_hips,
+            "ra": column("ra", ANGLE_DECIMALS),
+            "dec": column("dec", ANGLE_DECIMALS),
+            "x": column("x", VECTOR_DECIMALS),
+            "y": column("y", VECTOR_DECIMALS),
+            "z": column("z", VECTOR_DECIMALS),
+        },
+        "constellations": constellations,
+    }
+    return geometry, report
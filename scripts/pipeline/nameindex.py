@@ -0,0 +1,362 @@
+"""
+星の名前の統合索引（HIP 番号をキーにした表と、HD / HR / 名前 → HIP 番号の副索引）
+
+固有名の出典は複数あり、同じ HIP 番号に別の名前が付いていることがある。出典ごとに
+NameSource を作り、merge_sources に優先順位の高い順に渡すと、欄（properName = カタカナ、
+iauName = IAU 英語名）ごとに最初に名前を持っていた出典を採用した NameIndex を返す。
+採用されなかった名前は NameConflict として報告する。
+
+保存形式（data/generated/name-index.npz・proper-names.npz、np.load(allow_pickle=False) で読める）:
+  hip             int32[N]  HIP 番号（昇順）
+  proper_name     str[N]    カタカナ表記（無ければ ""）
+  iau_name        str[N]    IAU 英語名（無ければ ""）
+  hd, hr          int32[N]  HD / HR 番号（無ければ -1）
+  proper_source   int8[N]   採用した出典（sources の番号、無ければ -1）
+  iau_source      int8[N]
+  hd_keys, hd_rows      HD 番号（昇順）→ 行
+  hr_keys, hr_rows      HR 番号（昇順）→ 行
+  name_keys, name_rows  正規化した名前（昇順）→ 行（カタカナ・英語名・ダイアクリティカル付き表記）
+  meta            str       JSON（version と出典の一覧）
+
+読み込み時に HIP 番号 → 行 の密な配列と、副索引の辞書を作るので、検索は配列の参照か
+辞書の参照 1 回で済む。
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from pipeline.paths import GENERATED_DIR
+
+INDEX_VERSION = 1
+FIELDS: tuple[str, ...] = ("properName", "iauName")
+NULL_NUMBER = -1
+
+
+def index_path() -> Path:
+    return GENERATED_DIR / "name-index.npz"
+
+
+def proper_names_path() -> Path:
+    """カタカナ表記の出典だけの索引（build_proper_names.py の出力、星データへの固有名の付与に使う）"""
+    return GENERATED_DIR / "proper-names.npz"
+
+
+def normalize_name(name: str) -> str:
+    """名前の照合キー（NFKC・大文字小文字の区別なし・連続する空白は 1 つ）"""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+@dataclass(frozen=True)
+class SourceEntry:
+    name: str
+    hd: Optional[int] = None
+    hr: Optional[int] = None
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass
+class NameSource:
+    label: str
+    field: str
+    entries: dict[int, SourceEntry]
+    path: Optional[Path] = None
+    note: Optional[str] = None
+
+    def describe(self) -> dict:
+        return {
+            "label": self.label,
+            "field": self.field,
+            "path": self.path.name if self.path else None,
+            "entries": len(self.entries),
+            "note": self.note,
+        }
+
+
+@dataclass(frozen=True)
+class NameConflict:
+    hip: int
+    field: str
+    chosen: tuple[str, str]
+    rejected: tuple[str, str]
+
+
+@dataclass(frozen=True)
+class NameCollision:
+    key: str
+    hip: int
+    other_hip: int
+
+
+# --- 出典の読み込み ---
+
+def table_source(label: str, table: Mapping[int, str], field: str = "properName") -> NameSource:
+    return NameSource(label, field, {hip: SourceEntry(name) for hip, name in table.items()})
+
+
+def typescript_source(path: Path, label: Optional[str] = None, field: str = "properName") -> NameSource:
+    """`12345: '名前',` の並んだ TypeScript の Record（data/brightStarNames.ts）"""
+    text = path.read_text(encoding="utf-8")
+    entries = {int(hip): SourceEntry(name) for hip, name in re.findall(r"^\s*(\d+):\s*'([^']+)'", text, re.M)}
+    return NameSource(label or path.name, field, entries, path)
+
+
+def stellarium_source(path: Path, label: Optional[str] = None) -> NameSource:
+    """Stellarium の common_star_names.fab（`HIP|_("Name") 参照番号`）"""
+    entries: dict[int, SourceEntry] = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            match = re.match(r'\s*(\d+)\|_\("(.+?)"\)', line)
+            if match:
+                entries.setdefault(int(match.group(1)), SourceEntry(match.group(2)))
+    return NameSource(label or path.name, "iauName", entries, path)
+
+
+def csv_source(path: Path, label: Optional[str] = None, field: str = "iauName") -> NameSource:
+    """
+    HIP 列と名前列を持つ CSV（列名は大文字小文字を区別しない）
+
+    HTML など CSV でない内容（取得に失敗したファイル）や、該当する列が無い場合は
+    空の出典として返し、理由を note に入れる。
+    """
+    source = NameSource(label or path.name, field, {}, path)
+    with path.open(encoding="utf-8", newline="") as f:
+        head = f.read(512)
+        if head.lstrip().lower().startswith(("<!doctype", "<html")):
+            source.note = "CSV ではない（HTML）ため読み込まない"
+            return source
+        f.seek(0)
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        hip_column = columns.get("hip")
+        name_column = next((columns[key] for key in ("name", "iau name", "proper name") if key in columns), None)
+        if hip_column is None or name_column is None:
+            source.note = "HIP 列・名前列が無いため読み込まない"
+            return source
+        for row in reader:
+            hip, name = (row.get(hip_column) or "").strip(), (row.get(name_column) or "").strip()
+            if hip.isdigit() and name:
+                source.entries.setdefault(int(hip), SourceEntry(name))
+    return source
+
+
+# --- 統合 ---
+
+@dataclass
+class NameIndex:
+    hip: np.ndarray
+    proper_name: np.ndarray
+    iau_name: np.ndarray
+    hd: np.ndarray
+    hr: np.ndarray
+    proper_source: np.ndarray
+    iau_source: np.ndarray
+    name_keys: np.ndarray
+    name_rows: np.ndarray
+    sources: list[dict] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        size = int(self.hip.max()) + 1 if len(self.hip) else 0
+        self._row_of_hip = np.full(size, NULL_NUMBER, dtype=np.int32)
+        self._row_of_hip[self.hip] = np.arange(len(self.hip), dtype=np.int32)
+        self._by_hd = {int(k): int(r) for k, r in zip(*_secondary(self.hd))}
+        self._by_hr = {int(k): int(r) for k, r in zip(*_secondary(self.hr))}
+        self._by_name = dict(zip(self.name_keys.tolist(), self.name_rows.tolist()))
+
+    def __len__(self) -> int:
+        return len(self.hip)
+
+    # --- 検索 ---
+
+    def row(self, hip: int) -> int:
+        """HIP 番号の行（無ければ -1）"""
+        return int(self._row_of_hip[hip]) if 0 <= hip < len(self._row_of_hip) else NULL_NUMBER
+
+    def rows(self, hips: np.ndarray) -> np.ndarray:
+        """HIP 番号の配列 → 行の配列（無ければ -1）"""
+        hips = np.asarray(hips)
+        inside = (hips >= 0) & (hips < len(self._row_of_hip))
+        rows = np.full(hips.shape, NULL_NUMBER, dtype=np.int32)
+        rows[inside] = self._row_of_hip[hips[inside]]
+        return rows
+
+    def proper_name_of(self, hip: int) -> Optional[str]:
+        row = self.row(hip)
+        return str(self.proper_name[row]) or None if row >= 0 else None
+
+    def entry(self, row: int) -> dict:
+        return {
+            "hip": int(self.hip[row]),
+            "properName": str(self.proper_name[row]) or None,
+            "iauName": str(self.iau_name[row]) or None,
+            "hd": int(self.hd[row]) if self.hd[row] >= 0 else None,
+            "hr": int(self.hr[row]) if self.hr[row] >= 0 else None,
+        }
+
+    def hip_for_hd(self, hd: int) -> Optional[int]:
+        row = self._by_hd.get(hd)
+        return None if row is None else int(self.hip[row])
+
+    def hip_for_hr(self, hr: int) -> Optional[int]:
+        row = self._by_hr.get(hr)
+        return None if row is None else int(self.hip[row])
+
+    def hip_for_name(self, name: str) -> Optional[int]:
+        row = self._by_name.get(normalize_name(name))
+        return None if row is None else int(self.hip[row])
+
+    # --- 保存・読み込み ---
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        hd_keys, hd_rows = _secondary(self.hd)
+        hr_keys, hr_rows = _secondary(self.hr)
+        meta = json.dumps({"version": INDEX_VERSION, "sources": self.sources}, ensure_ascii=False)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                hip=self.hip,
+                proper_name=self.proper_name,
+                iau_name=self.iau_name,
+                hd=self.hd,
+                hr=self.hr,
+                proper_source=self.proper_source,
+                iau_source=self.iau_source,
+                hd_keys=hd_keys,
+                hd_rows=hd_rows,
+                hr_keys=hr_keys,
+                hr_rows=hr_rows,
+                name_keys=self.name_keys,
+                name_rows=self.name_rows,
+                meta=np.array(meta),
+            )
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "NameIndex":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["version"] != INDEX_VERSION:
+                raise ValueError(f"名前索引の版が異なります（{meta['version']}、期待: {INDEX_VERSION}）: {path}")
+            return cls(
+                hip=data["hip"],
+                proper_name=data["proper_name"],
+                iau_name=data["iau_name"],
+                hd=data["hd"],
+                hr=data["hr"],
+                proper_source=data["proper_source"],
+                iau_source=data["iau_source"],
+                name_keys=data["name_keys"],
+                name_rows=data["name_rows"],
+                sources=meta["sources"],
+            )
+
+
+def _secondary(numbers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """番号 → 行 の副索引（番号の昇順。同じ番号が複数あれば先の行）"""
+    rows = np.flatnonzero(numbers >= 0).astype(np.int32)
+    keys, first = np.unique(numbers[rows], return_index=True)
+    return keys.astype(np.int32), rows[first]
+
+
+def merge_sources(
+    sources: Sequence[NameSource],
+) -> tuple[NameIndex, list[NameConflict], list[NameCollision]]:
+    """
+    出典を優先順位の高い順に統合する
+
+    欄ごとに最初に名前を持っていた出典を採用し、HD / HR 番号も最初に持っていた出典の値を使う。
+    名前の副索引は、同じキーが別の HIP 番号を指す場合に先に登録したほう（カタカナ → 英語名の順、
+    それぞれ HIP 番号の昇順）を残し、NameCollision として報告する。
+    """
+    for source in sources:
+        if source.field not in FIELDS:
+            raise ValueError(f"未知の欄です: {source.field}（{source.label}）")
+
+    hips = sorted({hip for source in sources for hip in source.entries})
+    chosen: dict[str, dict[int, tuple[int, str]]] = {name: {} for name in FIELDS}
+    numbers: dict[str, dict[int, int]] = {"hd": {}, "hr": {}}
+    aliases: dict[int, list[str]] = {}
+    conflicts: list[NameConflict] = []
+    for number, source in enumerate(sources):
+        for hip, entry in source.entries.items():
+            current = chosen[source.field].get(hip)
+            if current is None:
+                chosen[source.field][hip] = (number, entry.name)
+            elif current[1] != entry.name:
+                conflicts.append(NameConflict(
+                    hip, source.field, (sources[current[0]].label, current[1]), (source.label, entry.name)
+                ))
+            if entry.hd is not None:
+                numbers["hd"].setdefault(hip, entry.hd)
+            if entry.hr is not None:
+                numbers["hr"].setdefault(hip, entry.hr)
+            aliases.setdefault(hip, []).extend(entry.aliases)
+    conflicts.sort(key=lambda c: (FIELDS.index(c.field), c.hip))
+
+    def column(values: Mapping[int, int]) -> np.ndarray:
+        return np.array([values.get(hip, NULL_NUMBER) for hip in hips], dtype=np.int32)
+
+    def names(field_name: str) -> tuple[np.ndarray, np.ndarray]:
+        values = [chosen[field_name].get(hip, (NULL_NUMBER, "")) for hip in hips]
+        return (
+            np.array([name for _, name in values], dtype=str),
+            np.array([number for number, _ in values], dtype=np.int8),
+        )
+
+    proper_name, proper_source = names("properName")
+    iau_name, iau_source = names("iauName")
+
+    by_name: dict[str, int] = {}
+    collisions: list[NameCollision] = []
+
+    def register(row: int, values: Iterable[str]) -> None:
+        for value in values:
+            key = normalize_name(value)
+            if not key:
+                continue
+            existing = by_name.setdefault(key, row)
+            if existing != row:
+                collisions.append(NameCollision(key, hips[row], hips[existing]))
+
+    for field_values in (proper_name, iau_name):
+        for row, value in enumerate(field_values.tolist()):
+            register(row, [value])
+    for row, hip in enumerate(hips):
+        register(row, aliases.get(hip, []))
+    name_keys = sorted(by_name)
+
+    index = NameIndex(
+        hip=np.array(hips, dtype=np.int32),
+        proper_name=proper_name,
+        iau_name=iau_name,
+        hd=column(numbers["hd"]),
+        hr=column(numbers["hr"]),
+        proper_source=proper_source,
+        iau_source=iau_source,
+        name_keys=np.array(name_keys, dtype=str),
+        name_rows=np.array([by_name[key] for key in name_keys], dtype=np.int32),
+        sources=[source.describe() for source in sources],
+    )
+    return index, conflicts, collisions
+
+
+def apply_proper_names(records: Sequence[dict], index: NameIndex) -> None:
+    """
+    星のレコードに索引のカタカナ表記（properName）を一括で付ける（HIP 番号 → 行の配列参照 1 回）
+
+    索引に名前の無い星と HIP 番号の無い星は None にする。
+    """
+    hips = np.array([NULL_NUMBER if record.get("id") is None else record["id"] for record in records], dtype=np.int64)
+    for record, row in zip(records, index.rows(hips).tolist()):
+        record["properName"] = str(index.proper_name[row]) or None if row >= 0 else None
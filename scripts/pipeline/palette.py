@@ -0,0 +1,140 @@
+"""
+星の表示色の固定パレット（B-V / スペクトル型 → 色クラス、等級 → 白への混合段階）
+
+描画側（lib/canvas/starRenderer.ts）は毎フレーム B-V から色文字列を作っていたため、
+ビルド時に色クラスと暗さの段階を uint8 のパレット番号にまとめて渡す。
+パレット番号 = 色クラス × FADE_LEVELS + 白への混合段階。
+同じ番号の星は同じ色になるので、描画側は色ごとにまとめて描ける。
+
+色クラスの判定:
+  B-V があれば BV_CLASS_LIMITS（上限値、未満で判定）で分類する。
+  B-V が無ければスペクトル型の先頭文字、どちらも無ければ UNKNOWN_CLASS。
+  スペクトル型だけで決まる K 型は、以前の SPECTRAL_COLORS と同じ橙色の専用クラスにする。
+  UNKNOWN_CLASS の描画色は以前の描画（B-V 欠損を 0 とみなした色）と同じ黄白。
+  stars.json の color 欄（class_colors）では以前どおり白にする。
+  Tycho-2 の BT-VT は tycho_bv で Johnson B-V に換算してから分類する。
+
+白への混合は描画側と同じく (vmag - 3.5) / 2.5 を 0〜1 に切り詰めた量で、
+FADE_LEVELS 段階に丸める（段階 0 は元の色そのまま）。
+lib/canvas/starPalette.ts は同じ定数でパレットを組み立てるため、変更時は両方を揃えること。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+PALETTE_VERSION = 1
+
+# 色クラス（番号順）
+COLOR_CLASSES: tuple[str, ...] = (
+    "#9bb0ff",  # 0: 青白い星（O,B型）
+    "#cad7ff",  # 1: 白い星（A型）
+    "#fff4ea",  # 2: 黄白い星（F型）
+    "#fffaf0",  # 3: 黄色い星（G型）
+    "#ffd2a1",  # 4: オレンジ色の星（K型）
+    "#ff7f00",  # 5: 赤い星（M型）
+    "#ffb56c",  # 6: オレンジ色の星（スペクトル型だけで判定した K型）
+    "#fff4ea",  # 7: 色不明（B-V = 0 とみなした色）
+)
+UNKNOWN_CLASS = len(COLOR_CLASSES) - 1
+# stars.json の color 欄で色不明の星に使う色
+UNKNOWN_FIELD_COLOR = "#ffffff"
+
+# B-V の上限値（この値未満ならその番号のクラス、最後の上限以上は赤）
+BV_CLASS_LIMITS: tuple[float, ...] = (-0.3, 0.0, 0.3, 0.6, 1.4)
+
+# スペクトル型の先頭文字 → 色クラス（各型の代表的な B-V が入るクラス）
+SPECTRAL_CLASSES: dict[str, int] = {"O": 0, "B": 1, "A": 2, "F": 3, "G": 4, "K": 6, "M": 5}
+
+FADE_LEVELS = 8
+FADE_START_MAGNITUDE = 3.5
+FADE_RANGE = 2.5
+
+# BT-VT → B-V の換算係数（Hipparcos/Tycho カタログ解説 1.3 節の近似）
+TYCHO_BV_FACTOR = 0.850
+
+
+def tycho_bv(bt: np.ndarray, vt: np.ndarray) -> np.ndarray:
+    return TYCHO_BV_FACTOR * (np.asarray(bt, dtype=np.float64) - np.asarray(vt, dtype=np.float64))
+
+
+def bv_class(bv: np.ndarray) -> np.ndarray:
+    """B-V → 色クラス（欠損は UNKNOWN_CLASS）"""
+    values = np.asarray(bv, dtype=np.float64)
+    classes = np.searchsorted(np.asarray(BV_CLASS_LIMITS), values, side="right").astype(np.uint8)
+    classes[np.isnan(values)] = UNKNOWN_CLASS
+    return classes
+
+
+def spectral_class(spectral_types: Sequence[object]) -> np.ndarray:
+    """スペクトル型の先頭文字 → 色クラス（不明は UNKNOWN_CLASS）"""
+    classes = np.full(len(spectral_types), UNKNOWN_CLASS, dtype=np.uint8)
+    for row, value in enumerate(spectral_types):
+        if isinstance(value, str):
+            code = SPECTRAL_CLASSES.get(value.strip()[:1].upper())
+            if code is not None:
+                classes[row] = code
+    return classes
+
+
+def color_class(bv: np.ndarray, spectral_types: Sequence[object] | None = None) -> np.ndarray:
+    """B-V を優先し、欠損の星だけスペクトル型で色クラスを決める"""
+    classes = bv_class(bv)
+    if spectral_types is not None:
+        missing = classes == UNKNOWN_CLASS
+        classes[missing] = spectral_class(spectral_types)[missing]
+    return classes
+
+
+def fade_level(vmag: np.ndarray) -> np.ndarray:
+    """等級 → 白への混合段階（0 〜 FADE_LEVELS - 1、等級不明は 0）"""
+    values = np.asarray(vmag, dtype=np.float64)
+    amount = np.clip((values - FADE_START_MAGNITUDE) / FADE_RANGE, 0.0, 1.0)
+    levels = np.floor(np.nan_to_num(amount) * (FADE_LEVELS - 1) + 0.5)
+    return levels.astype(np.uint8)
+
+
+def palette_index(
+    bv: np.ndarray,
+    spectral_types: Sequence[object] | None,
+    vmag: np.ndarray,
+) -> np.ndarray:
+    """星ごとのパレット番号（uint8）"""
+    return color_class(bv, spectral_types) * np.uint8(FADE_LEVELS) + fade_level(vmag)
+
+
+def mix_with_white(color: str, amount: float) -> str:
+    """#rrggbb を amount（0〜1）だけ白に近づける（描画側の mixWithWhite と同じ丸め）"""
+    amount = min(max(amount, 0.0), 1.0)
+    channels = (int(color[i : i + 2], 16) for i in (1, 3, 5))
+    return "#" + "".join(f"{math.floor(c + (255 - c) * amount + 0.5):02x}" for c in channels)
+
+
+def build_palette() -> list[str]:
+    """パレット番号順の色（#rrggbb）"""
+    return [
+        mix_with_white(color, level / (FADE_LEVELS - 1))
+        for color in COLOR_CLASSES
+        for level in range(FADE_LEVELS)
+    ]
+
+
+def palette_table() -> dict:
+    """public/data/star-palette.json の内容"""
+    return {
+        "version": PALETTE_VERSION,
+        "fadeLevels": FADE_LEVELS,
+        "classes": list(COLOR_CLASSES),
+        "colors": build_palette(),
+    }
+
+
+def class_colors(classes: np.ndarray) -> np.ndarray:
+    """色クラス → stars.json の color 欄の色（白への混合をしない #rrggbb の object 配列、色不明は白）"""
+    classes = np.asarray(classes, dtype=np.intp)
+    colors = np.asarray(COLOR_CLASSES, dtype=object)[classes]
+    colors[classes == UNKNOWN_CLASS] = UNKNOWN_FIELD_COLOR
+    return colors
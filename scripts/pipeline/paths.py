@@ -0,0 +1,12 @@
+"""
+パイプラインで共有するディレクトリ定義
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = ROOT / "scripts"
+RAW_DIR = ROOT / "data" / "raw"
+# 中間生成物（Git管理外）
+GENERATED_DIR = ROOT / "data" / "generated"
+PUBLIC_DATA_DIR = ROOT / "public" / "data"
@@ -0,0 +1,105 @@
+"""
+固有運動による位置の移動（カタログ全体を NumPy で一括計算）
+
+視線速度が不明なため 0 とし、星は空間を等速直線運動するとみなす。
+方向ベクトルは u(t) = normalize(u0 + t·μ) で、μ は接平面上の固有運動ベクトル
+（pmRA = μα cosδ と pmDE から東・北方向の単位ベクトルで組み立てる、rad/年）。
+数万年の移動でも正規化により単位球上に留まる（線形の赤経・赤緯加算とは違い極付近でも破綻しない）。
+
+stars.json の座標は Hipparcos（新整約）の元期 J1991.25。
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from pipeline.sphere import radec_to_unit, unit_to_radec
+
+HIPPARCOS_EPOCH = 1991.25
+MAS_TO_RAD = np.radians(1.0 / 3600.0 / 1000.0)
+DELTA_SCALE_MAX = np.iinfo(np.int16).max
+
+
+def motion_vectors(ra: np.ndarray, dec: np.ndarray, pm_ra: np.ndarray, pm_de: np.ndarray) -> np.ndarray:
+    """固有運動（mas/年、pm_ra は cosδ 込み）→ 接平面上の速度ベクトル（rad/年、欠損は 0）"""
+    ra_rad = np.radians(np.asarray(ra, dtype=np.float64))
+    dec_rad = np.radians(np.asarray(dec, dtype=np.float64))
+    pm_ra = np.nan_to_num(np.asarray(pm_ra, dtype=np.float64)) * MAS_TO_RAD
+    pm_de = np.nan_to_num(np.asarray(pm_de, dtype=np.float64)) * MAS_TO_RAD
+    east = np.stack([-np.sin(ra_rad), np.cos(ra_rad), np.zeros_like(ra_rad)], axis=-1)
+    north = np.stack([
+        -np.sin(dec_rad) * np.cos(ra_rad),
+        -np.sin(dec_rad) * np.sin(ra_rad),
+        np.cos(dec_rad),
+    ], axis=-1)
+    return pm_ra[:, None] * east + pm_de[:, None] * north
+
+
+def propagate_vectors(vectors: np.ndarray, velocity: np.ndarray, years: float) -> np.ndarray:
+    moved = vectors + years * velocity
+    moved /= np.linalg.norm(moved, axis=-1, keepdims=True)
+    return moved
+
+
+def propagate(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    pm_ra: np.ndarray,
+    pm_de: np.ndarray,
+    years: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """赤経・赤緯（度）を years 年後（負なら過去）の位置に移す"""
+    vectors = radec_to_unit(ra, dec)
+    velocity = motion_vectors(ra, dec, pm_ra, pm_de)
+    return unit_to_radec(propagate_vectors(vectors, velocity, years))
+
+
+def propagate_to_epoch(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    pm_ra: np.ndarray,
+    pm_de: np.ndarray,
+    epoch: float,
+    from_epoch: float = HIPPARCOS_EPOCH,
+) -> tuple[np.ndarray, np.ndarray]:
+    return propagate(ra, dec, pm_ra, pm_de, epoch - from_epoch)
+
+
+def keyframe_epochs(step: float, span: float, center: float = 2000.0) -> np.ndarray:
+    """center ± span の範囲を step 年ごとに区切った元期（両端を含む）"""
+    count = int(round(span / step))
+    return center + step * np.arange(-count, count + 1, dtype=np.float64)
+
+
+def quantize_deltas(deltas: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    方向ベクトルの差分 (N, 3) を int16 に量子化する
+
+    戻り値の scale を掛けると元の差分に戻る（scale = 最大絶対値 / 32767）。
+    """
+    peak = float(np.abs(deltas).max()) if deltas.size else 0.0
+    scale = peak / DELTA_SCALE_MAX if peak > 0 else 1.0
+    quantized = np.round(deltas / scale).astype("<i2")
+    return quantized, scale
+
+
+def keyframe_deltas(
+    vectors: np.ndarray,
+    velocity: np.ndarray,
+    epochs: Sequence[float],
+    base_epoch: float = HIPPARCOS_EPOCH,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    各元期での方向ベクトルと基準位置との差分を int16 で返す
+
+    戻り値は (差分 (元期数, N, 3) int16, 元期ごとの scale)。
+    元期ごとに計算するため、メモリは星数 × 元期数 × 6 バイト程度で済む。
+    """
+    frames = np.empty((len(epochs), vectors.shape[0], 3), dtype="<i2")
+    scales = np.empty(len(epochs), dtype=np.float64)
+    for k, epoch in enumerate(epochs):
+        moved = propagate_vectors(vectors, velocity, epoch - base_epoch)
+        frames[k], scales[k] = quantize_deltas(moved - vectors)
+    return frames, scales
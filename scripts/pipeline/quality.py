@@ -0,0 +1,439 @@
+"""
+星データ（stars.bin / stars.json）の品質検査
+
+stars.json と同じ内容を持つ列指向バンドル（pipeline/bundle.py）を読み、全件に対して
+列単位の NumPy 演算で検査する（10 万行で 0.05 秒程度、250 万行で 1 秒弱）。
+文字列列は復元せず、文字列表への索引のまま欠損率だけを見る。
+
+検査項目:
+  schema          列の有無・型・長さ（失敗した場合は以降の検査を行わない）
+  nan-rate        列ごとの欠損率（NAN_LIMITS を超えると失敗）
+  range           ra / dec / vmag / bv / pmRA / pmDE / colorIndex の値域
+  unit-vector     x, y, z が単位ベクトルで、ra / dec と同じ方向を指していること
+  duplicate-id    HIP 番号（id）の重複・0 以下
+  parallax        年周視差の上限（最も近い恒星より大きいものは失敗）と、0 以下の割合（警告）
+  tier-counts     等級シャードの累計件数が目安（expected_counts、カタログごとに呼び出し側が渡す）の範囲内か
+  consistency     stars.json の HIP 番号の並びと properName の有無・マニフェストのシャード件数がバンドルと一致するか
+  proper-name     stars.json の properName が空でなく、名前索引のカタカナ表記と一致するか
+
+stars.json は 1 レコードずつ読み、id と properName だけを見る。
+
+各検査は severity が "error" なら違反時に全体を失敗とし、"warning" は報告だけする。
+レポート例（data/generated/quality/stars.json）:
+  {"version": 1, "status": "failed", "rows": 102372, "seconds": 0.08,
+   "source": "public/data/stars.bin",
+   "checks": [{"name": "range:dec", "severity": "error", "status": "failed", "violations": 2,
+               "message": "-90〜90 の範囲外", "examples": [12345, 67890]}, ...],
+   "nanRates": {"ra": 0.0, "bv": 0.012, ...},
+   "tiers": [{"name": "mag4", "cumulativeCount": 513, "expected": 513}, ...]}
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+from pipeline.bundle import NULL_INT, STAR_COLUMNS, STAR_STRING_COLUMNS, null_value, read_bundle
+from pipeline.jsonout import read_records
+from pipeline.nameindex import NameIndex
+from pipeline.palette import build_palette
+from pipeline.paths import GENERATED_DIR, ROOT
+from pipeline.tiers import TIER_LIMITS, tier_name
+
+REPORT_VERSION = 1
+MAX_EXAMPLES = 5
+
+# 列ごとの欠損率の上限（載っていない列は率だけを報告する。hd / hr は大半が欠損）
+NAN_LIMITS: dict[str, float] = {
+    "id": 0.0,
+    "ra": 0.001,
+    "dec": 0.001,
+    "vmag": 0.001,
+    "x": 0.001,
+    "y": 0.001,
+    "z": 0.001,
+    "colorIndex": 0.0,
+    "bv": 0.05,
+    "parallax": 0.05,
+    "pmRA": 0.05,
+    "pmDE": 0.05,
+}
+
+# 値域（両端を含む。ra の上限だけは含まない）
+VALUE_RANGES: dict[str, tuple[float, float]] = {
+    "ra": (0.0, 360.0),
+    "dec": (-90.0, 90.0),
+    "vmag": (-1.6, 14.0),      # シリウス -1.46 等〜Hipparcos の最も暗い星
+    "bv": (-0.5, 6.0),         # 炭素星で 5 台まである
+    "pmRA": (-11000.0, 11000.0),  # バーナード星 10.4″/年
+    "pmDE": (-11000.0, 11000.0),
+}
+
+# 最も近い恒星（プロキシマ・ケンタウリ 768 mas）より大きい年周視差はありえない
+MAX_PARALLAX_MAS = 800.0
+# 0 以下の年周視差（測定誤差で負になる遠方の星）がこの割合を超えたら警告する
+MAX_NONPOSITIVE_PARALLAX_SHARE = 0.15
+
+# 方向余弦と ra / dec のずれの許容値（float32 の丸めを含む）
+UNIT_VECTOR_TOLERANCE = 1e-5
+DIRECTION_TOLERANCE_ARCSEC = 1.0
+
+# 等級シャードの累計件数の許容誤差（目安の件数はカタログごとに異なるため validate_bundle に渡す）
+COUNT_TOLERANCE = 0.1
+
+
+def report_path() -> Path:
+    return GENERATED_DIR / "quality" / "stars.json"
+
+
+@dataclass
+class CheckResult:
+    name: str
+    severity: str
+    violations: int
+    message: str
+    examples: list[int] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.violations > 0
+
+    def to_json(self) -> dict:
+        entry = asdict(self)
+        entry["status"] = ("failed" if self.severity == "error" else "warning") if self.failed else "ok"
+        if not self.examples:
+            del entry["examples"]
+        return entry
+
+
+def is_null(values: np.ndarray, dtype: str) -> np.ndarray:
+    """欠損値（NaN・-1・符号なし整数の最大値）の真偽配列"""
+    if np.dtype(dtype).kind == "f":
+        return np.isnan(values)
+    return values == null_value(dtype)
+
+
+def _examples(ids: np.ndarray, mask: np.ndarray) -> list[int]:
+    return ids[mask][:MAX_EXAMPLES].tolist()
+
+
+def check_schema(header: Mapping, columns: Mapping[str, object]) -> list[CheckResult]:
+    count = header["count"]
+    problems = []
+    for name, dtype in STAR_COLUMNS.items():
+        values = columns.get(name)
+        if values is None:
+            problems.append(f"{name} がない")
+        elif np.asarray(values).dtype != np.dtype(dtype):
+            problems.append(f"{name} の型が {np.asarray(values).dtype}（期待: {dtype}）")
+        elif len(values) != count:
+            problems.append(f"{name} の長さが {len(values)}（期待: {count}）")
+    for name in STAR_STRING_COLUMNS:
+        values = columns.get(name)
+        if values is None:
+            problems.append(f"{name} がない")
+        elif np.asarray(values).dtype != np.int32:
+            problems.append(f"{name} が文字列表への索引でない")
+        elif len(values) != count:
+            problems.append(f"{name} の長さが {len(values)}（期待: {count}）")
+    return [CheckResult("schema", "error", len(problems), "、".join(problems) or "列・型・長さが一致")]
+
+
+def nan_rates(columns: Mapping[str, object]) -> dict[str, float]:
+    rates = {}
+    for name, dtype in STAR_COLUMNS.items():
+        values = columns[name]
+        rates[name] = float(is_null(values, dtype).mean()) if len(values) else 0.0
+    for name in STAR_STRING_COLUMNS:
+        values = columns[name]
+        rates[name] = float((values < 0).mean()) if len(values) else 0.0
+    return rates
+
+
+def check_nan_rates(rates: Mapping[str, float], limits: Mapping[str, float] = NAN_LIMITS) -> list[CheckResult]:
+    results = []
+    for name, limit in limits.items():
+        rate = rates[name]
+        results.append(CheckResult(
+            f"nan-rate:{name}",
+            "error",
+            int(rate > limit),
+            f"欠損率 {rate:.4%}（上限 {limit:.2%}）",
+        ))
+    return results
+
+
+def check_ranges(columns: Mapping[str, object], ranges: Mapping[str, tuple[float, float]] = VALUE_RANGES) -> list[CheckResult]:
+    ids = columns["id"]
+    results = []
+    for name, (low, high) in ranges.items():
+        values = columns[name]
+        # NaN は比較がすべて偽になるので範囲外に数えない（欠損率は nan-rate で見る）
+        outside = (values < low) | (values >= high if name == "ra" else values > high)
+        upper = "未満" if name == "ra" else ""
+        results.append(CheckResult(
+            f"range:{name}", "error", int(outside.sum()), f"{low:g}〜{high:g}{upper} の範囲外", _examples(ids, outside)
+        ))
+    palette_size = len(build_palette())
+    color = columns["colorIndex"]
+    outside = (color >= palette_size) & ~is_null(color, STAR_COLUMNS["colorIndex"])
+    results.append(CheckResult(
+        "range:colorIndex", "error", int(outside.sum()), f"パレット（{palette_size} 色）の範囲外", _examples(ids, outside)
+    ))
+    return results
+
+
+def check_unit_vectors(columns: Mapping[str, object]) -> list[CheckResult]:
+    ids = columns["id"]
+    vectors = np.stack([columns["x"], columns["y"], columns["z"]], axis=1).astype(np.float64)
+    ra = np.radians(columns["ra"].astype(np.float64))
+    dec = np.radians(columns["dec"].astype(np.float64))
+    expected = np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)], axis=1)
+
+    norm = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    present = ~np.isnan(norm)
+    not_unit = present & (np.abs(norm - 1.0) > UNIT_VECTOR_TOLERANCE)
+    # 座標と方向余弦の片方だけが欠損しているものも不一致に数える
+    distance = np.linalg.norm(vectors - expected, axis=1)
+    tolerance = np.radians(DIRECTION_TOLERANCE_ARCSEC / 3600.0)
+    mismatch = (distance > tolerance) | (np.isnan(distance) & (present != ~np.isnan(ra + dec)))
+    return [
+        CheckResult("unit-vector:norm", "error", int(not_unit.sum()),
+                    f"|(x, y, z)| と 1 の差が {UNIT_VECTOR_TOLERANCE:g} を超える", _examples(ids, not_unit)),
+        CheckResult("unit-vector:direction", "error", int(mismatch.sum()),
+                    f"ra / dec との方向のずれが {DIRECTION_TOLERANCE_ARCSEC:g}″ を超える", _examples(ids, mismatch)),
+    ]
+
+
+def check_ids(columns: Mapping[str, object]) -> list[CheckResult]:
+    ids = columns["id"]
+    unique, counts = np.unique(ids, return_counts=True)
+    duplicated = unique[counts > 1]
+    invalid = ids <= 0
+    return [
+        CheckResult("duplicate-id", "error", int((counts[counts > 1] - 1).sum()),
+                    f"重複する HIP 番号 {len(duplicated)} 種類", duplicated[:MAX_EXAMPLES].tolist()),
+        CheckResult("invalid-id", "error", int(invalid.sum()), "0 以下の HIP 番号（欠損を含む）", _examples(ids, invalid)),
+    ]
+
+
+def check_parallax(columns: Mapping[str, object]) -> list[CheckResult]:
+    ids = columns["id"]
+    parallax = columns["parallax"]
+    too_large = parallax > MAX_PARALLAX_MAS
+    measured = ~np.isnan(parallax)
+    nonpositive = measured & (parallax <= 0.0)
+    share = float(nonpositive.sum() / measured.sum()) if measured.any() else 0.0
+    return [
+        CheckResult("parallax:max", "error", int(too_large.sum()),
+                    f"{MAX_PARALLAX_MAS:g} mas を超える年周視差", _examples(ids, too_large)),
+        CheckResult("parallax:nonpositive", "warning", int(share > MAX_NONPOSITIVE_PARALLAX_SHARE),
+                    f"0 以下の年周視差 {share:.2%}（目安 {MAX_NONPOSITIVE_PARALLAX_SHARE:.0%} 以下）"),
+    ]
+
+
+def tier_counts(vmag: np.ndarray, limits: Sequence[float] = TIER_LIMITS) -> list[dict]:
+    """シャードごとの件数と累計件数（区間は下限を含まず上限を含む。等級不明は rest）"""
+    known = np.sort(vmag[~np.isnan(vmag)])
+    cumulative = np.searchsorted(known, np.asarray(limits, dtype=known.dtype), side="right").tolist()
+    cumulative.append(len(vmag))
+    tiers = []
+    previous = 0
+    for limit, total in zip([*limits, None], cumulative):
+        tiers.append({"name": tier_name(limit), "count": total - previous, "cumulativeCount": total})
+        previous = total
+    return tiers
+
+
+def check_tier_counts(
+    tiers: Sequence[dict],
+    expected: Mapping[str, int],
+    tolerance: float = COUNT_TOLERANCE,
+) -> list[CheckResult]:
+    results = []
+    for tier in tiers:
+        target = expected.get(tier["name"])
+        tier["expected"] = target
+        if target is None:
+            continue
+        actual = tier["cumulativeCount"]
+        results.append(CheckResult(
+            f"tier-counts:{tier['name']}",
+            "error",
+            int(abs(actual - target) > target * tolerance),
+            f"累計 {actual:,} 件（目安 {target:,} 件 ±{tolerance:.0%}）",
+        ))
+    return results
+
+
+def read_json_columns(path: Path) -> tuple[np.ndarray, dict[int, object]]:
+    """stars.json の HIP 番号（欠損は -1）と、properName を持つ星の HIP 番号 → properName"""
+    ids = []
+    proper_names = {}
+    for record in read_records(path):
+        hip = record.get("id")
+        ids.append(NULL_INT if hip is None else hip)
+        if "properName" in record:
+            proper_names[hip] = record["properName"]
+    return np.array(ids, dtype=np.int64), proper_names
+
+
+def check_json(
+    path: Path,
+    ids: np.ndarray,
+    names: Optional[NameIndex] = None,
+    proper_name_rows: Optional[np.ndarray] = None,
+) -> list[CheckResult]:
+    """
+    stars.json の HIP 番号の並びがバンドルと同じか、properName が名前索引どおりかを調べる
+
+    proper_name_rows（バンドルの properName 列の文字列表への索引）を渡すと、properName を持つ星が
+    stars.json とバンドルで同じかも調べる。
+    names=None の場合は properName が空でない文字列かどうかだけを見る。
+    """
+    json_ids, proper_names = read_json_columns(path)
+    shared = min(len(json_ids), len(ids))
+    reordered = json_ids[:shared] != ids[:shared]
+    results = [CheckResult(
+        "consistency:json",
+        "error",
+        int(reordered.sum()) + abs(len(json_ids) - len(ids)),
+        f"{path.name} {len(json_ids):,} 件、バンドル {len(ids):,} 件（HIP 番号の並びが異なる行 {int(reordered.sum()):,}）",
+        json_ids[:shared][reordered][:MAX_EXAMPLES].tolist(),
+    )]
+    if proper_name_rows is not None:
+        named = np.isin(ids, np.array([hip for hip in proper_names if hip is not None], dtype=np.int64))
+        differs = named != (proper_name_rows >= 0)
+        results.append(CheckResult(
+            "consistency:proper-name",
+            "error",
+            int(differs.sum()),
+            f"properName を持つ星 {path.name} {len(proper_names):,} 件、バンドル {int((proper_name_rows >= 0).sum()):,} 件",
+            _examples(ids, differs),
+        ))
+
+    invalid = [hip for hip, name in proper_names.items() if not isinstance(name, str) or not name.strip()]
+    results.append(CheckResult(
+        "proper-name:empty", "error", len(invalid), "空または文字列でない properName", invalid[:MAX_EXAMPLES]
+    ))
+    if names is not None:
+        expected = {}
+        for hip in np.intersect1d(names.hip, json_ids).tolist():
+            name = names.proper_name_of(hip)
+            if name is not None:
+                expected[hip] = name
+        mismatched = sorted(hip for hip in expected.keys() | proper_names.keys()
+                            if expected.get(hip) != proper_names.get(hip))
+        results.append(CheckResult(
+            "proper-name:index",
+            "error",
+            len(mismatched),
+            f"名前索引と異なる properName（{len(proper_names):,} 件中、索引の該当 {len(expected):,} 件）",
+            mismatched[:MAX_EXAMPLES],
+        ))
+    return results
+
+
+def check_consistency(
+    rows: int,
+    tiers: Sequence[dict],
+    manifest_path: Optional[Path] = None,
+) -> list[CheckResult]:
+    results = []
+    if manifest_path is not None and manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        expected = {tier["name"]: tier["count"] for tier in tiers}
+        actual = {tier["name"]: tier["count"] for tier in manifest["tiers"]}
+        mismatched = sorted(name for name in expected.keys() | actual.keys() if expected.get(name) != actual.get(name))
+        results.append(CheckResult(
+            "consistency:manifest",
+            "error",
+            len(mismatched) + int(manifest["total"] != rows),
+            f"シャード件数の不一致: {', '.join(mismatched)}" if mismatched else f"総数 {manifest['total']:,} 件",
+        ))
+    return results
+
+
+def validate_bundle(
+    path: Path,
+    *,
+    json_path: Optional[Path] = None,
+    manifest_path: Optional[Path] = None,
+    names: Optional[NameIndex] = None,
+    expected_counts: Optional[Mapping[str, int]] = None,
+    count_tolerance: float = COUNT_TOLERANCE,
+    skip: Sequence[str] = (),
+) -> dict:
+    """
+    バンドル（と json_path の stars.json）を検査してレポート（辞書）を返す
+
+    skip には検査名の接頭辞（"tier-counts"、"parallax" など）を指定する。
+    expected_counts は等級シャード名 → 累計件数の目安（{"mag4": 513, "rest": 102372} など）で、
+    None の場合は件数を報告だけする。names を渡すと properName を名前索引と突き合わせる。
+    """
+    started = time.perf_counter()
+    header, columns = read_bundle(path, decode_strings=False)
+    rows = header["count"]
+    checks = check_schema(header, columns)
+    rates: dict[str, float] = {}
+    tiers: list[dict] = []
+    if not checks[0].failed:
+        rates = nan_rates(columns)
+        tiers = tier_counts(columns["vmag"])
+        checks += check_nan_rates(rates)
+        checks += check_ranges(columns)
+        checks += check_unit_vectors(columns)
+        checks += check_ids(columns)
+        checks += check_parallax(columns)
+        checks += check_tier_counts(tiers, expected_counts or {}, count_tolerance)
+        checks += check_consistency(rows, tiers, manifest_path)
+        if json_path is not None and json_path.exists():
+            checks += check_json(json_path, columns["id"], names, columns["properName"])
+    checks = [check for check in checks if not any(check.name.startswith(prefix) for prefix in skip)]
+
+    failed = any(check.failed and check.severity == "error" for check in checks)
+    return {
+        "version": REPORT_VERSION,
+        "status": "failed" if failed else "ok",
+        "rows": rows,
+        "seconds": round(time.perf_counter() - started, 3),
+        "source": _relative(path),
+        "checks": [check.to_json() for check in checks],
+        "nanRates": {name: round(rate, 6) for name, rate in rates.items()},
+        "tiers": tiers,
+    }
+
+
+def _relative(path: Path) -> str:
+    resolved = path.resolve()
+    try:
+        return resolved.relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(resolved)
+
+
+def write_report(report: dict, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    return path
+
+
+def format_report(report: dict, verbose: bool = False) -> str:
+    """違反のあった検査（verbose なら全検査）の一覧"""
+    lines = [f"品質検査: {report['source']}（{report['rows']:,} 行、{report['seconds']:.2f} 秒）"]
+    for check in report["checks"]:
+        if check["status"] == "ok" and not verbose:
+            continue
+        mark = {"ok": "OK", "warning": "警告", "failed": "失敗"}[check["status"]]
+        examples = f"（例: {', '.join(map(str, check['examples']))}）" if check.get("examples") else ""
+        count = f" {check['violations']:,} 件" if check["status"] != "ok" and check["violations"] > 1 else ""
+        lines.append(f"  [{mark}] {check['name']}{count}: {check['message']}{examples}")
+    failures = sum(1 for check in report["checks"] if check["status"] == "failed")
+    warnings = sum(1 for check in report["checks"] if check["status"] == "warning")
+    lines.append(f"  検査 {len(report['checks'])} 件: 失敗 {failures}、警告 {warnings}")
+    return "\n".join(lines)
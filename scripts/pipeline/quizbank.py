@@ -0,0 +1,325 @@
+"""
+クイズの問題バンク（種類 × 難易度 × 出題範囲ごとに、検証済みの問題を前もって作っておく）
+
+lib/data/quizGenerator/ の各クイズは、出題のたびに星の配列全体を絞り込んで並べ替えている。
+ここで問題（対象の星・比較する星・選択肢・正解の位置）を前もって作っておくと、アプリ側の
+出題は配列から 1 件取り出すだけになり、難易度の偏りも数千問単位で事前に確かめられる。
+
+判定の定数は TypeScript 側と同じ（変更時は両方を揃えること）:
+  FIND_STAR_MAX_VMAG     findStarQuiz.ts の等級の上限
+  BRIGHTNESS_MAG_DIFF    brightnessQuiz.ts の等級差の下限。バンクでは次の難易度の下限を上限に
+                         した帯にする（hard の問題が easy 並みに易しくならないように）
+  SPECTRAL_COLORS        colorQuiz.ts の getColorFromSpectralType
+  COLOR_CHOICES          colorQuiz.ts の getColorChoices（easy に「オレンジ」は無いので、
+                         K 型の星は easy に出さない）
+  format_distance        distanceQuiz.ts の formatDistance（Math.round と同じ四捨五入）
+
+層別抽出: 対象の星はまず層（等級・色・距離の区分）を一様に選び、その層の中から一様に選ぶ。
+明るさ比べの比較相手と距離の誤答も同じく層を選んでから選ぶので、明るい星や白い星ばかりに
+偏らない。乱数は numpy の Generator で、種（seed）と (種類, 難易度, 出題範囲) の番号から
+作るため、同じ入力と種からは同じバンクができる。
+
+形式（public/data/quiz/<種類>-<難易度>-<出題範囲>.json、lib/data/quizBank.ts が読む）:
+  version, type, difficulty, category, seed, stream, count, unique
+  strata     {"name": 層の種類, "edges": 区分の境界, "counts": 層ごとの問題数}
+  questions  列ごとの配列（HIP 番号と正解の位置）
+    find-star   target
+    brightness  first, second（選択肢の順）, answer（明るい方の位置）
+    color       target, answer（COLOR_CHOICES の位置）
+    distance    target, choices（光年。format_distance で丸めた値）, answer
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from pipeline.paths import PUBLIC_DATA_DIR
+
+BANK_VERSION = 1
+QUIZ_TYPES: tuple[str, ...] = ("find-star", "brightness", "color", "distance")
+DIFFICULTIES: tuple[str, ...] = ("easy", "medium", "hard")
+CATEGORIES: tuple[str, ...] = ("north", "south", "all")
+DEFAULT_BANK_SIZE = 2000
+DEFAULT_SEED = 20261017
+
+FIND_STAR_MAX_VMAG = {"easy": 1.5, "medium": 2.5, "hard": 4.0}
+BRIGHTNESS_MAG_DIFF = {"easy": (1.5, math.inf), "medium": (0.8, 1.5), "hard": (0.3, 0.8)}
+COLOR_NAMES: tuple[str, ...] = ("青白い", "白い", "黄色い", "オレンジ", "赤い")
+SPECTRAL_COLORS = {"O": 0, "B": 0, "A": 1, "F": 1, "G": 2, "K": 3, "M": 4}
+DEFAULT_COLOR = 1  # 不明なスペクトル型は「白い」
+COLOR_CHOICES = {"easy": (0, 1, 2, 4), "medium": (0, 1, 2, 3, 4), "hard": (0, 1, 2, 3, 4)}
+DISTANCE_CHOICE_COUNT = 4
+# 誤答に使う距離の層と、正解の層との差（easy は 2 層以上離す、hard は隣の層まで）
+DISTANCE_STRATUM_GAP = {"easy": (2, None), "medium": (1, None), "hard": (0, 1)}
+
+MAGNITUDE_EDGES: tuple[float, ...] = (0.0, 1.0, 2.0, 3.0)
+DISTANCE_EDGES_LY: tuple[float, ...] = (10.0, 50.0, 100.0, 500.0, 1000.0)
+LIGHT_YEARS_PER_PARSEC = 3.26
+
+
+def bank_dir() -> Path:
+    return PUBLIC_DATA_DIR / "quiz"
+
+
+def shard_name(quiz_type: str, difficulty: str, category: str) -> str:
+    return f"{quiz_type}-{difficulty}-{category}.json"
+
+
+def js_round(value: float) -> int:
+    """Math.round と同じ四捨五入（.5 は正の無限大の方向）"""
+    return math.floor(value + 0.5)
+
+
+def format_distance(light_years: float) -> int:
+    """distanceQuiz.ts の formatDistance が表示する光年の値"""
+    if light_years < 10:
+        return js_round(light_years)
+    if light_years < 100:
+        return js_round(light_years / 5) * 5
+    if light_years < 500:
+        return js_round(light_years / 10) * 10
+    return js_round(light_years / 50) * 50
+
+
+def color_class(spectral_type: Optional[str]) -> int:
+    return SPECTRAL_COLORS.get((spectral_type or "")[:1].upper(), DEFAULT_COLOR)
+
+
+@dataclass
+class StarTable:
+    """出題に使う星（固有名の有無に関係なく全件。列は stars.bin と同じ並び）"""
+
+    hip: np.ndarray
+    ra: np.ndarray
+    dec: np.ndarray
+    vmag: np.ndarray
+    parallax: np.ndarray
+    color: np.ndarray  # COLOR_NAMES の番号（スペクトル型が無ければ -1）
+    named: np.ndarray  # 固有名（カタカナ表記）がある
+
+    @property
+    def distance(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.parallax > 0, 1000.0 / self.parallax * LIGHT_YEARS_PER_PARSEC, np.nan)
+
+    def in_category(self, category: str) -> np.ndarray:
+        if category == "north":
+            return self.dec >= 0
+        if category == "south":
+            return self.dec < 0
+        return np.ones(len(self.hip), dtype=bool)
+
+
+def star_table(columns: dict, spectral_types: Sequence[Optional[str]], named: np.ndarray) -> StarTable:
+    color = np.array([color_class(s) if s else -1 for s in spectral_types], dtype=np.int8)
+    return StarTable(
+        hip=np.asarray(columns["id"], dtype=np.int32),
+        ra=np.asarray(columns["ra"], dtype=np.float64),
+        dec=np.asarray(columns["dec"], dtype=np.float64),
+        vmag=np.asarray(columns["vmag"], dtype=np.float64),
+        parallax=np.asarray(columns["parallax"], dtype=np.float64),
+        color=color,
+        named=np.asarray(named, dtype=bool),
+    )
+
+
+# --- 層別抽出 ---
+
+def stratified_sample(rng: np.random.Generator, strata: np.ndarray, size: int) -> np.ndarray:
+    """層を一様に選び、層の中から一様に選んだ位置（strata の添字）を size 件返す"""
+    labels = np.unique(strata)
+    if not len(labels) or size <= 0:
+        return np.empty(0, dtype=np.int64)
+    picks = rng.integers(len(labels), size=size)
+    result = np.empty(size, dtype=np.int64)
+    for number, label in enumerate(labels):
+        slots = np.flatnonzero(picks == number)
+        if len(slots):
+            result[slots] = rng.choice(np.flatnonzero(strata == label), size=len(slots))
+    return result
+
+
+def stratify(values: np.ndarray, edges: Sequence[float]) -> np.ndarray:
+    return np.searchsorted(np.asarray(edges), values, side="right")
+
+
+@dataclass
+class Bank:
+    quiz_type: str
+    difficulty: str
+    category: str
+    questions: dict[str, list]
+    strata_name: str
+    strata_edges: Sequence[float]
+    strata: np.ndarray  # 問題ごとの対象の層
+    skipped: int = 0  # 条件を満たす問題を作れなかった抽選の数
+    metrics: dict = field(default_factory=dict)  # 種類ごとの難易度の目安（レポート用）
+
+    @property
+    def count(self) -> int:
+        return len(self.strata)
+
+    def unique(self) -> int:
+        columns = [self.questions[name] for name in sorted(self.questions)]
+        rows = zip(*[[tuple(v) if isinstance(v, list) else v for v in column] for column in columns])
+        return len(set(rows))
+
+    def to_dict(self, seed: int, stream: Sequence[int]) -> dict:
+        counts = np.bincount(self.strata, minlength=len(self.strata_edges) + 1) if self.count else []
+        return {
+            "version": BANK_VERSION,
+            "type": self.quiz_type,
+            "difficulty": self.difficulty,
+            "category": self.category,
+            "seed": seed,
+            "stream": list(stream),
+            "count": self.count,
+            "unique": self.unique(),
+            "strata": {"name": self.strata_name, "edges": list(self.strata_edges), "counts": list(map(int, counts))},
+            "questions": self.questions,
+        }
+
+
+def _hips(stars: StarTable, rows: np.ndarray) -> list[int]:
+    return stars.hip[rows].tolist()
+
+
+def find_star_bank(stars: StarTable, difficulty: str, category: str, size: int, rng: np.random.Generator) -> Bank:
+    eligible = np.flatnonzero(
+        stars.named & stars.in_category(category) & (stars.vmag <= FIND_STAR_MAX_VMAG[difficulty])
+    )
+    strata = stratify(stars.vmag[eligible], MAGNITUDE_EDGES)
+    rows = eligible[stratified_sample(rng, strata, size if len(eligible) else 0)]
+    return Bank("find-star", difficulty, category, {"target": _hips(stars, rows)},
+                "vmag", MAGNITUDE_EDGES, stratify(stars.vmag[rows], MAGNITUDE_EDGES))
+
+
+def brightness_bank(stars: StarTable, difficulty: str, category: str, size: int, rng: np.random.Generator) -> Bank:
+    low, high = BRIGHTNESS_MAG_DIFF[difficulty]
+    candidates = np.flatnonzero(stars.named & stars.in_category(category) & ~np.isnan(stars.vmag))
+    vmag = stars.vmag[candidates]
+    difference = np.abs(vmag[:, None] - vmag[None, :])
+    partners = (difference >= low) & (difference < high)  # 固有名の星は数百件なので組は全部並べられる
+    has_partner = np.flatnonzero(partners.any(axis=1))
+    strata_of = stratify(vmag, MAGNITUDE_EDGES)
+
+    first, second, answer, target_strata = [], [], [], []
+    if len(has_partner):
+        for a in has_partner[stratified_sample(rng, strata_of[has_partner], size)].tolist():
+            options = np.flatnonzero(partners[a])
+            b = int(options[stratified_sample(rng, strata_of[options], 1)[0]])
+            pair = (a, b) if rng.random() < 0.5 else (b, a)
+            first.append(int(stars.hip[candidates[pair[0]]]))
+            second.append(int(stars.hip[candidates[pair[1]]]))
+            answer.append(0 if vmag[pair[0]] < vmag[pair[1]] else 1)
+            target_strata.append(strata_of[a])
+    bank = Bank("brightness", difficulty, category, {"first": first, "second": second, "answer": answer},
+                "vmag", MAGNITUDE_EDGES, np.asarray(target_strata, dtype=np.int64))
+    if first:
+        row_of_hip = {int(hip): row for row, hip in enumerate(stars.hip.tolist())}
+        gaps = [abs(stars.vmag[row_of_hip[a]] - stars.vmag[row_of_hip[b]]) for a, b in zip(first, second)]
+        bank.metrics["meanMagDiff"] = round(float(np.mean(gaps)), 3)
+    return bank
+
+
+def color_bank(stars: StarTable, difficulty: str, category: str, size: int, rng: np.random.Generator) -> Bank:
+    choices = COLOR_CHOICES[difficulty]
+    eligible = np.flatnonzero(stars.named & stars.in_category(category) & np.isin(stars.color, choices))
+    rows = eligible[stratified_sample(rng, stars.color[eligible], size if len(eligible) else 0)]
+    answer = [choices.index(int(color)) for color in stars.color[rows].tolist()]
+    edges = tuple(range(1, len(COLOR_NAMES)))
+    return Bank("color", difficulty, category, {"target": _hips(stars, rows), "answer": answer},
+                "color", edges, stars.color[rows].astype(np.int64))
+
+
+def distance_bank(stars: StarTable, difficulty: str, category: str, size: int, rng: np.random.Generator) -> Bank:
+    distance = stars.distance
+    known = np.flatnonzero(~np.isnan(distance))
+    known_strata = stratify(distance[known], DISTANCE_EDGES_LY)
+    members = {int(label): known[known_strata == label] for label in np.unique(known_strata)}
+    eligible = np.flatnonzero(stars.named & stars.in_category(category) & ~np.isnan(distance))
+    eligible_strata = stratify(distance[eligible], DISTANCE_EDGES_LY)
+    gap_low, gap_high = DISTANCE_STRATUM_GAP[difficulty]
+
+    def allowed_strata(stratum: int) -> list[int]:
+        return [
+            label for label in members
+            if abs(label - stratum) >= gap_low and (gap_high is None or abs(label - stratum) <= gap_high)
+        ]
+
+    # 誤答の候補の層は対象の層だけで決まるので、層ごとに 1 回だけ求める
+    allowed = {int(stratum): allowed_strata(int(stratum)) for stratum in np.unique(eligible_strata)}
+
+    targets, choices, answer, target_strata = [], [], [], []
+    skipped = 0
+    picks = stratified_sample(rng, eligible_strata, size if len(eligible) else 0)
+    for row, stratum in zip(eligible[picks].tolist(), eligible_strata[picks].tolist()):
+        correct = format_distance(distance[row])
+        values = [correct]
+        labels = allowed[stratum]
+        draws = DISTANCE_CHOICE_COUNT * 4
+        # 層を選んでから星を選ぶ。表示が重複する値は引き直す（数回で足りなければこの星は見送る）
+        for label in (rng.integers(len(labels), size=draws).tolist() if labels else []):
+            pool = members[labels[label]]
+            value = format_distance(distance[pool[rng.integers(len(pool))]])
+            if value not in values:
+                values.append(value)
+            if len(values) == DISTANCE_CHOICE_COUNT:
+                break
+        if len(values) < DISTANCE_CHOICE_COUNT:
+            skipped += 1
+            continue
+        order = rng.permutation(DISTANCE_CHOICE_COUNT)
+        targets.append(int(stars.hip[row]))
+        choices.append([values[i] for i in order.tolist()])
+        answer.append(int(np.flatnonzero(order == 0)[0]))
+        target_strata.append(stratum)
+    bank = Bank("distance", difficulty, category, {"target": targets, "choices": choices, "answer": answer},
+                "distanceLy", DISTANCE_EDGES_LY, np.asarray(target_strata, dtype=np.int64))
+    bank.skipped = skipped
+    if targets:
+        # 正解と最も近い誤答の比（1 に近いほど難しい）
+        ratios = [
+            min(max(value, correct) / max(min(value, correct), 1) for value in row if value != correct)
+            for row, correct in ((row, row[a]) for row, a in zip(choices, answer))
+        ]
+        bank.metrics["medianNearestRatio"] = round(float(np.median(ratios)), 3)
+    return bank
+
+
+BUILDERS: dict[str, Callable[..., Bank]] = {
+    "find-star": find_star_bank,
+    "brightness": brightness_bank,
+    "color": color_bank,
+    "distance": distance_bank,
+}
+
+
+def shard_rng(seed: int, quiz_type: str, difficulty: str, category: str) -> tuple[np.random.Generator, tuple]:
+    """バンクごとの乱数（種と番号が同じなら、他のバンクの有無に関係なく同じ列になる）"""
+    stream = (QUIZ_TYPES.index(quiz_type), DIFFICULTIES.index(difficulty), CATEGORIES.index(category))
+    return np.random.default_rng([seed, *stream]), stream
+
+
+def balance(bank: Bank) -> dict:
+    """難易度の偏りの確認用（層ごとの割合、正解の位置の割合など）"""
+    summary: dict = {
+        "count": bank.count,
+        "unique": bank.unique(),
+        "skipped": bank.skipped,
+        "strata": {
+            "name": bank.strata_name,
+            "share": np.round(np.bincount(bank.strata, minlength=len(bank.strata_edges) + 1)
+                              / max(bank.count, 1), 3).tolist(),
+        },
+    }
+    if "answer" in bank.questions and bank.count:
+        answers = np.asarray(bank.questions["answer"])
+        summary["answerShare"] = np.round(np.bincount(answers) / len(answers), 3).tolist()
+    summary.update(bank.metrics)
+    return summary
@@ -0,0 +1,360 @@
+"""
+星の名前検索の索引（正規化した検索キーの接頭辞表と 3-gram の転置リスト）
+
+オートコンプリートとクイズの解答判定が、星の配列（約 10 万件）を毎回なめずに
+索引の参照だけで済むようにする。検索できる表記:
+  properName  カタカナ表記（シリウス）
+  iauName     IAU 英語名（Sirius）
+  bayer       バイエル符号（α CMa。alp CMa / alpha CMa でも引ける）
+  flamsteed   フラムスティード番号（9 CMa）
+  HIP / HD / HR 番号（"HIP 32349"、"HD 48915"、"HR 2491"）は catalog で完全一致
+
+正規化（normalize_search_text、lib/data/starSearchIndex.ts と同じ手順。変更時は両方を揃えること）:
+  1. NFKC（全角英数・半角カナ・上付き数字を通常の文字に）
+  2. 小文字化（str.lower と String.prototype.toLowerCase が一致する範囲で使う）
+  3. ギリシャ文字 → バイエル符号の略号（α → alp）
+  4. 結合用のダイアクリティカルマーク（U+0300〜U+036F）を除く（Acamar / Açamar）。
+     濁点・半濁点は NFD の後に NFC で戻すので残る（ガ と カ は区別する）
+  5. ひらがな → カタカナ（しりうす → シリウス）
+  6. 空白と区切り記号（・ - . ' など）を除く。長音符「ー」は残す
+
+形式（public/data/search-index.json）:
+  version
+  kinds       表記の種類（entries.kind はこの配列の番号）
+  entries     {"hip": [...], "kind": [...], "text": [...]}
+              表示順（種類 → 明るい順 → HIP 番号）に並べた表記
+  keys        検索キー（昇順。接頭辞はこの配列の二分探索で引く）
+  keyEntries  キーごとの entries の番号（昇順 = 表示順、差分符号化）
+  trigrams    キーに現れる 3-gram（昇順）
+  postings    3-gram ごとの keys の番号（昇順、差分符号化）
+  catalog     {"hip": [...], "hd": [...], "hdHip": [...], "hr": [...], "hrHip": [...]}
+              収録している HIP 番号、HD / HR 番号（いずれも昇順、差分符号化）と対応する HIP 番号
+
+キーの並びは Python の str の比較（コードポイント順）で決める。キーは基本多言語面の文字だけ
+なので、JavaScript の文字列比較（UTF-16 の符号単位順）とも一致する。
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from pipeline.paths import PUBLIC_DATA_DIR
+
+INDEX_VERSION = 1
+KINDS: tuple[str, ...] = ("properName", "iauName", "bayer", "flamsteed")
+DEFAULT_LIMIT = 10
+NGRAM = 3
+
+# (バイエル符号の略号, ギリシャ文字, 英語の綴り)
+GREEK_LETTERS: tuple[tuple[str, str, str], ...] = (
+    ("alp", "α", "alpha"), ("bet", "β", "beta"), ("gam", "γ", "gamma"), ("del", "δ", "delta"),
+    ("eps", "ε", "epsilon"), ("zet", "ζ", "zeta"), ("eta", "η", "eta"), ("the", "θ", "theta"),
+    ("iot", "ι", "iota"), ("kap", "κ", "kappa"), ("lam", "λ", "lambda"), ("mu", "μ", "mu"),
+    ("nu", "ν", "nu"), ("xi", "ξ", "xi"), ("omi", "ο", "omicron"), ("pi", "π", "pi"),
+    ("rho", "ρ", "rho"), ("sig", "σ", "sigma"), ("tau", "τ", "tau"), ("ups", "υ", "upsilon"),
+    ("phi", "φ", "phi"), ("chi", "χ", "chi"), ("psi", "ψ", "psi"), ("ome", "ω", "omega"),
+)
+GREEK_ABBREVIATIONS: dict[str, str] = {
+    **{letter: abbreviation for abbreviation, letter, _ in GREEK_LETTERS},
+    "ς": "sig",  # 語末形のシグマ
+    "ϑ": "the",  # NFKC で θ にならない異体字
+    "ϕ": "phi",
+}
+SEPARATORS = frozenset(" \t　・･-‐‑–—−_.,'’`\"")
+SUPERSCRIPT_DIGITS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+# stars.json の name 欄（BSC の表記。"9Alp CMa"、"Alp1 Cen"、"61 Cyg"）。
+# BSC は固定幅のため、上付きの番号の後は空白なしで星座が続くことがある（"Alp1Cen"、"Gam2Vel"）
+DESIGNATION_PATTERN = re.compile(r"^(\d+)?\s*(?:([A-Z][a-z]{1,2})(\d)?)?(?:\s+|(?<=[a-z]\d))([A-Z][A-Za-z]{2})$")
+CATALOG_QUERY_PATTERN = re.compile(r"^(hip|hd|hr)(\d+)$")
+
+_HIRAGANA_START, _HIRAGANA_END = 0x3041, 0x309E
+_KATAKANA_OFFSET = 0x60
+_COMBINING_START, _COMBINING_END = 0x0300, 0x036F
+
+
+def index_path() -> Path:
+    return PUBLIC_DATA_DIR / "search-index.json"
+
+
+def normalize_search_text(text: str) -> str:
+    """検索キー・検索語の正規化（手順はモジュールの説明を参照）"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(GREEK_ABBREVIATIONS.get(ch, ch) for ch in text)
+    text = unicodedata.normalize("NFD", text)
+    text = "".join(ch for ch in text if not _COMBINING_START <= ord(ch) <= _COMBINING_END)
+    text = unicodedata.normalize("NFC", text)
+    return "".join(
+        chr(ord(ch) + _KATAKANA_OFFSET) if _HIRAGANA_START <= ord(ch) <= _HIRAGANA_END else ch
+        for ch in text
+        if ch not in SEPARATORS
+    )
+
+
+def trigrams(key: str) -> set[str]:
+    return {key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1)}
+
+
+# --- 符号 ---
+
+@dataclass(frozen=True)
+class Designation:
+    flamsteed: Optional[int]
+    bayer: Optional[str]  # 略号（小文字。"alp"）
+    bayer_index: Optional[int]  # 上付きの番号（α¹ の 1）
+    constellation: str  # 略号（"CMa"）
+
+
+_GREEK_BY_ABBREVIATION = {abbreviation: (letter, spelled) for abbreviation, letter, spelled in GREEK_LETTERS}
+
+
+def parse_designation(name: Optional[str]) -> Optional[Designation]:
+    """BSC 形式の符号を分解する（バイエル符号でもフラムスティード番号でもなければ None）"""
+    match = DESIGNATION_PATTERN.match((name or "").strip())
+    if not match:
+        return None
+    flamsteed, bayer, index, constellation = match.groups()
+    if bayer and bayer.lower() not in _GREEK_BY_ABBREVIATION:
+        return None  # ギリシャ文字以外（変光星符号など）
+    if not flamsteed and not bayer:
+        return None
+    return Designation(
+        flamsteed=int(flamsteed) if flamsteed else None,
+        bayer=bayer.lower() if bayer else None,
+        bayer_index=int(index) if index else None,
+        constellation=constellation,
+    )
+
+
+def designation_forms(designation: Designation) -> list[tuple[str, str, list[str]]]:
+    """符号 → (種類, 表示する表記, 検索キー) の一覧"""
+    forms = []
+    if designation.bayer:
+        letter, spelled = _GREEK_BY_ABBREVIATION[designation.bayer]
+        index = str(designation.bayer_index) if designation.bayer_index else ""
+        text = f"{letter}{index.translate(SUPERSCRIPT_DIGITS)} {designation.constellation}"
+        constellation = designation.constellation.lower()
+        keys = [f"{designation.bayer}{index}{constellation}", f"{spelled}{index}{constellation}"]
+        if index:  # α¹ Cen は "α Cen" でも引けるようにする
+            keys += [f"{designation.bayer}{constellation}", f"{spelled}{constellation}"]
+        forms.append(("bayer", text, keys))
+    if designation.flamsteed:
+        text = f"{designation.flamsteed} {designation.constellation}"
+        forms.append(("flamsteed", text, [normalize_search_text(text)]))
+    return forms
+
+
+# --- 組み立て ---
+
+def _delta(values: Sequence[int]) -> list[int]:
+    """昇順の整数列 → 差分（先頭はそのまま）"""
+    return np.diff(np.asarray(values, dtype=np.int64), prepend=0).tolist()
+
+
+def _undelta(values: Sequence[int]) -> np.ndarray:
+    return np.cumsum(np.asarray(values, dtype=np.int64)).astype(np.int32)
+
+
+def _catalog_column(numbers: np.ndarray, hips: np.ndarray) -> tuple[list[int], list[int]]:
+    present = numbers >= 0
+    numbers, hips = numbers[present], hips[present]
+    if not len(numbers):  # 番号を持つ星が無い（HD / HR 番号の無いカタログ）
+        return [], []
+    order = np.lexsort((hips, numbers))
+    numbers, hips = numbers[order], hips[order]
+    first = np.concatenate(([True], numbers[1:] != numbers[:-1]))  # 同じ番号は HIP 番号の小さい方
+    return _delta(numbers[first]), hips[first].tolist()
+
+
+def build_search_index(
+    hips: np.ndarray,
+    vmags: np.ndarray,
+    designations: Sequence[Optional[str]],
+    hds: np.ndarray,
+    hrs: np.ndarray,
+    proper_names: Sequence[Optional[str]],
+    iau_names: Sequence[Optional[str]],
+) -> dict:
+    """星の列（stars.bin の並び）から索引を組み立てる。名前は各行の星のもの（無ければ None）"""
+    hips = np.asarray(hips, dtype=np.int32)
+    brightness = np.where(np.isnan(vmags), np.inf, vmags)
+
+    entries: list[tuple[int, float, int, str, list[str]]] = []  # (種類, 等級, HIP, 表記, キー)
+    for row, hip in enumerate(hips.tolist()):
+        forms = []
+        if proper_names[row]:
+            forms.append(("properName", proper_names[row], [normalize_search_text(proper_names[row])]))
+        if iau_names[row]:
+            forms.append(("iauName", iau_names[row], [normalize_search_text(iau_names[row])]))
+        designation = parse_designation(designations[row])
+        if designation:
+            forms += designation_forms(designation)
+        for kind, text, keys in forms:
+            entries.append((KINDS.index(kind), float(brightness[row]), hip, text, keys))
+    entries.sort(key=lambda entry: entry[:3])
+
+    entries_of_key: dict[str, list[int]] = {}
+    for number, (_, _, _, _, keys) in enumerate(entries):
+        for key in dict.fromkeys(keys):
+            if key:
+                entries_of_key.setdefault(key, []).append(number)
+    keys = sorted(entries_of_key)
+
+    postings: dict[str, list[int]] = {}
+    for number, key in enumerate(keys):
+        for gram in trigrams(key):
+            postings.setdefault(gram, []).append(number)
+    grams = sorted(postings)
+
+    hd, hd_hip = _catalog_column(np.asarray(hds), hips)
+    hr, hr_hip = _catalog_column(np.asarray(hrs), hips)
+    return {
+        "version": INDEX_VERSION,
+        "kinds": list(KINDS),
+        "entries": {
+            "hip": [entry[2] for entry in entries],
+            "kind": [entry[0] for entry in entries],
+            "text": [entry[3] for entry in entries],
+        },
+        "keys": keys,
+        "keyEntries": [_delta(entries_of_key[key]) for key in keys],
+        "trigrams": grams,
+        "postings": [_delta(postings[gram]) for gram in grams],
+        "catalog": {"hip": _delta(np.unique(hips)), "hd": hd, "hdHip": hd_hip, "hr": hr, "hrHip": hr_hip},
+    }
+
+
+# --- 検索 ---
+
+@dataclass(frozen=True)
+class SearchHit:
+    hip: int
+    text: str
+    kind: str
+
+
+def _intersect(lists: Iterable[np.ndarray]) -> np.ndarray:
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        result = np.intersect1d(result, other, assume_unique=True)
+        if not len(result):
+            break
+    return result
+
+
+class SearchIndex:
+    """search-index.json を読み込んだ索引（lib/data/starSearchIndex.ts と同じ手順で引く）"""
+
+    def __init__(self, data: dict) -> None:
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"search-index の形式が違います: version={data.get('version')}（期待値 {INDEX_VERSION}）")
+        self.kinds: list[str] = data["kinds"]
+        self.entry_hip: list[int] = data["entries"]["hip"]
+        self.entry_kind: list[int] = data["entries"]["kind"]
+        self.entry_text: list[str] = data["entries"]["text"]
+        self.keys: list[str] = data["keys"]
+        self.key_entries = [_undelta(values) for values in data["keyEntries"]]
+        self._key_number = {key: number for number, key in enumerate(self.keys)}
+        self._postings = {gram: _undelta(values) for gram, values in zip(data["trigrams"], data["postings"])}
+        catalog = data["catalog"]
+        self._hips = set(_undelta(catalog["hip"]).tolist())
+        self._catalog = {
+            "hd": dict(zip(_undelta(catalog["hd"]).tolist(), catalog["hdHip"])),
+            "hr": dict(zip(_undelta(catalog["hr"]).tolist(), catalog["hrHip"])),
+        }
+
+    def __len__(self) -> int:
+        return len(self.entry_hip)
+
+    def _hit(self, entry: int) -> SearchHit:
+        return SearchHit(self.entry_hip[entry], self.entry_text[entry], self.kinds[self.entry_kind[entry]])
+
+    def _hits(self, keys: Iterable[int], limit: int, seen: set[int]) -> list[SearchHit]:
+        """検索キーの番号 → その表記を表示順に、星ごとに最初の 1 件だけ limit 件まで
+
+        表記に印を付けてから先頭から走査するので、候補の数によらず並べ替えは要らない
+        （短い検索語で数千件の表記が当たっても、走査は表記の件数分で済む）。
+        """
+        hits: list[SearchHit] = []
+        keys = list(keys)
+        if not keys or limit <= 0:
+            return hits
+        marked = np.zeros(len(self.entry_hip), dtype=bool)
+        marked[np.concatenate([self.key_entries[number] for number in keys])] = True
+        for entry in np.flatnonzero(marked).tolist():
+            hip = self.entry_hip[entry]
+            if hip in seen:
+                continue
+            seen.add(hip)
+            hits.append(self._hit(entry))
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def catalog_hip(self, key: str) -> Optional[int]:
+        """正規化した "hip32349" / "hd48915" / "hr2491" → HIP 番号（収録外なら None）"""
+        match = CATALOG_QUERY_PATTERN.match(key)
+        if not match:
+            return None
+        catalog, number = match.group(1), int(match.group(2))
+        if catalog == "hip":
+            return number if number in self._hips else None
+        return self._catalog[catalog].get(number)
+
+    def prefix_range(self, key: str) -> range:
+        """key で始まる検索キーの番号の範囲"""
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, key + "\uffff", lo=start)
+        return range(start, end)
+
+    def substring_keys(self, key: str) -> list[int]:
+        """key を含む検索キーの番号（3 文字以上。3-gram の積集合を取ってから部分一致を確かめる）"""
+        grams = trigrams(key)
+        if not grams or any(gram not in self._postings for gram in grams):
+            return []
+        candidates = _intersect(self._postings[gram] for gram in grams)
+        return [number for number in candidates.tolist() if key in self.keys[number]]
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+        """オートコンプリート: カタログ番号・検索キーの完全一致 → 接頭辞一致 → 部分一致 の順に limit 件まで"""
+        key = normalize_search_text(query)
+        if not key:
+            return []
+        seen: set[int] = set()
+        hits = []
+        hip = self.catalog_hip(key)
+        if hip is not None:
+            seen.add(hip)
+            hits.append(SearchHit(hip, query.strip(), "catalog"))
+        exact = self._key_number.get(key)
+        if exact is not None:
+            hits += self._hits([exact], limit - len(hits), seen)
+        prefixed = self.prefix_range(key)
+        hits += self._hits((number for number in prefixed if number != exact), limit - len(hits), seen)
+        if len(hits) < limit and len(key) >= NGRAM:
+            inner = (number for number in self.substring_keys(key) if number not in prefixed)
+            hits += self._hits(inner, limit - len(hits), seen)
+        return hits
+
+    def resolve(self, answer: str) -> list[int]:
+        """解答の表記と完全一致する星の HIP 番号（表示順。同じ表記の星が複数あればすべて）"""
+        key = normalize_search_text(answer)
+        hip = self.catalog_hip(key)
+        if hip is not None:
+            return [hip]
+        number = self._key_number.get(key)
+        if number is None:
+            return []
+        return list(dict.fromkeys(self.entry_hip[entry] for entry in self.key_entries[number].tolist()))
+
+    def matches(self, answer: str, hip: int) -> bool:
+        """クイズの解答判定: answer がその星の名前・符号・カタログ番号のどれかと一致するか"""
+        return hip in self.resolve(answer)
@@ -0,0 +1,205 @@
+"""
+SIMBAD からの HIP 番号 → 名前の一括照合（非同期・バッチ・永続キャッシュ付き）
+
+Simbad.query_object を1件ずつ呼ぶ代わりに、SIMBAD の TAP（ADQL）エンドポイントへ
+HIP 番号をまとめて問い合わせる。
+- バッチ単位で同時実行数を制限し、HTTP 接続はセッション内で使い回す
+- 429 / 5xx / タイムアウトは指数バックオフで再試行する
+- 結果は HIP 番号をキーとする SQLite に逐次保存し、再実行時は未解決分だけを問い合わせる
+  （見つからなかった HIP も空文字で記録し、NOT_FOUND_TTL の間は再問い合わせしない。
+  SIMBAD 側に後から識別子が追加されることがあるため、期限が過ぎたら問い合わせ直す）
+
+エンドポイントは環境変数 SIMBAD_TAP_URL で差し替えられる（scripts/tests/standins.py のスタブ等）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import aiohttp
+
+DEFAULT_TAP_URL = "https://simbad.cds.unistra.fr/simbad/sim-tap/sync"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+NOT_FOUND_TTL = 30 * 86400  # 秒
+
+QUERY_TEMPLATE = """SELECT ident.id AS query_id, basic.main_id, ids.ids
+FROM ident
+JOIN basic ON basic.oid = ident.oidref
+JOIN ids ON ids.oidref = ident.oidref
+WHERE ident.id IN ({identifiers})"""
+
+
+@dataclass(frozen=True)
+class SimbadName:
+    hip: int
+    name: str
+    main_id: str
+    ids: str
+
+
+def pick_name(main_id: str, ids: str) -> str:
+    """識別子一覧から代表名を選ぶ（固有名 "NAME xxx" を優先し、無ければ先頭の識別子）"""
+    identifiers = [item.strip() for item in ids.split("|") if item.strip()]
+    for identifier in identifiers:
+        if identifier.startswith("NAME "):
+            return identifier[len("NAME "):].strip()
+    if identifiers:
+        return identifiers[0]
+    return main_id.strip()
+
+
+def build_query(hips: Iterable[int]) -> str:
+    identifiers = ", ".join(f"'HIP {int(hip)}'" for hip in hips)
+    return QUERY_TEMPLATE.format(identifiers=identifiers)
+
+
+def parse_response(text: str) -> dict[int, SimbadName]:
+    """TAP の CSV 応答を HIP 番号ごとの結果に変換する"""
+    results: dict[int, SimbadName] = {}
+    for row in csv.DictReader(io.StringIO(text)):
+        query_id = (row.get("query_id") or "").strip()
+        if not query_id.startswith("HIP "):
+            continue
+        hip = int(query_id[len("HIP "):])
+        main_id = row.get("main_id") or ""
+        ids = row.get("ids") or ""
+        results[hip] = SimbadName(hip=hip, name=pick_name(main_id, ids), main_id=main_id, ids=ids)
+    return results
+
+
+class SimbadNameCache:
+    """
+    HIP 番号をキーとする照合結果の SQLite キャッシュ
+
+    見つからなかった HIP（名前が空文字の行）は not_found_ttl 秒を過ぎると missing() に再び含まれる。
+    """
+
+    def __init__(self, path: Path, not_found_ttl: float = NOT_FOUND_TTL) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.not_found_ttl = not_found_ttl
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS names ("
+            " hip INTEGER PRIMARY KEY, name TEXT NOT NULL, main_id TEXT NOT NULL,"
+            " ids TEXT NOT NULL, resolved_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SimbadNameCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def missing(self, hips: Iterable[int]) -> list[int]:
+        """キャッシュに無い HIP 番号と、見つからなかったまま期限が過ぎた HIP 番号"""
+        expired = time.time() - self.not_found_ttl
+        known = {
+            row[0]
+            for row in self._conn.execute(
+                "SELECT hip FROM names WHERE name != '' OR resolved_at > ?", (expired,)
+            )
+        }
+        return sorted({int(hip) for hip in hips} - known)
+
+    def store(self, requested: Iterable[int], results: dict[int, SimbadName]) -> None:
+        """1バッチ分を保存する。見つからなかった HIP は空文字で記録する"""
+        now = time.time()
+        rows = []
+        for hip in requested:
+            found = results.get(hip)
+            if found is None:
+                rows.append((hip, "", "", "", now))
+            else:
+                rows.append((hip, found.name, found.main_id, found.ids, now))
+        self._conn.executemany("INSERT OR REPLACE INTO names VALUES (?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+
+    def names(self) -> dict[int, str]:
+        """見つかった HIP 番号 → 代表名（見つからなかった HIP は含まない）"""
+        return dict(self._conn.execute("SELECT hip, name FROM names WHERE name != ''"))
+
+
+async def _query_batch(
+    session: aiohttp.ClientSession,
+    endpoint: str,
+    hips: list[int],
+    retries: int,
+    backoff: float,
+) -> dict[int, SimbadName]:
+    payload = {"REQUEST": "doQuery", "LANG": "ADQL", "FORMAT": "csv", "QUERY": build_query(hips)}
+    attempt = 0
+    while True:
+        try:
+            async with session.post(endpoint, data=payload) as response:
+                if response.status in RETRY_STATUSES:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status
+                    )
+                response.raise_for_status()
+                return parse_response(await response.text())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            status = getattr(exc, "status", None)
+            if attempt >= retries or (status is not None and status not in RETRY_STATUSES):
+                raise
+        await asyncio.sleep(backoff * (2 ** attempt))
+        attempt += 1
+
+
+async def resolve_names(
+    hips: Iterable[int],
+    cache: SimbadNameCache,
+    *,
+    endpoint: Optional[str] = None,
+    batch_size: int = 500,
+    concurrency: int = 4,
+    retries: int = 4,
+    backoff: float = 1.0,
+    timeout: float = 120.0,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> dict[str, int]:
+    """
+    キャッシュに無い HIP 番号だけを SIMBAD に問い合わせてキャッシュへ保存する
+
+    on_batch(完了件数, 対象件数) はバッチ完了ごとに呼ばれる。
+    戻り値は {"requested": 対象件数, "resolved": 保存件数, "failed": 失敗件数}。
+    失敗したバッチはキャッシュに残らないため、再実行すると再び対象になる。
+    """
+    endpoint = endpoint or os.environ.get("SIMBAD_TAP_URL", DEFAULT_TAP_URL)
+    pending = cache.missing(hips)
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    stats = {"requested": len(pending), "resolved": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+
+        async def run(batch: list[int]) -> None:
+            async with semaphore:
+                try:
+                    results = await _query_batch(session, endpoint, batch, retries, backoff)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    stats["failed"] += len(batch)
+                    print(f"⚠️ SIMBAD 照合失敗（HIP {batch[0]}〜{batch[-1]}、{len(batch)} 件）: {exc}")
+                else:
+                    cache.store(batch, results)
+                    stats["resolved"] += len(batch)
+            if on_batch:
+                on_batch(stats["resolved"] + stats["failed"], stats["requested"])
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+
+    return stats
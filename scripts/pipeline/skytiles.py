@@ -0,0 +1,114 @@
+"""
+HEALPix セル単位の星データ分割（public/data/sky/）
+
+等級シャード（pipeline/tiers.py と同じ区間）ごとに HEALPix の order を決め、
+セルごとに stars.bin 形式のファイルを書き出す。明るいシャードは粗いセル、
+暗いシャードほど細かいセルに分割し、1ファイルあたりの件数を揃える。
+
+セル索引（public/data/sky/index.json）例:
+  {
+    "version": 1,
+    "scheme": "healpix-nested",
+    "tiers": [
+      {"name": "mag4", "minMagnitude": null, "maxMagnitude": 4.0, "order": 0, "count": 513,
+       "cells": [
+         {"pixel": 0, "count": 41, "center": [0.52, 0.48, 0.70], "radius": 38.2,
+          "path": "sky/mag4/o0-0.bin", "bytes": 2688},
+         ...
+       ]},
+      ...
+    ]
+  }
+
+center / radius はセル内の星をすべて含む球冠（ICRS 単位ベクトル・度）。
+クライアントは視野の中心方向との角距離が「視野半径 + radius」以下のセルだけを読み込めばよい。
+空のセルはファイルも索引も作らない。
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from pipeline.bundle import columns_from_records, take_columns, write_bundle
+from pipeline.healpix import ang2pix_nest
+from pipeline.sphere import bounding_cap, radec_to_unit
+from pipeline.tiers import TIER_LIMITS, split_by_magnitude, tier_name
+
+INDEX_VERSION = 1
+SKY_DIRNAME = "sky"
+# シャード名 → HEALPix order（12 * 4**order セル）
+TIER_ORDERS: dict[str, int] = {
+    "mag4": 0,
+    "mag6": 1,
+    "mag7": 2,
+    "mag8": 2,
+    "mag9": 3,
+    "rest": 3,
+}
+DEFAULT_ORDER = 3
+
+
+def partition_cells(ra: np.ndarray, dec: np.ndarray, order: int) -> list[tuple[int, np.ndarray]]:
+    """(画素番号, 行番号の配列) のリストを画素番号順に返す（セル内は元の並び順）"""
+    pixels = ang2pix_nest(order, ra, dec)
+    order_idx = np.argsort(pixels, kind="stable")
+    sorted_pixels = pixels[order_idx]
+    unique, starts = np.unique(sorted_pixels, return_index=True)
+    groups = np.split(order_idx, starts[1:])
+    return [(int(pixel), rows) for pixel, rows in zip(unique, groups)]
+
+
+def write_sky_tiles(
+    stars: Sequence[Mapping[str, object]],
+    public_dir: Path,
+    limits: Sequence[float] = TIER_LIMITS,
+    tier_orders: Mapping[str, int] = TIER_ORDERS,
+) -> dict:
+    """セルごとのファイルを書き出し、セル索引の内容を返す"""
+    sky_dir = public_dir / SKY_DIRNAME
+    if sky_dir.exists():
+        # 以前の order で作ったセルが残らないよう作り直す
+        shutil.rmtree(sky_dir)
+
+    tiers = []
+    bounds = [None, *limits]
+    for idx, shard in enumerate(split_by_magnitude(stars, limits)):
+        upper = limits[idx] if idx < len(limits) else None
+        name = tier_name(upper)
+        order = tier_orders.get(name, DEFAULT_ORDER)
+
+        placed = [star for star in shard if star.get("ra") is not None and star.get("dec") is not None]
+        columns = columns_from_records(placed)
+        ra = columns["ra"].astype(np.float64)  # type: ignore[union-attr]
+        dec = columns["dec"].astype(np.float64)  # type: ignore[union-attr]
+        vectors = radec_to_unit(ra, dec)
+
+        cells = []
+        for pixel, rows in partition_cells(ra, dec, order):
+            path = sky_dir / name / f"o{order}-{pixel}.bin"
+            size = write_bundle(path, take_columns(columns, rows))
+            center, radius = bounding_cap(vectors[rows])
+            cells.append({
+                "pixel": pixel,
+                "count": len(rows),
+                "center": [round(float(c), 6) for c in center],
+                # center の丸め誤差を吸収する余裕を持たせる
+                "radius": round(radius + 0.001, 3),
+                "path": path.relative_to(public_dir).as_posix(),
+                "bytes": size,
+            })
+
+        tiers.append({
+            "name": name,
+            "minMagnitude": bounds[idx],
+            "maxMagnitude": upper,
+            "order": order,
+            "count": len(placed),
+            "cells": cells,
+        })
+
+    return {"version": INDEX_VERSION, "scheme": "healpix-nested", "tiers": tiers}
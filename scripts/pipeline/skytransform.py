@@ -0,0 +1,323 @@
+"""
+赤道座標 → 地平座標・画面座標の一括変換（lib/canvas/coordinateUtils.ts の NumPy 版）
+
+2 つの使い方がある。
+  参照実装   julian_date / local_sidereal_time / equatorial_to_horizontal / celestial_to_screen は
+             coordinateUtils.ts と同じ式を同じ順序で計算する（JavaScript の % は np.fmod、
+             Date の UTC 秒は切り捨て）。三角関数の実装差による末尾桁の違いを除けば TS と一致するので、
+             ゴールデンベクトル（入力と期待値の組）の作成に使う。
+  一括変換   horizontal_grid は星 N 個 × 観測条件 M 個（時刻と観測地）を行列で変換する。
+             時角の sin / cos を加法定理で星ごと・観測条件ごとの値の積に分け、方位角は atan2 で
+             求めるので、要素ごとの三角関数は asin と atan2 の 2 回で済む。サーバー側で星空の
+             スナップショットを作る場合や、大量の入力で TS 側と突き合わせる場合に使う。
+
+ゴールデンベクトルの形式（data/generated/golden/coordinate-transforms.bin、stars.bin と同じ列指向バイナリ）:
+  入力  ra, dec, timeMs（UTC ミリ秒）, latitude, longitude, centerRa, centerDec, zoom, width, height
+  期待値 julianDate, siderealTime, altitude, azimuth,
+        orthographicX, orthographicY, stereographicX, stereographicY（画面外 = null は NaN）
+  すべて float64。判定の境界（画面の裏側・視野の端・画面外の余白・方位角の折り返し）に
+  近すぎる行は、実装差で null かどうかが入れ替わらないよう除いてある。
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from pipeline.paths import GENERATED_DIR
+
+DEG2RAD = math.pi / 180
+RAD2DEG = 180 / math.pi
+OFFSCREEN_MARGIN = 100
+MS_PER_DAY = 86_400_000
+J2000 = 2451545.0
+
+GOLDEN_VERSION = 1
+DEFAULT_GOLDEN_ROWS = 200_000
+DEFAULT_GOLDEN_SEED = 20261017
+# 判定の境界からこれより近い行はゴールデンベクトルに入れない
+BOUNDARY_EPSILON = 1e-9
+SCREEN_EPSILON = 1e-6  # ピクセル
+
+GOLDEN_INPUTS = ("ra", "dec", "timeMs", "latitude", "longitude", "centerRa", "centerDec", "zoom", "width", "height")
+GOLDEN_OUTPUTS = (
+    "julianDate", "siderealTime", "altitude", "azimuth",
+    "orthographicX", "orthographicY", "stereographicX", "stereographicY",
+)
+
+
+def golden_path() -> Path:
+    return GENERATED_DIR / "golden" / "coordinate-transforms.bin"
+
+
+# --- 参照実装（coordinateUtils.ts と同じ式） ---
+
+def normalize_degrees(value: np.ndarray) -> np.ndarray:
+    result = np.fmod(value, 360.0)
+    return np.where(result < 0, result + 360.0, result)
+
+
+def normalized_delta_degrees(value: np.ndarray) -> np.ndarray:
+    delta = np.fmod(value + 180.0, 360.0) - 180.0
+    return np.where(delta < -180.0, delta + 360.0, delta)
+
+
+def _civil_from_days(days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """1970-01-01 からの日数 → (年, 月, 日)（先発グレゴリオ暦。Date の getUTC* と同じ）"""
+    z = days + 719468
+    era = np.floor_divide(z, 146097)
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def julian_date(time_ms: np.ndarray) -> np.ndarray:
+    """getJulianDate（UTC の年月日・時分秒から。ミリ秒は切り捨てる）"""
+    time_ms = np.asarray(time_ms, dtype=np.float64)
+    days = np.floor(time_ms / MS_PER_DAY).astype(np.int64)
+    seconds = np.floor((time_ms - days * float(MS_PER_DAY)) / 1000).astype(np.int64)
+    year, month, day = _civil_from_days(days)
+    hour, minute, second = seconds // 3600, seconds % 3600 // 60, seconds % 60
+
+    y = np.where(month <= 2, year - 1, year)
+    m = np.where(month <= 2, month + 12, month)
+    a = np.floor(y / 100)
+    b = 2 - a + np.floor(a / 4)
+    return (
+        np.floor(365.25 * (y + 4716)) + np.floor(30.6001 * (m + 1)) + day + b - 1524.5
+        + (hour + minute / 60 + second / 3600) / 24
+    )
+
+
+def local_sidereal_time(jd: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """getLocalSiderealTime（度）"""
+    t = (jd - J2000) / 36525.0
+    gst = 280.46061837 + 360.98564736629 * (jd - J2000) + t * t * (0.000387933 - t / 38710000.0)
+    return normalize_degrees(gst + longitude)
+
+
+def equatorial_to_horizontal(
+    ra: np.ndarray, dec: np.ndarray, latitude: np.ndarray, lst: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """equatorialToHorizontal → (方位角, 高度)（度）。引数は互いにブロードキャストできればよい"""
+    lat_rad = latitude * DEG2RAD
+    ha_rad = normalize_degrees(lst - ra) * DEG2RAD
+    dec_rad = dec * DEG2RAD
+    sin_lat, cos_lat = np.sin(lat_rad), np.cos(lat_rad)
+    sin_dec, cos_dec = np.sin(dec_rad), np.cos(dec_rad)
+    sin_alt = sin_lat * sin_dec + cos_lat * cos_dec * np.cos(ha_rad)
+    altitude_rad = np.arcsin(np.clip(sin_alt, -1.0, 1.0))
+
+    cos_alt = np.cos(altitude_rad)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_az = np.clip((sin_dec - sin_lat * sin_alt) / (cos_lat * cos_alt), -1.0, 1.0)
+    azimuth = np.where(cos_alt == 0, 0.0, np.arccos(cos_az) * RAD2DEG)
+    azimuth = np.where(np.sin(ha_rad) > 0, 360.0 - azimuth, azimuth)
+    return azimuth, altitude_rad * RAD2DEG
+
+
+def _projection_terms(ra, dec, center_ra, center_dec):
+    """(cos c, cos δ sin Δα, cos δ0 sin δ - sin δ0 cos δ cos Δα, cos δ, sin Δα)"""
+    delta_ra = normalized_delta_degrees(ra - center_ra) * DEG2RAD
+    dec_rad = dec * DEG2RAD
+    center_rad = center_dec * DEG2RAD
+    sin_center, cos_center = np.sin(center_rad), np.cos(center_rad)
+    sin_dec, cos_dec = np.sin(dec_rad), np.cos(dec_rad)
+    sin_delta, cos_delta = np.sin(delta_ra), np.cos(delta_ra)
+    cos_c = sin_center * sin_dec + cos_center * cos_dec * cos_delta
+    x = cos_dec * sin_delta
+    y = cos_center * sin_dec - sin_center * cos_dec * cos_delta
+    return cos_c, x, y, cos_dec, sin_delta
+
+
+def _scale(zoom, width, height):
+    fov = 90 / zoom
+    return np.minimum(width, height) / 2 / np.tan((fov * DEG2RAD) / 2), fov
+
+
+def celestial_to_screen(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    center_ra: np.ndarray,
+    center_dec: np.ndarray,
+    zoom: np.ndarray,
+    width: np.ndarray,
+    height: np.ndarray,
+    mode: str = "orthographic",
+) -> tuple[np.ndarray, np.ndarray]:
+    """celestialToScreen → (x, y)。TS で null になる位置は NaN"""
+    scale, fov = _scale(zoom, width, height)
+    cos_c, x, y, cos_dec, sin_delta = _projection_terms(ra, dec, center_ra, center_dec)
+    if mode == "orthographic":
+        hidden = cos_c < 0
+        screen_x = width / 2 + x * scale
+        screen_y = height / 2 - y * scale
+    elif mode == "stereographic":
+        hidden = cos_c < np.cos((fov / 2 + 30) * DEG2RAD)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = 2 / (1 + cos_c)
+        screen_x = width / 2 - k * cos_dec * sin_delta * scale
+        screen_y = height / 2 - k * y * scale
+    else:
+        raise ValueError(f"未知の投影: {mode}")
+    hidden = (
+        hidden
+        | (screen_x < -OFFSCREEN_MARGIN) | (screen_x > width + OFFSCREEN_MARGIN)
+        | (screen_y < -OFFSCREEN_MARGIN) | (screen_y > height + OFFSCREEN_MARGIN)
+    )
+    return np.where(hidden, np.nan, screen_x), np.where(hidden, np.nan, screen_y)
+
+
+# --- 一括変換 ---
+
+def horizontal_grid(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    lst: np.ndarray,
+    latitude: np.ndarray,
+    chunk_rows: int = 0,
+    dtype: type = np.float64,
+) -> Iterator[tuple[slice, np.ndarray, np.ndarray]]:
+    """
+    星 N 個 × 観測条件 M 個（地方恒星時と緯度の組）の地平座標を、観測条件 chunk_rows 個ずつ
+    (観測条件の範囲, 方位角 [行, N], 高度 [行, N]) として返す（度）
+
+    cos(H) = cos(LST) cos(α) + sin(LST) sin(α) のように時角を分解し、星ごとの sin / cos は 1 回だけ
+    計算する。方位角は atan2 で求めるため、equatorial_to_horizontal の acos と違って
+    天頂・子午線の近くでも桁落ちしない（値は同じ定義: 北 = 0、東 = 90）。
+    """
+    ra_rad = np.asarray(ra, dtype=np.float64) * DEG2RAD
+    dec_rad = np.asarray(dec, dtype=np.float64) * DEG2RAD
+    cos_ra, sin_ra = np.cos(ra_rad).astype(dtype), np.sin(ra_rad).astype(dtype)
+    cos_dec, sin_dec = np.cos(dec_rad).astype(dtype), np.sin(dec_rad).astype(dtype)
+    cos_dec_cos_ra, cos_dec_sin_ra = cos_dec * cos_ra, cos_dec * sin_ra
+
+    lst_rad = np.asarray(lst, dtype=np.float64) * DEG2RAD
+    lat_rad = np.asarray(latitude, dtype=np.float64) * DEG2RAD
+    observers = len(lst_rad)
+    # 1 回に扱う要素数が 100 万程度になるように区切る（中間配列をキャッシュに収める）
+    step = chunk_rows or max(1, 1_000_000 // max(len(ra_rad), 1))
+
+    for start in range(0, observers, step):
+        rows = slice(start, min(start + step, observers))
+        cos_lst = np.cos(lst_rad[rows]).astype(dtype)[:, None]
+        sin_lst = np.sin(lst_rad[rows]).astype(dtype)[:, None]
+        sin_lat = np.sin(lat_rad[rows]).astype(dtype)[:, None]
+        cos_lat = np.cos(lat_rad[rows]).astype(dtype)[:, None]
+
+        # cos δ cos H と cos δ sin H（H = LST - α）
+        cos_h = cos_lst * cos_dec_cos_ra
+        cos_h += sin_lst * cos_dec_sin_ra
+        sin_h = sin_lst * cos_dec_cos_ra
+        sin_h -= cos_lst * cos_dec_sin_ra
+
+        sin_alt = cos_lat * cos_h
+        sin_alt += sin_lat * sin_dec
+        np.clip(sin_alt, -1.0, 1.0, out=sin_alt)
+        altitude = np.arcsin(sin_alt, out=sin_alt)
+        altitude *= RAD2DEG
+
+        north = cos_lat * sin_dec
+        north -= sin_lat * cos_h
+        np.negative(sin_h, out=sin_h)
+        azimuth = np.arctan2(sin_h, north, out=north)
+        azimuth *= RAD2DEG
+        azimuth[azimuth < 0] += 360.0
+        yield rows, azimuth, altitude
+
+
+# --- ゴールデンベクトル ---
+
+def golden_workload(rng: np.random.Generator, rows: int) -> dict[str, np.ndarray]:
+    """
+    固定の乱数で作る入力（天球上で一様な星、1900〜2100 年の時刻、全緯度・全経度、視野・キャンバス）
+    画面座標が null ばかりにならないよう、4 分の 3 の行は視野の中心を星の近く（視野角の ±0.75 倍）に置く
+    """
+    start = -2_208_988_800_000.0  # 1900-01-01
+    end = 4_102_444_800_000.0  # 2100-01-01
+    ra = rng.uniform(0.0, 360.0, rows)
+    dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, rows)))
+    zoom = np.exp(rng.uniform(np.log(0.5), np.log(20.0), rows))
+    fov = 90 / zoom
+    near = rng.random(rows) < 0.75
+    center_ra = np.where(near, np.mod(ra + fov * rng.uniform(-0.75, 0.75, rows), 360.0), rng.uniform(0.0, 360.0, rows))
+    center_dec = np.where(near, np.clip(dec + fov * rng.uniform(-0.75, 0.75, rows), -90.0, 90.0),
+                          rng.uniform(-90.0, 90.0, rows))
+    return {
+        "ra": ra,
+        "dec": dec,
+        "timeMs": np.floor(rng.uniform(start, end, rows)),
+        "latitude": rng.uniform(-90.0, 90.0, rows),
+        "longitude": rng.uniform(-180.0, 180.0, rows),
+        "centerRa": center_ra,
+        "centerDec": center_dec,
+        "zoom": zoom,
+        "width": rng.integers(320, 2561, rows).astype(np.float64),
+        "height": rng.integers(240, 1601, rows).astype(np.float64),
+    }
+
+
+def golden_outputs(workload: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    w = workload
+    jd = julian_date(w["timeMs"])
+    lst = local_sidereal_time(jd, w["longitude"])
+    azimuth, altitude = equatorial_to_horizontal(w["ra"], w["dec"], w["latitude"], lst)
+    view = (w["ra"], w["dec"], w["centerRa"], w["centerDec"], w["zoom"], w["width"], w["height"])
+    ortho_x, ortho_y = celestial_to_screen(*view, mode="orthographic")
+    stereo_x, stereo_y = celestial_to_screen(*view, mode="stereographic")
+    return {
+        "julianDate": jd,
+        "siderealTime": lst,
+        "altitude": altitude,
+        "azimuth": azimuth,
+        "orthographicX": ortho_x,
+        "orthographicY": ortho_y,
+        "stereographicX": stereo_x,
+        "stereographicY": stereo_y,
+    }
+
+
+def stable_rows(workload: dict[str, np.ndarray], outputs: dict[str, np.ndarray]) -> np.ndarray:
+    """判定の境界から十分に離れた行（三角関数の末尾桁の違いで結果の種類が変わらない行）"""
+    w = workload
+    ha = normalize_degrees(outputs["siderealTime"] - w["ra"])
+    stable = np.abs(np.sin(ha * DEG2RAD)) > BOUNDARY_EPSILON  # 方位角の折り返し
+    stable &= np.abs(np.abs(outputs["altitude"]) - 90.0) > 1e-6  # 天頂・天底（方位角が不定）
+    lst = outputs["siderealTime"]
+    stable &= (lst > BOUNDARY_EPSILON) & (lst < 360.0 - BOUNDARY_EPSILON)  # 恒星時の 0 / 360 度の折り返し
+
+    scale, fov = _scale(w["zoom"], w["width"], w["height"])
+    cos_c, x, y, _, _ = _projection_terms(w["ra"], w["dec"], w["centerRa"], w["centerDec"])
+    stable &= np.abs(cos_c) > BOUNDARY_EPSILON
+    stable &= np.abs(cos_c - np.cos((fov / 2 + 30) * DEG2RAD)) > BOUNDARY_EPSILON
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 2 / (1 + cos_c)
+    for screen_x, screen_y in (
+        (w["width"] / 2 + x * scale, w["height"] / 2 - y * scale),
+        (w["width"] / 2 - k * x * scale, w["height"] / 2 - k * y * scale),
+    ):
+        for value, size in ((screen_x, w["width"]), (screen_y, w["height"])):
+            edges = np.minimum(np.abs(value + OFFSCREEN_MARGIN), np.abs(value - size - OFFSCREEN_MARGIN))
+            stable &= ~(edges <= SCREEN_EPSILON)
+    return stable
+
+
+def build_golden(rows: int, seed: int = DEFAULT_GOLDEN_SEED) -> dict[str, np.ndarray]:
+    """rows 行のゴールデンベクトル（境界に近い行を除いた分は多めに作って補う）"""
+    rng = np.random.default_rng(seed)
+    columns: Optional[dict[str, np.ndarray]] = None
+    while columns is None or len(columns["ra"]) < rows:
+        workload = golden_workload(rng, max(rows, 1) + rows // 100 + 16)
+        outputs = golden_outputs(workload)
+        keep = stable_rows(workload, outputs)
+        batch = {name: values[keep] for name, values in {**workload, **outputs}.items()}
+        columns = batch if columns is None else {name: np.concatenate([columns[name], batch[name]]) for name in batch}
+    return {name: values[:rows] for name, values in columns.items()}
@@ -0,0 +1,34 @@
+"""
+天球上の位置計算（単位ベクトル・角距離）
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def radec_to_unit(ra_deg: np.ndarray, dec_deg: np.ndarray) -> np.ndarray:
+    """赤経・赤緯（度）を ICRS 方向余弦 (x, y, z) の (N, 3) 配列に変換する"""
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec)
+    return np.stack((cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)), axis=-1)
+
+
+def unit_to_radec(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """単位ベクトルを赤経 [0, 360)・赤緯（度）に戻す"""
+    v = np.asarray(vectors, dtype=np.float64)
+    ra = np.degrees(np.arctan2(v[..., 1], v[..., 0])) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(v[..., 2], -1.0, 1.0)))
+    return ra, dec
+
+
+def bounding_cap(vectors: np.ndarray) -> tuple[np.ndarray, float]:
+    """点群を含む球冠（中心の単位ベクトル, 半径[度]）を返す"""
+    center = vectors.mean(axis=0)
+    norm = np.linalg.norm(center)
+    if norm == 0.0:
+        return np.array([0.0, 0.0, 1.0]), 180.0
+    center = center / norm
+    min_dot = float(np.clip((vectors @ center).min(), -1.0, 1.0))
+    return center, float(np.degrees(np.arccos(min_dot)))
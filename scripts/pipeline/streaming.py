@@ -0,0 +1,45 @@
+"""
+逐次処理（ジェネレータの連鎖）用の小道具
+
+カタログ全体をリストに溜めずに、読み込み → 解析 → 検証 → 付加 → 書き出しを
+一定件数ずつ流すために使う。NumPy でまとめて計算したい処理（方向余弦・星座判定など）は
+batched で区切った単位で行う。
+"""
+
+from __future__ import annotations
+
+import resource
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def batched(items: Iterable[T], size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[T]]:
+    """size 件ずつのリストに区切る（最後は端数）"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def peak_rss_bytes() -> int:
+    """このプロセスの最大常駐メモリ（バイト）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KiB、macOS はバイト単位
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> int:
+    """このプロセスの現在の常駐メモリ（バイト）。/proc の無い環境では最大値で代用する"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return peak_rss_bytes()
+
+
+def format_peak_rss() -> str:
+    return f"最大メモリ使用量 {peak_rss_bytes() / 1024**2:,.0f} MiB"
@@ -0,0 +1,180 @@
+"""
+ベンチマーク用の合成カタログ（Hipparcos 形式の列構成）
+
+等級と銀緯の分布を実際の全天カタログに近づけてある。
+- 等級: 累積数 N(<m) ∝ 10^(0.45 m)（Hipparcos / Tycho-2 の 6〜11 等の傾き）。
+  行数から限界等級を逆算するため、1 万行なら約 6.7 等、250 万行なら約 12 等までになる
+- 位置: 全天一様な成分と、銀河面に集中する成分（銀緯はラプラス分布）の混合。
+  暗い星ほど銀河面成分の割合を増やす
+- B-V: 主系列・巨星・早期型の 3 成分の正規分布の混合。スペクトル型は B-V から付ける
+- 年周視差・固有運動は明るい星ほど大きくする
+
+列構成は fetch_hipparcos_fast.py の出力（= scripts/bench_convert.py の合成データ）と同じで、
+HIP 番号は赤経順に振る。companion_catalog は位置照合の相手（BSC 相当）を作る。
+
+使用例:
+  frame = synthetic_catalog(1_000_000, seed=0)
+  other = companion_catalog(frame, fraction=0.3, seed=1)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from pipeline.sphere import radec_to_unit, unit_to_radec
+
+# 銀河座標の単位ベクトル → ICRS（Hipparcos カタログ解説 1.5.3 節の行列 A_G）
+GALACTIC_TO_ICRS = np.array([
+    [-0.0548755604, +0.4941094279, -0.8676661490],
+    [-0.8734370902, -0.4448296300, -0.1980763734],
+    [-0.4838350155, +0.7469822445, +0.4559837762],
+])
+
+MAGNITUDE_SLOPE = 0.45
+# N(<6) ≈ 5,000 を基準に限界等級を決める
+REFERENCE_MAGNITUDE = 6.0
+REFERENCE_COUNT = 5_000
+BRIGHTEST_MAGNITUDE = -1.46
+
+DISK_SCALE_DEG = 12.0
+
+# (割合, B-V の平均, 標準偏差)
+BV_COMPONENTS: tuple[tuple[float, float, float], ...] = (
+    (0.55, 0.55, 0.30),  # 主系列
+    (0.35, 1.15, 0.20),  # 巨星
+    (0.10, -0.10, 0.12),  # 早期型
+)
+# B-V の上限 → スペクトル型の文字
+SPECTRAL_LIMITS: tuple[tuple[float, str], ...] = (
+    (-0.25, "B"), (0.0, "A"), (0.3, "F"), (0.6, "G"), (1.0, "K"), (np.inf, "M"),
+)
+PROPER_NAMES = np.array(["Sirius", "Vega", "Altair", "Deneb", "Rigel", "Spica", "Antares", "Polaris"], dtype=object)
+
+
+def limiting_magnitude(rows: int) -> float:
+    """rows 件を含む限界等級"""
+    return REFERENCE_MAGNITUDE + np.log10(rows / REFERENCE_COUNT) / MAGNITUDE_SLOPE
+
+
+def sample_magnitudes(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """N(<m) ∝ 10^(MAGNITUDE_SLOPE m) に従う等級"""
+    u = 1.0 - rng.random(rows)  # (0, 1]
+    magnitudes = limiting_magnitude(rows) + np.log10(u) / MAGNITUDE_SLOPE
+    return np.maximum(magnitudes, BRIGHTEST_MAGNITUDE)
+
+
+def disk_fraction(magnitudes: np.ndarray) -> np.ndarray:
+    """銀河面成分の割合（明るい星 0.15 → 暗い星 0.55）"""
+    return np.clip(0.15 + 0.05 * (magnitudes - 4.0), 0.15, 0.55)
+
+
+def sample_positions(rng: np.random.Generator, magnitudes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """銀緯分布を持つ位置（赤経・赤緯、度）"""
+    rows = len(magnitudes)
+    longitude = rng.uniform(0.0, 2.0 * np.pi, rows)
+    sin_b = rng.uniform(-1.0, 1.0, rows)
+    disk = rng.random(rows) < disk_fraction(magnitudes)
+    disk_b = np.clip(rng.laplace(0.0, DISK_SCALE_DEG, disk.sum()), -90.0, 90.0)
+    sin_b[disk] = np.sin(np.radians(disk_b))
+    cos_b = np.sqrt(1.0 - sin_b**2)
+    galactic = np.stack((cos_b * np.cos(longitude), cos_b * np.sin(longitude), sin_b), axis=-1)
+    return unit_to_radec(galactic @ GALACTIC_TO_ICRS.T)
+
+
+def galactic_latitude(ra: np.ndarray, dec: np.ndarray) -> np.ndarray:
+    """赤経・赤緯（度）→ 銀緯（度）"""
+    galactic = radec_to_unit(ra, dec) @ GALACTIC_TO_ICRS
+    return np.degrees(np.arcsin(np.clip(galactic[..., 2], -1.0, 1.0)))
+
+
+def sample_bv(rng: np.random.Generator, rows: int) -> np.ndarray:
+    weights = np.array([component[0] for component in BV_COMPONENTS])
+    choice = rng.choice(len(BV_COMPONENTS), size=rows, p=weights / weights.sum())
+    means = np.array([component[1] for component in BV_COMPONENTS])[choice]
+    sigmas = np.array([component[2] for component in BV_COMPONENTS])[choice]
+    return np.clip(rng.normal(means, sigmas), -0.4, 2.0)
+
+
+def spectral_types(rng: np.random.Generator, bv: np.ndarray) -> np.ndarray:
+    limits = np.array([limit for limit, _ in SPECTRAL_LIMITS])
+    letters = np.array([letter for _, letter in SPECTRAL_LIMITS], dtype=object)
+    classes = letters[np.searchsorted(limits, bv, side="right").clip(max=len(letters) - 1)]
+    subclass = rng.integers(0, 10, len(bv)).astype(str).astype(object)
+    luminosity = np.where(bv > 0.9, "III", "V").astype(object)
+    return classes + subclass + luminosity
+
+
+def _with_gaps(rng: np.random.Generator, values: np.ndarray, rate: np.ndarray | float) -> np.ndarray:
+    values = values.astype("float64")
+    values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def synthetic_catalog(rows: int, seed: int = 0) -> pd.DataFrame:
+    """fetch_hipparcos_fast.py の出力と同じ列構成の合成カタログ（HIP 番号は赤経順）"""
+    rng = np.random.default_rng(seed)
+    vmag = sample_magnitudes(rng, rows)
+    ra, dec = sample_positions(rng, vmag)
+    order = np.argsort(ra, kind="stable")
+    vmag, ra, dec = vmag[order], ra[order], dec[order]
+
+    bv = sample_bv(rng, rows)
+    spectral = spectral_types(rng, bv)
+    spectral[rng.random(rows) < 0.1] = ""
+
+    # 明るい星ほど近い（視差が大きく、固有運動も大きい）
+    parallax = np.exp(rng.normal(np.log(10.0) - 0.2 * np.log(10.0) * (vmag - 5.0), 0.8))
+    # 接線速度の分散 25 km/s 相当（μ[mas/年] = v[km/s] × 視差[mas] / 4.74）
+    pm_scale = 25.0 / 4.74 * parallax
+    bright = vmag < 6.5
+
+    names = np.full(rows, None, dtype=object)
+    named = ((vmag < 2.5) & (rng.random(rows) < 0.8)) | (bright & (rng.random(rows) < 0.003))
+    names[named] = PROPER_NAMES[rng.integers(0, len(PROPER_NAMES), named.sum())]
+
+    return pd.DataFrame({
+        "HIP": np.arange(1, rows + 1),
+        "RA": ra,
+        "DEC": dec,
+        "Vmag": _with_gaps(rng, vmag, 0.002),
+        "B-V_hip2": _with_gaps(rng, bv, 0.05),
+        "B-V_bsc": _with_gaps(rng, bv + rng.normal(0.0, 0.02, rows), np.where(bright, 0.1, 1.0)),
+        "SpType": spectral,
+        "Name": names,
+        "HD": _with_gaps(rng, rng.integers(1, 360_000, rows), np.where(vmag < 9.0, 0.1, 0.8)),
+        "HR": _with_gaps(rng, rng.integers(1, 9_110, rows), np.where(bright, 0.05, 1.0)),
+        "Plx": _with_gaps(rng, parallax, 0.05),
+        "pmRA": rng.normal(0.0, pm_scale),
+        "pmDE": rng.normal(0.0, pm_scale),
+    })
+
+
+def companion_catalog(
+    frame: pd.DataFrame,
+    fraction: float = 0.3,
+    jitter_arcsec: float = 0.5,
+    unrelated: float = 0.05,
+    seed: int = 1,
+) -> pd.DataFrame:
+    """
+    位置照合の相手となるカタログ（ra, dec, id）
+
+    frame の fraction だけを位置を jitter_arcsec 程度ずらして含め、
+    どの星とも対応しない点を unrelated の割合で加える。
+    """
+    rng = np.random.default_rng(seed)
+    picked = np.flatnonzero(rng.random(len(frame)) < fraction)
+    jitter = np.radians(jitter_arcsec / 3600.0)
+    vectors = radec_to_unit(frame["RA"].to_numpy()[picked], frame["DEC"].to_numpy()[picked])
+    vectors = vectors + rng.normal(0.0, jitter, vectors.shape)
+    ra, dec = unit_to_radec(vectors / np.linalg.norm(vectors, axis=1, keepdims=True))
+
+    extra = int(len(picked) * unrelated)
+    extra_ra = rng.uniform(0.0, 360.0, extra)
+    extra_dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, extra)))
+    return pd.DataFrame({
+        "id": np.arange(1, len(picked) + extra + 1),
+        "ra": np.concatenate([ra, extra_ra]),
+        "dec": np.concatenate([dec, extra_dec]),
+    })
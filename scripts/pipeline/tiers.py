@@ -0,0 +1,148 @@
+"""
+等級別シャード（public/data/tiers/）とマニフェストの生成
+
+星を等級の区間ごとに重複なく分割して書き出す。区間は下限を含まず上限を含む。
+N 等までの星が必要なクライアントは maxMagnitude <= N のシャードをすべて読めばよく、
+肉眼モード（7等）から天の川モード（9等）へ切り替える際は差分のシャードだけを追加で取得する。
+
+マニフェスト例（public/data/stars-manifest.json）:
+  {
+    "version": 1,
+    "total": 102372,
+    "tiers": [
+      {"name": "mag4", "minMagnitude": null, "maxMagnitude": 4.0, "count": 513, "cumulativeCount": 513,
+       "json": {"path": "tiers/stars-mag4.json", "bytes": 123456, "sha256": "...",
+                "gzipBytes": 34567, "brotliBytes": 29876},
+       "bin":  {"path": "tiers/stars-mag4.bin",  "bytes": 23456,  "sha256": "..."}},
+      ...
+      {"name": "rest", "minMagnitude": 9.0, "maxMagnitude": null, ...}
+    ]
+  }
+
+最後の "rest" シャードには最終区間より暗い星と等級不明の星が入る。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+from pipeline.bundle import BundleWriter, columns_from_records
+from pipeline.jsonout import RecordWriter, WrittenFile, write_json
+
+MANIFEST_VERSION = 1
+TIER_LIMITS: tuple[float, ...] = (4.0, 6.0, 7.0, 8.0, 9.0)
+TIERS_DIRNAME = "tiers"
+
+
+def tier_name(limit: Optional[float]) -> str:
+    if limit is None:
+        return "rest"
+    return f"mag{limit:g}"
+
+
+def tier_index(vmag: Optional[float], limits: Sequence[float] = TIER_LIMITS) -> int:
+    """等級から所属するシャード番号を返す（len(limits) は rest シャード）"""
+    if vmag is None:
+        return len(limits)
+    return bisect_left(limits, vmag)
+
+
+def split_by_magnitude(
+    stars: Sequence[Mapping[str, object]],
+    limits: Sequence[float] = TIER_LIMITS,
+) -> list[list[Mapping[str, object]]]:
+    """星を等級区間ごとのリストに分割する（元の並び順は保持）"""
+    shards: list[list[Mapping[str, object]]] = [[] for _ in range(len(limits) + 1)]
+    for star in stars:
+        shards[tier_index(star.get("vmag"), limits)].append(star)  # type: ignore[arg-type]
+    return shards
+
+
+def describe_file(path: Path, base: Path) -> dict:
+    with path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return {
+        "path": path.relative_to(base).as_posix(),
+        "bytes": path.stat().st_size,
+        "sha256": digest,
+    }
+
+
+def describe_json(written: WrittenFile, base: Path) -> dict:
+    """describe_file に圧縮版（.gz / .br）のバイト数を加えたもの"""
+    return {
+        **describe_file(written.path, base),
+        "gzipBytes": written.gzip_bytes,
+        "brotliBytes": written.brotli_bytes,
+    }
+
+
+class TierWriter:
+    """
+    星を順に受け取り、等級区間ごとのシャード（JSON と stars.bin 形式）へ振り分けて書き出す
+
+    各シャードへは受け取った順に追記するため、全件をメモリに溜める必要はない。
+    close() でマニフェストの内容を返す。
+    """
+
+    def __init__(self, public_dir: Path, limits: Sequence[float] = TIER_LIMITS) -> None:
+        self.public_dir = public_dir
+        self.limits = tuple(limits)
+        out_dir = public_dir / TIERS_DIRNAME
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.names = [tier_name(limit) for limit in (*self.limits, None)]
+        self.json_writers = [RecordWriter(out_dir / f"stars-{name}.json") for name in self.names]
+        self.bin_writers = [BundleWriter(out_dir / f"stars-{name}.bin") for name in self.names]
+
+    def append(self, stars: Sequence[Mapping[str, object]]) -> None:
+        for json_writer, bin_writer, shard in zip(
+            self.json_writers, self.bin_writers, split_by_magnitude(stars, self.limits)
+        ):
+            for star in shard:
+                json_writer.write(star)
+            bin_writer.append(columns_from_records(shard))
+
+    def close(self) -> dict:
+        tiers = []
+        cumulative = 0
+        bounds = [None, *self.limits]
+        for idx, name in enumerate(self.names):
+            upper = self.limits[idx] if idx < len(self.limits) else None
+            written = self.json_writers[idx].close()
+            bin_writer = self.bin_writers[idx]
+            bin_writer.close()
+            count = written.records or 0
+            cumulative += count
+            tiers.append({
+                "name": name,
+                "minMagnitude": bounds[idx],
+                "maxMagnitude": upper,
+                "count": count,
+                "cumulativeCount": cumulative,
+                "json": describe_json(written, self.public_dir),
+                "bin": describe_file(bin_writer.path, self.public_dir),
+            })
+        return {"version": MANIFEST_VERSION, "total": cumulative, "tiers": tiers}
+
+    def abort(self) -> None:
+        for json_writer, bin_writer in zip(self.json_writers, self.bin_writers):
+            json_writer.abort()
+            bin_writer.abort()
+
+
+def write_tiers(
+    stars: Sequence[Mapping[str, object]],
+    public_dir: Path,
+    limits: Sequence[float] = TIER_LIMITS,
+) -> dict:
+    """シャード（JSON と stars.bin 形式）を書き出し、マニフェストの内容を返す"""
+    writer = TierWriter(public_dir, limits)
+    writer.append(stars)
+    return writer.close()
+
+
+def write_manifest(manifest: dict, path: Path) -> WrittenFile:
+    return write_json(path, manifest)
@@ -0,0 +1,160 @@
+"""
+緯度帯ごとの可視性の表（周極星・昇らない星・出没の時角）
+
+観測地の緯度 φ が決まると、赤緯 δ の星について
+  周極星（一日中 地平より上）       最低高度 |φ + δ| - 90 > h
+  昇らない星（一日中 地平より下）   最高高度 90 - |φ - δ| < h
+  それ以外は時角 |H| <= H0 のときだけ地平より上。cos H0 = (sin h - sin φ sin δ) / (cos φ cos δ)
+が恒星時に関係なく決まる（h は地平の高度。大気差と描画の余裕のため既定で -1 度）。
+緯度を帯（既定 5 度幅）に区切り、帯の中のどの緯度でも成り立つ側に寄せて表にしておくと、
+描画側は昇らない星を最初に捨て、時角が H0 を超える星は高度の三角関数計算を省ける
+（地平より上の星を誤って捨てることはない）。
+
+H0 の帯の中での最大値: cos H0 の φ による微分は (sin h sin φ - sin δ) / (cos² φ cos δ) なので、
+帯の両端と、|sin δ| <= |sin h| の星だけにある極値 sin φ = sin δ / sin h を調べれば十分。
+
+形式（public/data/visibility/、lib/data/visibilityTable.ts が読む）:
+  index.json       version, bandWidth, horizon, hourAngleScale, count, idChecksum（id_checksum）,
+                   bands [{"latitude": [下端, 上端], "path": "lat+35.bin", "circumpolar": 件数, "neverRises": 件数}]
+  lat<下端>.bin    stars.bin と同じ列指向バイナリ（scripts/pipeline/bundle.py）。行は stars.bin と同じ並び
+    hourAngle      int16。H0 × hourAngleScale（切り上げ）。昇らない星は -1、周極星・座標欠損は 180 × hourAngleScale
+    circumpolar    uint8。周極星のビット列（行 i はバイト i >> 3 のビット i & 7）
+    neverRises     uint8。昇らない星のビット列
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from pipeline.paths import PUBLIC_DATA_DIR
+
+VISIBILITY_VERSION = 2  # 2: index.json に idChecksum を追加
+DEFAULT_BAND_WIDTH = 5.0  # 度
+DEFAULT_HORIZON = -1.0  # 度（大気差 約 0.6 度 + 描画の余裕）
+HOUR_ANGLE_SCALE = 100  # int16 の 1 = 0.01 度
+FULL_HOUR_ANGLE = 180 * HOUR_ANGLE_SCALE
+NEVER_RISES = -1
+
+_POLE_LIMIT = 90.0 - 1e-9  # cos φ = 0 を避ける
+_FNV_OFFSET = 0x811C9DC5
+_FNV_PRIME = 0x01000193
+
+
+def table_dir() -> Path:
+    return PUBLIC_DATA_DIR / "visibility"
+
+
+def band_edges(width: float) -> list[tuple[float, float]]:
+    """-90 度から 90 度までの緯度帯（下端, 上端）"""
+    count = int(np.ceil(180.0 / width - 1e-9))
+    lows = -90.0 + width * np.arange(count)
+    return [(float(low), float(min(low + width, 90.0))) for low in lows]
+
+
+def band_name(low: float) -> str:
+    return f"lat{low:+g}.bin"
+
+
+def id_checksum(ids: np.ndarray) -> int:
+    """
+    HIP 番号の並びのチェックサム（32 ビット FNV-1a を 1 星 1 語で回したもの）
+
+    表の行は番号ではなく stars.bin の並びで星を指すため、読み込む側
+    （lib/data/visibilityTable.ts の idChecksum）が同じ値を計算して、渡された星の並びが表と同じかを確かめる。
+    """
+    checksum = _FNV_OFFSET
+    for hip in np.asarray(ids, dtype=np.int64).tolist():
+        checksum = ((checksum ^ (hip & 0xFFFFFFFF)) * _FNV_PRIME) & 0xFFFFFFFF
+    return checksum
+
+
+@dataclass
+class BandTable:
+    low: float
+    high: float
+    hour_angle: np.ndarray  # int16
+    circumpolar: np.ndarray  # bool
+    never_rises: np.ndarray  # bool
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {
+            "hourAngle": self.hour_angle,
+            "circumpolar": np.packbits(self.circumpolar, bitorder="little"),
+            "neverRises": np.packbits(self.never_rises, bitorder="little"),
+        }
+
+    def visible_fraction(self) -> float:
+        """恒星時を一様にしたときに高度の計算が要る星の割合（昇らない星・H0 の外の星を除いた残り）"""
+        if not len(self.hour_angle):
+            return 0.0
+        return float(np.clip(self.hour_angle, 0, FULL_HOUR_ANGLE).mean() / FULL_HOUR_ANGLE)
+
+
+def _cos_hour_angle(latitude: np.ndarray, dec: np.ndarray, sin_horizon: float) -> np.ndarray:
+    lat = np.radians(np.clip(latitude, -_POLE_LIMIT, _POLE_LIMIT))
+    d = np.radians(dec)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (sin_horizon - np.sin(lat) * np.sin(d)) / (np.cos(lat) * np.cos(d))
+
+
+def band_table(dec: np.ndarray, low: float, high: float, horizon: float = DEFAULT_HORIZON) -> BandTable:
+    """赤緯（度）の配列から、緯度帯 [low, high] の表を作る"""
+    dec = np.asarray(dec, dtype=np.float64)
+    known = ~np.isnan(dec)
+    d = np.where(known, dec, 0.0)
+
+    # 帯の中で最も高く上る緯度（φ が δ に最も近い）と、最も低く沈む緯度（φ が -δ に最も近い）
+    max_altitude = 90.0 - np.abs(np.clip(d, low, high) - d)
+    min_altitude = np.abs(np.clip(-d, low, high) + d) - 90.0
+    never_rises = known & (max_altitude < horizon)
+    circumpolar = known & (min_altitude > horizon)
+
+    sin_horizon = float(np.sin(np.radians(horizon)))
+    cos_h0 = np.minimum(_cos_hour_angle(np.full_like(d, low), d, sin_horizon),
+                        _cos_hour_angle(np.full_like(d, high), d, sin_horizon))
+    if sin_horizon != 0.0:
+        ratio = np.sin(np.radians(d)) / sin_horizon
+        interior = np.abs(ratio) <= 1.0
+        critical = np.degrees(np.arcsin(np.clip(ratio, -1.0, 1.0)))
+        interior &= (critical > low) & (critical < high)
+        cos_h0 = np.where(interior, np.minimum(cos_h0, _cos_hour_angle(critical, d, sin_horizon)), cos_h0)
+    h0 = np.degrees(np.arccos(np.clip(np.nan_to_num(cos_h0, nan=-1.0), -1.0, 1.0)))
+
+    hour_angle = np.minimum(np.ceil(h0 * HOUR_ANGLE_SCALE), FULL_HOUR_ANGLE)
+    hour_angle = np.where(circumpolar | ~known, FULL_HOUR_ANGLE, hour_angle)
+    hour_angle = np.where(never_rises, NEVER_RISES, hour_angle).astype(np.int16)
+    return BandTable(low, high, hour_angle, circumpolar, never_rises)
+
+
+def check_band(
+    table: BandTable,
+    dec: np.ndarray,
+    rng: np.random.Generator,
+    samples: int,
+    horizon: float = DEFAULT_HORIZON,
+) -> dict[str, int]:
+    """
+    帯の中の緯度・時角を無作為に選んで高度を直接計算し、表が地平より上の星を捨てていないか確かめる
+    （件数が 0 でない項目があれば表の誤り）
+    """
+    known = np.flatnonzero(~np.isnan(dec))
+    if not len(known) or samples <= 0:
+        return {"samples": 0, "missed": 0, "circumpolarBelow": 0, "neverRisesAbove": 0}
+    rows = known[rng.integers(len(known), size=samples)]
+    latitude = np.radians(rng.uniform(table.low, table.high, size=samples))
+    hour = rng.uniform(-180.0, 180.0, size=samples)
+    d = np.radians(dec[rows])
+    altitude = np.degrees(np.arcsin(np.clip(
+        np.sin(latitude) * np.sin(d) + np.cos(latitude) * np.cos(d) * np.cos(np.radians(hour)), -1.0, 1.0
+    )))
+    above = altitude > horizon
+    allowed = np.abs(hour) * HOUR_ANGLE_SCALE <= table.hour_angle[rows]
+    return {
+        "samples": samples,
+        "missed": int((above & ~allowed).sum()),
+        "circumpolarBelow": int((table.circumpolar[rows] & ~above).sum()),
+        "neverRisesAbove": int((table.never_rises[rows] & above).sum()),
+    }
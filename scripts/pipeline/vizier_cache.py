@@ -0,0 +1,248 @@
+"""
+VizieR 問い合わせ結果のローカルキャッシュ（内容アドレス方式・オフライン再生対応）
+
+カタログ ID・取得列・絞り込み条件・行数上限から SHA-256 のキーを作り、
+結果を列ごとの圧縮 .npz（data/generated/vizier-cache/）として保存する。
+同じ問い合わせは2回目以降ネットワークに出ずにキャッシュから返す。
+
+環境変数:
+  STAR_PIPELINE_OFFLINE=1     キャッシュのみを使う（期限切れでも返し、無ければ VizierCacheMiss）
+                              1 / true / yes / on（大文字小文字は問わない）で有効
+  VIZIER_CACHE_TTL_DAYS       有効期限（日、既定 30）
+  VIZIER_CACHE_MAX_BYTES      キャッシュ全体の上限（バイト、既定 2GB）。超えたら最終利用が古い順に削除
+  VIZIER_CACHE_DIR            保存先ディレクトリ
+
+使用例:
+  df = query_catalog("I/311/hip2", columns=["HIP", "RArad", "DErad"])
+  df = query_catalog("I/239/hip_main", column_filters={"Vmag": "<9"})
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pipeline.paths import GENERATED_DIR
+
+CACHE_FORMAT = 1
+DEFAULT_TTL_DAYS = 30.0
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+class VizierCacheMiss(RuntimeError):
+    """オフラインモードでキャッシュに結果が無い"""
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get("VIZIER_CACHE_DIR", GENERATED_DIR / "vizier-cache"))
+
+
+def is_offline() -> bool:
+    return os.environ.get("STAR_PIPELINE_OFFLINE", "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def query_key(
+    catalog: str,
+    columns: Optional[Sequence[str]],
+    column_filters: Optional[Mapping[str, str]],
+    row_limit: int,
+) -> tuple[str, dict]:
+    """問い合わせ内容を正規化した辞書と、その SHA-256 キーを返す"""
+    spec = {
+        "format": CACHE_FORMAT,
+        "catalog": catalog,
+        "columns": list(columns) if columns is not None else None,
+        "filters": dict(sorted((column_filters or {}).items())),
+        "rowLimit": row_limit,
+    }
+    encoded = json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest(), spec
+
+
+def _paths(key: str) -> tuple[Path, Path]:
+    base = cache_dir() / key[:2]
+    return base / f"{key}.npz", base / f"{key}.json"
+
+
+def save_frame(frame: pd.DataFrame, data_path: Path) -> list[dict]:
+    """DataFrame を列ごとの配列として保存し、復元用の列情報を返す"""
+    arrays: dict[str, np.ndarray] = {}
+    columns: list[dict] = []
+    for idx, name in enumerate(frame.columns):
+        series = frame[name]
+        field = f"c{idx}"
+        mask = series.isna().to_numpy()
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.dtype.kind in "iub":
+            kind = "nullable"
+            arrays[field] = series.fillna(0).to_numpy(dtype=series.dtype.numpy_dtype)
+        elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            kind = "string"
+            values = series.map(lambda v: v.decode("utf-8") if isinstance(v, bytes) else v)
+            arrays[field] = values.where(~mask, "").astype(str).to_numpy(dtype=str)
+        else:
+            kind = "numpy"
+            arrays[field] = series.to_numpy()
+        if mask.any() and kind != "numpy":
+            arrays[f"{field}__mask"] = mask
+        columns.append({"name": str(name), "field": field, "kind": kind, "dtype": str(series.dtype)})
+
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(".tmp.npz")
+    np.savez_compressed(tmp_path, **arrays)
+    tmp_path.replace(data_path)
+    return columns
+
+
+def load_frame(data_path: Path, columns: list[dict]) -> pd.DataFrame:
+    with np.load(data_path, allow_pickle=False) as arrays:
+        data = {}
+        for column in columns:
+            field = column["field"]
+            values = arrays[field]
+            mask = arrays[f"{field}__mask"] if f"{field}__mask" in arrays.files else None
+            if column["kind"] == "nullable":
+                series = pd.Series(values).astype(column["dtype"])
+                if mask is not None:
+                    series[mask] = pd.NA
+                data[column["name"]] = series
+            elif column["kind"] == "string":
+                series = pd.Series(values, dtype=object)
+                if mask is not None:
+                    series[mask] = None
+                data[column["name"]] = series
+            else:
+                data[column["name"]] = values
+    return pd.DataFrame(data)
+
+
+def _read_meta(meta_path: Path) -> Optional[dict]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_meta(meta_path: Path, meta: dict) -> None:
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = meta_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(meta_path)
+
+
+def _fetch(
+    catalog: str,
+    columns: Optional[Sequence[str]],
+    column_filters: Optional[Mapping[str, str]],
+    row_limit: int,
+) -> pd.DataFrame:
+    from astroquery.vizier import Vizier
+
+    kwargs: dict = {"row_limit": row_limit}
+    if columns is not None:
+        kwargs["columns"] = list(columns)
+    if column_filters:
+        kwargs["column_filters"] = dict(column_filters)
+    result = Vizier(**kwargs).query_constraints(catalog=catalog)
+    if not result:
+        return pd.DataFrame()
+    return result[0].to_pandas()
+
+
+def query_catalog(
+    catalog: str,
+    columns: Optional[Sequence[str]] = None,
+    column_filters: Optional[Mapping[str, str]] = None,
+    row_limit: int = -1,
+    ttl_days: Optional[float] = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """
+    VizieR のカタログを DataFrame で返す（キャッシュがあればそれを使う）
+
+    columns を省略すると VizieR の既定列、["*"] で全列。
+    column_filters は astroquery の column_filters と同じ（例: {"Vmag": "<9"}）。
+    refresh=True で有効期限内でも取り直す。
+    """
+    key, spec = query_key(catalog, columns, column_filters, row_limit)
+    data_path, meta_path = _paths(key)
+    meta = _read_meta(meta_path)
+    available = meta is not None and data_path.exists()
+
+    if ttl_days is None:
+        ttl_days = float(os.environ.get("VIZIER_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS))
+    fresh = available and time.time() - meta["createdAt"] < ttl_days * 86400  # type: ignore[index]
+
+    if is_offline():
+        if not available:
+            raise VizierCacheMiss(f"オフラインモードでキャッシュがありません: {catalog} (key {key[:12]})")
+    elif refresh or not fresh:
+        frame = _fetch(catalog, columns, column_filters, row_limit)
+        meta = {
+            **spec,
+            "key": key,
+            "columns": save_frame(frame, data_path),
+            "requestedColumns": spec["columns"],
+            "rows": len(frame),
+            "bytes": data_path.stat().st_size,
+            "createdAt": time.time(),
+        }
+        meta["lastUsedAt"] = meta["createdAt"]
+        _write_meta(meta_path, meta)
+        # 今回の結果は上限を超えていても消さない（大きすぎる結果は次の問い合わせで古い順に消える）
+        result = load_frame(data_path, meta["columns"])
+        evict(keep=(key,))
+        return result
+
+    assert meta is not None
+    meta["lastUsedAt"] = time.time()
+    _write_meta(meta_path, meta)
+    return load_frame(data_path, meta["columns"])
+
+
+def cache_entries() -> list[dict]:
+    entries = []
+    for meta_path in cache_dir().glob("*/*.json"):
+        meta = _read_meta(meta_path)
+        if meta is not None:
+            entries.append(meta)
+    return entries
+
+
+def evict(
+    max_bytes: Optional[int] = None,
+    ttl_days: Optional[float] = None,
+    keep: Sequence[str] = (),
+) -> list[str]:
+    """
+    期限切れのエントリと、合計サイズが上限を超えた分（最終利用が古い順）を削除する
+
+    ttl_days を省略した場合は期限切れの削除を行わずサイズ上限だけを適用する
+    （オフライン再生用に古いエントリも残しておくため）。keep のキーは削除しない。
+    削除したキーを返す。
+    """
+    if max_bytes is None:
+        max_bytes = int(os.environ.get("VIZIER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    now = time.time()
+    entries = sorted(cache_entries(), key=lambda meta: meta.get("lastUsedAt", 0))
+    total = sum(meta.get("bytes", 0) for meta in entries)
+
+    removed = []
+    for meta in entries:
+        if meta["key"] in keep:
+            continue
+        expired = ttl_days is not None and now - meta["createdAt"] >= ttl_days * 86400
+        if not expired and total <= max_bytes:
+            continue
+        data_path, meta_path = _paths(meta["key"])
+        data_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        total -= meta.get("bytes", 0)
+        removed.append(meta["key"])
+    return removed
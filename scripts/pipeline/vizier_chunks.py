@@ -0,0 +1,378 @@
+"""
+VizieR カタログの天域分割取得（赤緯帯 × 赤経区画の並列取得・チャンク単位のチェックポイント）
+
+I/259/tyc2 全体（約 250 万行）を 1 回の問い合わせで取ると、途中で失敗したときに
+最初からやり直しになる。ここでは天球を等面積の赤緯帯（さらに必要なら赤経の区画）に
+分けて問い合わせ、チャンクごとに列指向の .npz として保存する。
+- 取得はプロセスプールで行い、同時実行数（workers）を制限する。VOTable の解析も各プロセスで行う
+- 429 / 5xx / タイムアウトは指数バックオフで再試行する
+- 保存済みのチャンクは再実行時に問い合わせない（中断しても続きから再開できる）
+- 全チャンクが揃ったら merge_chunks で 1 つの列指向バンドル（stars.bin 形式）にまとめる
+
+チャンクの範囲は半開区間 [下限, 上限)（赤緯の最後の帯だけ +90° を含む）。
+VizieR の範囲指定は両端を含むため、境界上の星は受け取った後で片方のチャンクから除く。
+
+保存先: data/generated/vizier-chunks/<カタログ>-<キー先頭12桁>/
+  plan.json             分割方法と問い合わせ内容
+  chunk-0000.npz/.json  チャンクの列データとメタ情報（.json があれば取得済み）
+  merged.bin            merge_chunks の出力
+
+環境変数:
+  VIZIER_VOTABLE_URL     問い合わせ先（tests/standins.py の VizierStandIn 等に差し替えられる）
+  VIZIER_CHUNKS_DIR      保存先の親ディレクトリ（既定 data/generated/vizier-chunks）
+  STAR_PIPELINE_OFFLINE  1 のとき未取得のチャンクがあれば VizierCacheMiss
+
+使用例:
+  plan = ChunkPlan("I/259/tyc2", TYCHO2_COLUMNS, {"VTmag": "<12"}, dec_bands=36, ra_sectors=8)
+  fetch_chunks(plan, workers=6)
+  rows, size = merge_chunks(plan)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pipeline.bundle import BundleWriter, null_value
+from pipeline.paths import GENERATED_DIR
+from pipeline.vizier_cache import VizierCacheMiss, is_offline, load_frame, save_frame
+
+DEFAULT_VOTABLE_URL = "https://vizier.cds.unistra.fr/viz-bin/votable"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PLAN_FORMAT = 1
+EDGE_DECIMALS = 6
+
+# Tycho-2 から取得する列（平均位置 RAmdeg/DEmdeg は欠損があるため観測位置 RAdeg/DEdeg も取る）
+TYCHO2_COLUMNS: tuple[str, ...] = (
+    "TYC1", "TYC2", "TYC3", "RAmdeg", "DEmdeg", "pmRA", "pmDE",
+    "BTmag", "VTmag", "HIP", "RAdeg", "DEdeg",
+)
+
+
+class ChunkOverflow(RuntimeError):
+    """VizieR が行数上限で結果を打ち切った（チャンクを細かくする必要がある）"""
+
+
+def chunks_root() -> Path:
+    return Path(os.environ.get("VIZIER_CHUNKS_DIR", GENERATED_DIR / "vizier-chunks"))
+
+
+def _edge(value: float) -> float:
+    return round(float(value), EDGE_DECIMALS)
+
+
+def _format_edge(value: float) -> str:
+    return f"{value:.{EDGE_DECIMALS}f}"
+
+
+@dataclass(frozen=True)
+class SkyChunk:
+    """天球の 1 区画（赤緯 [dec_min, dec_max) × 赤経 [ra_min, ra_max)、度）"""
+
+    index: int
+    dec_min: float
+    dec_max: float
+    ra_min: float = 0.0
+    ra_max: float = 360.0
+
+    @property
+    def name(self) -> str:
+        return f"chunk-{self.index:04d}"
+
+    def constraints(self, ra_column: str, dec_column: str) -> dict[str, str]:
+        """VizieR の範囲指定（両端を含む）"""
+        constraints = {dec_column: f"{_format_edge(self.dec_min)}..{_format_edge(self.dec_max)}"}
+        if self.ra_min > 0.0 or self.ra_max < 360.0:
+            constraints[ra_column] = f"{_format_edge(self.ra_min)}..{_format_edge(self.ra_max)}"
+        return constraints
+
+    def contains(self, ra: np.ndarray, dec: np.ndarray) -> np.ndarray:
+        """半開区間で判定する（赤緯 +90° と赤経 360° の手前の境界は最後の区画に含める）"""
+        ra = np.asarray(ra, dtype=np.float64)
+        dec = np.asarray(dec, dtype=np.float64)
+        in_dec = (dec >= self.dec_min) & ((dec < self.dec_max) | (self.dec_max >= 90.0))
+        in_ra = (ra >= self.ra_min) & ((ra < self.ra_max) | (self.ra_max >= 360.0))
+        return in_dec & in_ra
+
+
+def declination_edges(bands: int) -> np.ndarray:
+    """面積が等しくなる赤緯帯の境界（bands + 1 個、-90 〜 +90 度）"""
+    if bands < 1:
+        raise ValueError(f"赤緯帯の数は 1 以上: {bands}")
+    edges = np.degrees(np.arcsin(np.linspace(-1.0, 1.0, bands + 1)))
+    edges[0], edges[-1] = -90.0, 90.0
+    return np.array([_edge(value) for value in edges])
+
+
+def sky_chunks(dec_bands: int, ra_sectors: int = 1) -> list[SkyChunk]:
+    """等面積の赤緯帯を ra_sectors 個の赤経区画に分けたチャンク（南から順、帯の中は赤経順）"""
+    if ra_sectors < 1:
+        raise ValueError(f"赤経区画の数は 1 以上: {ra_sectors}")
+    dec_edges = declination_edges(dec_bands)
+    ra_edges = [_edge(360.0 * sector / ra_sectors) for sector in range(ra_sectors + 1)]
+    chunks = []
+    for band in range(dec_bands):
+        for sector in range(ra_sectors):
+            chunks.append(SkyChunk(
+                index=len(chunks),
+                dec_min=float(dec_edges[band]),
+                dec_max=float(dec_edges[band + 1]),
+                ra_min=ra_edges[sector],
+                ra_max=ra_edges[sector + 1],
+            ))
+    return chunks
+
+
+@dataclass(frozen=True)
+class ChunkPlan:
+    """分割取得する問い合わせの内容（キーが同じなら同じ保存先を再利用する）"""
+
+    catalog: str
+    columns: tuple[str, ...]
+    filters: Mapping[str, str] = field(default_factory=dict)
+    dec_bands: int = 36
+    ra_sectors: int = 4
+    ra_column: str = "RAdeg"
+    dec_column: str = "DEdeg"
+
+    def spec(self) -> dict:
+        return {
+            "format": PLAN_FORMAT,
+            "catalog": self.catalog,
+            "columns": list(self.columns),
+            "filters": dict(sorted(self.filters.items())),
+            "decBands": self.dec_bands,
+            "raSectors": self.ra_sectors,
+            "raColumn": self.ra_column,
+            "decColumn": self.dec_column,
+        }
+
+    @property
+    def key(self) -> str:
+        encoded = json.dumps(self.spec(), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @property
+    def directory(self) -> Path:
+        return chunks_root() / f"{self.catalog.replace('/', '_')}-{self.key[:12]}"
+
+    @property
+    def merged_path(self) -> Path:
+        return self.directory / "merged.bin"
+
+    def chunks(self) -> list[SkyChunk]:
+        return sky_chunks(self.dec_bands, self.ra_sectors)
+
+    def paths(self, chunk: SkyChunk) -> tuple[Path, Path]:
+        return self.directory / f"{chunk.name}.npz", self.directory / f"{chunk.name}.json"
+
+    def params(self, chunk: SkyChunk) -> dict[str, str]:
+        """VizieR の votable エンドポイントへの問い合わせパラメータ"""
+        columns = list(self.columns)
+        for column in (self.ra_column, self.dec_column):
+            if column not in columns:
+                columns.append(column)
+        return {
+            "-source": self.catalog,
+            "-out": ",".join(columns),
+            "-out.max": "unlimited",
+            **self.filters,
+            **chunk.constraints(self.ra_column, self.dec_column),
+        }
+
+
+def _write_json_atomic(path: Path, value: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(value, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def read_chunk_meta(plan: ChunkPlan, chunk: SkyChunk) -> Optional[dict]:
+    try:
+        return json.loads(plan.paths(chunk)[1].read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def parse_votable(body: bytes) -> pd.DataFrame:
+    """VOTable の最初の表を DataFrame にする（打ち切り・エラーの INFO があれば例外）"""
+    from astropy.io.votable import parse
+
+    votable = parse(io.BytesIO(body), verify="ignore")
+    for info in votable.iter_info():
+        if info.name == "QUERY_STATUS" and info.value == "OVERFLOW":
+            raise ChunkOverflow("VizieR が行数上限で結果を打ち切りました")
+        if info.name == "QUERY_STATUS" and info.value == "ERROR":
+            raise RuntimeError(f"VizieR の問い合わせエラー: {info.content}")
+    tables = list(votable.iter_tables())
+    if not tables:
+        return pd.DataFrame()
+    return tables[0].to_table(use_names_over_ids=True).to_pandas()
+
+
+def _download(url: str, params: Mapping[str, str], retries: int, backoff: float, timeout: float) -> bytes:
+    request_url = f"{url}?{urllib.parse.urlencode(params)}"
+    attempt = 0
+    while True:
+        try:
+            with urllib.request.urlopen(request_url, timeout=timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as exc:
+            if attempt >= retries or exc.code not in RETRY_STATUSES:
+                # HTTPError は応答本体を持つためプロセス間で受け渡せない
+                raise RuntimeError(f"HTTP {exc.code} {exc.reason}") from None
+        except (urllib.error.URLError, TimeoutError):
+            if attempt >= retries:
+                raise
+        time.sleep(backoff * (2 ** attempt))
+        attempt += 1
+
+
+def fetch_chunk(
+    plan: ChunkPlan,
+    chunk: SkyChunk,
+    endpoint: str,
+    retries: int = 4,
+    backoff: float = 2.0,
+    timeout: float = 600.0,
+) -> dict:
+    """1 チャンクを取得して保存し、メタ情報を返す（プロセスプールの各プロセスで実行される）"""
+    started = time.perf_counter()
+    body = _download(endpoint, plan.params(chunk), retries, backoff, timeout)
+    frame = parse_votable(body)
+    if len(frame):
+        inside = chunk.contains(frame[plan.ra_column], frame[plan.dec_column])
+        frame = frame[inside].reset_index(drop=True)
+
+    data_path, meta_path = plan.paths(chunk)
+    meta = {
+        "chunk": chunk.index,
+        "decMin": chunk.dec_min,
+        "decMax": chunk.dec_max,
+        "raMin": chunk.ra_min,
+        "raMax": chunk.ra_max,
+        "columns": save_frame(frame, data_path),
+        "rows": len(frame),
+        "bytes": data_path.stat().st_size,
+        "seconds": round(time.perf_counter() - started, 3),
+        "fetchedAt": time.time(),
+    }
+    # メタ情報を最後に書くことで、.json の有無をそのまま取得済みの印にする
+    _write_json_atomic(meta_path, meta)
+    return meta
+
+
+def pending_chunks(plan: ChunkPlan) -> list[SkyChunk]:
+    return [chunk for chunk in plan.chunks() if read_chunk_meta(plan, chunk) is None]
+
+
+def fetch_chunks(
+    plan: ChunkPlan,
+    *,
+    workers: int = 4,
+    endpoint: Optional[str] = None,
+    refresh: bool = False,
+    retries: int = 4,
+    backoff: float = 2.0,
+    timeout: float = 600.0,
+    on_chunk: Optional[Callable[[dict, int, int], None]] = None,
+) -> dict[str, int]:
+    """
+    未取得のチャンクを最大 workers 個ずつ並列に取得する
+
+    on_chunk(メタ情報, 完了件数, 対象件数) はチャンク完了ごとに呼ばれる。
+    戻り値は {"chunks": 全チャンク数, "cached": 取得済み, "fetched": 今回取得, "failed": 失敗, "rows": 今回の行数}。
+    失敗したチャンクは保存されないため、再実行すると再び対象になる。
+    """
+    endpoint = endpoint or os.environ.get("VIZIER_VOTABLE_URL", DEFAULT_VOTABLE_URL)
+    chunks = plan.chunks()
+    pending = chunks if refresh else pending_chunks(plan)
+    stats = {"chunks": len(chunks), "cached": len(chunks) - len(pending), "fetched": 0, "failed": 0, "rows": 0}
+    if not pending:
+        return stats
+    if is_offline():
+        raise VizierCacheMiss(f"オフラインモードで未取得のチャンクがあります: {len(pending)} 件 ({plan.directory})")
+
+    _write_json_atomic(plan.directory / "plan.json", {**plan.spec(), "key": plan.key, "chunks": len(chunks)})
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_chunk, plan, chunk, endpoint, retries, backoff, timeout): chunk
+            for chunk in pending
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                meta = future.result()
+            except Exception as exc:  # noqa: BLE001 - 失敗したチャンクは再実行で取り直す
+                stats["failed"] += 1
+                print(
+                    f"⚠️ {chunk.name}（赤緯 {chunk.dec_min:+.2f}〜{chunk.dec_max:+.2f}°、"
+                    f"赤経 {chunk.ra_min:.1f}〜{chunk.ra_max:.1f}°）の取得失敗: {exc}"
+                )
+                continue
+            stats["fetched"] += 1
+            stats["rows"] += meta["rows"]
+            if on_chunk:
+                on_chunk(meta, stats["fetched"] + stats["failed"], len(pending))
+    return stats
+
+
+def frame_columns(frame: pd.DataFrame, strings: Sequence[str]) -> dict[str, object]:
+    """チャンクの DataFrame をバンドル用の列（数値は NumPy 配列、文字列は str/None のリスト）にする"""
+    result: dict[str, object] = {}
+    for name in frame.columns:
+        series = frame[name]
+        if name in strings:
+            result[name] = [None if pd.isna(v) else str(v) for v in series]
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.dtype.kind in "iub":
+            dtype = series.dtype.numpy_dtype
+            result[name] = series.to_numpy(dtype=dtype, na_value=null_value(dtype.name))
+        else:
+            result[name] = series.to_numpy()
+    return result
+
+
+def merge_chunks(plan: ChunkPlan, path: Optional[Path] = None) -> tuple[int, int]:
+    """
+    取得済みのチャンクをチャンク番号順に 1 つのバンドルへ連結し、(行数, バイト数) を返す
+
+    未取得のチャンクが残っている場合は RuntimeError。文字列列は列名と同名の文字列表になる。
+    """
+    path = path or plan.merged_path
+    metas = [(chunk, read_chunk_meta(plan, chunk)) for chunk in plan.chunks()]
+    missing = [chunk.name for chunk, meta in metas if meta is None]
+    if missing:
+        raise RuntimeError(f"未取得のチャンクがあります（{len(missing)} 件）: {', '.join(missing[:5])} ...")
+
+    filled = [(chunk, meta) for chunk, meta in metas if meta["rows"]]
+    if not filled:
+        raise RuntimeError(f"取得した行がありません: {plan.directory}")
+    layout = filled[0][1]["columns"]
+    strings = {column["name"]: column["name"] for column in layout if column["kind"] == "string"}
+
+    writer = BundleWriter(path, string_tables=strings)
+    rows = 0
+    try:
+        for chunk, meta in filled:
+            frame = load_frame(plan.paths(chunk)[0], meta["columns"])
+            writer.append(frame_columns(frame, list(strings)))
+            rows += len(frame)
+    except BaseException:
+        writer.abort()
+        raise
+    return rows, writer.close()
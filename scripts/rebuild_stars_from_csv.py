@@ -5,16 +5,53 @@ hipparcos_vmag9_named.csv から public/data/stars.json を再生成するユー
 重複する Vmag 列が存在するため DictReader では値を取りこぼす。
 本スクリプトでは 0-based index 6 の Vmag（元の値）を優先し、
 欠損時は index 14 の列をフォールバックとして参照する。
+
+stars.json と同じ内容を列指向バイナリ（public/data/stars.bin）としても書き出す。
+形式は scripts/pipeline/bundle.py を参照。
+各星には ICRS 方向余弦 x, y, z（単位ベクトル）を付与し、描画時の
+三角関数計算を回転行列の積だけで済ませられるようにする。
+星座は IAU 星座境界で判定した略号（"Ori" 等）を constellation に入れる
+（scripts/pipeline/constellations.py、参照格子は build_constellation_grid.py で作成）。
+表示色は B-V（欠損時はスペクトル型）と等級から固定パレットの番号 colorIndex を付け、
+パレット本体を public/data/star-palette.json に書き出す（scripts/pipeline/palette.py）。
+固有名（カタカナ表記）は build_proper_names.py の索引（data/generated/proper-names.npz）から
+HIP 番号で引いて properName に入れる（stars.json・stars.bin・等級別シャードのすべてに入る）。
+あわせて等級別シャード（public/data/tiers/）とマニフェスト
+（public/data/stars-manifest.json）を生成する。形式は scripts/pipeline/tiers.py を参照。
+
+処理は 読み込み → 解析 → 検証 → 付加 → 書き出し の連鎖で、
+--batch-size 件（既定 5 万件）ずつ流す（計測もバッチ単位）。全件をリストに溜めないため、
+数百万行の CSV でもメモリ使用量はほぼ一定（最後に最大メモリ使用量を表示する）。
+段階ごとの時間・件数は data/generated/runs/rebuild_stars_from_csv/ に記録する
+（--profile / --trace-memory は scripts/pipeline/instrument.py を参照）。
 """
 
+import argparse
 import csv
-import json
 import math
+from collections import Counter
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from pipeline.bundle import BundleWriter, columns_from_records
+from pipeline.constellations import ConstellationGrid, assign_constellations, load_grid
+from pipeline.instrument import Instrument, add_arguments
+from pipeline.jsonout import RecordWriter, format_size_report, write_json
+from pipeline.nameindex import NameIndex, apply_proper_names, proper_names_path
+from pipeline.palette import palette_index, palette_table
+from pipeline.sphere import radec_to_unit
+from pipeline.streaming import DEFAULT_BATCH_SIZE, batched, format_peak_rss
+from pipeline.tiers import TierWriter, write_manifest
 
 ROOT = Path(__file__).resolve().parents[1]
 CSV_PATH = ROOT / "scripts" / "hipparcos_vmag9_named.csv"
 OUTPUT_PATH = ROOT / "public" / "data" / "stars.json"
+UNIT_VECTOR_DECIMALS = 7
+BUNDLE_PATH = ROOT / "public" / "data" / "stars.bin"
+MANIFEST_PATH = ROOT / "public" / "data" / "stars-manifest.json"
+PALETTE_PATH = ROOT / "public" / "data" / "star-palette.json"
 
 
 def parse_float(value: str) -> float | None:
@@ -65,10 +102,46 @@ def build_star(row: list[str]) -> dict:
   }
 
 
-def main() -> None:
-  stars: list[dict] = []
+def add_unit_vectors(stars: list[dict]) -> None:
+  """全星の (x, y, z) を NumPy で一括計算して各辞書に書き込む（座標欠損は None）"""
+  ra = np.array([s["ra"] if s["ra"] is not None else np.nan for s in stars], dtype=np.float64)
+  dec = np.array([s["dec"] if s["dec"] is not None else np.nan for s in stars], dtype=np.float64)
+  vectors = np.round(radec_to_unit(ra, dec), UNIT_VECTOR_DECIMALS)
+  valid = ~np.isnan(vectors).any(axis=1)
+
+  for star, vector, ok in zip(stars, vectors.tolist(), valid.tolist()):
+    x, y, z = vector if ok else (None, None, None)
+    star["x"] = x
+    star["y"] = y
+    star["z"] = z
+
+
+def add_constellations(stars: list[dict], grid: ConstellationGrid) -> None:
+  """全星の星座略号を参照格子で一括判定して各辞書に書き込む（座標欠損は None）"""
+  ra = np.array([s["ra"] if s["ra"] is not None else np.nan for s in stars], dtype=np.float64)
+  dec = np.array([s["dec"] if s["dec"] is not None else np.nan for s in stars], dtype=np.float64)
+  for star, code in zip(stars, assign_constellations(ra, dec, grid).tolist()):
+    star["constellation"] = code
 
-  with CSV_PATH.open(newline="", encoding="utf-8") as f:
+
+def add_palette_indices(stars: list[dict]) -> None:
+  """全星のパレット番号を一括計算して各辞書に書き込む"""
+  bv = np.array([s["bv"] if s["bv"] is not None else np.nan for s in stars], dtype=np.float64)
+  vmag = np.array([s["vmag"] if s["vmag"] is not None else np.nan for s in stars], dtype=np.float64)
+  spectral_types = [s["spectralType"] for s in stars]
+  for star, index in zip(stars, palette_index(bv, spectral_types, vmag).tolist()):
+    star["colorIndex"] = index
+
+
+def load_proper_names() -> NameIndex:
+  path = proper_names_path()
+  if not path.exists():
+    raise FileNotFoundError(f"固有名の索引がありません: {path}（build_proper_names.py で作成できます）")
+  return NameIndex.load(path)
+
+
+def read_rows(path: Path) -> Iterator[list[str]]:
+  with path.open(newline="", encoding="utf-8") as f:
     reader = csv.reader(f)
     headers = next(reader)
     if headers.count("Vmag") < 2:
@@ -77,14 +150,121 @@ def main() -> None:
     for row in reader:
       if not row or not row[0].strip():
         continue
-      stars.append(build_star(row))
+      yield row
+
+
+def parse_stars(rows: Iterable[list[str]]) -> Iterator[dict]:
+  for row in rows:
+    yield build_star(row)
+
+
+def validate_stars(stars: Iterable[dict], rejected: Counter) -> Iterator[dict]:
+  """HIP 番号の無い行を除き、範囲外の座標は欠損にする（件数は rejected に数える）"""
+  for star in stars:
+    if star["id"] is None:
+      rejected["HIP 番号なし"] += 1
+      continue
+    ra, dec = star["ra"], star["dec"]
+    if (ra is not None and not 0.0 <= ra < 360.0) or (dec is not None and not -90.0 <= dec <= 90.0):
+      rejected["座標が範囲外"] += 1
+      star["ra"] = star["dec"] = None
+    yield star
+
+
+def enrich_batches(row_batches: Iterable[list[list[str]]], rejected: Counter, run: Instrument) -> Iterator[list[dict]]:
+  """
+  CSV の行をバッチごとに解析・検証し、方向余弦・星座・パレット番号・固有名を NumPy でまとめて付与する
+
+  段階の計測はバッチ単位で行う（1 行ごとに時刻を取ると、100 万行で解析そのものより長くかかる）。
+  """
+  with run.stage("load-grid"):
+    grid = load_grid()
+  with run.stage("load-names"):
+    names = load_proper_names()
+  for rows in row_batches:
+    with run.stage("parse", rows_in=len(rows)) as stage:
+      batch = list(parse_stars(rows))
+      stage.count(len(batch))
+    with run.stage("validate", rows_in=len(batch)) as stage:
+      batch = list(validate_stars(batch, rejected))
+      stage.count(len(batch))
+    with run.stage("unit-vectors") as stage:
+      add_unit_vectors(batch)
+      stage.count(len(batch))
+    with run.stage("constellations") as stage:
+      add_constellations(batch, grid)
+      stage.count(len(batch))
+    with run.stage("palette") as stage:
+      add_palette_indices(batch)
+      stage.count(len(batch))
+    with run.stage("proper-names") as stage:
+      apply_proper_names(batch, names)
+      stage.count(len(batch))
+    yield batch
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--csv", type=Path, default=CSV_PATH, help="入力 CSV（既定: scripts/hipparcos_vmag9_named.csv）")
+  parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="まとめて処理する件数")
+  add_arguments(parser)
+  args = parser.parse_args()
+
+  with Instrument.from_args("rebuild_stars_from_csv", args) as run:
+    rebuild(args, run)
+
+
+def rebuild(args: argparse.Namespace, run: Instrument) -> None:
+  rejected: Counter = Counter()
+  row_batches = run.iterate("read", batched(read_rows(args.csv), args.batch_size), size=len)
+  batches = enrich_batches(row_batches, rejected, run)
+
+  stars_writer = RecordWriter(OUTPUT_PATH)
+  bundle_writer = BundleWriter(BUNDLE_PATH)
+  tier_writer = TierWriter(MANIFEST_PATH.parent)
+  total = with_vmag = named = 0
+  try:
+    for batch in batches:
+      with run.stage("write-json") as stage:
+        for star in batch:
+          stars_writer.write(star)
+        stage.count(len(batch))
+      with run.stage("write-bundle") as stage:
+        bundle_writer.append(columns_from_records(batch))
+        stage.count(len(batch))
+      with run.stage("write-tiers") as stage:
+        tier_writer.append(batch)
+        stage.count(len(batch))
+      total += len(batch)
+      with_vmag += sum(1 for s in batch if s["vmag"] is not None)
+      named += sum(1 for s in batch if s["properName"] is not None)
+  except BaseException:
+    stars_writer.abort()
+    bundle_writer.abort()
+    tier_writer.abort()
+    raise
+
+  with run.stage("finalize-json"):
+    written = [stars_writer.close()]
+  print(f"書き出し完了: {OUTPUT_PATH} (総数 {total} 件, Vmagあり {with_vmag} 件, 固有名あり {named} 件)")
+  for reason, count in rejected.items():
+    print(f"  除外・修正: {reason} {count} 件")
+
+  written.append(write_json(PALETTE_PATH, palette_table()))
 
-  OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-  with OUTPUT_PATH.open("w", encoding="utf-8") as f:
-    json.dump(stars, f, ensure_ascii=False, indent=2)
-    f.write("\n")
+  with run.stage("finalize-bundle"):
+    bundle_size = bundle_writer.close()
+  print(f"書き出し完了: {BUNDLE_PATH} ({bundle_size:,} bytes, JSON {OUTPUT_PATH.stat().st_size:,} bytes)")
 
-  print(f"書き出し完了: {OUTPUT_PATH} (総数 {len(stars)} 件, Vmagあり {sum(1 for s in stars if s['vmag'] is not None)} 件)")
+  with run.stage("finalize-tiers"):
+    manifest = tier_writer.close()
+    written.append(write_manifest(manifest, MANIFEST_PATH))
+  print(f"書き出し完了: {MANIFEST_PATH}")
+  for tier in manifest["tiers"]:
+    print(f"  {tier['name']:>5}: {tier['count']:>7} 件 (累計 {tier['cumulativeCount']:>7} 件, bin {tier['bin']['bytes']:,} bytes, json.br {tier['json']['brotliBytes']:,} bytes)")
+  print(format_size_report(written, OUTPUT_PATH.parent))
+  run.add_output(*written, BUNDLE_PATH)
+  print(format_peak_rss())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+"""
+外部サービスのローカル代替サーバー（ネットワーク無しでの動作確認・テスト用）
+
+SimbadStandIn は SIMBAD TAP の同期エンドポイント（/simbad/sim-tap/sync）を模倣し、
+ADQL の `ident.id IN ('HIP 1', ...)` を読み取って CSV で応答する。
+VizierStandIn は VizieR の votable エンドポイント（/viz-bin/votable）を模倣し、
+あらかじめ渡した表を -source / -out / -out.max と列の条件（"a..b"、"<x" など）で絞り込んで
+VOTable で応答する。-out.max を超えた分は打ち切り、QUERY_STATUS=OVERFLOW を付ける。
+fail_first で最初の N 件の要求に 503 を返し、再試行の動作を確認できる。
+
+使用例:
+  with SimbadStandIn({32349: ("* alf CMa", "NAME Sirius|* alf CMa|HIP 32349")}) as stub:
+      stats = asyncio.run(resolve_names([32349], cache, endpoint=stub.url))
+
+  with VizierStandIn({"I/259/tyc2": frame}) as stub:
+      fetch_chunks(plan, endpoint=stub.url)
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Mapping
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+SIMBAD_TAP_PATH = "/simbad/sim-tap/sync"
+HIP_IDENT_RE = re.compile(r"'HIP (\d+)'")
+VIZIER_VOTABLE_PATH = "/viz-bin/votable"
+VIZIER_CONSTRAINT_RE = re.compile(r"^\s*(?:(?P<low>[-+.\deE]+)\.\.(?P<high>[-+.\deE]+)|(?P<op><=|>=|<|>|=)?(?P<value>[-+.\deE]+))\s*$")
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """要求を受けたサーバーの代替サーバー本体（server.stand_in）を参照できるハンドラー"""
+
+    @property
+    def stand_in(self):
+        return self.server.stand_in
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+    def reply(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _StandInServer:
+    """ThreadingHTTPServer をバックグラウンドで起動する共通部分（handler は要求ごとに作られる）"""
+
+    def __init__(self, handler: type[_StandInHandler]) -> None:
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.stand_in = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class _SimbadHandler(_StandInHandler):
+    def do_POST(self) -> None:  # noqa: N802
+        stand_in = self.stand_in
+        if self.path != SIMBAD_TAP_PATH:
+            self.send_error(404)
+            return
+        if stand_in.count_request() <= stand_in.fail_first:
+            self.send_error(503, "stand-in failure")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        query = form.get("QUERY", [""])[0]
+        hips = [int(hip) for hip in HIP_IDENT_RE.findall(query)]
+        stand_in.queried.append(hips)
+
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["query_id", "main_id", "ids"])
+        for hip in hips:
+            found = stand_in.objects.get(hip)
+            if found is not None:
+                writer.writerow([f"HIP {hip}", *found])
+        self.reply(out.getvalue().encode("utf-8"), "text/csv; charset=utf-8")
+
+
+class SimbadStandIn(_StandInServer):
+    def __init__(self, objects: Mapping[int, tuple[str, str]], fail_first: int = 0) -> None:
+        """objects は HIP 番号 → (main_id, ids) の対応"""
+        self.objects = dict(objects)
+        self.fail_first = fail_first
+        # 要求ごとに問い合わせられた HIP 番号
+        self.queried: list[list[int]] = []
+        super().__init__(_SimbadHandler)
+
+    @property
+    def url(self) -> str:
+        return self.base_url + SIMBAD_TAP_PATH
+
+
+def constraint_mask(values: pd.Series, constraint: str) -> np.ndarray:
+    """VizieR の数値条件（"a..b" は両端を含む、"<x"・">=x"・"x" など）を満たす行"""
+    match = VIZIER_CONSTRAINT_RE.match(constraint)
+    if match is None:
+        raise ValueError(f"対応していない条件です: {constraint}")
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    if match["low"] is not None:
+        return (numbers >= float(match["low"])) & (numbers <= float(match["high"]))
+    value = float(match["value"])
+    op = match["op"] or "="
+    return {
+        "<": numbers < value,
+        "<=": numbers <= value,
+        ">": numbers > value,
+        ">=": numbers >= value,
+        "=": numbers == value,
+    }[op]
+
+
+def votable_bytes(frame: pd.DataFrame, overflow: bool = False) -> bytes:
+    """DataFrame を VOTable（TABLEDATA）にする"""
+    from astropy.io.votable import from_table
+    from astropy.io.votable.tree import Info
+    from astropy.table import Table
+
+    votable = from_table(Table.from_pandas(frame))
+    resource = votable.resources[0]
+    resource.infos.append(Info(name="QUERY_STATUS", value="OVERFLOW" if overflow else "OK"))
+    out = io.BytesIO()
+    votable.to_xml(out)
+    return out.getvalue()
+
+
+class _VizierHandler(_StandInHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        stand_in = self.stand_in
+        url = urlsplit(self.path)
+        if url.path != VIZIER_VOTABLE_PATH:
+            self.send_error(404)
+            return
+        if stand_in.count_request() <= stand_in.fail_first:
+            self.send_error(503, "stand-in failure")
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        stand_in.queries.append(params)
+        if params.get("-source") not in stand_in.catalogs:
+            self.send_error(404, "unknown catalog")
+            return
+        self.reply(stand_in.answer(params), "application/x-votable+xml")
+
+
+class VizierStandIn(_StandInServer):
+    def __init__(self, catalogs: Mapping[str, pd.DataFrame], fail_first: int = 0) -> None:
+        """catalogs はカタログ ID → 全行の表"""
+        self.catalogs = dict(catalogs)
+        self.fail_first = fail_first
+        self.queries: list[dict[str, str]] = []
+        super().__init__(_VizierHandler)
+
+    @property
+    def url(self) -> str:
+        return self.base_url + VIZIER_VOTABLE_PATH
+
+    def answer(self, params: Mapping[str, str]) -> bytes:
+        frame = self.catalogs[params["-source"]]
+        mask = np.ones(len(frame), dtype=bool)
+        for column, constraint in params.items():
+            if not column.startswith("-"):
+                mask &= constraint_mask(frame[column], constraint)
+        selected = frame[mask]
+        if "-out" in params:
+            selected = selected[params["-out"].split(",")]
+        limit = params.get("-out.max", "50")
+        overflow = limit != "unlimited" and len(selected) > int(limit)
+        if overflow:
+            selected = selected.iloc[: int(limit)]
+        return votable_bytes(selected.reset_index(drop=True), overflow)
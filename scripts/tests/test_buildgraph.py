@@ -0,0 +1,43 @@
+from build_data import STAGES
+from pipeline.buildgraph import import_closure
+
+STAGES_BY_NAME = {stage.name: stage for stage in STAGES}
+
+
+def test_closure_follows_pipeline_imports_transitively():
+    closure = import_closure(["scripts/build_golden_vectors.py"])
+    assert "scripts/pipeline/skytransform.py" in closure
+    # bundle.py → jsonout.py / streaming.py のように間接的に import されるモジュール
+    assert {"scripts/pipeline/jsonout.py", "scripts/pipeline/streaming.py"} <= set(closure)
+    assert "scripts/pipeline/__init__.py" in closure
+
+
+def test_closure_includes_sibling_scripts():
+    assert "scripts/generate_named_stars.py" in import_closure(["scripts/build_name_index.py"])
+
+
+def test_stage_inputs_cover_every_imported_module():
+    for stage in STAGES:
+        scripts = [f"scripts/{command[1]}" for command in stage.commands if command[0] == "python"]
+        assert set(import_closure(scripts)) <= set(stage.inputs), stage.name
+
+
+def test_stages_depend_on_indirectly_imported_modules():
+    assert {"scripts/pipeline/sphere.py", "scripts/pipeline/vizier_cache.py"} <= set(
+        STAGES_BY_NAME["constellation-grid"].inputs
+    )
+    for name in ("sky-tiles", "epoch-keyframes", "search-index", "quiz-bank", "visibility"):
+        assert "scripts/pipeline/streaming.py" in STAGES_BY_NAME[name].inputs
+
+
+def test_english_name_sources_do_not_rebuild_the_star_catalogue():
+    # IAU-CSN.txt などの英語名の出典は name-index だけの入力で、stars はカタカナ表記の索引に依存する
+    upstream = {"stars"}
+    while True:
+        inputs = {path for name in upstream for path in STAGES_BY_NAME[name].inputs}
+        producers = {stage.name for stage in STAGES if set(stage.outputs) & inputs}
+        if producers <= upstream:
+            break
+        upstream |= producers
+    assert upstream == {"stars", "constellation-grid", "proper-names"}
+    assert not {"data/raw/iau/IAU-CSN.txt", "scripts/generate_named_stars.py", "scripts/build_name_index.py"} & inputs
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.constellations import (
+    B1875_JD,
+    ConstellationGrid,
+    assign_constellations,
+    boundaries_from_frame,
+    precess_radec,
+)
+
+CODES = ["Gem", "Oct", "Ori", "Psc", "UMi"]
+# VI/49 constbnd と同じ列構成の簡略化した境界（B1875、赤経は時）。表記は大文字・SER1 のような番号付き
+BOUNDARIES = [
+    ("UMI", [(0, 86), (6, 86), (12, 86), (18, 86)]),
+    ("OCT", [(0, -80), (18, -80), (12, -80), (6, -80)]),
+    ("ORI", [(4, -11), (7, -11), (7, 23), (4, 23)]),
+    ("GEM1", [(7, 10), (8, 10), (8, 35), (7, 35)]),
+    ("PSC", [(22, -6), (2, -6), (2, 33), (22, 33)]),
+]
+
+
+@pytest.fixture(scope="module")
+def grid():
+    frame = pd.DataFrame(
+        [(code, ra, dec) for code, vertices in BOUNDARIES for ra, dec in vertices],
+        columns=["cst", "RAhr", "DEdeg"],
+    )
+    polygons = boundaries_from_frame(frame, CODES)
+    assert [(p.code, p.pole) for p in polygons] == [("UMi", 1), ("Oct", -1), ("Ori", 0), ("Gem", 0), ("Psc", 0)]
+    return ConstellationGrid.from_polygons(polygons, CODES)
+
+
+def assign(grid, *stars):
+    ra, dec = np.array(stars, dtype=float).T
+    return assign_constellations(ra, dec, grid).tolist()
+
+
+def test_precession_moves_the_j2000_pole_by_theta():
+    # θ = 2004.3109″T − 0.42665″T² − 0.041833″T³、T = (B1875 − J2000) / 36525 = −1.249986
+    # → θ = −2505.95″ = −0.69610°。J2000 の北極は B1875 では赤緯 90° − |θ|
+    _, dec = precess_radec(np.array([0.0]), np.array([90.0]), B1875_JD)
+    assert dec[0] == pytest.approx(89.30390, abs=1e-5)
+
+
+def test_precession_round_trips():
+    ra, dec = np.array([0.5, 88.79, 359.9]), np.array([-45.0, 7.41, 60.0])
+    back_ra, back_dec = precess_radec(*precess_radec(ra, dec, B1875_JD), 2451545.0, B1875_JD)
+    assert np.allclose(back_ra, ra, atol=1e-9) and np.allclose(back_dec, dec, atol=1e-9)
+
+
+def test_known_stars(grid):
+    # ベテルギウス・リゲル・ポラリス・はちぶんぎ座σ星（J2000）
+    assert assign(grid, (88.793, 7.407), (78.634, -8.202), (37.955, 89.264), (317.195, -88.956)) == [
+        "Ori", "Ori", "UMi", "Oct",
+    ]
+
+
+def test_boundary_is_decided_in_b1875(grid):
+    # 境界（B1875 の赤経 7h = 105°）の J2000 側では東にある星も、B1875 に戻すと約 1.8° 西に寄る
+    assert assign(grid, (105.8, 15.0), (107.0, 15.0)) == ["Ori", "Gem"]
+    # 赤経 2h（30°）の境界も同様に、J2000 で 31° の星は Psc
+    assert assign(grid, (31.0, 5.0), (32.0, 5.0)) == ["Psc", None]
+
+
+def test_ra_wrap_at_zero(grid):
+    # Psc の境界は赤経 0° をまたぐ（B1875 では 0.5° 以下の星も 359° 台になる）
+    assert assign(grid, (0.5, 5.0), (359.0, 5.0), (335.0, 5.0), (325.0, 5.0)) == ["Psc", "Psc", "Psc", None]
+
+
+def test_poles_and_polar_caps(grid):
+    assert assign(grid, (0.0, 90.0), (0.0, -90.0), (123.0, 89.999), (250.0, -89.999)) == ["UMi", "Oct", "UMi", "Oct"]
+    # 赤緯 86.5° の星は B1875 では赤経 0° 側で 85.8°（UMi の外）、180° 側で 87.2°（UMi の内）
+    assert assign(grid, (0.0, 86.5), (180.0, 86.5)) == [None, "UMi"]
+
+
+def test_missing_coordinates_and_uncovered_sky(grid):
+    assert assign(grid, (np.nan, 10.0), (10.0, np.nan), (180.0, 0.0)) == [None, None, None]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.crossmatch import NO_MATCH, SkyIndex, cross_match, join_nearest
+
+ARCSEC = 1.0 / 3600.0
+
+
+def test_match_within_and_beyond_the_radius():
+    catalog = SkyIndex(np.array([10.0]), np.array([20.0]))
+    index, separation = catalog.nearest(
+        np.array([10.0, 10.0, 10.0]), np.array([20.0 + 1.5 * ARCSEC, 20.0 - 2.5 * ARCSEC, 20.0]), radius_arcsec=2.0
+    )
+    assert index.tolist() == [0, NO_MATCH, 0]
+    assert separation[0] == pytest.approx(1.5, abs=1e-6)
+    assert np.isnan(separation[1])
+    assert separation[2] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_ra_offsets_shrink_with_cos_dec():
+    # 赤緯 60° では赤経の 3″ は天球上で 3″ × cos 60° = 1.5″
+    catalog = SkyIndex(np.array([100.0]), np.array([60.0]))
+    index, separation = catalog.nearest(np.array([100.0 + 3 * ARCSEC]), np.array([60.0]), radius_arcsec=2.0)
+    assert index.tolist() == [0]
+    assert separation[0] == pytest.approx(1.5, abs=1e-5)
+
+
+def test_ra_wrap_at_zero():
+    # 359.9997° と 0.0002° は赤道上で 0.0005° = 1.8″ しか離れていない
+    catalog = SkyIndex(np.array([359.9997, 180.0]), np.array([0.0, 0.0]))
+    index, separation = catalog.nearest(np.array([0.0002, 359.9995]), np.array([0.0, 0.0]), radius_arcsec=2.0)
+    assert index.tolist() == [0, 0]
+    assert separation == pytest.approx([1.8, 0.72], abs=1e-5)
+
+    query, found, separation = catalog.within(np.array([0.0002]), np.array([0.0]), radius_arcsec=2.0)
+    assert (query.tolist(), found.tolist()) == ([0], [0])
+    assert separation[0] == pytest.approx(1.8, abs=1e-5)
+
+
+def test_missing_coordinates_never_match():
+    catalog = SkyIndex(np.array([np.nan, 0.0]), np.array([np.nan, 0.0]))
+    index, separation = catalog.nearest(np.array([np.nan, 0.0]), np.array([0.0, 0.0]), radius_arcsec=1.0)
+    assert index.tolist() == [NO_MATCH, 1]
+    assert np.isnan(separation[0])
+
+
+def test_within_lists_every_pair_by_distance():
+    catalog = SkyIndex(np.array([50.0, 50.0, 50.0]), np.array([0.0, 3 * ARCSEC, 1 * ARCSEC]))
+    query, found, separation = catalog.within(np.array([50.0]), np.array([0.0]), radius_arcsec=2.0)
+    assert query.tolist() == [0, 0]
+    assert found.tolist() == [0, 2]
+    assert separation == pytest.approx([0.0, 1.0], abs=1e-6)
+
+
+def test_mutual_match_keeps_only_the_closer_partner():
+    left = SkyIndex(np.array([200.0, 200.0]), np.array([-30.0, -30.0 + 1.5 * ARCSEC]))
+    right = SkyIndex(np.array([200.0]), np.array([-30.0 + 0.5 * ARCSEC]))
+    assert cross_match(left, right, 2.0)[1].tolist() == [0, 0]
+    left_index, right_index, separation = cross_match(left, right, 2.0, mutual=True)
+    assert left_index.tolist() == [0]
+    assert right_index.tolist() == [0]
+    assert separation == pytest.approx([0.5], abs=1e-6)
+
+
+def test_match_after_moving_to_the_other_epoch():
+    # pmDE 1000 mas/年で 1991.25 → 2000.0 の 8.75 年に 8.75″ 北へ動く
+    hipparcos = SkyIndex(np.array([30.0]), np.array([10.0]), pm_ra=np.array([0.0]), pm_de=np.array([1000.0]), epoch=1991.25)
+    other = SkyIndex(np.array([30.0]), np.array([10.0 + 8.75 * ARCSEC]), epoch=2000.0)
+    assert cross_match(other, hipparcos, 0.5)[0].size == 0
+    left_index, _, separation = cross_match(other, hipparcos, 0.5, epoch=2000.0)
+    assert left_index.tolist() == [0]
+    assert separation[0] == pytest.approx(0.0, abs=1e-4)
+
+
+def test_join_nearest_leaves_unmatched_rows_empty():
+    left = pd.DataFrame({"id": [1, 2], "ra": [0.0001, 90.0], "dec": [0.0, 0.0]})
+    right = pd.DataFrame({"id": [10], "ra": [359.9999], "dec": [0.0]})
+    joined = join_nearest(left, right, 1.0)
+    assert joined["id_match"].tolist()[0] == 10
+    assert np.isnan(joined["id_match"].tolist()[1])
+    assert joined["separation"].tolist()[0] == pytest.approx(0.72, abs=1e-5)
+    assert np.isnan(joined["separation"].tolist()[1])
@@ -0,0 +1,46 @@
+from collections import defaultdict
+
+from build_name_index import name_sources
+from build_proper_names import BRIGHT_STAR_NAMES_PATH, katakana_sources
+from pipeline.japanese_names import FAMOUS_STARS, STAR_NAMES
+from pipeline.nameindex import merge_sources, typescript_source
+
+KATAKANA_TABLES = {
+    "brightStarNames.ts": {hip: entry.name for hip, entry in typescript_source(BRIGHT_STAR_NAMES_PATH).entries.items()},
+    "FAMOUS_STARS": FAMOUS_STARS,
+    "STAR_NAMES": STAR_NAMES,
+}
+
+
+def test_orion_names_point_at_the_right_stars():
+    # リゲル（オリオン座β星）は HIP 24436、ベテルギウス（α星）は HIP 27989
+    index, _, _ = merge_sources(name_sources())
+    assert index.proper_name_of(24436) == "リゲル"
+    assert index.proper_name_of(27989) == "ベテルギウス"
+    assert index.hip_for_name("ベテルギウス") == 27989
+    assert index.iau_name[index.row(24436)] == "Rigel"
+    assert index.iau_name[index.row(27989)] == "Betelgeuse"
+
+
+def test_every_katakana_table_labels_rigel_and_betelgeuse():
+    for label, table in KATAKANA_TABLES.items():
+        assert table[24436] == "リゲル", label
+        assert table[27989] == "ベテルギウス", label
+
+
+def test_a_katakana_name_is_given_to_only_one_star():
+    # 表の HIP 番号が隣の星にずれると、同じ名前が別の HIP 番号にも付く
+    hips = defaultdict(set)
+    for table in KATAKANA_TABLES.values():
+        for hip, name in table.items():
+            hips[name].add(hip)
+    assert {name: sorted(found) for name, found in hips.items() if len(found) > 1} == {}
+
+
+def test_katakana_index_gives_the_same_proper_names_as_the_full_index():
+    # stars ステージはカタカナ表記だけの索引で固有名を付ける
+    full, _, _ = merge_sources(name_sources())
+    katakana, _, _ = merge_sources(katakana_sources())
+    assert {int(hip): str(name) for hip, name in zip(katakana.hip, katakana.proper_name) if name} == {
+        int(hip): str(name) for hip, name in zip(full.hip, full.proper_name) if name
+    }
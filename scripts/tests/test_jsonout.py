@@ -0,0 +1,25 @@
+import gzip
+
+import brotli
+
+from pipeline.jsonout import DEFAULT_BROTLI_QUALITY, PUBLISH_BROTLI_QUALITY, compressed_paths, recompress_brotli, write_records
+
+STARS = [{"id": hip, "vmag": 1.5 + hip / 1000, "properName": None} for hip in range(1, 2000)]
+
+
+def test_recompress_only_rewrites_the_brotli_sibling(tmp_path, monkeypatch):
+    monkeypatch.delenv("STAR_PIPELINE_BROTLI_QUALITY", raising=False)
+    path = tmp_path / "stars.json"
+    written = write_records(path, STARS)
+    gz_path, br_path = compressed_paths(path)
+    raw, gz = path.read_bytes(), gz_path.read_bytes()
+    assert brotli.decompress(br_path.read_bytes()) == raw
+
+    assert DEFAULT_BROTLI_QUALITY < PUBLISH_BROTLI_QUALITY
+    recompressed = recompress_brotli(path)
+    assert brotli.decompress(br_path.read_bytes()) == raw
+    assert path.read_bytes() == raw and gz_path.read_bytes() == gz
+    assert gzip.decompress(gz) == raw
+    assert recompressed.bytes == written.bytes and recompressed.gzip_bytes == written.gzip_bytes
+    assert recompressed.brotli_bytes == br_path.stat().st_size <= written.brotli_bytes
+    assert not br_path.with_name(br_path.name + ".tmp").exists()
@@ -0,0 +1,42 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from pipeline.convert import star_color
+from pipeline.palette import (
+    COLOR_CLASSES,
+    FADE_LEVELS,
+    SPECTRAL_CLASSES,
+    UNKNOWN_CLASS,
+    build_palette,
+    color_class,
+    palette_index,
+)
+from pipeline.paths import ROOT
+
+STAR_PALETTE_TS = ROOT / "lib" / "canvas" / "starPalette.ts"
+
+
+def test_matches_the_typescript_palette():
+    source = STAR_PALETTE_TS.read_text(encoding="utf-8")
+    classes = re.search(r"COLOR_CLASSES = \[(.*?)\] as const", source, re.S).group(1)
+    assert tuple(re.findall(r"'(#[0-9a-f]{6})'", classes)) == COLOR_CLASSES
+    spectral = re.search(r"SPECTRAL_CLASSES: Record<string, number> = \{(.*?)\}", source).group(1)
+    assert {key: int(value) for key, value in re.findall(r"(\w): (\d+)", spectral)} == SPECTRAL_CLASSES
+
+
+def test_spectral_k_keeps_its_own_orange():
+    classes = color_class(np.array([1.0, np.nan]), [None, "K5III"])
+    assert [COLOR_CLASSES[c] for c in classes] == ["#ffd2a1", "#ffb56c"]
+
+
+def test_unknown_stars_render_like_bv_zero():
+    index = palette_index(np.array([np.nan]), [None], np.array([1.0]))
+    assert index[0] == UNKNOWN_CLASS * FADE_LEVELS
+    assert build_palette()[index[0]] == "#fff4ea"
+
+
+def test_color_field_stays_white_for_unknown_stars():
+    colors = star_color(pd.Series([np.nan, np.nan, 0.1]), pd.Series([None, "K0", None]))
+    assert colors.tolist() == ["#ffffff", "#ffb56c", "#fff4ea"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from pipeline.propagation import propagate, propagate_to_epoch
+
+ARCSEC = 1.0 / 3600.0
+MAS = ARCSEC / 1000.0
+
+
+def move(ra, dec, pm_ra, pm_de, years):
+    ra, dec = propagate(np.array([ra]), np.array([dec]), np.array([pm_ra]), np.array([pm_de]), years)
+    return ra[0], dec[0]
+
+
+def test_barnards_star_from_j1991_25_to_j2000():
+    # Hipparcos（新整約）: α = 269.45402305°, δ = 4.66828815°, μα* = −797.84, μδ = 10326.93 mas/年
+    # 8.75 年: Δδ = 10326.93 × 8.75 = 90360.6 mas = 0.02510018°
+    #          Δα = −797.84 × 8.75 / cos 4.66828815° = −7004.3 mas = −0.00194565°
+    ra, dec = propagate_to_epoch(
+        np.array([269.45402305]), np.array([4.66828815]), np.array([-797.84]), np.array([10326.93]), 2000.0
+    )
+    assert dec[0] == pytest.approx(4.66828815 + 0.02510018, abs=1 * MAS)
+    assert ra[0] == pytest.approx(269.45402305 - 0.00194565, abs=1 * MAS)
+
+
+def test_pm_ra_includes_cos_dec():
+    # 赤緯 60° で μα* = 1000 mas/年 は赤経の 2000 mas/年。10 年で 20″
+    ra, dec = move(45.0, 60.0, 1000.0, 0.0, 10.0)
+    assert ra == pytest.approx(45.0 + 20 * ARCSEC, abs=0.01 * MAS)
+    assert dec == pytest.approx(60.0, abs=1 * MAS)
+
+
+def test_motion_across_the_ra_wrap_and_backwards():
+    ra, dec = move(359.999, 0.0, 7200.0, 0.0, 1.0)
+    assert ra == pytest.approx(0.001, abs=0.01 * MAS)
+    assert dec == pytest.approx(0.0, abs=0.01 * MAS)
+    back = move(ra, dec, 7200.0, 0.0, -1.0)
+    assert back == pytest.approx((359.999, 0.0), abs=0.01 * MAS)
+
+
+def test_motion_over_the_pole_stays_on_the_sphere():
+    # 北極の 1″ 手前から北へ 2″ 動くと、反対側（赤経 +180°）の 1″ 手前に出る
+    ra, dec = move(0.0, 90.0 - ARCSEC, 0.0, 1000.0, 2.0)
+    assert ra == pytest.approx(180.0, abs=1e-6)
+    assert dec == pytest.approx(90.0 - ARCSEC, abs=0.01 * MAS)
+
+
+def test_missing_proper_motion_does_not_move():
+    ra, dec = propagate(np.array([10.0, 20.0]), np.array([-5.0, 5.0]), np.array([np.nan, 0.0]), np.array([np.nan, 0.0]), 50000.0)
+    assert ra == pytest.approx([10.0, 20.0], abs=1e-9)
+    assert dec == pytest.approx([-5.0, 5.0], abs=1e-9)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from pipeline.bundle import columns_from_records, write_bundle
+from pipeline.jsonout import write_records
+from pipeline.nameindex import merge_sources, table_source
+from pipeline.quality import validate_bundle
+
+STARS = [
+    {"id": 32349, "ra": 101.287, "dec": -16.716, "vmag": -1.44, "bv": 0.009, "colorIndex": 0},
+    {"id": 24436, "ra": 78.634, "dec": -8.202, "vmag": 0.18, "bv": -0.03, "colorIndex": 0},
+    {"id": 27989, "ra": 88.793, "dec": 7.407, "vmag": 0.45, "bv": 1.5, "colorIndex": 0},
+    {"id": 1, "ra": 0.0009, "dec": 1.089, "vmag": 9.1, "bv": 0.482, "colorIndex": 0},
+]
+NAMES = {32349: "シリウス", 24436: "リゲル", 27989: "ベテルギウス"}
+
+
+def with_vectors(star: dict) -> dict:
+    ra, dec = np.radians(star["ra"]), np.radians(star["dec"])
+    return {**star, "x": np.cos(dec) * np.cos(ra), "y": np.cos(dec) * np.sin(ra), "z": np.sin(dec)}
+
+
+def write_stars_bin(path, proper_names):
+    stars = [{**with_vectors(star), "properName": proper_names.get(star["id"])} for star in STARS]
+    write_bundle(path, columns_from_records(stars))
+    return path
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    return write_stars_bin(tmp_path / "stars.bin", NAMES)
+
+
+def write_json(path, proper_names, order=None):
+    stars = [dict(star) for star in STARS]
+    for star in stars:
+        if star["id"] in proper_names:
+            star["properName"] = proper_names[star["id"]]
+    if order is not None:
+        stars = [stars[i] for i in order]
+    write_records(path, stars)
+    return path
+
+
+def checks(report: dict) -> dict[str, dict]:
+    return {check["name"]: check for check in report["checks"]}
+
+
+def validate(bundle, json_path, **options):
+    names, _, _ = merge_sources([table_source("test", NAMES)])
+    options = {"skip": ("nan-rate", "parallax"), **options}
+    return validate_bundle(bundle, json_path=json_path, names=names, **options)
+
+
+def test_proper_names_matching_the_index_pass(bundle):
+    report = validate(bundle, write_json(bundle.with_suffix(".json"), NAMES))
+    assert report["status"] == "ok"
+    assert checks(report)["proper-name:index"]["violations"] == 0
+
+
+def test_wrong_or_missing_proper_names_fail(bundle):
+    # 固有名が付かなかった星と、別の星の名前が付いた星
+    json_path = write_json(bundle.with_suffix(".json"), {32349: "シリウス", 24436: "ベテルギウス"})
+    report = validate(bundle, json_path)
+    assert report["status"] == "failed"
+    check = checks(report)["proper-name:index"]
+    assert check["violations"] == 2
+    assert check["examples"] == [24436, 27989]
+
+
+def test_empty_proper_names_fail(bundle):
+    report = validate(bundle, write_json(bundle.with_suffix(".json"), {**NAMES, 1: " "}))
+    assert checks(report)["proper-name:empty"]["examples"] == [1]
+
+
+def test_bundle_without_the_json_proper_names_fails(tmp_path):
+    bundle = write_stars_bin(tmp_path / "stars.bin", {32349: "シリウス"})
+    report = validate(bundle, write_json(tmp_path / "stars.json", NAMES))
+    check = checks(report)["consistency:proper-name"]
+    assert check["status"] == "failed"
+    assert check["examples"] == [24436, 27989]
+
+
+def test_reordered_json_fails(bundle):
+    report = validate(bundle, write_json(bundle.with_suffix(".json"), NAMES, order=[1, 0, 2, 3]))
+    check = checks(report)["consistency:json"]
+    assert check["status"] == "failed"
+    assert check["violations"] == 2
+
+
+def test_tier_counts_are_only_compared_when_given(bundle):
+    json_path = write_json(bundle.with_suffix(".json"), NAMES)
+    report = validate(bundle, json_path)
+    assert not any(name.startswith("tier-counts") for name in checks(report))
+    assert [tier["expected"] for tier in report["tiers"]] == [None] * len(report["tiers"])
+
+    report = validate(bundle, json_path, expected_counts={"mag4": 3, "rest": 10})
+    assert checks(report)["tier-counts:mag4"]["status"] == "ok"
+    assert checks(report)["tier-counts:rest"]["status"] == "failed"
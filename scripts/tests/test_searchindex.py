@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from pipeline.searchindex import Designation, build_search_index, designation_forms, parse_designation
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("9Alp CMa", Designation(9, "alp", None, "CMa")),
+    ("Alp1 Cen", Designation(None, "alp", 1, "Cen")),
+    ("61 Cyg", Designation(61, None, None, "Cyg")),
+    # BSC の固定幅の表記では、上付きの番号の直後に星座が続く
+    ("Alp1Cen", Designation(None, "alp", 1, "Cen")),
+    ("Alp2Cen", Designation(None, "alp", 2, "Cen")),
+    ("Gam2Vel", Designation(None, "gam", 2, "Vel")),
+    ("  Alp1Cen", Designation(None, "alp", 1, "Cen")),
+])
+def test_parses_designations(name, expected):
+    assert parse_designation(name) == expected
+
+
+@pytest.mark.parametrize("name", [None, "", "AlpCMa", "R Lep", "Cen"])
+def test_rejects_other_names(name):
+    assert parse_designation(name) is None
+
+
+def test_packed_designation_is_searchable_with_and_without_the_index():
+    [(kind, text, keys)] = designation_forms(parse_designation("Alp2Cen"))
+    assert kind == "bayer"
+    assert text == "α² Cen"
+    assert keys == ["alp2cen", "alpha2cen", "alpcen", "alphacen"]
+
+
+def build(hds, hrs):
+    hips = np.array([71683, 71681, 32349], dtype=np.int32)
+    return build_search_index(
+        hips,
+        np.array([-0.01, 1.33, -1.46]),
+        ["Alp1Cen", "Alp2Cen", "9Alp CMa"],
+        np.array(hds),
+        np.array(hrs),
+        [None, None, "シリウス"],
+        ["Rigil Kentaurus", "Toliman", "Sirius"],
+    )
+
+
+def test_catalog_columns_without_hd_or_hr_numbers():
+    catalog = build([-1, -1, -1], [-1, -1, -1])["catalog"]
+    assert catalog["hd"] == [] and catalog["hdHip"] == []
+    assert catalog["hr"] == [] and catalog["hrHip"] == []
+    assert catalog["hip"] == [32349, 71681 - 32349, 71683 - 71681]
+
+
+def test_catalog_columns_keep_the_smaller_hip_for_a_shared_number():
+    catalog = build([128620, 128621, 48915], [5459, 5459, 2491])["catalog"]
+    assert catalog["hd"] == [48915, 128620 - 48915, 1]
+    assert catalog["hdHip"] == [32349, 71683, 71681]
+    assert catalog["hr"] == [2491, 5459 - 2491]
+    assert catalog["hrHip"] == [32349, 71681]
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+from pipeline.simbad import SimbadNameCache, resolve_names
+from tests.standins import SimbadStandIn
+
+OBJECTS = {
+    32349: ("* alf CMa", "NAME Sirius|* alf CMa|HIP 32349"),
+    91262: ("* alf Lyr", "* alf Lyr|NAME Vega|HIP 91262"),
+    27989: ("* alf Ori", "* alf Ori|HIP 27989"),
+}
+
+
+def resolve(stub: SimbadStandIn, cache: SimbadNameCache, hips, **options):
+    options = {"batch_size": 2, "concurrency": 1, "backoff": 0.001, **options}
+    return asyncio.run(resolve_names(hips, cache, endpoint=stub.url, **options))
+
+
+def test_resolves_names_in_batches(tmp_path):
+    with SimbadStandIn(OBJECTS) as stub, SimbadNameCache(tmp_path / "names.sqlite") as cache:
+        stats = resolve(stub, cache, [32349, 91262, 27989])
+        assert stats == {"requested": 3, "resolved": 3, "failed": 0}
+        assert stub.requests == 2
+        assert cache.names() == {32349: "Sirius", 91262: "Vega", 27989: "* alf Ori"}
+
+
+def test_retries_transient_failures_with_backoff(tmp_path):
+    with SimbadStandIn(OBJECTS, fail_first=2) as stub, SimbadNameCache(tmp_path / "names.sqlite") as cache:
+        started = time.perf_counter()
+        stats = resolve(stub, cache, [32349], retries=2, backoff=0.05)
+        elapsed = time.perf_counter() - started
+        assert stats["resolved"] == 1
+        assert stub.requests == 3
+        # 0.05 + 0.1 秒待ってから 3 回目で成功する
+        assert elapsed >= 0.15
+        assert cache.names() == {32349: "Sirius"}
+
+
+def test_gives_up_after_the_retry_limit(tmp_path):
+    with SimbadStandIn(OBJECTS, fail_first=10) as stub, SimbadNameCache(tmp_path / "names.sqlite") as cache:
+        stats = resolve(stub, cache, [32349, 91262], retries=1)
+        assert stats == {"requested": 2, "resolved": 0, "failed": 2}
+        assert stub.requests == 2
+        # 失敗したバッチはキャッシュに残らず、次の実行で再び対象になる
+        assert cache.missing([32349, 91262]) == [32349, 91262]
+
+
+def test_cached_names_are_not_queried_again(tmp_path):
+    path = tmp_path / "names.sqlite"
+    with SimbadStandIn(OBJECTS) as stub:
+        with SimbadNameCache(path) as cache:
+            resolve(stub, cache, [32349, 91262])
+        with SimbadNameCache(path) as cache:
+            stats = resolve(stub, cache, [32349, 91262, 27989])
+        assert stats["requested"] == 1
+        assert stub.queried[-1] == [27989]
+
+
+def test_not_found_is_cached_until_the_ttl_expires(tmp_path):
+    path = tmp_path / "names.sqlite"
+    with SimbadStandIn(OBJECTS) as stub:
+        with SimbadNameCache(path) as cache:
+            stats = resolve(stub, cache, [32349, 99999])
+            assert stats["resolved"] == 2
+            assert cache.names() == {32349: "Sirius"}
+            assert cache.missing([32349, 99999]) == []
+        with SimbadNameCache(path, not_found_ttl=0) as cache:
+            assert cache.missing([32349, 99999]) == [99999]
+            resolve(stub, cache, [32349, 99999])
+        assert stub.queried[-1] == [99999]
@@ -0,0 +1,15 @@
+from pipeline.visibility import id_checksum
+
+# __tests__/lib/data/visibilityTable.test.ts の IDS と ID_CHECKSUM（TS の idChecksum と同じ値になること）
+IDS = [11767, 32349, 60718, 30438, 91262, 27989, 24436, 1]
+ID_CHECKSUM = 347199903
+
+
+def test_checksum_matches_the_typescript_reader():
+    assert id_checksum(IDS) == ID_CHECKSUM
+
+
+def test_checksum_depends_on_the_order():
+    assert id_checksum(IDS[::-1]) != ID_CHECKSUM
+    assert id_checksum(IDS[1:]) != ID_CHECKSUM
+    assert id_checksum([]) == 0x811C9DC5
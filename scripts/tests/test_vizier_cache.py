@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from pipeline import vizier_cache
+from pipeline.vizier_cache import cache_entries, is_offline, query_catalog
+
+
+@pytest.fixture
+def fetched(tmp_path, monkeypatch):
+    """VizieR への問い合わせを差し替え、呼ばれた回数を数える"""
+    monkeypatch.setenv("VIZIER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("STAR_PIPELINE_OFFLINE", raising=False)
+    calls = []
+
+    def fetch(catalog, columns, column_filters, row_limit):
+        calls.append(catalog)
+        return pd.DataFrame({"HIP": [1, 2, 3], "Vmag": [1.5, 2.5, None], "Name": ["a", None, "c"]})
+
+    monkeypatch.setattr(vizier_cache, "_fetch", fetch)
+    return calls
+
+
+def test_second_query_is_served_from_cache(fetched):
+    first = query_catalog("I/239/hip_main", columns=["HIP", "Vmag", "Name"])
+    second = query_catalog("I/239/hip_main", columns=["HIP", "Vmag", "Name"])
+    assert fetched == ["I/239/hip_main"]
+    pd.testing.assert_frame_equal(first, second)
+    assert second["Name"].tolist() == ["a", None, "c"]
+
+
+def test_result_larger_than_the_cache_limit_is_returned(fetched, monkeypatch):
+    monkeypatch.setenv("VIZIER_CACHE_MAX_BYTES", "100")
+    frame = query_catalog("I/239/hip_main")
+    assert len(frame) == 3
+    # 上限を超えた古いエントリは次の問い合わせで消える
+    query_catalog("I/311/hip2")
+    assert [meta["catalog"] for meta in cache_entries()] == ["I/311/hip2"]
+
+
+@pytest.mark.parametrize("value", ["1", "true", "TRUE", "Yes", " on "])
+def test_offline_flag_accepts_common_spellings(monkeypatch, value):
+    monkeypatch.setenv("STAR_PIPELINE_OFFLINE", value)
+    assert is_offline()
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "False", "NO", "off"])
+def test_offline_flag_can_be_disabled(monkeypatch, value):
+    monkeypatch.setenv("STAR_PIPELINE_OFFLINE", value)
+    assert not is_offline()
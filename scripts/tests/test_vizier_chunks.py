@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.bundle import read_bundle
+from pipeline.vizier_chunks import ChunkPlan, fetch_chunks, merge_chunks
+from tests.standins import VizierStandIn
+
+CATALOG = "I/259/tyc2"
+# 赤緯帯 2 × 赤経区画 2（境界は赤緯 0°、赤経 180°）
+PLAN = ChunkPlan(CATALOG, ("TYC1", "VTmag"), {"VTmag": "<12"}, dec_bands=2, ra_sectors=2)
+STARS = pd.DataFrame({
+    "TYC1": [1, 2, 3, 4, 5, 6, 7, 8],
+    "RAdeg": [10.0, 200.0, 180.0, 359.5, 90.0, 180.0, 0.0, 270.0],
+    "DEdeg": [-45.0, -10.0, 30.0, 0.0, 0.0, 0.0, 90.0, 60.0],
+    "VTmag": [5.0, 11.9, 8.0, 9.0, 10.0, 6.0, 3.0, 12.5],
+})
+
+
+@pytest.fixture
+def chunks_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIZIER_CHUNKS_DIR", str(tmp_path / "chunks"))
+    monkeypatch.delenv("STAR_PIPELINE_OFFLINE", raising=False)
+    return tmp_path / "chunks"
+
+
+def fetch(stub: VizierStandIn, **options) -> dict[str, int]:
+    options = {"workers": 1, "backoff": 0.001, **options}
+    return fetch_chunks(PLAN, endpoint=stub.url, **options)
+
+
+def merged_ids(path) -> list[int]:
+    _, columns = read_bundle(path)
+    return sorted(int(value) for value in columns["TYC1"])
+
+
+def test_merged_rows_match_the_filter_without_edge_duplicates(chunks_dir):
+    with VizierStandIn({CATALOG: STARS}) as stub:
+        stats = fetch(stub)
+    expected = STARS.loc[STARS["VTmag"] < 12, "TYC1"].tolist()
+    assert stats == {"chunks": 4, "cached": 0, "fetched": 4, "failed": 0, "rows": len(expected)}
+
+    rows, _ = merge_chunks(PLAN)
+    assert rows == len(expected)
+    # 赤緯 0°・赤経 180° の境界上の星（3〜6）は VizieR から 2 回以上返るが、1 回だけ残る
+    assert merged_ids(PLAN.merged_path) == expected
+
+
+def test_retries_a_transient_failure(chunks_dir):
+    with VizierStandIn({CATALOG: STARS}, fail_first=1) as stub:
+        stats = fetch(stub, retries=2)
+        assert stub.requests == 5
+    assert stats["fetched"] == 4
+    assert stats["failed"] == 0
+
+
+def test_failed_chunks_are_left_for_the_next_run(chunks_dir):
+    with VizierStandIn({CATALOG: STARS}, fail_first=1) as stub:
+        stats = fetch(stub, retries=0)
+    assert stats["fetched"] == 3
+    assert stats["failed"] == 1
+    with pytest.raises(RuntimeError, match="未取得のチャンク"):
+        merge_chunks(PLAN)
+
+
+def test_resumes_from_chunks_already_on_disk(chunks_dir):
+    with VizierStandIn({CATALOG: STARS}) as stub:
+        fetch(stub)
+        # 1 チャンクだけ取得前の状態に戻す
+        PLAN.paths(PLAN.chunks()[2])[1].unlink()
+        stats = fetch(stub)
+        assert stub.requests == 5
+        resumed = stub.queries[-1]
+    assert stats["cached"] == 3
+    assert stats["fetched"] == 1
+    assert resumed["DEdeg"] == "0.000000..90.000000"
+    assert resumed["RAdeg"] == "0.000000..180.000000"
+
+    rows, _ = merge_chunks(PLAN)
+    assert rows == int(np.sum(STARS["VTmag"] < 12))
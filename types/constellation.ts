@@ -16,3 +16,26 @@ export interface ConstellationLine {
   constellationId: string;       // 星座ID
   lines: number[][];             // 星のIDペアの配列
 }
+
+// 星座線の描画用ジオメトリ（public/data/constellation-geometry.json）
+// 形式は scripts/pipeline/linegeometry.py を参照
+export interface ConstellationGeometryVertices {
+  hip: number[];                 // 頂点の HIP 番号（昇順、全星座で共有）
+  ra: number[];                  // 赤経（度）
+  dec: number[];                 // 赤緯（度）
+  x: number[];                   // 方向余弦
+  y: number[];
+  z: number[];
+}
+
+export interface ConstellationGeometryEntry {
+  constellationId: string;       // 星座ID
+  indices: number[];             // 線分ごとの頂点番号の組（平らに並べたもの）
+  strips: number[][];            // 線分をつないだ折れ線（頂点番号の列）
+}
+
+export interface ConstellationGeometry {
+  version: number;
+  vertices: ConstellationGeometryVertices;
+  constellations: ConstellationGeometryEntry[];
+}
@@ -8,10 +8,14 @@ export interface Star {
   spectralType: string | null;   // スペクトル型
   name: string | null;           // カタログ名（例: "9Alp CMa"）
   properName?: string;           // 固有名（カタカナ、例: "シリウス"）
-  constellation?: string;        // 星座名（例: "Orion"）
+  constellation?: string;        // 星座（stars.json では IAU 略号 "Ori"、読み込み後は日本語名 "オリオン"）
   hd: number | null;             // Henry Draper番号
   hr: number | null;             // Harvard Revised番号
   parallax: number | null;       // 視差（mas）
   pmRA: number | null;           // 赤経方向固有運動（mas/yr）
   pmDE: number | null;           // 赤緯方向固有運動（mas/yr）
+  x?: number | null;             // ICRS方向余弦 x = cos(dec)cos(ra)（ビルド時に計算）
+  y?: number | null;             // ICRS方向余弦 y = cos(dec)sin(ra)
+  z?: number | null;             // ICRS方向余弦 z = sin(dec)
+  colorIndex?: number;           // 表示色のパレット番号（lib/canvas/starPalette.ts、ビルド時に計算）
 }